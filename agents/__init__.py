@@ -6,6 +6,7 @@ from .purchase_retrieval_agent import PurchaseRetrievalAgent
 from .return_classification_agent import ReturnClassificationAgent
 from .return_processing_agent import ReturnProcessingAgent
 from .logistics_agent import LogisticsAgent
+from .packaging_templates import PackagingTemplate, PackagingTemplateRegistry
 from .tracking_refund_agent import TrackingRefundAgent
 
 __all__ = [
@@ -17,5 +18,7 @@ __all__ = [
     "ReturnClassificationAgent",
     "ReturnProcessingAgent",
     "LogisticsAgent",
+    "PackagingTemplate",
+    "PackagingTemplateRegistry",
     "TrackingRefundAgent",
 ]
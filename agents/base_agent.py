@@ -38,6 +38,23 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def process_async(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
+        """
+        Process user input without blocking the event loop.
+
+        Agents that only do in-memory work inherit this default, which
+        calls ``process``. Agents that read storage override it to await
+        an AsyncDatabase.
+
+        Args:
+            user_input: The user's voice input
+            context: Conversation context and session data
+
+        Returns:
+            AgentResponse with the agent's response
+        """
+        return self.process(user_input, context)
+
     def update_context(self, key: str, value: Any) -> None:
         """Update the agent's context."""
         self.context[key] = value
@@ -1,17 +1,19 @@
 """Logistics Agent - Provides packaging and drop-off information."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import re
 
 from .base_agent import BaseAgent, AgentResponse
+from .packaging_templates import PackagingTemplateRegistry, packaging_templates
 
 
 class LogisticsAgent(BaseAgent):
     """Provides packaging instructions and carrier drop-off locations."""
 
-    def __init__(self):
+    def __init__(self, templates: Optional[PackagingTemplateRegistry] = None):
         """Initialize the Logistics Agent."""
         super().__init__("LogisticsAgent")
+        self.packaging_templates = templates or packaging_templates
 
         # Mock carrier locations (in a real system, this would use geolocation API)
         self.carrier_locations = {
@@ -84,25 +86,14 @@ class LogisticsAgent(BaseAgent):
         return any(re.search(keyword, user_input) for keyword in location_keywords)
 
     def _provide_packaging_instructions(self, context: Dict[str, Any]) -> AgentResponse:
-        """Provide packaging instructions."""
+        """Provide packaging instructions for the item's category."""
         item_name = context.get("item_name", "item")
-
-        message = f"""Here's how to pack your {item_name}:
-
-1. Place the item in its original packaging if you have it
-2. If not, use a sturdy box that's slightly larger than the item
-3. Wrap the item in bubble wrap or packing paper
-4. Fill empty space with packing material to prevent movement
-5. Seal the box securely with packing tape
-6. Attach your shipping label to the outside of the box
-
-Make sure not to include any personal items or accessories you want to keep!
-
-Would you like help finding a drop-off location?"""
+        template = self.packaging_templates.get(context.get("item_category"))
 
         return AgentResponse(
             success=True,
-            message=message,
+            message=template.render(item_name=item_name),
+            data={"template_id": template.template_id, "category": template.category},
             next_action="await_user_response",
         )
 
@@ -0,0 +1,166 @@
+"""Packaging instruction templates keyed by item category."""
+
+from dataclasses import dataclass
+from hashlib import sha1
+from string import Formatter
+from typing import Dict, Optional, Tuple
+
+
+DEFAULT_CATEGORY = "General"
+
+_CLOSING = """Make sure not to include any personal items or accessories you want to keep!
+
+Would you like help finding a drop-off location?"""
+
+DEFAULT_PACKAGING_TEMPLATES: Dict[str, str] = {
+    DEFAULT_CATEGORY: """Here's how to pack your {item_name}:
+
+1. Place the item in its original packaging if you have it
+2. If not, use a sturdy box that's slightly larger than the item
+3. Wrap the item in bubble wrap or packing paper
+4. Fill empty space with packing material to prevent movement
+5. Seal the box securely with packing tape
+6. Attach your shipping label to the outside of the box
+
+""" + _CLOSING,
+    "Electronics": """Here's how to pack your {item_name}:
+
+1. Power the device off and remove any batteries if you can
+2. Place it in its original box with the foam inserts if you have them
+3. Otherwise wrap it in at least two layers of bubble wrap, screen facing inward
+4. Pack cables and chargers separately in a small bag inside the box
+5. Use a sturdy box with two inches of padding on every side
+6. Seal the box with packing tape and attach your shipping label to the top
+
+Please sign out of any accounts and reset the device before sending it back.
+
+""" + _CLOSING,
+    "Footwear": """Here's how to pack your {item_name}:
+
+1. Put the shoes back in their original shoe box with any tissue paper
+2. Stuff the toes with paper so they keep their shape
+3. Place the shoe box inside a shipping box or mailer
+4. Do not tape or write on the shoe box itself
+5. Seal the outer box with packing tape
+6. Attach your shipping label to the outer box
+
+""" + _CLOSING,
+    "Home & Kitchen": """Here's how to pack your {item_name}:
+
+1. Empty, clean and fully dry the item before packing
+2. Remove any glass carafes or detachable parts and wrap them separately
+3. Wrap the item in bubble wrap or packing paper
+4. Fill empty space in the box so nothing can shift
+5. Seal the box securely with packing tape
+6. Attach your shipping label to the outside of the box
+
+""" + _CLOSING,
+    "Accessories": """Here's how to pack your {item_name}:
+
+1. Place the item in its original bag or packaging if you have it
+2. Use a padded mailer or small box
+3. Include every piece that came with it, such as straps or clips
+4. Seal the mailer or box securely
+5. Attach your shipping label to the outside
+
+""" + _CLOSING,
+}
+
+
+@dataclass(frozen=True)
+class PackagingTemplate:
+    """A packaging instruction body compiled into literal segments and slots."""
+
+    template_id: str
+    category: str
+    body: str
+    segments: Tuple[str, ...]
+    slots: Tuple[Optional[str], ...]
+
+    @classmethod
+    def compile(cls, category: str, body: str) -> "PackagingTemplate":
+        """
+        Compile a template body once so rendering is a plain join.
+
+        Args:
+            category: Item category the template applies to
+            body: Template text with ``{slot}`` placeholders
+
+        Returns:
+            Compiled PackagingTemplate
+        """
+        segments = []
+        slots = []
+        for literal, field_name, _, _ in Formatter().parse(body):
+            segments.append(literal)
+            slots.append(field_name)
+
+        # The ID is derived from the body so cached audio is reused across
+        # restarts and invalidated automatically when the wording changes.
+        digest = sha1(body.encode("utf-8")).hexdigest()[:10]
+        slug = category.lower().replace("&", "and").replace(" ", "_")
+        return cls(
+            template_id=f"packaging.{slug}.{digest}",
+            category=category,
+            body=body,
+            segments=tuple(segments),
+            slots=tuple(slots),
+        )
+
+    def render(self, **values: str) -> str:
+        """
+        Fill the template slots with the given values.
+
+        Raises:
+            KeyError: If a slot in the template has no value
+        """
+        parts = []
+        for literal, slot in zip(self.segments, self.slots):
+            parts.append(literal)
+            if slot is not None:
+                if slot not in values:
+                    raise KeyError(f"No value for slot '{slot}' in template {self.template_id}")
+                parts.append(str(values[slot]))
+        return "".join(parts)
+
+
+class PackagingTemplateRegistry:
+    """Category-keyed registry of compiled packaging templates."""
+
+    def __init__(self, bodies: Dict[str, str], default_category: str = DEFAULT_CATEGORY):
+        """Compile every template body up front."""
+        if default_category not in bodies:
+            raise ValueError(f"No template registered for default category '{default_category}'")
+
+        self.default_category = default_category
+        self._templates: Dict[str, PackagingTemplate] = {}
+        self._by_id: Dict[str, PackagingTemplate] = {}
+        for category, body in bodies.items():
+            self.register(category, body)
+
+    def register(self, category: str, body: str) -> PackagingTemplate:
+        """Compile and register a template for a category."""
+        template = PackagingTemplate.compile(category, body)
+        self._templates[category.casefold()] = template
+        self._by_id[template.template_id] = template
+        return template
+
+    def get(self, category: Optional[str]) -> PackagingTemplate:
+        """Get the template for a category, falling back to the default."""
+        if category:
+            template = self._templates.get(category.casefold())
+            if template:
+                return template
+        return self._templates[self.default_category.casefold()]
+
+    def get_by_id(self, template_id: str) -> Optional[PackagingTemplate]:
+        """Look up a template by its stable ID."""
+        return self._by_id.get(template_id)
+
+    def template_ids(self) -> Dict[str, str]:
+        """Map each registered category to its template ID."""
+        return {template.category: template.template_id for template in self._templates.values()}
+
+
+# Compiled once at import time and shared by every LogisticsAgent
+packaging_templates = PackagingTemplateRegistry(DEFAULT_PACKAGING_TEMPLATES)
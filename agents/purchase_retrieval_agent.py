@@ -1,19 +1,22 @@
 """Purchase Retrieval Agent - Fetches and presents user's recent orders."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from .base_agent import BaseAgent, AgentResponse
+from models.order import Order
+from database.async_db import AsyncDatabase
 from database.mock_db import MockDatabase
 
 
 class PurchaseRetrievalAgent(BaseAgent):
     """Fetches user's recent purchases and helps them select items to return."""
 
-    def __init__(self, database: MockDatabase):
+    def __init__(self, database: MockDatabase, async_database: Optional[AsyncDatabase] = None):
         """Initialize the Purchase Retrieval Agent."""
         super().__init__("PurchaseRetrievalAgent")
         self.db = database
+        self.async_db = async_database or AsyncDatabase(database)
 
     def process(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
         """
@@ -29,17 +32,51 @@ class PurchaseRetrievalAgent(BaseAgent):
         user_id = context.get("user_id")
 
         if not user_id:
-            return AgentResponse(
-                success=False,
-                message="I need to identify you first. Can you provide your phone number or order ID?",
-                requires_clarification=True,
-            )
+            return self._identify_first()
 
         # Check if user is selecting an item
         if "selected_order_id" in context and "selected_item_id" not in context:
-            return self._handle_item_selection(user_input, context)
+            order = self.db.get_order(context.get("selected_order_id"))
+            return self._handle_item_selection(user_input, context, order)
+
+        response = self._handle_order_selection(user_input, context)
+        if response:
+            return response
 
-        # Check if user is selecting an order from multiple orders
+        # Fetch user's recent orders
+        orders = self.db.get_user_orders(user_id, limit=5)
+        return self._present_orders(orders, context)
+
+    async def process_async(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
+        """Async variant of ``process`` that awaits the database."""
+        user_id = context.get("user_id")
+
+        if not user_id:
+            return self._identify_first()
+
+        if "selected_order_id" in context and "selected_item_id" not in context:
+            order = await self.async_db.get_order(context.get("selected_order_id"))
+            return self._handle_item_selection(user_input, context, order)
+
+        response = self._handle_order_selection(user_input, context)
+        if response:
+            return response
+
+        orders = await self.async_db.get_user_orders(user_id, limit=5)
+        return self._present_orders(orders, context)
+
+    def _identify_first(self) -> AgentResponse:
+        """Ask an unidentified caller to identify themselves."""
+        return AgentResponse(
+            success=False,
+            message="I need to identify you first. Can you provide your phone number or order ID?",
+            requires_clarification=True,
+        )
+
+    def _handle_order_selection(
+        self, user_input: str, context: Dict[str, Any]
+    ) -> Optional[AgentResponse]:
+        """Handle the user picking one of the presented orders, if awaited."""
         if context.get("awaiting_order_selection"):
             orders = context.get("available_orders", [])
             selected_order = self._select_order_from_input(user_input, orders)
@@ -52,6 +89,7 @@ class PurchaseRetrievalAgent(BaseAgent):
                     context["selected_item_id"] = item.item_id
                     context["item_name"] = item.product_name
                     context["item_price"] = item.price
+                    context["item_category"] = item.category
                     return AgentResponse(
                         success=True,
                         message=f"Got it, you want to return the {item.product_name}. Can you tell me why you're returning it?",
@@ -72,9 +110,10 @@ class PurchaseRetrievalAgent(BaseAgent):
                         requires_clarification=True,
                     )
 
-        # Fetch user's recent orders
-        orders = self.db.get_user_orders(user_id, limit=5)
+        return None
 
+    def _present_orders(self, orders: List[Order], context: Dict[str, Any]) -> AgentResponse:
+        """Present the user's recent orders for selection."""
         if not orders:
             return AgentResponse(
                 success=False,
@@ -125,10 +164,11 @@ class PurchaseRetrievalAgent(BaseAgent):
         message += "Which order contains the item you want to return?"
         return message
 
-    def _handle_item_selection(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
+    def _handle_item_selection(
+        self, user_input: str, context: Dict[str, Any], order: Optional[Order]
+    ) -> AgentResponse:
         """Handle user selecting a specific item from an order."""
         order_id = context.get("selected_order_id")
-        order = self.db.get_order(order_id)
 
         if not order:
             return AgentResponse(
@@ -181,6 +221,7 @@ class PurchaseRetrievalAgent(BaseAgent):
         context["selected_item_id"] = selected_item.item_id
         context["item_name"] = selected_item.product_name
         context["item_price"] = selected_item.price
+        context["item_category"] = selected_item.category
 
         return AgentResponse(
             success=True,
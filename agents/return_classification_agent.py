@@ -1,20 +1,30 @@
 """Return Classification Agent - Classifies return reasons and checks eligibility."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import asyncio
 import re
 
 from .base_agent import BaseAgent, AgentResponse
+from models.order import Order
 from models.return_request import ReturnReason
+from models.user import User
+from database.async_db import AsyncDatabase
 from database.mock_db import MockDatabase
 
 
+async def _none() -> None:
+    """Placeholder awaitable for a lookup that is not needed."""
+    return None
+
+
 class ReturnClassificationAgent(BaseAgent):
     """Classifies the reason for return and validates eligibility."""
 
-    def __init__(self, database: MockDatabase):
+    def __init__(self, database: MockDatabase, async_database: Optional[AsyncDatabase] = None):
         """Initialize the Return Classification Agent."""
         super().__init__("ReturnClassificationAgent")
         self.db = database
+        self.async_db = async_database or AsyncDatabase(database)
 
         # Reason classification patterns
         self.reason_patterns = {
@@ -78,19 +88,47 @@ class ReturnClassificationAgent(BaseAgent):
         reason = self._classify_reason(user_input)
 
         if reason == ReturnReason.OTHER:
-            return AgentResponse(
-                success=False,
-                message="I didn't quite catch that. Can you tell me more about why you're returning this item? Is it damaged, the wrong item, a size issue, or something else?",
-                requires_clarification=True,
-            )
+            return self._clarify_reason()
 
         # Calculate fraud risk
-        fraud_risk = self._calculate_fraud_risk(context, reason)
+        user_id = context.get("user_id")
+        user = self.db.get_user(user_id) if user_id else None
+        fraud_risk = self._calculate_fraud_risk(reason, user)
 
         # Check if return is eligible
-        order_id = context.get("selected_order_id")
-        order = self.db.get_order(order_id)
+        order = self.db.get_order(context.get("selected_order_id"))
+        return self._classification_response(reason, fraud_risk, order, context)
+
+    async def process_async(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
+        """Async variant of ``process``; the user and order are fetched concurrently."""
+        reason = self._classify_reason(user_input)
+        if reason == ReturnReason.OTHER:
+            return self._clarify_reason()
+
+        user_id = context.get("user_id")
+        order, user = await asyncio.gather(
+            self.async_db.get_order(context.get("selected_order_id")),
+            self.async_db.get_user(user_id) if user_id else _none(),
+        )
+        fraud_risk = self._calculate_fraud_risk(reason, user)
+        return self._classification_response(reason, fraud_risk, order, context)
 
+    def _clarify_reason(self) -> AgentResponse:
+        """Ask the user to restate an unrecognized return reason."""
+        return AgentResponse(
+            success=False,
+            message="I didn't quite catch that. Can you tell me more about why you're returning this item? Is it damaged, the wrong item, a size issue, or something else?",
+            requires_clarification=True,
+        )
+
+    def _classification_response(
+        self,
+        reason: ReturnReason,
+        fraud_risk: float,
+        order: Optional[Order],
+        context: Dict[str, Any],
+    ) -> AgentResponse:
+        """Check eligibility and build the response for a classified reason."""
         if not order or not order.is_returnable():
             return AgentResponse(
                 success=False,
@@ -143,13 +181,13 @@ class ReturnClassificationAgent(BaseAgent):
 
         return ReturnReason.OTHER
 
-    def _calculate_fraud_risk(self, context: Dict[str, Any], reason: ReturnReason) -> float:
+    def _calculate_fraud_risk(self, reason: ReturnReason, user: Optional[User]) -> float:
         """
         Calculate basic fraud risk score.
 
         Args:
-            context: Conversation context with user info
             reason: The classified return reason
+            user: The returning user, if identified
 
         Returns:
             Fraud risk score (0.0 to 1.0)
@@ -168,11 +206,8 @@ class ReturnClassificationAgent(BaseAgent):
         risk_score += reason_risk.get(reason, 0.3)
 
         # Adjust based on user history
-        user_id = context.get("user_id")
-        if user_id:
-            user = self.db.get_user(user_id)
-            if user:
-                risk_score *= user.get_fraud_risk_multiplier()
+        if user:
+            risk_score *= user.get_fraud_risk_multiplier()
 
         # Cap at 1.0
         return min(risk_score, 1.0)
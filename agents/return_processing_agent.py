@@ -1,22 +1,25 @@
 """Return Processing Agent - Generates return ID, labels, and QR codes."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import random
 import string
 
 from .base_agent import BaseAgent, AgentResponse
+from models.order import Order, OrderItem
 from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from database.async_db import AsyncDatabase
 from database.mock_db import MockDatabase
 
 
 class ReturnProcessingAgent(BaseAgent):
     """Processes returns, generates labels and QR codes."""
 
-    def __init__(self, database: MockDatabase):
+    def __init__(self, database: MockDatabase, async_database: Optional[AsyncDatabase] = None):
         """Initialize the Return Processing Agent."""
         super().__init__("ReturnProcessingAgent")
         self.db = database
+        self.async_db = async_database or AsyncDatabase(database)
 
     def process(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
         """
@@ -29,68 +32,115 @@ class ReturnProcessingAgent(BaseAgent):
         Returns:
             AgentResponse with return confirmation and label info
         """
-        # Extract context information
-        user_id = context.get("user_id")
-        order_id = context.get("selected_order_id")
-        item_id = context.get("selected_item_id")
-        reason_str = context.get("return_reason", "other")
-        fraud_risk = context.get("fraud_risk_score", 0.0)
-
-        if not all([user_id, order_id, item_id]):
+        missing = self._check_context(context)
+        if missing:
+            return missing
+
+        # Get order and item details
+        order = self.db.get_order(context["selected_order_id"])
+        error, return_request, item = self._prepare_return(order, context)
+        if error:
+            return error
+
+        # Save to database
+        self.db.create_return(return_request)
+        return self._confirm_return(return_request, item, context)
+
+    async def process_async(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
+        """Async variant of ``process`` that awaits the database."""
+        missing = self._check_context(context)
+        if missing:
+            return missing
+
+        order = await self.async_db.get_order(context["selected_order_id"])
+        error, return_request, item = self._prepare_return(order, context)
+        if error:
+            return error
+
+        await self.async_db.create_return(return_request)
+        return self._confirm_return(return_request, item, context)
+
+    def _check_context(self, context: Dict[str, Any]) -> Optional[AgentResponse]:
+        """Return an error response if the context lacks the selected item."""
+        if not all(
+            [context.get("user_id"), context.get("selected_order_id"), context.get("selected_item_id")]
+        ):
             return AgentResponse(
                 success=False,
                 message="I'm missing some information to process your return. Let's start over.",
                 next_action="intent_router",
             )
+        return None
 
-        # Get order and item details
-        order = self.db.get_order(order_id)
+    def _prepare_return(
+        self, order: Optional[Order], context: Dict[str, Any]
+    ) -> Tuple[Optional[AgentResponse], Optional[ReturnRequest], Optional[OrderItem]]:
+        """
+        Build the return request for the selected item.
+
+        Returns:
+            (error_response, return_request, item); error_response is set
+            when the order or item could not be found
+        """
         if not order:
-            return AgentResponse(
-                success=False,
-                message="I couldn't find that order. Please try again.",
-                next_action="purchase_retrieval",
+            return (
+                AgentResponse(
+                    success=False,
+                    message="I couldn't find that order. Please try again.",
+                    next_action="purchase_retrieval",
+                ),
+                None,
+                None,
             )
 
+        item_id = context["selected_item_id"]
         item = order.get_item_by_id(item_id)
         if not item:
-            return AgentResponse(
-                success=False,
-                message="I couldn't find that item in your order.",
-                next_action="purchase_retrieval",
+            return (
+                AgentResponse(
+                    success=False,
+                    message="I couldn't find that item in your order.",
+                    next_action="purchase_retrieval",
+                ),
+                None,
+                None,
             )
 
         # Create return request
-        return_id = self._generate_return_id(order_id)
+        return_id = self._generate_return_id(order.order_id)
         tracking_number = self._generate_tracking_number()
 
         # Convert reason string to enum
         try:
-            reason = ReturnReason(reason_str)
+            reason = ReturnReason(context.get("return_reason", "other"))
         except ValueError:
             reason = ReturnReason.OTHER
 
         return_request = ReturnRequest(
             return_id=return_id,
-            order_id=order_id,
-            user_id=user_id,
+            order_id=order.order_id,
+            user_id=context["user_id"],
             item_id=item_id,
             reason=reason,
             status=ReturnStatus.LABEL_GENERATED,
-            refund_amount=item.price,
-            fraud_risk_score=fraud_risk,
+            refund_cents=item.price_cents,
+            fraud_risk_score=context.get("fraud_risk_score", 0.0),
             tracking_number=tracking_number,
         )
 
         # Generate label and QR code URLs (mock)
-        label_url = self._generate_label_url(return_id)
-        qr_code_url = self._generate_qr_code_url(return_id)
-
-        return_request.label_url = label_url
-        return_request.qr_code_url = qr_code_url
-
-        # Save to database
-        self.db.create_return(return_request)
+        return_request.label_url = self._generate_label_url(return_id)
+        return_request.qr_code_url = self._generate_qr_code_url(return_id)
+        return None, return_request, item
+
+    def _confirm_return(
+        self, return_request: ReturnRequest, item: OrderItem, context: Dict[str, Any]
+    ) -> AgentResponse:
+        """Record the saved return in the context and build the confirmation."""
+        return_id = return_request.return_id
+        tracking_number = return_request.tracking_number
+        label_url = return_request.label_url
+        qr_code_url = return_request.qr_code_url
 
         # Store in context for future reference
         context["return_id"] = return_id
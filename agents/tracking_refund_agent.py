@@ -1,22 +1,42 @@
 """Tracking & Refund Agent - Handles tracking, refund status, and disputes."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import random
 
 from .base_agent import BaseAgent, AgentResponse
+from models.order import Order
 from models.tracking import TrackingInfo, ShipmentStatus
-from models.return_request import ReturnStatus
+from models.return_request import ReturnRequest, ReturnStatus
+from database.async_db import AsyncDatabase
 from database.mock_db import MockDatabase
+from database.tracking_cache import TrackingCache
+from database.tracking_history import TrackingScan
 
 
 class TrackingRefundAgent(BaseAgent):
     """Provides tracking information and handles refund queries and disputes."""
 
-    def __init__(self, database: MockDatabase):
-        """Initialize the Tracking & Refund Agent."""
+    def __init__(
+        self,
+        database: MockDatabase,
+        tracking_cache: Optional[TrackingCache] = None,
+        async_database: Optional[AsyncDatabase] = None,
+    ):
+        """
+        Initialize the Tracking & Refund Agent.
+
+        Args:
+            database: Database for returns, orders and tracking
+            tracking_cache: Optional in-memory tracking cache; when set,
+                tracking answers are served from it instead of the database
+            async_database: Awaitable view of ``database`` for process_async
+        """
         super().__init__("TrackingRefundAgent")
         self.db = database
+        self.tracking_cache = tracking_cache
+        self.async_db = async_database or AsyncDatabase(database)
 
     def process(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
         """
@@ -29,51 +49,124 @@ class TrackingRefundAgent(BaseAgent):
         Returns:
             AgentResponse with tracking/refund information
         """
-        user_input_lower = user_input.lower()
-
-        # Determine what the user wants
-        if "dispute" in user_input_lower or "wrong" in user_input_lower or "less" in user_input_lower:
+        query = self._query_type(user_input)
+        if query == "dispute":
             return self._handle_dispute(user_input, context)
-        elif "refund" in user_input_lower:
+        elif query == "refund":
             return self._handle_refund_status(context)
         else:
             return self._handle_tracking_status(context)
 
+    async def process_async(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
+        """Async variant of ``process`` that awaits the database."""
+        query = self._query_type(user_input)
+        if query == "dispute":
+            return await self._handle_dispute_async(user_input, context)
+        elif query == "refund":
+            return await self._handle_refund_status_async(context)
+        else:
+            return await self._handle_tracking_status_async(context)
+
+    @staticmethod
+    def _query_type(user_input: str) -> str:
+        """Determine what the user wants: "dispute", "refund" or "tracking"."""
+        user_input_lower = user_input.lower()
+        if "dispute" in user_input_lower or "wrong" in user_input_lower or "less" in user_input_lower:
+            return "dispute"
+        elif "refund" in user_input_lower:
+            return "refund"
+        return "tracking"
+
     def _handle_tracking_status(self, context: Dict[str, Any]) -> AgentResponse:
         """Provide tracking status for a return."""
         user_id = context.get("user_id")
-        return_id = context.get("return_id")
-
         if not user_id:
-            return AgentResponse(
-                success=False,
-                message="I need to identify you first. Can you provide your phone number or return ID?",
-                requires_clarification=True,
-            )
+            return self._identify_first("phone number or return ID")
 
         # Get user's returns
+        return_id = context.get("return_id")
         if return_id:
             return_request = self.db.get_return(return_id)
-            if not return_request:
-                return AgentResponse(
-                    success=False,
-                    message="I couldn't find that return. Can you provide your return ID?",
-                    requires_clarification=True,
-                )
         else:
             # Get most recent return
-            user_returns = self.db.get_user_returns(user_id)
-            if not user_returns:
-                return AgentResponse(
-                    success=False,
-                    message="I couldn't find any returns for your account.",
-                    next_action="end",
-                )
-            return_request = user_returns[-1]  # Most recent
+            return_request = self.db.get_latest_user_return(user_id)
+        if not return_request:
+            return self._return_not_found(return_id)
 
         # Get or create tracking info
         tracking_info = self._get_or_create_tracking(return_request)
+        scan_history = self.db.get_tracking_history(return_request.tracking_number, limit=10)
+        return self._tracking_status_response(return_request, tracking_info, scan_history)
+
+    async def _handle_tracking_status_async(self, context: Dict[str, Any]) -> AgentResponse:
+        """Async variant of ``_handle_tracking_status``."""
+        user_id = context.get("user_id")
+        if not user_id:
+            return self._identify_first("phone number or return ID")
+
+        return_id = context.get("return_id")
+        if return_id:
+            return_request = await self.async_db.get_return(return_id)
+        else:
+            return_request = await self.async_db.get_latest_user_return(user_id)
+        if not return_request:
+            return self._return_not_found(return_id)
+
+        tracking_number = return_request.tracking_number
+        tracking_info = None
+        if self.tracking_cache is not None:
+            # In-memory lookup; never blocks
+            tracking_info = self.tracking_cache.get(tracking_number)
+        if tracking_info is not None:
+            scan_history = await self.async_db.get_tracking_history(tracking_number, limit=10)
+        else:
+            # Both are reads, so they can overlap
+            tracking_info, scan_history = await asyncio.gather(
+                self.async_db.get_tracking(tracking_number),
+                self.async_db.get_tracking_history(tracking_number, limit=10),
+            )
+            if tracking_info is None:
+                # First lookup of this shipment: store it before answering. The
+                # history was read before the write, so add the scan it records
+                tracking_info = self._mock_tracking(return_request)
+                await self.async_db.create_tracking(tracking_info)
+                scan = TrackingScan(
+                    tracking_info.status, tracking_info.last_update, tracking_info.current_location
+                )
+                scan_history = (scan_history + [scan])[-10:]
+            if self.tracking_cache is not None:
+                self.tracking_cache.put(tracking_info, fresh=False)
+        return self._tracking_status_response(return_request, tracking_info, scan_history)
+
+    def _identify_first(self, identifiers: str = "phone number") -> AgentResponse:
+        """Ask an unidentified caller to identify themselves."""
+        return AgentResponse(
+            success=False,
+            message=f"I need to identify you first. Can you provide your {identifiers}?",
+            requires_clarification=True,
+        )
+
+    def _return_not_found(self, return_id: Optional[str] = None) -> AgentResponse:
+        """Response when the requested (or latest) return does not exist."""
+        if return_id:
+            return AgentResponse(
+                success=False,
+                message="I couldn't find that return. Can you provide your return ID?",
+                requires_clarification=True,
+            )
+        return AgentResponse(
+            success=False,
+            message="I couldn't find any returns for your account.",
+            next_action="end",
+        )
 
+    def _tracking_status_response(
+        self,
+        return_request: ReturnRequest,
+        tracking_info: TrackingInfo,
+        scan_history: List[TrackingScan],
+    ) -> AgentResponse:
+        """Build the tracking status answer."""
         # Generate status message
         message = f"""Let me check your return status for {return_request.return_id}.
 
@@ -104,6 +197,14 @@ Current status: {tracking_info.status.value.replace('_', ' ').title()}
                 "tracking_number": return_request.tracking_number,
                 "status": tracking_info.status.value,
                 "refund_amount": return_request.refund_amount,
+                "scan_history": [
+                    {
+                        "status": scan.status.value,
+                        "timestamp": scan.timestamp.isoformat(),
+                        "location": scan.location,
+                    }
+                    for scan in scan_history
+                ],
             },
             next_action="end",
         )
@@ -111,26 +212,28 @@ Current status: {tracking_info.status.value.replace('_', ' ').title()}
     def _handle_refund_status(self, context: Dict[str, Any]) -> AgentResponse:
         """Provide refund status information."""
         user_id = context.get("user_id")
-
         if not user_id:
-            return AgentResponse(
-                success=False,
-                message="I need to identify you first. Can you provide your phone number?",
-                requires_clarification=True,
-            )
+            return self._identify_first()
 
-        # Get user's returns
-        user_returns = self.db.get_user_returns(user_id)
-        if not user_returns:
-            return AgentResponse(
-                success=False,
-                message="I couldn't find any returns for your account.",
-                next_action="end",
-            )
+        # Get user's most recent return
+        return_request = self.db.get_latest_user_return(user_id)
+        if not return_request:
+            return self._return_not_found()
+        return self._refund_status_response(return_request)
 
-        # Get most recent return
-        return_request = user_returns[-1]
+    async def _handle_refund_status_async(self, context: Dict[str, Any]) -> AgentResponse:
+        """Async variant of ``_handle_refund_status``."""
+        user_id = context.get("user_id")
+        if not user_id:
+            return self._identify_first()
+
+        return_request = await self.async_db.get_latest_user_return(user_id)
+        if not return_request:
+            return self._return_not_found()
+        return self._refund_status_response(return_request)
 
+    def _refund_status_response(self, return_request: ReturnRequest) -> AgentResponse:
+        """Build the refund status answer."""
         # Determine refund status based on return status
         refund_messages = {
             ReturnStatus.INITIATED: f"Your refund of ${return_request.refund_amount:.2f} will be processed once we receive your return.",
@@ -159,91 +262,136 @@ Current status: {tracking_info.status.value.replace('_', ' ').title()}
     def _handle_dispute(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
         """Handle refund disputes."""
         user_id = context.get("user_id")
-
         if not user_id:
-            return AgentResponse(
-                success=False,
-                message="I need to identify you first. Can you provide your phone number?",
-                requires_clarification=True,
-            )
-
-        # Get user's returns
-        user_returns = self.db.get_user_returns(user_id)
-        if not user_returns:
-            return AgentResponse(
-                success=False,
-                message="I couldn't find any returns for your account.",
-                next_action="end",
-            )
+            return self._identify_first()
 
-        # Get most recent return
-        return_request = user_returns[-1]
+        # Get user's most recent return
+        return_request = self.db.get_latest_user_return(user_id)
+        if not return_request:
+            return self._return_not_found()
 
         # Review the original reason and calculate expected refund
         order = self.db.get_order(return_request.order_id)
         if not order:
-            return AgentResponse(
-                success=False,
-                message="I'm having trouble finding your order information. Let me escalate this to a specialist.",
-                next_action="escalate",
-            )
+            return self._escalate_missing_order()
+
+        response, disputed = self._review_dispute(return_request, order)
+        if disputed:
+            # Update return status to disputed
+            self.db.update_return_status(return_request.return_id, ReturnStatus.DISPUTED)
+        return response
+
+    async def _handle_dispute_async(self, user_input: str, context: Dict[str, Any]) -> AgentResponse:
+        """Async variant of ``_handle_dispute``."""
+        user_id = context.get("user_id")
+        if not user_id:
+            return self._identify_first()
+
+        return_request = await self.async_db.get_latest_user_return(user_id)
+        if not return_request:
+            return self._return_not_found()
 
+        order = await self.async_db.get_order(return_request.order_id)
+        if not order:
+            return self._escalate_missing_order()
+
+        response, disputed = self._review_dispute(return_request, order)
+        if disputed:
+            await self.async_db.update_return_status(return_request.return_id, ReturnStatus.DISPUTED)
+        return response
+
+    def _escalate_missing_order(self) -> AgentResponse:
+        """Escalate a dispute whose order cannot be found."""
+        return AgentResponse(
+            success=False,
+            message="I'm having trouble finding your order information. Let me escalate this to a specialist.",
+            next_action="escalate",
+        )
+
+    def _review_dispute(
+        self, return_request: ReturnRequest, order: Order
+    ) -> Tuple[AgentResponse, bool]:
+        """
+        Compare the refund with the item price.
+
+        Returns:
+            (response, disputed); disputed is True when the return should
+            be marked DISPUTED and escalated
+        """
         item = order.get_item_by_id(return_request.item_id)
-        expected_refund = item.price if item else return_request.refund_amount
+        # Compare in integer cents: float dollars made a one-cent gap
+        # count on some prices and not on others
+        expected_cents = item.price_cents if item else return_request.refund_cents
+        delta_cents = expected_cents - return_request.refund_cents
 
         message = f"""Let me review your refund for return {return_request.return_id}.
 
-Original item price: ${expected_refund:.2f}
+Original item price: ${expected_cents / 100:.2f}
 Refund issued: ${return_request.refund_amount:.2f}
 Return reason: {return_request.reason.value.replace('_', ' ').title()}
 """
 
         # Check for discrepancy
-        if abs(expected_refund - return_request.refund_amount) > 0.01:
-            message += f"\nI see there's a difference of ${abs(expected_refund - return_request.refund_amount):.2f}. "
+        if delta_cents:
+            message += f"\nI see there's a difference of ${abs(delta_cents) / 100:.2f}. "
             message += "This might be due to a restocking fee or the item's condition. Let me escalate this to a specialist who can review your case and help resolve this. You should hear back within 24 hours."
 
-            # Update return status to disputed
-            self.db.update_return_status(return_request.return_id, ReturnStatus.DISPUTED)
-
-            return AgentResponse(
-                success=True,
-                message=message,
-                data={"escalated": True, "return_id": return_request.return_id},
-                next_action="escalate",
+            return (
+                AgentResponse(
+                    success=True,
+                    message=message,
+                    data={"escalated": True, "return_id": return_request.return_id},
+                    next_action="escalate",
+                ),
+                True,
             )
         else:
             message += "\nYour refund amount appears to be correct. If you believe there's still an issue, I can escalate this to a specialist. Would you like me to do that?"
 
-            return AgentResponse(
-                success=True,
-                message=message,
-                requires_clarification=True,
+            return (
+                AgentResponse(
+                    success=True,
+                    message=message,
+                    requires_clarification=True,
+                ),
+                False,
             )
 
     def _get_or_create_tracking(self, return_request) -> TrackingInfo:
-        """Get existing tracking info or create mock tracking."""
+        """Get cached or stored tracking info, or create mock tracking."""
+        if self.tracking_cache is not None:
+            tracking_info = self.tracking_cache.get(return_request.tracking_number)
+            if tracking_info:
+                return tracking_info
+
         tracking_info = self.db.get_tracking(return_request.tracking_number)
 
         if not tracking_info:
-            # Create mock tracking based on return status
-            status_map = {
-                ReturnStatus.LABEL_GENERATED: ShipmentStatus.LABEL_CREATED,
-                ReturnStatus.IN_TRANSIT: ShipmentStatus.IN_TRANSIT,
-                ReturnStatus.RECEIVED: ShipmentStatus.DELIVERED,
-            }
-
-            status = status_map.get(return_request.status, ShipmentStatus.LABEL_CREATED)
-
-            tracking_info = TrackingInfo(
-                tracking_number=return_request.tracking_number,
-                carrier="UPS",
-                status=status,
-                last_update=datetime.now(),
-                estimated_delivery=datetime.now() + timedelta(days=random.randint(3, 7)),
-                current_location="In Transit" if status == ShipmentStatus.IN_TRANSIT else None,
-            )
-
+            tracking_info = self._mock_tracking(return_request)
             self.db.create_tracking(tracking_info)
 
+        if self.tracking_cache is not None:
+            # Serve this copy from memory next time and let the refresher
+            # pick up carrier updates
+            self.tracking_cache.put(tracking_info, fresh=False)
+
         return tracking_info
+
+    def _mock_tracking(self, return_request) -> TrackingInfo:
+        """Create mock tracking based on return status."""
+        status_map = {
+            ReturnStatus.LABEL_GENERATED: ShipmentStatus.LABEL_CREATED,
+            ReturnStatus.IN_TRANSIT: ShipmentStatus.IN_TRANSIT,
+            ReturnStatus.RECEIVED: ShipmentStatus.DELIVERED,
+        }
+
+        status = status_map.get(return_request.status, ShipmentStatus.LABEL_CREATED)
+
+        return TrackingInfo(
+            tracking_number=return_request.tracking_number,
+            carrier="UPS",
+            status=status,
+            last_update=datetime.now(),
+            estimated_delivery=datetime.now() + timedelta(days=random.randint(3, 7)),
+            current_location="In Transit" if status == ShipmentStatus.IN_TRANSIT else None,
+        )
@@ -166,11 +166,51 @@ class Config:
         """Get database URL."""
         return os.getenv('DATABASE_URL')
 
+    @property
+    def database_cache_size(self) -> int:
+        """Get max entities held by the read-through database cache (0 disables it)."""
+        return int(os.getenv('DATABASE_CACHE_SIZE', '0'))
+
+    @property
+    def database_cache_ttl(self) -> float:
+        """Get seconds a cached entity is served before it is re-read."""
+        return float(os.getenv('DATABASE_CACHE_TTL', '30'))
+
     @property
     def redis_url(self) -> Optional[str]:
         """Get Redis URL."""
         return os.getenv('REDIS_URL')
 
+    @property
+    def session_store(self) -> str:
+        """Get where conversation sessions live: 'memory' (one process) or 'redis'."""
+        return os.getenv('SESSION_STORE', 'memory').lower()
+
+    @property
+    def session_ttl(self) -> int:
+        """Get seconds an idle session is kept in the session store."""
+        return int(os.getenv('SESSION_TTL', '3600'))
+
+    @property
+    def session_max_sessions(self) -> int:
+        """Get max sessions held in process memory before the least recently used is evicted."""
+        return int(os.getenv('SESSION_MAX_SESSIONS', '10000'))
+
+    @property
+    def history_dir(self) -> Optional[str]:
+        """Get directory for spilled conversation transcripts (a temporary one if unset)."""
+        return os.getenv('HISTORY_DIR') or None
+
+    @property
+    def history_max_entries(self) -> int:
+        """Get conversation history entries kept in a session before older ones are spilled."""
+        return int(os.getenv('HISTORY_MAX_ENTRIES', '40'))
+
+    @property
+    def history_max_age(self) -> float:
+        """Get seconds after its last turn that a spilled transcript is deleted."""
+        return float(os.getenv('HISTORY_MAX_AGE', '86400'))
+
     # ==========================================================================
     # SECURITY
     # ==========================================================================
@@ -1,5 +1,74 @@
-"""Mock database for the ReturnFlow Voice Agent."""
+"""Storage engines for the ReturnFlow Voice Agent."""
 
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from config import config
+from .async_db import AsyncDatabase
+from .cache import CachedDatabase
+from .journal import JournaledDatabase
 from .mock_db import MockDatabase
+from .phone import normalize_phone, spoken_digits_to_string
+from .returns_analytics import ReturnsAnalytics
+from .sharded_db import ShardedDatabase
+from .sqlite_db import SqliteDatabase
+from .tracking_cache import TrackingCache
+
+
+def create_database(url: Optional[str] = None, cache_size: Optional[int] = None):
+    """
+    Create the storage engine selected by a database URL.
+
+    Args:
+        url: Database URL (defaults to ``config.database_url``).
+            ``sqlite:///path.db`` or ``sqlite://`` selects SqliteDatabase;
+            no URL or ``memory://`` selects the in-memory MockDatabase;
+            ``memory://?shards=16`` selects the thread-safe ShardedDatabase;
+            ``journal:///data/dir`` selects the durable JournaledDatabase.
+        cache_size: Wrap the engine in a read-through CachedDatabase of
+            this many entries (defaults to ``config.database_cache_size``;
+            0 disables the cache)
+
+    Returns:
+        A database exposing the MockDatabase interface
+
+    Raises:
+        ValueError: If the URL scheme is not supported and mock
+            databases are disabled
+    """
+    if cache_size is None:
+        cache_size = config.database_cache_size
+    database = _create_engine(config.database_url if url is None else url)
+    if cache_size > 0:
+        return CachedDatabase(database, max_entries=cache_size, ttl=config.database_cache_ttl)
+    return database
+
+
+def _create_engine(url: Optional[str]):
+    """Create the uncached storage engine for a database URL."""
+    if not url or url.startswith("memory:"):
+        shards = parse_qs(urlsplit(url or "").query).get("shards")
+        if shards:
+            return ShardedDatabase(shards=int(shards[0]))
+        return MockDatabase()
+    if url.startswith("sqlite:"):
+        return SqliteDatabase.from_url(url)
+    if url.startswith("journal:"):
+        return JournaledDatabase.from_url(url)
+    if config.use_mock_database:
+        return MockDatabase()
+    raise ValueError(f"Unsupported database URL: {url}")
 
-__all__ = ["MockDatabase"]
+__all__ = [
+    "AsyncDatabase",
+    "CachedDatabase",
+    "JournaledDatabase",
+    "MockDatabase",
+    "ReturnsAnalytics",
+    "ShardedDatabase",
+    "SqliteDatabase",
+    "TrackingCache",
+    "create_database",
+    "normalize_phone",
+    "spoken_digits_to_string",
+]
@@ -0,0 +1,174 @@
+"""
+Asyncio access to the storage engines.
+
+AsyncDatabase exposes the MockDatabase interface as coroutines so agents
+can ``await`` lookups and run independent ones concurrently with
+``asyncio.gather`` instead of blocking the event loop. Engines that do
+I/O (SQLite today, remote stores later) run on a worker thread pool;
+in-memory engines are called inline since a dict lookup is cheaper than
+a thread hop.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from models.order import Order, OrderItem
+from models.user import User
+from models.return_request import ReturnRequest, ReturnStatus
+from models.tracking import TrackingInfo, ShipmentStatus
+from .mock_db import MockDatabase
+from .sharded_db import ShardedDatabase
+from .tracking_history import TrackingScan
+
+T = TypeVar("T")
+
+# Engines whose methods never block, so they are safe to call on the loop
+_IN_MEMORY_ENGINES = (MockDatabase, ShardedDatabase)
+
+
+class AsyncDatabase:
+    """Awaitable wrapper around a synchronous storage engine."""
+
+    def __init__(
+        self,
+        database,
+        offload: Optional[bool] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize the wrapper.
+
+        Args:
+            database: Synchronous storage engine to wrap
+            offload: Run calls on a thread pool. Defaults to True for
+                engines that do I/O and False for in-memory engines.
+            executor: Thread pool for offloaded calls (defaults to the
+                loop's default executor)
+        """
+        self.sync = database
+        if offload is None:
+            # A cache in front of an in-memory engine never blocks either
+            engine = getattr(database, "backend", database)
+            offload = not isinstance(engine, _IN_MEMORY_ENGINES)
+        self.offload = offload
+        self.executor = executor
+
+    async def _call(self, method: Callable[..., T], *args, **kwargs) -> T:
+        """Run a storage engine method without blocking the event loop."""
+        if not self.offload:
+            return method(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(method, *args, **kwargs))
+
+    # User operations
+    async def get_user(self, user_id: str) -> Optional[User]:
+        """Retrieve a user by ID."""
+        return await self._call(self.sync.get_user, user_id)
+
+    async def add_user(self, user: User) -> User:
+        """Add or replace a user."""
+        return await self._call(self.sync.add_user, user)
+
+    async def list_users(self) -> List[User]:
+        """Retrieve every user."""
+        return await self._call(self.sync.list_users)
+
+    async def get_user_by_phone(self, phone: str) -> Optional[User]:
+        """Retrieve a user by phone number in any format."""
+        return await self._call(self.sync.get_user_by_phone, phone)
+
+    # Order operations
+    async def add_order(self, order: Order) -> Order:
+        """Add or replace an order."""
+        return await self._call(self.sync.add_order, order)
+
+    async def get_order(self, order_id: str) -> Optional[Order]:
+        """Retrieve an order by ID."""
+        return await self._call(self.sync.get_order, order_id)
+
+    async def get_user_orders(self, user_id: str, limit: int = 10) -> List[Order]:
+        """Retrieve recent orders for a user, most recent first."""
+        return await self._call(self.sync.get_user_orders, user_id, limit)
+
+    async def get_items_bulk(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], OrderItem]:
+        """Resolve many (order_id, item_id) pairs in one call."""
+        return await self._call(self.sync.get_items_bulk, list(pairs))
+
+    # Return operations
+    async def create_return(self, return_request: ReturnRequest) -> ReturnRequest:
+        """Create a new return request."""
+        return await self._call(self.sync.create_return, return_request)
+
+    async def get_return(self, return_id: str) -> Optional[ReturnRequest]:
+        """Retrieve a return request by ID."""
+        return await self._call(self.sync.get_return, return_id)
+
+    async def update_return_status(
+        self, return_id: str, status: ReturnStatus
+    ) -> Optional[ReturnRequest]:
+        """Update the status of a return request."""
+        return await self._call(self.sync.update_return_status, return_id, status)
+
+    async def update_return_statuses(self, updates: Iterable[Tuple[str, ReturnStatus]]) -> int:
+        """Update the status of many returns in one call."""
+        return await self._call(self.sync.update_return_statuses, list(updates))
+
+    async def get_user_returns(self, user_id: str) -> List[ReturnRequest]:
+        """Retrieve all returns for a user, oldest first."""
+        return await self._call(self.sync.get_user_returns, user_id)
+
+    async def get_latest_user_return(self, user_id: str) -> Optional[ReturnRequest]:
+        """Retrieve the most recently created return for a user."""
+        return await self._call(self.sync.get_latest_user_return, user_id)
+
+    async def get_user_return_history(
+        self, user_id: str, offset: int = 0, limit: int = 10
+    ) -> List[ReturnRequest]:
+        """Retrieve a page of a user's returns, most recent first."""
+        return await self._call(self.sync.get_user_return_history, user_id, offset, limit)
+
+    async def get_return_by_tracking(self, tracking_number: str) -> Optional[ReturnRequest]:
+        """Find a return by tracking number."""
+        return await self._call(self.sync.get_return_by_tracking, tracking_number)
+
+    async def set_return_tracking_number(
+        self, return_id: str, tracking_number: Optional[str]
+    ) -> Optional[ReturnRequest]:
+        """Assign, change or clear the tracking number of a return."""
+        return await self._call(self.sync.set_return_tracking_number, return_id, tracking_number)
+
+    # Tracking operations
+    async def create_tracking(self, tracking_info: TrackingInfo) -> TrackingInfo:
+        """Create tracking information."""
+        return await self._call(self.sync.create_tracking, tracking_info)
+
+    async def get_tracking(self, tracking_number: str) -> Optional[TrackingInfo]:
+        """Retrieve tracking information."""
+        return await self._call(self.sync.get_tracking, tracking_number)
+
+    async def update_tracking_status(
+        self, tracking_number: str, status: ShipmentStatus, location: Optional[str] = None
+    ) -> Optional[TrackingInfo]:
+        """Update tracking status."""
+        return await self._call(self.sync.update_tracking_status, tracking_number, status, location)
+
+    async def get_tracking_history(
+        self, tracking_number: str, limit: Optional[int] = None
+    ) -> List[TrackingScan]:
+        """Retrieve the scan history for a tracking number, oldest first."""
+        return await self._call(self.sync.get_tracking_history, tracking_number, limit)
+
+    async def record_tracking_scans(
+        self, scans: Iterable[Tuple[str, ShipmentStatus, datetime, Optional[str]]]
+    ) -> int:
+        """Append carrier scans to the tracking history."""
+        return await self._call(self.sync.record_tracking_scans, list(scans))
+
+    async def apply_tracking_updates(self, updates: Iterable[TrackingInfo]) -> List[TrackingInfo]:
+        """Apply the latest known state of many shipments in one call."""
+        return await self._call(self.sync.apply_tracking_updates, list(updates))
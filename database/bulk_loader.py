@@ -0,0 +1,240 @@
+"""
+Streaming JSONL bulk loader.
+
+Loads users and orders from a JSON Lines export (optionally gzipped)
+into any storage engine. The file is read one line at a time and
+records are inserted in chunks through the engine's bulk_insert_*
+methods, so the loader holds at most one chunk of records however large
+the file is.
+
+Each line is one record. Orders carry an ``items`` list and users an
+``email``; a ``"type": "user" | "order"`` key may be given explicitly.
+Timestamps are ISO 8601 strings::
+
+    {"user_id": "USER001", "name": "John Doe", "email": "...", "phone": "..."}
+    {"order_id": "ORD001", "user_id": "USER001", "order_date": "2026-09-30T12:00:00",
+     "total_amount": 189.97, "items": [{"item_id": "ITEM001", "product_name": "...",
+     "price": 149.99, "quantity": 1, "category": "Electronics"}]}
+
+Usage:
+    python -m database.bulk_loader orders.jsonl.gz --url sqlite:///returnflow.db
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from models.order import Order, OrderItem
+from models.user import User
+
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+_USER_FIELDS = ("user_id", "name", "email", "phone", "address", "return_count", "account_age_days")
+_ITEM_FIELDS = ("item_id", "product_name", "price", "quantity", "category")
+
+
+@dataclass
+class LoadReport:
+    """What a load did and what it cost."""
+
+    users: int = 0
+    orders: int = 0
+    items: int = 0
+    bytes_read: int = 0
+    seconds: float = 0.0
+    peak_rss_bytes: Optional[int] = None
+
+    @property
+    def records(self) -> int:
+        return self.users + self.orders
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_read / 1e6 / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        """One-line human-readable report."""
+        rss = f", peak RSS {self.peak_rss_bytes / 1e6:,.0f} MB" if self.peak_rss_bytes else ""
+        return (
+            f"Loaded {self.users:,} users and {self.orders:,} orders ({self.items:,} items) "
+            f"in {self.seconds:.1f}s: {self.records_per_second:,.0f} records/sec, "
+            f"{self.megabytes_per_second:,.1f} MB/s{rss}"
+        )
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ==============================================================================
+# RECORD MAPPING
+# ==============================================================================
+
+
+def user_from_record(record: Dict[str, Any]) -> User:
+    """Build a User from an export record."""
+    return User(**{name: record[name] for name in _USER_FIELDS if name in record})
+
+
+def order_from_record(record: Dict[str, Any]) -> Order:
+    """Build an Order (and its items) from an export record."""
+    items = [
+        OrderItem(**{name: item[name] for name in _ITEM_FIELDS if name in item})
+        for item in record["items"]
+    ]
+    return Order(
+        order_id=record["order_id"],
+        user_id=record["user_id"],
+        items=items,
+        order_date=datetime.fromisoformat(record["order_date"]),
+        total_amount=record.get("total_amount", 0),
+        status=record.get("status", "delivered"),
+    )
+
+
+def user_record(user: User) -> Dict[str, Any]:
+    """Export record for a User."""
+    return {name: getattr(user, name) for name in _USER_FIELDS}
+
+
+def order_record(order: Order) -> Dict[str, Any]:
+    """Export record for an Order."""
+    return {
+        "order_id": order.order_id,
+        "user_id": order.user_id,
+        "order_date": order.order_date.isoformat(),
+        "total_amount": order.total_amount,
+        "status": order.status,
+        "items": [{name: getattr(item, name) for name in _ITEM_FIELDS} for item in order.items],
+    }
+
+
+def _open(path: Union[str, Path], mode: str):
+    """Open a plain or gzipped (``.gz``) file."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def write_jsonl(path: Union[str, Path], records: Iterable[Union[User, Order]]) -> int:
+    """
+    Write users and orders as a JSONL export.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with _open(path, "wt") as export:
+        for record in records:
+            data = user_record(record) if isinstance(record, User) else order_record(record)
+            export.write(json.dumps(data, separators=(",", ":")))
+            export.write("\n")
+            count += 1
+    return count
+
+
+# ==============================================================================
+# LOADING
+# ==============================================================================
+
+
+def load_jsonl(
+    db,
+    path: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> LoadReport:
+    """
+    Stream a JSONL export of users and orders into a storage engine.
+
+    Args:
+        db: Storage engine with bulk_insert_users/bulk_insert_orders
+        path: Export file (``.gz`` files are decompressed on the fly)
+        chunk_size: Records built and inserted per batch
+
+    Returns:
+        LoadReport with counts, throughput and peak RSS
+
+    Raises:
+        ValueError: If a line is not a valid user or order record (the
+            message names the line; earlier chunks stay loaded)
+    """
+    report = LoadReport()
+    users: List[User] = []
+    orders: List[Order] = []
+
+    def flush() -> None:
+        # Users first so an engine enforcing references sees them
+        report.users += db.bulk_insert_users(users)
+        report.orders += db.bulk_insert_orders(orders)
+        users.clear()
+        orders.clear()
+
+    start = time.perf_counter()
+    with _open(path, "rb") as export:
+        for line_number, line in enumerate(export, 1):
+            report.bytes_read += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                kind = record.get("type") or ("order" if "items" in record else "user")
+                if kind == "order":
+                    order = order_from_record(record)
+                    orders.append(order)
+                    report.items += len(order.items)
+                elif kind == "user":
+                    users.append(user_from_record(record))
+                else:
+                    raise ValueError(f"unknown record type {kind!r}")
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid record: {e}") from e
+            if len(users) + len(orders) >= chunk_size:
+                flush()
+    flush()
+
+    report.seconds = time.perf_counter() - start
+    report.peak_rss_bytes = peak_rss_bytes()
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Load a JSONL export into the database at --url."""
+    from database import create_database
+
+    parser = argparse.ArgumentParser(description="Load a ReturnFlow JSONL export")
+    parser.add_argument("path", help="JSONL file of users and orders (.gz supported)")
+    parser.add_argument("--url", default="sqlite:///returnflow.db", help="Target DATABASE_URL")
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Records per batch insert"
+    )
+    args = parser.parse_args(argv)
+
+    db = create_database(args.url)
+    report = load_jsonl(db, args.path, chunk_size=args.chunk_size)
+    print(report.summary())
+    close = getattr(db, "close", None)
+    if close:
+        close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
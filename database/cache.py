@@ -0,0 +1,250 @@
+"""
+Read-through entity cache in front of a storage engine.
+
+Agents look up the same user, order and return several times per
+conversation (the selected order alone is fetched by item selection,
+classification and processing). CachedDatabase keeps recently read
+entities in a bounded LRU with a TTL, so with a remote engine only the
+first lookup is a round trip. Writes made through the cache invalidate
+the affected keys; the TTL bounds staleness from writers elsewhere.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+import threading
+import time
+
+from models.order import Order
+from models.user import User
+from models.return_request import ReturnRequest, ReturnStatus
+from .phone import normalize_phone
+
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL = 30.0
+
+_MISSING = object()
+
+
+class CachedDatabase:
+    """Storage engine wrapper with a read-through LRU + TTL cache."""
+
+    def __init__(
+        self,
+        backend,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage engine to read through to
+            max_entries: Entries kept before the least recently used is evicted
+            ttl: Seconds an entry is served before it is re-read
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    # ==========================================================================
+    # CACHE MECHANICS
+    # ==========================================================================
+
+    def _get(self, key: Hashable) -> Any:
+        """Return a live cached value, or _MISSING."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return _MISSING
+            if entry[0] <= now:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def _put(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop cached entries, e.g. ``("user", "USER001")``."""
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self.stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def _read_through(self, key: Hashable, load):
+        """Serve ``key`` from the cache, loading and caching it on a miss."""
+        value = self._get(key)
+        if value is _MISSING:
+            value = load()
+            # Absent records are not cached so a later insert is seen at once
+            if value is not None:
+                self._put(key, value)
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Counters plus current size and hit rate."""
+        with self._lock:
+            size = len(self._entries)
+        return {**self.stats, "size": size, "hit_rate": round(self.hit_rate, 4)}
+
+    # ==========================================================================
+    # CACHED READS
+    # ==========================================================================
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        """Retrieve a user by ID."""
+        return self._read_through(("user", user_id), lambda: self.backend.get_user(user_id))
+
+    def get_user_by_phone(self, phone: str) -> Optional[User]:
+        """
+        Retrieve a user by phone number in any format.
+
+        The phone number is cached as a pointer to the user ID, so the
+        user itself is shared with get_user and only invalidated once.
+        """
+        phone_key = normalize_phone(phone)
+        if not phone_key:
+            return None
+        user_id = self._get(("phone", phone_key))
+        if user_id is not _MISSING:
+            user = self.get_user(user_id)
+            # The user may since have changed number
+            if user is not None and normalize_phone(user.phone) == phone_key:
+                return user
+        user = self.backend.get_user_by_phone(phone)
+        if user is not None:
+            self._put(("phone", phone_key), user.user_id)
+            self._put(("user", user.user_id), user)
+        return user
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Retrieve an order by ID."""
+        return self._read_through(("order", order_id), lambda: self.backend.get_order(order_id))
+
+    def get_user_orders(self, user_id: str, limit: int = 10) -> List[Order]:
+        """Retrieve recent orders for a user, most recent first."""
+        key = ("user_orders", user_id)
+        cached = self._get(key)
+        if cached is not _MISSING:
+            fetched_limit, orders = cached
+            # A shorter list than was asked for is the complete list
+            if limit <= fetched_limit or len(orders) < fetched_limit:
+                return orders[:limit]
+        orders = self.backend.get_user_orders(user_id, limit)
+        self._put(key, (limit, orders))
+        return list(orders)
+
+    def get_return(self, return_id: str) -> Optional[ReturnRequest]:
+        """Retrieve a return request by ID."""
+        return self._read_through(("return", return_id), lambda: self.backend.get_return(return_id))
+
+    # ==========================================================================
+    # WRITES (write through, then invalidate)
+    # ==========================================================================
+
+    def add_user(self, user: User) -> User:
+        """Add or replace a user."""
+        result = self.backend.add_user(user)
+        self.invalidate(("user", user.user_id), ("phone", normalize_phone(user.phone)))
+        return result
+
+    def bulk_insert_users(self, users: Iterable[User]) -> int:
+        """Insert or replace many users."""
+        users = list(users)
+        count = self.backend.bulk_insert_users(users)
+        self.invalidate(
+            *[("user", user.user_id) for user in users],
+            *[("phone", normalize_phone(user.phone)) for user in users],
+        )
+        return count
+
+    def add_order(self, order: Order) -> Order:
+        """Add or replace an order."""
+        result = self.backend.add_order(order)
+        self.invalidate(("order", order.order_id), ("user_orders", order.user_id))
+        return result
+
+    def bulk_insert_orders(self, orders: Iterable[Order]) -> int:
+        """Insert or replace many orders."""
+        orders = list(orders)
+        count = self.backend.bulk_insert_orders(orders)
+        self.invalidate(
+            *[("order", order.order_id) for order in orders],
+            *[("user_orders", order.user_id) for order in orders],
+        )
+        return count
+
+    def create_return(self, return_request: ReturnRequest) -> ReturnRequest:
+        """Create a new return request (also bumps the user's return count)."""
+        result = self.backend.create_return(return_request)
+        self.invalidate(("return", return_request.return_id), ("user", return_request.user_id))
+        return result
+
+    def bulk_insert_returns(self, returns: Iterable[ReturnRequest]) -> int:
+        """Insert many existing returns without bumping return counts."""
+        returns = list(returns)
+        count = self.backend.bulk_insert_returns(returns)
+        self.invalidate(*[("return", ret.return_id) for ret in returns])
+        return count
+
+    def update_return_status(
+        self, return_id: str, status: ReturnStatus
+    ) -> Optional[ReturnRequest]:
+        """Update the status of a return request."""
+        result = self.backend.update_return_status(return_id, status)
+        self.invalidate(("return", return_id))
+        return result
+
+    def update_return_statuses(self, updates: Iterable[Tuple[str, ReturnStatus]]) -> int:
+        """Update the status of many returns in one call."""
+        updates = list(updates)
+        count = self.backend.update_return_statuses(updates)
+        self.invalidate(*[("return", return_id) for return_id, _ in updates])
+        return count
+
+    def set_return_tracking_number(
+        self, return_id: str, tracking_number: Optional[str]
+    ) -> Optional[ReturnRequest]:
+        """Assign, change or clear the tracking number of a return."""
+        result = self.backend.set_return_tracking_number(return_id, tracking_number)
+        self.invalidate(("return", return_id))
+        return result
+
+    def __getattr__(self, name: str):
+        """Pass every other read and write straight to the backend."""
+        backend = self.__dict__.get("backend")
+        if backend is None or name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(backend, name)
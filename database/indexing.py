@@ -0,0 +1,357 @@
+"""
+Declarative secondary indexes for the in-memory storage engines.
+
+A Table stores records by primary key and declares its secondary
+indexes up front; every insert, update and delete goes through the
+table, which keeps all of them consistent:
+
+    returns = Table("return_id", [
+        Index("user_id", sort_key=attrgetter("created_at")),  # multi, sorted
+        Index("tracking_number", unique=True),                 # unique
+        Index("status"),                                       # multi
+    ])
+    returns.insert(return_request)
+    returns.update("RET-1", status=ReturnStatus.RECEIVED)
+    returns.where(user_id="USER001", status=ReturnStatus.RECEIVED)
+
+``where`` picks the most selective index among its criteria and only
+filters the candidates that index returns, falling back to a scan when
+no criterion is indexed. Tables are read-only mappings of primary key
+to record, so ``table[pk]``, ``len(table)`` and ``table.values()`` work
+as they do on a dict.
+"""
+
+from bisect import bisect_left, insort
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence
+import threading
+
+
+class Index:
+    """
+    A secondary index over one derived key of a table's records.
+
+    Unique indexes map each key to one record and reject a second record
+    with the same key. Multi indexes map each key to a bucket of records,
+    kept in ``sort_key`` order if given (oldest first for timestamps) or
+    else in insertion order. Records whose key is None are not indexed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        key: Optional[Callable[[Any], Optional[Hashable]]] = None,
+        unique: bool = False,
+        sort_key: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Declare an index.
+
+        Args:
+            name: Index name, also the criterion it serves in Table.where
+            key: Derives the key from a record (defaults to the attribute
+                called ``name``)
+            unique: At most one record per key
+            sort_key: Order of records within a multi-index bucket
+        """
+        if unique and sort_key is not None:
+            raise ValueError("Unique indexes hold one record per key and cannot be sorted")
+        self.name = name
+        self.key = key or attrgetter(name)
+        self.unique = unique
+        self.sort_key = sort_key
+        # unique: key -> record; sorted: key -> [records]; otherwise
+        # key -> {primary key: record}, an insertion-ordered set with O(1) removal
+        self.entries: Dict[Hashable, Any] = {}
+        self._primary_key: Callable[[Any], Hashable] = attrgetter("id")
+
+    def __len__(self) -> int:
+        """Number of distinct keys."""
+        return len(self.entries)
+
+    # ==========================================================================
+    # LOOKUPS
+    # ==========================================================================
+
+    def get(self, key: Hashable):
+        """
+        Look up a key.
+
+        Returns:
+            The record (unique) or a new list of records (multi); None
+            or an empty list when nothing is indexed under ``key``
+        """
+        if self.unique:
+            return self.entries.get(key)
+        return list(self.bucket(key))
+
+    def bucket(self, key: Hashable) -> Sequence:
+        """
+        The records indexed under ``key`` without copying them.
+
+        Treat the result as read-only; it changes as the table does.
+        """
+        bucket = self.entries.get(key)
+        if bucket is None:
+            return []
+        if self.unique:
+            return [bucket]
+        return bucket if self.sort_key is not None else list(bucket.values())
+
+    def last(self, key: Hashable):
+        """The greatest (sorted) or most recently indexed record under ``key``, or None."""
+        bucket = self.entries.get(key)
+        if not bucket:
+            return None
+        if self.unique:
+            return bucket
+        if self.sort_key is not None:
+            return bucket[-1]
+        return next(reversed(bucket.values()))
+
+    def count(self, key: Hashable) -> int:
+        """Number of records indexed under ``key``."""
+        bucket = self.entries.get(key)
+        if bucket is None:
+            return 0
+        return 1 if self.unique else len(bucket)
+
+    # ==========================================================================
+    # MAINTENANCE (called by Table with its lock held)
+    # ==========================================================================
+
+    def _check(self, record, key: Optional[Hashable]) -> None:
+        """Raise if a unique key is held by a different record."""
+        if not self.unique or key is None:
+            return
+        holder = self.entries.get(key)
+        if holder is not None:
+            holder_id = self._primary_key(holder)
+            if holder_id != self._primary_key(record):
+                raise ValueError(f"{self.name} {key!r} is already assigned to {holder_id}")
+
+    def _add(self, record, key: Optional[Hashable]) -> None:
+        if key is None:
+            return
+        if self.unique:
+            self.entries[key] = record
+        elif self.sort_key is not None:
+            insort(self.entries.setdefault(key, []), record, key=self.sort_key)
+        else:
+            self.entries.setdefault(key, {})[self._primary_key(record)] = record
+
+    def _remove(self, record, key: Optional[Hashable], sort_value: Any = None) -> None:
+        """Remove a record, given the key and sort value it was indexed with."""
+        if key is None:
+            return
+        if self.unique:
+            if self.entries.get(key) is record:
+                del self.entries[key]
+            return
+        bucket = self.entries.get(key)
+        if bucket is None:
+            return
+        if self.sort_key is not None:
+            position = bisect_left(bucket, sort_value, key=self.sort_key)
+            while position < len(bucket) and bucket[position] is not record:
+                position += 1
+            if position == len(bucket):
+                # The record's own sort value already changed (Table.update),
+                # which can misdirect the bisect; fall back to a scan
+                position = next((i for i, held in enumerate(bucket) if held is record), None)
+                if position is None:
+                    return
+            del bucket[position]
+        else:
+            bucket.pop(self._primary_key(record), None)
+        if not bucket:
+            del self.entries[key]
+
+    def _state(self, record):
+        """What the index stored a record under: (key, sort value)."""
+        key = self.key(record)
+        if self.sort_key is None or key is None:
+            return key, None
+        return key, self.sort_key(record)
+
+
+class Table(Mapping):
+    """Records by primary key plus the secondary indexes declared for them."""
+
+    def __init__(
+        self,
+        primary_key: str,
+        indexes: Iterable[Index] = (),
+        lock: Optional[threading.RLock] = None,
+    ):
+        """
+        Create an empty table.
+
+        Args:
+            primary_key: Attribute holding each record's primary key
+            indexes: Secondary indexes to maintain
+            lock: Lock serializing writes (a private RLock by default);
+                share one between tables to update several atomically
+        """
+        self.primary_key = primary_key
+        self._pk = attrgetter(primary_key)
+        self.records: Dict[Hashable, Any] = {}
+        # primary key -> (key, sort value) each index stored the record
+        # under, so a record mutated in place is still found and removed
+        self._indexed: Dict[Hashable, Dict[str, tuple]] = {}
+        self.indexes: Dict[str, Index] = {}
+        self.lock = lock or threading.RLock()
+        for index in indexes:
+            if index.name in self.indexes:
+                raise ValueError(f"Duplicate index {index.name!r}")
+            index._primary_key = self._pk
+            self.indexes[index.name] = index
+
+    def index(self, name: str) -> Index:
+        """Look up a declared index by name."""
+        return self.indexes[name]
+
+    # Mapping interface, served straight from the primary dict
+    def __getitem__(self, pk: Hashable):
+        return self.records[pk]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, pk) -> bool:
+        return pk in self.records
+
+    def get(self, pk: Hashable, default=None):
+        return self.records.get(pk, default)
+
+    def keys(self):
+        return self.records.keys()
+
+    def values(self):
+        return self.records.values()
+
+    def items(self):
+        return self.records.items()
+
+    # ==========================================================================
+    # WRITES
+    # ==========================================================================
+
+    def insert(self, record):
+        """
+        Insert a record, replacing any record with the same primary key.
+
+        Raises:
+            ValueError: If a unique index key belongs to another record
+                (nothing is changed)
+        """
+        pk = self._pk(record)
+        with self.lock:
+            states = {name: index._state(record) for name, index in self.indexes.items()}
+            for name, index in self.indexes.items():
+                index._check(record, states[name][0])
+            existing = self.records.get(pk)
+            if existing is not None:
+                self._unindex(pk, existing)
+            self.records[pk] = record
+            for name, index in self.indexes.items():
+                index._add(record, states[name][0])
+            self._indexed[pk] = states
+        return record
+
+    def update(self, pk: Hashable, **changes):
+        """
+        Change attributes of a stored record and re-index it.
+
+        Only indexes whose key or sort order changed are touched.
+
+        Returns:
+            The updated record, or None if ``pk`` is not stored
+
+        Raises:
+            ValueError: If a unique index key belongs to another record
+                (the record is left unchanged)
+        """
+        with self.lock:
+            record = self.records.get(pk)
+            if record is None:
+                return None
+            before = self._indexed[pk]
+            previous = {attribute: getattr(record, attribute) for attribute in changes}
+            for attribute, value in changes.items():
+                setattr(record, attribute, value)
+
+            moved = []
+            for name, index in self.indexes.items():
+                after = index._state(record)
+                if after != before[name]:
+                    moved.append((name, index, before[name], after))
+            try:
+                for _, index, _, (key, _) in moved:
+                    index._check(record, key)
+            except ValueError:
+                for attribute, value in previous.items():
+                    setattr(record, attribute, value)
+                raise
+            states = dict(before)
+            for name, index, (old_key, old_sort), after in moved:
+                index._remove(record, old_key, old_sort)
+                index._add(record, after[0])
+                states[name] = after
+            self._indexed[pk] = states
+        return record
+
+    def delete(self, pk: Hashable):
+        """Remove a record and its index entries. Returns it, or None if absent."""
+        with self.lock:
+            record = self.records.pop(pk, None)
+            if record is not None:
+                self._unindex(pk, record)
+        return record
+
+    def _unindex(self, pk: Hashable, record) -> None:
+        """Remove a record from every index, under the keys it was stored with."""
+        states = self._indexed.pop(pk)
+        for name, index in self.indexes.items():
+            key, sort_value = states[name]
+            index._remove(record, key, sort_value)
+
+    # ==========================================================================
+    # QUERIES
+    # ==========================================================================
+
+    def where(self, **criteria) -> List:
+        """
+        Records matching every ``name=value`` criterion.
+
+        Criteria named after an index compare against that index's key
+        (so ``phone=`` matches a normalized phone index); others compare
+        against the attribute of that name. The most selective indexed
+        criterion supplies the candidates.
+        """
+        indexed = [name for name in criteria if name in self.indexes]
+        if indexed:
+            best = min(indexed, key=lambda name: self.indexes[name].count(criteria[name]))
+            candidates = self.indexes[best].bucket(criteria[best])
+            remaining = {name: value for name, value in criteria.items() if name != best}
+        else:
+            candidates = list(self.records.values())
+            remaining = criteria
+        if not remaining:
+            return list(candidates)
+        checks = [
+            (self.indexes[name].key if name in self.indexes else attrgetter(name), value)
+            for name, value in remaining.items()
+        ]
+        return [
+            record for record in candidates if all(get(record) == value for get, value in checks)
+        ]
+
+    def find(self, **criteria):
+        """The first record matching the criteria, or None."""
+        matches = self.where(**criteria)
+        return matches[0] if matches else None
@@ -0,0 +1,493 @@
+"""
+Write-ahead journal and snapshots for the in-memory database.
+
+JournaledDatabase keeps MockDatabase's in-memory speed and adds
+durability:
+
+- Every mutation is appended to a journal segment as one JSON line
+  ``[lsn, operation, args]`` after it has been applied in memory.
+- Journal writes are group-committed: a background thread fsyncs every
+  ``sync_interval`` seconds ("batch" durability, losing at most that
+  window on a crash), or each writer waits for the fsync that covers its
+  record ("always" durability, with concurrent writers sharing fsyncs).
+- Snapshots periodically write the full state as JSON lines, after which
+  older snapshots and journal segments are deleted.
+- Recovery loads the newest snapshot and replays the journal tail; a
+  torn final record from a crash mid-write is discarded.
+
+Files in the data directory:
+    snapshot-<lsn>.jsonl     state including every record up to <lsn>
+    journal-<lsn>.log        records starting at <lsn>
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from models.serialization import decode, encode
+from models.tracking import TrackingInfo
+from .mock_db import MockDatabase
+
+
+DURABILITY_MODES = ("batch", "always")
+
+_SNAPSHOT_PREFIX = "snapshot-"
+_SNAPSHOT_SUFFIX = ".jsonl"
+_JOURNAL_PREFIX = "journal-"
+_JOURNAL_SUFFIX = ".log"
+
+
+def _file_lsn(path: Path, prefix: str, suffix: str) -> int:
+    """LSN encoded in a snapshot or journal file name."""
+    return int(path.name[len(prefix):-len(suffix)])
+
+
+def _files(directory: Path, prefix: str, suffix: str) -> List[Path]:
+    """Snapshot or journal files in LSN order."""
+    paths = directory.glob(f"{prefix}*{suffix}")
+    return sorted(paths, key=lambda path: _file_lsn(path, prefix, suffix))
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist file creations and renames in a directory."""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """Append-only, group-committed log of mutations split into segments."""
+
+    def __init__(self, directory: Path, next_lsn: int):
+        """
+        Open a new journal segment.
+
+        Args:
+            directory: Data directory
+            next_lsn: LSN of the first record to write
+        """
+        self.directory = directory
+        self.lsn = next_lsn - 1
+        self.synced_lsn = self.lsn
+        self._write_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._file = self._open_segment(next_lsn)
+
+    def _open_segment(self, first_lsn: int):
+        path = self.directory / f"{_JOURNAL_PREFIX}{first_lsn:016d}{_JOURNAL_SUFFIX}"
+        segment = open(path, "ab", buffering=1 << 20)
+        _fsync_directory(self.directory)
+        return segment
+
+    def append(self, operation: str, args: List[Any]) -> int:
+        """
+        Append one mutation record.
+
+        Returns:
+            The record's LSN
+        """
+        with self._write_lock:
+            self.lsn += 1
+            record = json.dumps([self.lsn, operation, encode(args)], separators=(",", ":"))
+            self._file.write(record.encode() + b"\n")
+            return self.lsn
+
+    def sync(self, lsn: Optional[int] = None) -> None:
+        """
+        Make every record up to ``lsn`` (default: all) durable.
+
+        Concurrent callers share one fsync: whoever gets the sync lock
+        flushes everything written so far, and the others find their
+        records already covered.
+        """
+        if lsn is None:
+            lsn = self.lsn
+        if self.synced_lsn >= lsn:
+            return
+        with self._sync_lock:
+            if self.synced_lsn >= lsn:
+                return
+            with self._write_lock:
+                self._file.flush()
+                target = self.lsn
+                fd = self._file.fileno()
+            os.fsync(fd)
+            self.synced_lsn = target
+
+    def rotate(self) -> int:
+        """
+        Finish the current segment and start a new one.
+
+        Returns:
+            LSN of the last record in the finished segment
+        """
+        with self._sync_lock, self._write_lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self.synced_lsn = self.lsn
+            self._file = self._open_segment(self.lsn + 1)
+            return self.lsn
+
+    def close(self) -> None:
+        """Flush, fsync and close the current segment."""
+        self.sync()
+        with self._write_lock:
+            self._file.close()
+
+    @staticmethod
+    def replay(directory: Path, after_lsn: int) -> Iterator[Tuple[int, str, List[Any]]]:
+        """
+        Yield (lsn, operation, args) for every record after ``after_lsn``.
+
+        A torn record at the very end of the newest segment (a crash
+        mid-write) is truncated away; corruption anywhere else raises.
+
+        Raises:
+            ValueError: If a record other than the last is unreadable
+        """
+        segments = _files(directory, _JOURNAL_PREFIX, _JOURNAL_SUFFIX)
+        for position, path in enumerate(segments):
+            newest = position == len(segments) - 1
+            with open(path, "rb") as segment:
+                data = segment.read()
+            offset = 0
+            for line in data.splitlines(keepends=True):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated record")
+                    lsn, operation, args = json.loads(line)
+                except ValueError:
+                    if newest and offset + len(line) == len(data):
+                        with open(path, "r+b") as segment:
+                            segment.truncate(offset)
+                        return
+                    raise ValueError(f"Corrupt journal record in {path.name} at byte {offset}")
+                offset += len(line)
+                if lsn > after_lsn:
+                    yield lsn, operation, decode(args)
+
+
+class JournaledDatabase:
+    """
+    MockDatabase with a write-ahead journal and periodic snapshots.
+
+    Reads are served straight from the in-memory database. Writes are
+    applied in memory and journaled under one lock, so the journal order
+    always matches the order mutations were applied.
+    """
+
+    # Mutations that are journaled verbatim and replayed by name
+    JOURNALED_OPERATIONS = (
+        "add_user",
+        "add_order",
+        "bulk_insert_users",
+        "bulk_insert_orders",
+        "bulk_insert_returns",
+        "bulk_insert_tracking",
+        "create_return",
+        "update_return_status",
+        "update_return_statuses",
+        "set_return_tracking_number",
+        "create_tracking",
+        "record_tracking_scans",
+        "apply_tracking_updates",
+    )
+
+    def __init__(
+        self,
+        directory: str,
+        durability: str = "batch",
+        sync_interval: float = 0.05,
+        snapshot_every: int = 100_000,
+    ):
+        """
+        Open (recovering if needed) a journaled database.
+
+        Args:
+            directory: Data directory for snapshots and journal segments
+            durability: "batch" to fsync in the background every
+                ``sync_interval`` seconds, or "always" to fsync before
+                each write returns
+            sync_interval: Seconds between background fsyncs
+            snapshot_every: Journal records between automatic snapshots
+                (0 disables automatic snapshots)
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.durability = durability
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+
+        self._lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self.db, self.snapshot_lsn, last_lsn, self.replayed = self._recover()
+        self.journal = Journal(self.directory, last_lsn + 1)
+        if not _files(self.directory, _SNAPSHOT_PREFIX, _SNAPSHOT_SUFFIX):
+            # First start: persist the seed data so recovery never reseeds
+            self.snapshot()
+
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+        self._flusher.start()
+
+    @classmethod
+    def from_url(cls, url: str) -> "JournaledDatabase":
+        """
+        Open a journaled database from a URL.
+
+        ``journal:///relative/dir`` and ``journal:////abs/dir`` are
+        supported; ``?durability=always`` selects per-write fsync.
+        """
+        if not url.startswith("journal:"):
+            raise ValueError(f"Not a journal URL: {url}")
+        parts = urlsplit(url)
+        path = url[len("journal:"):].split("?", 1)[0]
+        if path.startswith("///"):
+            path = path[3:]
+        elif path.startswith("//"):
+            path = path[2:]
+        if not path:
+            raise ValueError("A journal URL needs a directory")
+        durability = parse_qs(parts.query).get("durability", ["batch"])[0]
+        return cls(path, durability=durability)
+
+    # ==========================================================================
+    # RECOVERY
+    # ==========================================================================
+
+    def _recover(self) -> Tuple[MockDatabase, int, int, int]:
+        """
+        Rebuild in-memory state from the newest snapshot and the journal.
+
+        Returns:
+            (database, snapshot_lsn, last_lsn, replayed_record_count)
+        """
+        snapshots = _files(self.directory, _SNAPSHOT_PREFIX, _SNAPSHOT_SUFFIX)
+        if snapshots:
+            db = MockDatabase(seed=False)
+            snapshot_lsn = self._load_snapshot(db, snapshots[-1])
+        else:
+            db = MockDatabase()
+            snapshot_lsn = 0
+
+        last_lsn = snapshot_lsn
+        replayed = 0
+        for lsn, operation, args in Journal.replay(self.directory, snapshot_lsn):
+            if operation not in self.JOURNALED_OPERATIONS:
+                raise ValueError(f"Unknown journal operation: {operation}")
+            getattr(db, operation)(*args)
+            last_lsn = lsn
+            replayed += 1
+        return db, snapshot_lsn, last_lsn, replayed
+
+    @staticmethod
+    def _load_snapshot(db: MockDatabase, path: Path) -> int:
+        """Load a snapshot file into an empty database and return its LSN."""
+        with open(path, "rb") as snapshot:
+            header = json.loads(snapshot.readline())
+            users, orders, returns, tracking = [], [], [], []
+            targets = {"user": users, "order": orders, "return": returns, "tracking": tracking}
+            scans = []
+            for line in snapshot:
+                kind, payload = json.loads(line)
+                if kind == "scans":
+                    tracking_number, history = payload
+                    scans.extend((tracking_number, *decode(scan)) for scan in history)
+                else:
+                    targets[kind].append(decode(payload))
+
+        db.bulk_insert_users(users)
+        db.bulk_insert_orders(orders)
+        # Users already carry their return counts
+        db.bulk_insert_returns(returns)
+        # History first so restoring current state adds no extra scan
+        db.record_tracking_scans(scans)
+        for info in tracking:
+            db.tracking[info.tracking_number] = info
+        return header["lsn"]
+
+    # ==========================================================================
+    # SNAPSHOTS AND SYNC
+    # ==========================================================================
+
+    def snapshot(self) -> int:
+        """
+        Write a snapshot of the current state and drop older files.
+
+        Writers are blocked only while the state is encoded; the file is
+        written after the lock is released.
+
+        Returns:
+            LSN covered by the snapshot
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                lsn = self.journal.rotate()
+                db = self.db
+                lines = [json.dumps({"lsn": lsn, "version": 1})]
+                for kind, records in (
+                    ("user", db.users.values()),
+                    ("order", db.orders.values()),
+                    ("return", db.returns.values()),
+                    ("tracking", db.tracking.values()),
+                ):
+                    lines.extend(
+                        json.dumps([kind, encode(record)], separators=(",", ":"))
+                        for record in records
+                    )
+                for tracking_number in db.tracking_history.tracking_numbers():
+                    history = [list(scan) for scan in db.tracking_history.history(tracking_number)]
+                    lines.append(
+                        json.dumps(["scans", [tracking_number, encode(history)]], separators=(",", ":"))
+                    )
+
+            path = self.directory / f"{_SNAPSHOT_PREFIX}{lsn:016d}{_SNAPSHOT_SUFFIX}"
+            temp = path.with_suffix(".tmp")
+            with open(temp, "w", encoding="utf-8") as snapshot:
+                snapshot.write("\n".join(lines))
+                snapshot.write("\n")
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temp, path)
+            _fsync_directory(self.directory)
+            self.snapshot_lsn = lsn
+
+            # Everything up to lsn is now in the snapshot
+            for old in _files(self.directory, _SNAPSHOT_PREFIX, _SNAPSHOT_SUFFIX):
+                if old != path:
+                    old.unlink()
+            for segment in _files(self.directory, _JOURNAL_PREFIX, _JOURNAL_SUFFIX):
+                if _file_lsn(segment, _JOURNAL_PREFIX, _JOURNAL_SUFFIX) <= lsn:
+                    segment.unlink()
+            return lsn
+
+    def sync(self) -> None:
+        """Make every journaled write durable now."""
+        self.journal.sync()
+
+    def close(self) -> None:
+        """Stop the background flusher and make all writes durable."""
+        self._stop.set()
+        self._flusher.join()
+        self.journal.close()
+
+    def _flush_loop(self) -> None:
+        """Background group commit and automatic snapshots."""
+        while not self._stop.wait(self.sync_interval):
+            self.journal.sync()
+            if (
+                self.snapshot_every
+                and self.journal.lsn - self.snapshot_lsn >= self.snapshot_every
+            ):
+                self.snapshot()
+
+    # ==========================================================================
+    # JOURNALED WRITES
+    # ==========================================================================
+
+    def _apply(self, operation: str, *args):
+        """Apply a mutation in memory, journal it and honour the durability mode."""
+        with self._lock:
+            result = getattr(self.db, operation)(*args)
+            lsn = self.journal.append(operation, list(args))
+        if self.durability == "always":
+            self.journal.sync(lsn)
+        return result
+
+    def add_user(self, user):
+        """Add or replace a user."""
+        return self._apply("add_user", user)
+
+    def add_order(self, order):
+        """Add or replace an order."""
+        return self._apply("add_order", order)
+
+    def bulk_insert_users(self, users: Iterable) -> int:
+        """Insert or replace many users."""
+        return self._apply("bulk_insert_users", list(users))
+
+    def bulk_insert_orders(self, orders: Iterable) -> int:
+        """Insert or replace many orders."""
+        return self._apply("bulk_insert_orders", list(orders))
+
+    def bulk_insert_returns(self, returns: Iterable) -> int:
+        """Insert many existing returns without bumping return counts."""
+        return self._apply("bulk_insert_returns", list(returns))
+
+    def bulk_insert_tracking(self, tracking: Iterable) -> int:
+        """Insert or replace many tracking records."""
+        return self._apply("bulk_insert_tracking", list(tracking))
+
+    def create_return(self, return_request):
+        """Create a new return request."""
+        return self._apply("create_return", return_request)
+
+    def update_return_status(self, return_id: str, status):
+        """Update the status of a return request."""
+        with self._lock:
+            if self.db.get_return(return_id) is None:
+                return None
+            return self._apply("update_return_status", return_id, status)
+
+    def update_return_statuses(self, updates: Iterable) -> int:
+        """Update the status of many returns in one call."""
+        return self._apply("update_return_statuses", [list(update) for update in updates])
+
+    def set_return_tracking_number(self, return_id: str, tracking_number: Optional[str]):
+        """Assign, change or clear the tracking number of a return."""
+        with self._lock:
+            if self.db.get_return(return_id) is None:
+                return None
+            return self._apply("set_return_tracking_number", return_id, tracking_number)
+
+    def create_tracking(self, tracking_info):
+        """Create tracking information."""
+        return self._apply("create_tracking", tracking_info)
+
+    def update_tracking_status(self, tracking_number: str, status, location: Optional[str] = None):
+        """
+        Update tracking status.
+
+        Journaled as the resulting state (via apply_tracking_updates) so
+        replay reproduces the original timestamp instead of the replay time.
+        """
+        with self._lock:
+            tracking_info = self.db.update_tracking_status(tracking_number, status, location)
+            if tracking_info is None:
+                return None
+            update = TrackingInfo(
+                tracking_number=tracking_number,
+                carrier=tracking_info.carrier,
+                status=status,
+                last_update=tracking_info.last_update,
+                current_location=location,
+            )
+            lsn = self.journal.append("apply_tracking_updates", [[update]])
+        if self.durability == "always":
+            self.journal.sync(lsn)
+        return tracking_info
+
+    def record_tracking_scans(self, scans: Iterable) -> int:
+        """Append carrier scans to the tracking history."""
+        return self._apply("record_tracking_scans", [list(scan) for scan in scans])
+
+    def apply_tracking_updates(self, updates: Iterable) -> List:
+        """Apply the latest known state of many shipments in one call."""
+        return self._apply("apply_tracking_updates", list(updates))
+
+    def __getattr__(self, name: str):
+        """Serve reads (get_*, list_users) from the in-memory database."""
+        db = self.__dict__.get("db")
+        if db is None or name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(db, name)
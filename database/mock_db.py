@@ -1,147 +1,284 @@
 """Mock database implementation for testing and demo purposes."""
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import random
+import threading
 
 from models.order import Order, OrderItem
 from models.user import User
 from models.return_request import ReturnRequest, ReturnStatus
 from models.tracking import TrackingInfo, ShipmentStatus
+from .indexing import Index, Table
+from .phone import normalize_phone
+from .tracking_history import TrackingEventLog, TrackingScan
+
+
+def _phone_key(user: User) -> Optional[str]:
+    """Index key for a user's phone number (None if it has no digits)."""
+    return normalize_phone(user.phone) or None
+
+
+def _tracking_key(return_request: ReturnRequest) -> Optional[str]:
+    """Index key for a return's tracking number (None if unassigned)."""
+    return return_request.tracking_number or None
+
+
+def sample_users() -> List[User]:
+    """Sample users shared by every storage engine's demo seed."""
+    return [
+        User(
+            user_id="USER001",
+            name="John Doe",
+            email="john.doe@email.com",
+            phone="+1-555-0001",
+            address="123 Main St, San Francisco, CA 94102",
+            return_count=2,
+            account_age_days=365,
+        ),
+        User(
+            user_id="USER002",
+            name="Jane Smith",
+            email="jane.smith@email.com",
+            phone="+1-555-0002",
+            address="456 Oak Ave, Los Angeles, CA 90001",
+            return_count=0,
+            account_age_days=180,
+        ),
+    ]
+
+
+def sample_orders() -> List[Order]:
+    """Sample orders shared by every storage engine's demo seed."""
+    return [
+        Order(
+            order_id="ORD001",
+            user_id="USER001",
+            items=[
+                OrderItem(
+                    item_id="ITEM001",
+                    product_name="Wireless Headphones",
+                    price=149.99,
+                    quantity=1,
+                    category="Electronics",
+                ),
+                OrderItem(
+                    item_id="ITEM002",
+                    product_name="Phone Case",
+                    price=19.99,
+                    quantity=2,
+                    category="Accessories",
+                ),
+            ],
+            order_date=datetime.now() - timedelta(days=7),
+            total_amount=189.97,
+            status="delivered",
+        ),
+        Order(
+            order_id="ORD002",
+            user_id="USER001",
+            items=[
+                OrderItem(
+                    item_id="ITEM003",
+                    product_name="Running Shoes",
+                    price=89.99,
+                    quantity=1,
+                    category="Footwear",
+                ),
+            ],
+            order_date=datetime.now() - timedelta(days=14),
+            total_amount=89.99,
+            status="delivered",
+        ),
+        Order(
+            order_id="ORD003",
+            user_id="USER002",
+            items=[
+                OrderItem(
+                    item_id="ITEM004",
+                    product_name="Coffee Maker",
+                    price=79.99,
+                    quantity=1,
+                    category="Home & Kitchen",
+                ),
+            ],
+            order_date=datetime.now() - timedelta(days=3),
+            total_amount=79.99,
+            status="delivered",
+        ),
+    ]
 
 
 class MockDatabase:
     """Mock database for storing users, orders, returns, and tracking info."""
 
-    def __init__(self):
-        """Initialize mock database with sample data."""
-        self.users: Dict[str, User] = {}
-        self.orders: Dict[str, Order] = {}
-        self.returns: Dict[str, ReturnRequest] = {}
+    def __init__(self, seed: bool = True):
+        """
+        Initialize mock database.
+
+        Args:
+            seed: Load the demo users and orders
+        """
+        # One lock for every table, so writes spanning tables are atomic
+        self._index_lock = threading.RLock()
+
+        # Tables keep their declared secondary indexes consistent on write
+        self.users = Table(
+            "user_id",
+            [Index("phone", key=_phone_key)],
+            lock=self._index_lock,
+        )
+        self.orders = Table(
+            "order_id",
+            [Index("user_id", sort_key=attrgetter("order_date"))],
+            lock=self._index_lock,
+        )
+        self.returns = Table(
+            "return_id",
+            [
+                Index("user_id", sort_key=attrgetter("created_at")),
+                Index("tracking_number", key=_tracking_key, unique=True),
+                Index("status"),
+            ],
+            lock=self._index_lock,
+        )
         self.tracking: Dict[str, TrackingInfo] = {}
-        self._seed_data()
+
+        # Append-only carrier scan history per tracking number
+        self.tracking_history = TrackingEventLog()
+
+        # Callbacks told about every batch of stored or updated returns
+        self._return_listeners: List[Callable[[List[ReturnRequest]], None]] = []
+
+        if seed:
+            self._seed_data()
 
     def _seed_data(self):
         """Seed database with sample data."""
-        # Create sample users
-        users_data = [
-            User(
-                user_id="USER001",
-                name="John Doe",
-                email="john.doe@email.com",
-                phone="+1-555-0001",
-                address="123 Main St, San Francisco, CA 94102",
-                return_count=2,
-                account_age_days=365,
-            ),
-            User(
-                user_id="USER002",
-                name="Jane Smith",
-                email="jane.smith@email.com",
-                phone="+1-555-0002",
-                address="456 Oak Ave, Los Angeles, CA 90001",
-                return_count=0,
-                account_age_days=180,
-            ),
-        ]
-        for user in users_data:
-            self.users[user.user_id] = user
-
-        # Create sample orders
-        orders_data = [
-            Order(
-                order_id="ORD001",
-                user_id="USER001",
-                items=[
-                    OrderItem(
-                        item_id="ITEM001",
-                        product_name="Wireless Headphones",
-                        price=149.99,
-                        quantity=1,
-                        category="Electronics",
-                    ),
-                    OrderItem(
-                        item_id="ITEM002",
-                        product_name="Phone Case",
-                        price=19.99,
-                        quantity=2,
-                        category="Accessories",
-                    ),
-                ],
-                order_date=datetime.now() - timedelta(days=7),
-                total_amount=189.97,
-                status="delivered",
-            ),
-            Order(
-                order_id="ORD002",
-                user_id="USER001",
-                items=[
-                    OrderItem(
-                        item_id="ITEM003",
-                        product_name="Running Shoes",
-                        price=89.99,
-                        quantity=1,
-                        category="Footwear",
-                    ),
-                ],
-                order_date=datetime.now() - timedelta(days=14),
-                total_amount=89.99,
-                status="delivered",
-            ),
-            Order(
-                order_id="ORD003",
-                user_id="USER002",
-                items=[
-                    OrderItem(
-                        item_id="ITEM004",
-                        product_name="Coffee Maker",
-                        price=79.99,
-                        quantity=1,
-                        category="Home & Kitchen",
-                    ),
-                ],
-                order_date=datetime.now() - timedelta(days=3),
-                total_amount=79.99,
-                status="delivered",
-            ),
-        ]
-        for order in orders_data:
-            self.orders[order.order_id] = order
+        for user in sample_users():
+            self.add_user(user)
+        for order in sample_orders():
+            self.add_order(order)
 
     # User operations
     def get_user(self, user_id: str) -> Optional[User]:
         """Retrieve a user by ID."""
         return self.users.get(user_id)
 
+    def add_user(self, user: User) -> User:
+        """Add or replace a user."""
+        return self.users.insert(user)
+
+    def list_users(self) -> List[User]:
+        """Retrieve every user."""
+        return list(self.users.values())
+
     def get_user_by_phone(self, phone: str) -> Optional[User]:
-        """Retrieve a user by phone number."""
-        for user in self.users.values():
-            if user.phone == phone:
-                return user
-        return None
+        """
+        Retrieve a user by phone number.
+
+        Accepts any common format, including caller ID ("+1-555-0001"),
+        bare digits ("5550001") and spoken transcripts ("five five five
+        oh oh oh one").
+        """
+        phone_key = normalize_phone(phone)
+        if not phone_key:
+            return None
+        # If several users share a number, the most recently added wins
+        return self.users.index("phone").last(phone_key)
+
+    # Bulk loading
+    def bulk_insert_users(self, users: Iterable[User]) -> int:
+        """Insert or replace many users. Returns the number inserted."""
+        count = 0
+        with self._index_lock:
+            for user in users:
+                self.users.insert(user)
+                count += 1
+        return count
+
+    def bulk_insert_orders(self, orders: Iterable[Order]) -> int:
+        """Insert or replace many orders. Returns the number inserted."""
+        count = 0
+        with self._index_lock:
+            for order in orders:
+                self.orders.insert(order)
+                count += 1
+        return count
+
+    def bulk_insert_returns(self, returns: Iterable[ReturnRequest]) -> int:
+        """
+        Insert many existing returns, e.g. from an export.
+
+        Unlike create_return this does not bump ``User.return_count``;
+        loaded users are expected to carry their own counts.
+        """
+        count = 0
+        stored = [] if self._return_listeners else None
+        with self._index_lock:
+            for return_request in returns:
+                self.returns.insert(return_request)
+                count += 1
+                if stored is not None:
+                    stored.append(return_request)
+            if stored:
+                self._notify_returns(stored)
+        return count
+
+    def bulk_insert_tracking(self, tracking: Iterable[TrackingInfo]) -> int:
+        """Insert or replace many tracking records. Returns the number inserted."""
+        count = 0
+        for tracking_info in tracking:
+            self.create_tracking(tracking_info)
+            count += 1
+        return count
 
     # Order operations
+    def add_order(self, order: Order) -> Order:
+        """Add or replace an order."""
+        return self.orders.insert(order)
+
     def get_order(self, order_id: str) -> Optional[Order]:
         """Retrieve an order by ID."""
         return self.orders.get(order_id)
 
     def get_user_orders(self, user_id: str, limit: int = 10) -> List[Order]:
-        """Retrieve recent orders for a user."""
-        user_orders = [
-            order for order in self.orders.values() if order.user_id == user_id
-        ]
-        # Sort by date, most recent first
-        user_orders.sort(key=lambda x: x.order_date, reverse=True)
-        return user_orders[:limit]
+        """Retrieve recent orders for a user, most recent first."""
+        if limit <= 0:
+            return []
+        # The per-user bucket is ordered by date, oldest first
+        user_orders = self.orders.index("user_id").bucket(user_id)
+        return user_orders[-limit:][::-1]
+
+    def get_items_bulk(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], OrderItem]:
+        """
+        Resolve many (order_id, item_id) pairs in one call.
+
+        Returns:
+            The item for each pair found; missing orders and items are left out
+        """
+        found: Dict[Tuple[str, str], OrderItem] = {}
+        for order_id, item_id in pairs:
+            order = self.get_order(order_id)
+            item = order.get_item_by_id(item_id) if order else None
+            if item is not None:
+                found[order_id, item_id] = item
+        return found
 
     # Return operations
     def create_return(self, return_request: ReturnRequest) -> ReturnRequest:
         """Create a new return request."""
-        self.returns[return_request.return_id] = return_request
-        # Update user return count
-        user = self.get_user(return_request.user_id)
-        if user:
-            user.return_count += 1
+        with self._index_lock:
+            self.returns.insert(return_request)
+
+            # Update user return count
+            user = self.get_user(return_request.user_id)
+            if user:
+                user.return_count += 1
+            self._notify_returns([return_request])
         return return_request
 
     def get_return(self, return_id: str) -> Optional[ReturnRequest]:
@@ -152,19 +289,90 @@ class MockDatabase:
         self, return_id: str, status: ReturnStatus
     ) -> Optional[ReturnRequest]:
         """Update the status of a return request."""
-        return_request = self.returns.get(return_id)
-        if return_request:
-            return_request.status = status
+        with self._index_lock:
+            return_request = self.returns.update(return_id, status=status)
+            if return_request:
+                self._notify_returns([return_request])
         return return_request
 
+    def update_return_statuses(self, updates: Iterable[Tuple[str, ReturnStatus]]) -> int:
+        """
+        Update the status of many returns in one call.
+
+        Args:
+            updates: (return_id, status) pairs
+
+        Returns:
+            Number of returns updated
+        """
+        updated = []
+        with self._index_lock:
+            for return_id, status in updates:
+                return_request = self.returns.update(return_id, status=status)
+                if return_request:
+                    updated.append(return_request)
+            if updated:
+                self._notify_returns(updated)
+        return len(updated)
+
     def get_user_returns(self, user_id: str) -> List[ReturnRequest]:
-        """Retrieve all returns for a user."""
-        return [ret for ret in self.returns.values() if ret.user_id == user_id]
+        """Retrieve all returns for a user, oldest first."""
+        return self.returns.index("user_id").get(user_id)
+
+    def list_returns(self) -> List[ReturnRequest]:
+        """Retrieve every return."""
+        return list(self.returns.values())
+
+    def find_returns(self, **criteria) -> List[ReturnRequest]:
+        """
+        Retrieve returns matching every ``attribute=value`` criterion.
+
+        The most selective indexed criterion (user_id, tracking_number or
+        status) is used to find candidates, e.g.
+        ``find_returns(status=ReturnStatus.RECEIVED, user_id="USER001")``.
+        """
+        return self.returns.where(**criteria)
+
+    def add_return_listener(self, listener: Callable[[List[ReturnRequest]], None]) -> None:
+        """
+        Register a callback for return writes.
+
+        The listener is called with the affected returns after they are
+        created, bulk inserted or change status, so derived views such as
+        ReturnsAnalytics stay current without polling.
+        """
+        self._return_listeners.append(listener)
+
+    def _notify_returns(self, returns: List[ReturnRequest]) -> None:
+        """Pass stored or updated returns to every registered listener."""
+        for listener in self._return_listeners:
+            listener(returns)
+
+    def get_latest_user_return(self, user_id: str) -> Optional[ReturnRequest]:
+        """Retrieve the most recently created return for a user."""
+        return self.returns.index("user_id").last(user_id)
+
+    def get_user_return_history(
+        self, user_id: str, offset: int = 0, limit: int = 10
+    ) -> List[ReturnRequest]:
+        """Retrieve a page of a user's returns, most recent first."""
+        user_returns = self.returns.index("user_id").bucket(user_id)
+        end = len(user_returns) - offset
+        if end <= 0:
+            return []
+        return user_returns[max(end - limit, 0):end][::-1]
 
     # Tracking operations
     def create_tracking(self, tracking_info: TrackingInfo) -> TrackingInfo:
         """Create tracking information."""
-        self.tracking[tracking_info.tracking_number] = tracking_info
+        with self._index_lock:
+            self.tracking[tracking_info.tracking_number] = tracking_info
+            self.tracking_history.append(
+                tracking_info.tracking_number,
+                tracking_info.status,
+                tracking_info.last_update,
+                tracking_info.current_location,
+            )
         return tracking_info
 
     def get_tracking(self, tracking_number: str) -> Optional[TrackingInfo]:
@@ -175,17 +383,96 @@ class MockDatabase:
         self, tracking_number: str, status: ShipmentStatus, location: Optional[str] = None
     ) -> Optional[TrackingInfo]:
         """Update tracking status."""
-        tracking_info = self.tracking.get(tracking_number)
-        if tracking_info:
-            tracking_info.status = status
-            tracking_info.last_update = datetime.now()
-            if location:
-                tracking_info.current_location = location
+        # Carrier webhooks and the tracking cache refresher write concurrently
+        with self._index_lock:
+            tracking_info = self.tracking.get(tracking_number)
+            if tracking_info:
+                tracking_info.status = status
+                tracking_info.last_update = datetime.now()
+                if location:
+                    tracking_info.current_location = location
+                self.tracking_history.append(
+                    tracking_number, status, tracking_info.last_update, location
+                )
         return tracking_info
 
+    def get_tracking_history(
+        self, tracking_number: str, limit: Optional[int] = None
+    ) -> List[TrackingScan]:
+        """Retrieve the scan history for a tracking number, oldest first."""
+        return self.tracking_history.history(tracking_number, limit)
+
+    def record_tracking_scans(
+        self, scans: Iterable[Tuple[str, ShipmentStatus, datetime, Optional[str]]]
+    ) -> int:
+        """
+        Append carrier scans to the tracking history.
+
+        Args:
+            scans: (tracking_number, status, timestamp, location) tuples,
+                in time order per tracking number
+
+        Returns:
+            Number of scans recorded
+        """
+        append = self.tracking_history.append
+        return sum(1 for scan in scans if append(*scan))
+
+    def apply_tracking_updates(self, updates: Iterable[TrackingInfo]) -> List[TrackingInfo]:
+        """
+        Apply the latest known state of many shipments in one call.
+
+        Unknown tracking numbers are created. Updates older than the
+        stored ``last_update`` are ignored so replays and late webhook
+        deliveries never move a shipment backwards.
+
+        Args:
+            updates: Latest TrackingInfo per tracking number
+
+        Returns:
+            The stored TrackingInfo records that changed
+        """
+        applied = []
+        tracking = self.tracking
+        with self._index_lock:
+            for update in updates:
+                current = tracking.get(update.tracking_number)
+                if current is None:
+                    tracking[update.tracking_number] = update
+                    applied.append(update)
+                elif update.last_update >= current.last_update:
+                    current.status = update.status
+                    current.last_update = update.last_update
+                    if update.current_location:
+                        current.current_location = update.current_location
+                    if update.estimated_delivery:
+                        current.estimated_delivery = update.estimated_delivery
+                    applied.append(current)
+                else:
+                    continue
+                self.tracking_history.append(
+                    update.tracking_number,
+                    update.status,
+                    update.last_update,
+                    update.current_location,
+                )
+        return applied
+
     def get_return_by_tracking(self, tracking_number: str) -> Optional[ReturnRequest]:
         """Find a return by tracking number."""
-        for return_req in self.returns.values():
-            if return_req.tracking_number == tracking_number:
-                return return_req
-        return None
+        return self.returns.index("tracking_number").get(tracking_number)
+
+    def set_return_tracking_number(
+        self, return_id: str, tracking_number: Optional[str]
+    ) -> Optional[ReturnRequest]:
+        """
+        Assign, change or clear the tracking number of a return.
+
+        Always go through this method rather than setting
+        ``ReturnRequest.tracking_number`` directly so the tracking index
+        stays consistent.
+
+        Raises:
+            ValueError: If the tracking number belongs to another return
+        """
+        return self.returns.update(return_id, tracking_number=tracking_number)
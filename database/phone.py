@@ -0,0 +1,111 @@
+"""
+Phone number normalization for caller identification.
+
+Caller ID, typed input and speech recognition all produce phone numbers
+in different shapes ("+1-555-0001", "5550001", "five five five oh oh oh
+one"). Everything is reduced to an E.164-style key ("+15550001") so a
+single dict lookup finds the user.
+"""
+
+import re
+from typing import Optional
+
+
+DEFAULT_COUNTRY_CODE = "1"
+
+_WORD_DIGITS = {
+    "zero": "0",
+    "oh": "0",
+    "o": "0",
+    "one": "1",
+    "two": "2",
+    "three": "3",
+    "four": "4",
+    "five": "5",
+    "six": "6",
+    "seven": "7",
+    "eight": "8",
+    "nine": "9",
+}
+
+_REPEATERS = {"double": 2, "triple": 3}
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+|\d+|\+")
+
+
+def spoken_digits_to_string(text: str) -> str:
+    """
+    Convert an ASR transcript of a phone number into a digit string.
+
+    Handles number words, "oh" for zero, "double"/"triple" repeats,
+    digits mixed with words and a leading "plus". Other words ("my",
+    "number", "is", "dash") are ignored.
+
+    Example:
+        >>> spoken_digits_to_string("five five five oh oh oh one")
+        '5550001'
+        >>> spoken_digits_to_string("plus one 555 double oh 01")
+        '+15550001'
+    """
+    result = []
+    repeat = 1
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in ("+", "plus"):
+            if not result:
+                result.append("+")
+            continue
+        if token in _REPEATERS:
+            repeat = _REPEATERS[token]
+            continue
+
+        digits = _WORD_DIGITS.get(token)
+        if digits is None and token.isdigit():
+            digits = token
+        if digits is None:
+            repeat = 1
+            continue
+
+        # "double five" repeats a single digit; "double 55" is taken literally
+        result.append(digits[0] * repeat + digits[1:])
+        repeat = 1
+    return "".join(result)
+
+
+def normalize_phone(raw: str, country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """
+    Normalize a typed, caller-ID or spoken phone number to E.164 form.
+
+    Args:
+        raw: Phone number in any common format, or a spoken transcript
+        country_code: Country calling code assumed for national numbers
+
+    Returns:
+        Normalized number such as "+15550001", or None if no plausible
+        number could be extracted
+    """
+    if not raw:
+        return None
+
+    text = raw.strip()
+    if re.search(r"[a-zA-Z]", text):
+        text = spoken_digits_to_string(text)
+
+    has_plus = text.startswith("+")
+    digits = re.sub(r"\D", "", text)
+
+    if has_plus:
+        pass
+    elif digits.startswith("00"):
+        # International dialing prefix
+        digits = digits[2:]
+    elif country_code == "1" and digits.startswith("1"):
+        # North American numbers never start with 1, so a leading 1 is the
+        # country code/trunk prefix that callers sometimes include
+        pass
+    else:
+        digits = country_code + digits
+
+    # E.164 allows at most 15 digits; shorter than 7 cannot be a phone number
+    if not 7 <= len(digits) <= 15:
+        return None
+    return f"+{digits}"
@@ -0,0 +1,334 @@
+"""
+Columnar returns analytics.
+
+ReturnsAnalytics mirrors every return into NumPy arrays, one per column
+(reason, status, category, user, refund in cents, fraud score, creation
+time), so ops questions such as "returns by reason" or "refund dollars
+by category" are a masked ``bincount`` instead of a Python loop over
+ReturnRequest objects. The mirror is kept current by a return listener
+on the storage engine, and queries run in NumPy with the GIL released
+for most of their work, so they do not stall live voice sessions.
+
+NumPy is an optional dependency: ``pip install 'voice-agent[analytics]'``.
+"""
+
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional
+import threading
+
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+
+
+UNKNOWN_CATEGORY = "Unknown"
+
+_MICROS_PER_DAY = 86_400_000_000
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+REASONS: List[ReturnReason] = list(ReturnReason)
+STATUSES: List[ReturnStatus] = list(ReturnStatus)
+_REASON_CODES = {reason: code for code, reason in enumerate(REASONS)}
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Column name -> NumPy dtype
+_COLUMNS = {
+    "reason": "int8",
+    "status": "int8",
+    "category": "int32",
+    "user": "int32",
+    "refund_cents": "int64",
+    "fraud": "float64",
+    "created": "datetime64[us]",
+}
+
+
+def require_numpy(feature: str = "returns analytics"):
+    """
+    Import NumPy, explaining how to install it if missing.
+
+    Shared by the NumPy-backed features (analytics, bulk settlement).
+
+    Args:
+        feature: What needs NumPy, for the error message
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            f"numpy is required for {feature}. "
+            "Install with: pip install 'voice-agent[analytics]'"
+        )
+    return numpy
+
+
+class ReturnsAnalytics:
+    """Columnar, write-maintained mirror of returns for aggregate queries."""
+
+    def __init__(
+        self,
+        category_of: Optional[Callable[[ReturnRequest], Optional[str]]] = None,
+        capacity: int = 1024,
+    ):
+        """
+        Initialize an empty analytics store.
+
+        Args:
+            category_of: Resolves a return's product category (returns
+                are recorded under UNKNOWN_CATEGORY without it)
+            capacity: Initial number of rows to allocate
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        self._np = require_numpy()
+        self.category_of = category_of
+        self._lock = threading.Lock()
+        self._size = 0
+        self._columns = {
+            name: self._np.empty(max(capacity, 1), dtype=dtype) for name, dtype in _COLUMNS.items()
+        }
+
+        # return_id -> row, plus dictionary encoding of users and categories
+        self._rows: Dict[str, int] = {}
+        self._user_codes: Dict[str, int] = {}
+        self.user_ids: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self.categories: List[str] = []
+
+    @classmethod
+    def attach(cls, db, capacity: int = 1024) -> "ReturnsAnalytics":
+        """
+        Mirror a storage engine's returns and keep following its writes.
+
+        Args:
+            db: Storage engine with ``add_return_listener`` and
+                ``list_returns`` (MockDatabase, ShardedDatabase,
+                SqliteDatabase, or a wrapper around one of them)
+            capacity: Initial number of rows to allocate
+
+        Returns:
+            The attached analytics store, loaded with existing returns
+
+        Raises:
+            TypeError: If the engine cannot report its return writes
+        """
+        missing = [
+            name for name in ("add_return_listener", "list_returns") if not hasattr(db, name)
+        ]
+        if missing:
+            raise TypeError(
+                f"{type(db).__name__} has no {' or '.join(missing)}; attach a MockDatabase, "
+                "ShardedDatabase or SqliteDatabase (or a wrapper around one)"
+            )
+
+        def category_of(return_request: ReturnRequest) -> Optional[str]:
+            order = db.get_order(return_request.order_id)
+            item = order.get_item_by_id(return_request.item_id) if order else None
+            return item.category if item else None
+
+        analytics = cls(category_of, capacity)
+        # Subscribe before the backfill so no write falls in between;
+        # returns seen twice are simply upserted again
+        db.add_return_listener(analytics.observe)
+        analytics.observe(db.list_returns())
+        return analytics
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ==========================================================================
+    # WRITES
+    # ==========================================================================
+
+    def observe(self, returns: Iterable[ReturnRequest]) -> None:
+        """
+        Insert new returns and refresh the mutable columns of known ones.
+
+        Args:
+            returns: Returns that were stored or updated
+        """
+        with self._lock:
+            columns = self._columns
+            new: List[ReturnRequest] = []
+            for return_request in returns:
+                row = self._rows.get(return_request.return_id)
+                if row is None:
+                    self._rows[return_request.return_id] = self._size + len(new)
+                    new.append(return_request)
+                elif row < self._size:
+                    columns["status"][row] = _STATUS_CODES[return_request.status]
+                    columns["reason"][row] = _REASON_CODES[return_request.reason]
+                    columns["refund_cents"][row] = return_request.refund_cents
+                    columns["fraud"][row] = return_request.fraud_risk_score
+                # else: repeated within this batch, the appended copy is current
+            if new:
+                self._append(new)
+
+    def _append(self, returns: List[ReturnRequest]) -> None:
+        """Append new rows, growing the columns geometrically. Caller holds the lock."""
+        np = self._np
+        count = len(returns)
+        start, end = self._size, self._size + count
+        self._reserve(end)
+
+        columns = self._columns
+        columns["reason"][start:end] = np.fromiter(
+            (_REASON_CODES[ret.reason] for ret in returns), dtype="int8", count=count
+        )
+        columns["status"][start:end] = np.fromiter(
+            (_STATUS_CODES[ret.status] for ret in returns), dtype="int8", count=count
+        )
+        columns["category"][start:end] = np.fromiter(
+            (self._category_code(ret) for ret in returns), dtype="int32", count=count
+        )
+        columns["user"][start:end] = np.fromiter(
+            (self._user_code(ret.user_id) for ret in returns), dtype="int32", count=count
+        )
+        columns["refund_cents"][start:end] = np.fromiter(
+            (ret.refund_cents for ret in returns), dtype="int64", count=count
+        )
+        columns["fraud"][start:end] = np.fromiter(
+            (ret.fraud_risk_score for ret in returns), dtype="float64", count=count
+        )
+        columns["created"][start:end] = np.array(
+            [ret.created_at for ret in returns], dtype="datetime64[us]"
+        )
+        self._size = end
+
+    def _reserve(self, rows: int) -> None:
+        """Make room for ``rows`` rows. Caller holds the lock."""
+        capacity = len(self._columns["reason"])
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2)
+        for name, column in self._columns.items():
+            grown = self._np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+    def _user_code(self, user_id: str) -> int:
+        code = self._user_codes.get(user_id)
+        if code is None:
+            code = self._user_codes[user_id] = len(self.user_ids)
+            self.user_ids.append(user_id)
+        return code
+
+    def _category_code(self, return_request: ReturnRequest) -> int:
+        category = self.category_of(return_request) if self.category_of else None
+        category = category or UNKNOWN_CATEGORY
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self.categories)
+            self.categories.append(category)
+        return code
+
+    # ==========================================================================
+    # QUERIES
+    # ==========================================================================
+
+    def _select(
+        self,
+        statuses: Optional[Iterable[ReturnStatus]] = None,
+        reasons: Optional[Iterable[ReturnReason]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+    ):
+        """
+        Snapshot the columns and build the row mask for a query.
+
+        Returns:
+            (columns, mask) where mask is None when every row matches
+        """
+        np = self._np
+        with self._lock:
+            size = self._size
+            columns = {name: column[:size] for name, column in self._columns.items()}
+            user_code = self._user_codes.get(user_id) if user_id is not None else None
+
+        mask = None
+
+        def narrow(condition):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if statuses is not None:
+            allowed = np.zeros(len(STATUSES), dtype=bool)
+            allowed[[_STATUS_CODES[status] for status in statuses]] = True
+            narrow(allowed[columns["status"]])
+        if reasons is not None:
+            allowed = np.zeros(len(REASONS), dtype=bool)
+            allowed[[_REASON_CODES[reason] for reason in reasons]] = True
+            narrow(allowed[columns["reason"]])
+        if since is not None:
+            narrow(columns["created"] >= np.datetime64(since, "us"))
+        if until is not None:
+            narrow(columns["created"] < np.datetime64(until, "us"))
+        if user_id is not None:
+            if user_code is None:
+                narrow(np.zeros(size, dtype=bool))
+            else:
+                narrow(columns["user"] == user_code)
+        return columns, mask
+
+    @staticmethod
+    def _masked(column, mask):
+        return column if mask is None else column[mask]
+
+    def count(self, **filters) -> int:
+        """
+        Count returns matching the filters.
+
+        Args:
+            **filters: statuses, reasons, since, until (datetimes; since
+                is inclusive, until exclusive) and user_id
+        """
+        columns, mask = self._select(**filters)
+        return len(columns["reason"]) if mask is None else int(mask.sum())
+
+    def count_by_reason(self, **filters) -> Dict[ReturnReason, int]:
+        """Number of matching returns per reason (reasons with none omitted)."""
+        columns, mask = self._select(**filters)
+        counts = self._np.bincount(self._masked(columns["reason"], mask), minlength=len(REASONS))
+        return {reason: int(counts[code]) for code, reason in enumerate(REASONS) if counts[code]}
+
+    def count_by_status(self, **filters) -> Dict[ReturnStatus, int]:
+        """Number of matching returns per status (statuses with none omitted)."""
+        columns, mask = self._select(**filters)
+        counts = self._np.bincount(self._masked(columns["status"], mask), minlength=len(STATUSES))
+        return {status: int(counts[code]) for code, status in enumerate(STATUSES) if counts[code]}
+
+    def refund_by_category(self, **filters) -> Dict[str, float]:
+        """Total refund dollars of matching returns per product category."""
+        np = self._np
+        columns, mask = self._select(**filters)
+        categories = self._masked(columns["category"], mask)
+        minlength = len(self.categories)
+        # Sum whole cents: the float64 weights are exact up to 2**53 cents
+        totals = np.bincount(
+            categories, weights=self._masked(columns["refund_cents"], mask), minlength=minlength
+        )
+        counts = np.bincount(categories, minlength=minlength)
+        return {
+            self.categories[code]: int(totals[code]) / 100 for code in np.flatnonzero(counts)
+        }
+
+    def average_fraud_score_by_day(self, **filters) -> Dict[date, float]:
+        """Mean fraud risk score of matching returns per creation day."""
+        np = self._np
+        columns, mask = self._select(**filters)
+        micros = self._masked(columns["created"], mask).view(np.int64)
+        if not len(micros):
+            return {}
+        days = micros // _MICROS_PER_DAY
+        # Offsetting by the first day keeps the bincount range to the data's span
+        first = int(days.min())
+        offsets = days - first
+        counts = np.bincount(offsets)
+        means = np.bincount(offsets, weights=self._masked(columns["fraud"], mask))
+        present = np.flatnonzero(counts)
+        means = means[present] / counts[present]
+        first += _EPOCH_ORDINAL
+        return {
+            date.fromordinal(first + offset): mean
+            for offset, mean in zip(present.tolist(), means.tolist())
+        }
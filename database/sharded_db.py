@@ -0,0 +1,568 @@
+"""
+Thread-safe sharded in-memory database.
+
+Drop-in replacement for MockDatabase when several voice sessions run on
+threads. Every record and index entry lives in one of N shards chosen by
+hashing its key, and each shard has its own lock:
+
+- Reads never lock. They are single dict lookups, and per-user index
+  entries are immutable tuples that writers replace wholesale, so a
+  reader sees either the old or the new state, never a half-applied one.
+- Writes lock only the shards their keys hash to. Operations touching
+  several shards (a return updates its own shard, its user's shard and
+  its tracking number's shard) take those locks in shard order, so
+  concurrent writers cannot deadlock.
+"""
+
+from bisect import bisect_right
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import threading
+
+from models.order import Order, OrderItem
+from models.user import User
+from models.return_request import ReturnRequest, ReturnStatus
+from models.tracking import TrackingInfo, ShipmentStatus
+from .mock_db import sample_orders, sample_users
+from .phone import normalize_phone
+from .tracking_history import TrackingEventLog, TrackingScan
+
+
+DEFAULT_SHARDS = 16
+
+
+class _Shard:
+    """One partition of every table and index, guarded by one lock."""
+
+    __slots__ = (
+        "lock",
+        "users",
+        "orders",
+        "returns",
+        "tracking",
+        "users_by_phone",
+        "orders_by_user",
+        "returns_by_user",
+        "returns_by_tracking",
+        "tracking_history",
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users: Dict[str, User] = {}
+        self.orders: Dict[str, Order] = {}
+        self.returns: Dict[str, ReturnRequest] = {}
+        self.tracking: Dict[str, TrackingInfo] = {}
+        self.users_by_phone: Dict[str, User] = {}
+        # Per-user indexes hold immutable tuples: orders most recent first,
+        # returns oldest first
+        self.orders_by_user: Dict[str, Tuple[Order, ...]] = {}
+        self.returns_by_user: Dict[str, Tuple[ReturnRequest, ...]] = {}
+        self.returns_by_tracking: Dict[str, ReturnRequest] = {}
+        self.tracking_history = TrackingEventLog()
+
+
+def _order_sort_key(order: Order) -> Tuple:
+    """Key that sorts orders most recent first."""
+    return (-order.order_date.timestamp(), order.order_id)
+
+
+def _tuple_insert(entries: Tuple, entry, key) -> Tuple:
+    """Return a new tuple with ``entry`` inserted in ``key`` order."""
+    position = bisect_right(entries, key(entry), key=key)
+    return entries[:position] + (entry,) + entries[position:]
+
+
+def _tuple_remove(entries: Tuple, entry) -> Tuple:
+    """Return a new tuple without ``entry`` (compared by identity)."""
+    return tuple(existing for existing in entries if existing is not entry)
+
+
+class ShardedDatabase:
+    """
+    Sharded, lock-striped database with the same methods as MockDatabase.
+
+    Safe to share between threads: per-user return counts, the phone
+    index, per-user order/return indexes and the unique tracking-number
+    index are always updated atomically with the records they describe.
+    """
+
+    def __init__(self, shards: int = DEFAULT_SHARDS, seed: bool = True):
+        """
+        Initialize the database.
+
+        Args:
+            shards: Number of shards (and locks)
+            seed: Load the demo users and orders
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self._shards = [_Shard() for _ in range(shards)]
+        # Callbacks told about every batch of stored or updated returns
+        self._return_listeners: List[Callable[[List[ReturnRequest]], None]] = []
+        if seed:
+            self.bulk_insert_users(sample_users())
+            self.bulk_insert_orders(sample_orders())
+
+    @property
+    def shard_count(self) -> int:
+        """Number of shards."""
+        return len(self._shards)
+
+    def _shard(self, key: str) -> _Shard:
+        """Shard owning a key."""
+        return self._shards[hash(key) % len(self._shards)]
+
+    @contextmanager
+    def _locked(self, *keys: Optional[str]) -> Iterator[None]:
+        """Hold the locks of every shard owning one of ``keys``, in shard order."""
+        count = len(self._shards)
+        indexes = sorted({hash(key) % count for key in keys if key is not None})
+        with ExitStack() as stack:
+            for index in indexes:
+                stack.enter_context(self._shards[index].lock)
+            yield
+
+    # ==========================================================================
+    # USER OPERATIONS
+    # ==========================================================================
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        """Retrieve a user by ID."""
+        return self._shard(user_id).users.get(user_id)
+
+    def add_user(self, user: User) -> User:
+        """Add or replace a user."""
+        phone_key = normalize_phone(user.phone)
+        while True:
+            existing = self.get_user(user.user_id)
+            old_key = normalize_phone(existing.phone) if existing else None
+            with self._locked(user.user_id, phone_key, old_key):
+                # Retry if another writer replaced the user meanwhile
+                if self.get_user(user.user_id) is not existing:
+                    continue
+                if old_key:
+                    old_index = self._shard(old_key).users_by_phone
+                    if old_index.get(old_key) is existing:
+                        del old_index[old_key]
+                self._shard(user.user_id).users[user.user_id] = user
+                if phone_key:
+                    self._shard(phone_key).users_by_phone[phone_key] = user
+                return user
+
+    def list_users(self) -> List[User]:
+        """Retrieve every user."""
+        users: List[User] = []
+        for shard in self._shards:
+            with shard.lock:
+                users.extend(shard.users.values())
+        return users
+
+    def get_user_by_phone(self, phone: str) -> Optional[User]:
+        """
+        Retrieve a user by phone number.
+
+        Accepts any common format, including caller ID ("+1-555-0001"),
+        bare digits ("5550001") and spoken transcripts ("five five five
+        oh oh oh one").
+        """
+        phone_key = normalize_phone(phone)
+        if not phone_key:
+            return None
+        return self._shard(phone_key).users_by_phone.get(phone_key)
+
+    # ==========================================================================
+    # BULK LOADING
+    # ==========================================================================
+
+    def bulk_insert_users(self, users: Iterable[User]) -> int:
+        """Insert or replace many users. Returns the number inserted."""
+        count = 0
+        for user in users:
+            self.add_user(user)
+            count += 1
+        return count
+
+    def bulk_insert_orders(self, orders: Iterable[Order]) -> int:
+        """Insert or replace many orders. Returns the number inserted."""
+        count = 0
+        for order in orders:
+            self.add_order(order)
+            count += 1
+        return count
+
+    def bulk_insert_returns(self, returns: Iterable[ReturnRequest]) -> int:
+        """
+        Insert many existing returns, e.g. from an export.
+
+        Unlike create_return this does not bump ``User.return_count``.
+
+        Raises:
+            ValueError: If a tracking number belongs to another return
+        """
+        count = 0
+        stored = [] if self._return_listeners else None
+        for return_request in returns:
+            self._store_return(return_request, count_return=False)
+            count += 1
+            if stored is not None:
+                stored.append(return_request)
+        if stored:
+            self._notify_returns(stored)
+        return count
+
+    def bulk_insert_tracking(self, tracking: Iterable[TrackingInfo]) -> int:
+        """Insert or replace many tracking records. Returns the number inserted."""
+        count = 0
+        for tracking_info in tracking:
+            self.create_tracking(tracking_info)
+            count += 1
+        return count
+
+    # ==========================================================================
+    # ORDER OPERATIONS
+    # ==========================================================================
+
+    def add_order(self, order: Order) -> Order:
+        """Add or replace an order."""
+        while True:
+            existing = self.get_order(order.order_id)
+            old_user = existing.user_id if existing else None
+            with self._locked(order.order_id, order.user_id, old_user):
+                if self.get_order(order.order_id) is not existing:
+                    continue
+                if existing:
+                    by_user = self._shard(old_user).orders_by_user
+                    by_user[old_user] = _tuple_remove(by_user[old_user], existing)
+                self._shard(order.order_id).orders[order.order_id] = order
+                by_user = self._shard(order.user_id).orders_by_user
+                by_user[order.user_id] = _tuple_insert(
+                    by_user.get(order.user_id, ()), order, _order_sort_key
+                )
+                return order
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Retrieve an order by ID."""
+        return self._shard(order_id).orders.get(order_id)
+
+    def get_user_orders(self, user_id: str, limit: int = 10) -> List[Order]:
+        """Retrieve recent orders for a user, most recent first."""
+        return list(self._shard(user_id).orders_by_user.get(user_id, ())[:limit])
+
+    def get_items_bulk(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], OrderItem]:
+        """
+        Resolve many (order_id, item_id) pairs in one call.
+
+        Returns:
+            The item for each pair found; missing orders and items are left out
+        """
+        found: Dict[Tuple[str, str], OrderItem] = {}
+        for order_id, item_id in pairs:
+            order = self.get_order(order_id)
+            item = order.get_item_by_id(item_id) if order else None
+            if item is not None:
+                found[order_id, item_id] = item
+        return found
+
+    # ==========================================================================
+    # RETURN OPERATIONS
+    # ==========================================================================
+
+    def create_return(self, return_request: ReturnRequest) -> ReturnRequest:
+        """
+        Create a new return request.
+
+        Raises:
+            ValueError: If the tracking number belongs to another return
+        """
+        self._store_return(return_request, count_return=True)
+        self._notify_returns([return_request])
+        return return_request
+
+    def _store_return(self, return_request: ReturnRequest, count_return: bool) -> None:
+        """Store a return, update its indexes and optionally the user's return count."""
+        return_id = return_request.return_id
+        tracking_number = return_request.tracking_number
+        while True:
+            existing = self.get_return(return_id)
+            old_user = existing.user_id if existing else None
+            old_tracking = existing.tracking_number if existing else None
+            with self._locked(
+                return_id, return_request.user_id, tracking_number, old_user, old_tracking
+            ):
+                if self.get_return(return_id) is not existing:
+                    continue
+                if tracking_number:
+                    self._check_tracking_available(tracking_number, return_id)
+
+                if existing:
+                    by_user = self._shard(old_user).returns_by_user
+                    by_user[old_user] = _tuple_remove(by_user[old_user], existing)
+                    if old_tracking:
+                        self._shard(old_tracking).returns_by_tracking.pop(old_tracking, None)
+
+                self._shard(return_id).returns[return_id] = return_request
+                user_shard = self._shard(return_request.user_id)
+                user_shard.returns_by_user[return_request.user_id] = _tuple_insert(
+                    user_shard.returns_by_user.get(return_request.user_id, ()),
+                    return_request,
+                    lambda ret: ret.created_at,
+                )
+                if tracking_number:
+                    self._shard(tracking_number).returns_by_tracking[tracking_number] = (
+                        return_request
+                    )
+                if count_return:
+                    user = user_shard.users.get(return_request.user_id)
+                    if user:
+                        user.return_count += 1
+                return
+
+    def get_return(self, return_id: str) -> Optional[ReturnRequest]:
+        """Retrieve a return request by ID."""
+        return self._shard(return_id).returns.get(return_id)
+
+    def update_return_status(
+        self, return_id: str, status: ReturnStatus
+    ) -> Optional[ReturnRequest]:
+        """Update the status of a return request."""
+        return_request = self._set_return_status(return_id, status)
+        if return_request:
+            self._notify_returns([return_request])
+        return return_request
+
+    def _set_return_status(
+        self, return_id: str, status: ReturnStatus
+    ) -> Optional[ReturnRequest]:
+        """Update the status of a return without notifying listeners."""
+        with self._locked(return_id):
+            return_request = self.get_return(return_id)
+            if return_request:
+                return_request.status = status
+        return return_request
+
+    def update_return_statuses(self, updates: Iterable[Tuple[str, ReturnStatus]]) -> int:
+        """
+        Update the status of many returns in one call.
+
+        Args:
+            updates: (return_id, status) pairs
+
+        Returns:
+            Number of returns updated
+        """
+        updated = []
+        for return_id, status in updates:
+            return_request = self._set_return_status(return_id, status)
+            if return_request:
+                updated.append(return_request)
+        if updated:
+            self._notify_returns(updated)
+        return len(updated)
+
+    def get_user_returns(self, user_id: str) -> List[ReturnRequest]:
+        """Retrieve all returns for a user, oldest first."""
+        return list(self._shard(user_id).returns_by_user.get(user_id, ()))
+
+    def list_returns(self) -> List[ReturnRequest]:
+        """Retrieve every return."""
+        returns: List[ReturnRequest] = []
+        for shard in self._shards:
+            # Copy under the lock; a writer may be resizing the dict
+            with shard.lock:
+                returns.extend(shard.returns.values())
+        return returns
+
+    def add_return_listener(self, listener: Callable[[List[ReturnRequest]], None]) -> None:
+        """
+        Register a callback for return writes.
+
+        The listener is called with the affected returns after they are
+        created, bulk inserted or change status. It runs on the writing
+        thread, outside the shard locks.
+        """
+        self._return_listeners.append(listener)
+
+    def _notify_returns(self, returns: List[ReturnRequest]) -> None:
+        """Pass stored or updated returns to every registered listener."""
+        for listener in self._return_listeners:
+            listener(returns)
+
+    def get_latest_user_return(self, user_id: str) -> Optional[ReturnRequest]:
+        """Retrieve the most recently created return for a user."""
+        user_returns = self._shard(user_id).returns_by_user.get(user_id)
+        return user_returns[-1] if user_returns else None
+
+    def get_user_return_history(
+        self, user_id: str, offset: int = 0, limit: int = 10
+    ) -> List[ReturnRequest]:
+        """Retrieve a page of a user's returns, most recent first."""
+        user_returns = self._shard(user_id).returns_by_user.get(user_id, ())
+        end = len(user_returns) - offset
+        if end <= 0:
+            return []
+        return list(user_returns[max(end - limit, 0):end][::-1])
+
+    # ==========================================================================
+    # TRACKING OPERATIONS
+    # ==========================================================================
+
+    def create_tracking(self, tracking_info: TrackingInfo) -> TrackingInfo:
+        """Create tracking information."""
+        tracking_number = tracking_info.tracking_number
+        shard = self._shard(tracking_number)
+        with shard.lock:
+            shard.tracking[tracking_number] = tracking_info
+            shard.tracking_history.append(
+                tracking_number,
+                tracking_info.status,
+                tracking_info.last_update,
+                tracking_info.current_location,
+            )
+        return tracking_info
+
+    def get_tracking(self, tracking_number: str) -> Optional[TrackingInfo]:
+        """Retrieve tracking information."""
+        return self._shard(tracking_number).tracking.get(tracking_number)
+
+    def update_tracking_status(
+        self, tracking_number: str, status: ShipmentStatus, location: Optional[str] = None
+    ) -> Optional[TrackingInfo]:
+        """Update tracking status."""
+        shard = self._shard(tracking_number)
+        with shard.lock:
+            tracking_info = shard.tracking.get(tracking_number)
+            if tracking_info:
+                tracking_info.status = status
+                tracking_info.last_update = datetime.now()
+                if location:
+                    tracking_info.current_location = location
+                shard.tracking_history.append(
+                    tracking_number, status, tracking_info.last_update, location
+                )
+        return tracking_info
+
+    def get_tracking_history(
+        self, tracking_number: str, limit: Optional[int] = None
+    ) -> List[TrackingScan]:
+        """Retrieve the scan history for a tracking number, oldest first."""
+        shard = self._shard(tracking_number)
+        # The event log's arrays are not safe to read mid-append
+        with shard.lock:
+            return shard.tracking_history.history(tracking_number, limit)
+
+    def record_tracking_scans(
+        self, scans: Iterable[Tuple[str, ShipmentStatus, datetime, Optional[str]]]
+    ) -> int:
+        """
+        Append carrier scans to the tracking history.
+
+        Args:
+            scans: (tracking_number, status, timestamp, location) tuples,
+                in time order per tracking number
+
+        Returns:
+            Number of scans recorded
+        """
+        recorded = 0
+        for shard, shard_scans in self._group_by_shard(scans, lambda scan: scan[0]):
+            with shard.lock:
+                append = shard.tracking_history.append
+                recorded += sum(1 for scan in shard_scans if append(*scan))
+        return recorded
+
+    def apply_tracking_updates(self, updates: Iterable[TrackingInfo]) -> List[TrackingInfo]:
+        """
+        Apply the latest known state of many shipments in one call.
+
+        Unknown tracking numbers are created. Updates older than the
+        stored ``last_update`` are ignored so replays and late webhook
+        deliveries never move a shipment backwards.
+
+        Args:
+            updates: Latest TrackingInfo per tracking number
+
+        Returns:
+            The stored TrackingInfo records that changed
+        """
+        applied = []
+        for shard, shard_updates in self._group_by_shard(
+            updates, lambda update: update.tracking_number
+        ):
+            with shard.lock:
+                for update in shard_updates:
+                    current = shard.tracking.get(update.tracking_number)
+                    if current is None:
+                        shard.tracking[update.tracking_number] = update
+                        applied.append(update)
+                    elif update.last_update >= current.last_update:
+                        current.status = update.status
+                        current.last_update = update.last_update
+                        if update.current_location:
+                            current.current_location = update.current_location
+                        if update.estimated_delivery:
+                            current.estimated_delivery = update.estimated_delivery
+                        applied.append(current)
+                    else:
+                        continue
+                    shard.tracking_history.append(
+                        update.tracking_number,
+                        update.status,
+                        update.last_update,
+                        update.current_location,
+                    )
+        return applied
+
+    def _group_by_shard(self, records: Iterable, key) -> List[Tuple[_Shard, List]]:
+        """Group records by owning shard, keeping their relative order."""
+        groups: Dict[int, List] = {}
+        count = len(self._shards)
+        for record in records:
+            groups.setdefault(hash(key(record)) % count, []).append(record)
+        return [(self._shards[index], groups[index]) for index in sorted(groups)]
+
+    def get_return_by_tracking(self, tracking_number: str) -> Optional[ReturnRequest]:
+        """Find a return by tracking number."""
+        return self._shard(tracking_number).returns_by_tracking.get(tracking_number)
+
+    def set_return_tracking_number(
+        self, return_id: str, tracking_number: Optional[str]
+    ) -> Optional[ReturnRequest]:
+        """
+        Assign, change or clear the tracking number of a return.
+
+        Raises:
+            ValueError: If the tracking number belongs to another return
+        """
+        while True:
+            return_request = self.get_return(return_id)
+            if not return_request:
+                return None
+            old_tracking = return_request.tracking_number
+            with self._locked(return_id, tracking_number, old_tracking):
+                if (
+                    self.get_return(return_id) is not return_request
+                    or return_request.tracking_number != old_tracking
+                ):
+                    continue
+                if tracking_number:
+                    self._check_tracking_available(tracking_number, return_id)
+                if old_tracking:
+                    self._shard(old_tracking).returns_by_tracking.pop(old_tracking, None)
+                return_request.tracking_number = tracking_number
+                if tracking_number:
+                    self._shard(tracking_number).returns_by_tracking[tracking_number] = (
+                        return_request
+                    )
+                return return_request
+
+    def _check_tracking_available(self, tracking_number: str, return_id: str) -> None:
+        """Raise if a tracking number is already assigned to a different return."""
+        holder = self._shard(tracking_number).returns_by_tracking.get(tracking_number)
+        if holder and holder.return_id != return_id:
+            raise ValueError(
+                f"Tracking number {tracking_number} is already assigned to {holder.return_id}"
+            )
@@ -0,0 +1,953 @@
+"""SQLite storage engine with the same interface as MockDatabase."""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import sqlite3
+import threading
+import uuid
+
+from models.compact import optional_epoch_us
+from models.order import Order, OrderItem
+from models.user import User
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from models.tracking import TrackingInfo, ShipmentStatus
+from .mock_db import sample_orders, sample_users
+from .phone import normalize_phone
+from .tracking_history import TrackingScan
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# SQLite's default limit on host parameters per statement is 999
+_MAX_IN_PARAMS = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    phone_key TEXT,
+    address TEXT,
+    return_count INTEGER NOT NULL DEFAULT 0,
+    account_age_days INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_users_phone_key ON users (phone_key);
+
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    order_date INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_user_date ON orders (user_id, order_date DESC);
+
+CREATE TABLE IF NOT EXISTS order_items (
+    order_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    item_id TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    price_cents INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (order_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS returns (
+    return_id TEXT PRIMARY KEY,
+    order_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    refund_cents INTEGER NOT NULL,
+    notes TEXT NOT NULL,
+    label_url TEXT,
+    qr_code_url TEXT,
+    tracking_number TEXT UNIQUE,
+    fraud_risk_score REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_returns_user_created ON returns (user_id, created_at);
+
+CREATE TABLE IF NOT EXISTS tracking (
+    tracking_number TEXT PRIMARY KEY,
+    carrier TEXT NOT NULL,
+    status TEXT NOT NULL,
+    last_update INTEGER NOT NULL,
+    estimated_delivery INTEGER,
+    current_location TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tracking_events (
+    tracking_number TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    location TEXT,
+    PRIMARY KEY (tracking_number, ts, seq)
+) WITHOUT ROWID;
+"""
+
+# Schema versions, recorded in PRAGMA user_version:
+#   0  money in REAL dollar columns (total_amount, price, refund_amount)
+#   1  money in INTEGER cent columns (total_cents, price_cents, refund_cents)
+#   2  tracking_events keyed on (tracking_number, ts, seq), so scans sharing
+#      a timestamp are all kept
+SCHEMA_VERSION = 2
+
+# Rebuild the money tables of a version 0 database with cent columns. SQLite
+# cannot change a column's type in place, so each table is renamed aside,
+# recreated from SCHEMA and copied back; the old indexes are dropped first
+# so SCHEMA recreates them on the new tables.
+_MIGRATE_TO_CENTS = f"""
+BEGIN;
+DROP INDEX IF EXISTS idx_orders_user_date;
+DROP INDEX IF EXISTS idx_returns_user_created;
+ALTER TABLE orders RENAME TO orders_v0;
+ALTER TABLE order_items RENAME TO order_items_v0;
+ALTER TABLE returns RENAME TO returns_v0;
+{SCHEMA}
+INSERT INTO orders (order_id, user_id, order_date, total_cents, status)
+SELECT order_id, user_id, order_date, CAST(ROUND(total_amount * 100) AS INTEGER), status
+FROM orders_v0;
+INSERT INTO order_items (order_id, position, item_id, product_name, price_cents, quantity, category)
+SELECT order_id, position, item_id, product_name, CAST(ROUND(price * 100) AS INTEGER), quantity,
+    category
+FROM order_items_v0;
+INSERT INTO returns (return_id, order_id, user_id, item_id, reason, status, created_at,
+    refund_cents, notes, label_url, qr_code_url, tracking_number, fraud_risk_score)
+SELECT return_id, order_id, user_id, item_id, reason, status, created_at,
+    CAST(ROUND(refund_amount * 100) AS INTEGER), notes, label_url, qr_code_url,
+    tracking_number, fraud_risk_score
+FROM returns_v0;
+DROP TABLE orders_v0;
+DROP TABLE order_items_v0;
+DROP TABLE returns_v0;
+PRAGMA user_version = 1;
+COMMIT;
+"""
+
+# Rebuild the scan history of a version 1 database with the seq column; a
+# shipment had at most one scan per timestamp, so each is seq 0.
+_MIGRATE_SCAN_SEQUENCE = f"""
+BEGIN;
+ALTER TABLE tracking_events RENAME TO tracking_events_v1;
+{SCHEMA}
+INSERT INTO tracking_events (tracking_number, ts, seq, status, location)
+SELECT tracking_number, ts, 0, status, location FROM tracking_events_v1;
+DROP TABLE tracking_events_v1;
+PRAGMA user_version = 2;
+COMMIT;
+"""
+
+_USER_COLUMNS = "user_id, name, email, phone, address, return_count, account_age_days"
+_ORDER_COLUMNS = "order_id, user_id, order_date, total_cents, status"
+_ITEM_COLUMNS = "order_id, item_id, product_name, price_cents, quantity, category"
+_RETURN_COLUMNS = (
+    "return_id, order_id, user_id, item_id, reason, status, created_at, refund_cents, "
+    "notes, label_url, qr_code_url, tracking_number, fraud_risk_score"
+)
+_TRACKING_COLUMNS = (
+    "tracking_number, carrier, status, last_update, estimated_delivery, current_location"
+)
+
+_INSERT_USER = (
+    "INSERT OR REPLACE INTO users (user_id, name, email, phone, phone_key, address, "
+    "return_count, account_age_days) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_ORDER = f"INSERT OR REPLACE INTO orders ({_ORDER_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+_DELETE_ORDER_ITEMS = "DELETE FROM order_items WHERE order_id = ?"
+_INSERT_ITEM = (
+    "INSERT INTO order_items (order_id, position, item_id, product_name, price_cents, "
+    "quantity, category) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+# Upsert on return_id only, so a clashing tracking_number raises instead of
+# silently replacing the other return
+_UPSERT_RETURN = f"""
+INSERT INTO returns ({_RETURN_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (return_id) DO UPDATE SET
+    order_id = excluded.order_id,
+    user_id = excluded.user_id,
+    item_id = excluded.item_id,
+    reason = excluded.reason,
+    status = excluded.status,
+    created_at = excluded.created_at,
+    refund_cents = excluded.refund_cents,
+    notes = excluded.notes,
+    label_url = excluded.label_url,
+    qr_code_url = excluded.qr_code_url,
+    tracking_number = excluded.tracking_number,
+    fraud_risk_score = excluded.fraud_risk_score
+"""
+_INSERT_TRACKING = (
+    f"INSERT OR REPLACE INTO tracking ({_TRACKING_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_UPSERT_NEWER_TRACKING = f"""
+INSERT INTO tracking ({_TRACKING_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (tracking_number) DO UPDATE SET
+    status = excluded.status,
+    last_update = excluded.last_update,
+    estimated_delivery = COALESCE(excluded.estimated_delivery, tracking.estimated_delivery),
+    current_location = COALESCE(excluded.current_location, tracking.current_location)
+WHERE excluded.last_update >= tracking.last_update
+"""
+# Scans must not be older than the shipment's latest recorded scan. One at
+# the same time is kept unless that status and location are already
+# recorded at that time (a replay), and is sequenced after the others.
+_APPEND_SCAN = """
+INSERT INTO tracking_events (tracking_number, ts, seq, status, location)
+SELECT :tracking_number, :ts, COALESCE(
+    (SELECT MAX(seq) + 1 FROM tracking_events
+     WHERE tracking_number = :tracking_number AND ts = :ts), 0
+), :status, :location
+WHERE :ts >= COALESCE(
+    (SELECT MAX(ts) FROM tracking_events WHERE tracking_number = :tracking_number),
+    -9223372036854775808
+)
+AND NOT EXISTS (
+    SELECT 1 FROM tracking_events
+    WHERE tracking_number = :tracking_number AND ts = :ts AND status = :status
+        AND location IS :location
+)
+"""
+
+
+def _to_us(value: Optional[datetime]) -> Optional[int]:
+    """Encode a datetime as integer microseconds since the epoch (aware ones as local time)."""
+    return optional_epoch_us(value)
+
+
+def _from_us(value: Optional[int]) -> Optional[datetime]:
+    """Decode integer microseconds since the epoch."""
+    if value is None:
+        return None
+    return _EPOCH + value * _MICROSECOND
+
+
+def _scan_params(
+    tracking_number: str, ts: int, status: str, location: Optional[str]
+) -> Dict[str, Any]:
+    """Parameters for _APPEND_SCAN (an empty location is stored as NULL)."""
+    return {
+        "tracking_number": tracking_number,
+        "ts": ts,
+        "status": status,
+        "location": location or None,
+    }
+
+
+def _chunks(values: List, size: int = _MAX_IN_PARAMS) -> Iterator[List]:
+    """Split a list into IN-clause sized chunks."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class SqliteDatabase:
+    """
+    SQLite-backed database with the same methods as MockDatabase.
+
+    State survives restarts and can be shared between worker processes
+    (file databases run in WAL mode). Each thread gets its own pooled
+    connection; statements are cached per connection by the sqlite3
+    module, and ``batch()`` groups many writes into one transaction.
+    """
+
+    def __init__(self, path: str = ":memory:", seed: bool = True):
+        """
+        Open (and create if needed) a SQLite database.
+
+        Args:
+            path: Database file path, or ":memory:" for a private
+                in-memory database shared by this instance's threads
+            seed: Load the demo sample data into an empty database
+        """
+        if path == ":memory:":
+            # memdb VFS so every pooled connection sees the same data. Unlike
+            # cache=shared it reports contention as SQLITE_BUSY, which
+            # busy_timeout waits out, rather than failing with "table is locked"
+            self._uri = f"file:/returnflow-{uuid.uuid4().hex}?vfs=memdb"
+            self.is_memory = True
+        else:
+            self._uri = f"file:{path}"
+            self.is_memory = False
+        self.path = path
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        # Callbacks told about every batch of stored or updated returns
+        self._return_listeners: List[Callable[[List[ReturnRequest]], None]] = []
+
+        conn = self._conn()
+        self._migrate(conn)
+
+        if seed and conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0:
+            with self.batch():
+                for user in sample_users():
+                    self.add_user(user)
+                for order in sample_orders():
+                    self.add_order(order)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Create the schema, or bring an older database up to SCHEMA_VERSION."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database schema version {version} is newer than this code ({SCHEMA_VERSION})"
+            )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(orders)")}
+        if version == 0 and "total_amount" in columns:
+            conn.executescript(_MIGRATE_TO_CENTS)
+        scan_columns = {row[1] for row in conn.execute("PRAGMA table_info(tracking_events)")}
+        if scan_columns and "seq" not in scan_columns:
+            conn.executescript(_MIGRATE_SCAN_SEQUENCE)
+        else:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+
+    @classmethod
+    def from_url(cls, url: str, seed: bool = True) -> "SqliteDatabase":
+        """
+        Open a database from a URL.
+
+        ``sqlite:///relative.db``, ``sqlite:////abs/path.db`` and
+        ``sqlite://`` (in-memory) are supported.
+        """
+        if not url.startswith("sqlite:"):
+            raise ValueError(f"Not a SQLite URL: {url}")
+        path = url[len("sqlite:"):]
+        if path.startswith("///"):
+            path = path[3:]
+        elif path.startswith("//"):
+            path = path[2:]
+        return cls(path or ":memory:", seed=seed)
+
+    # ==========================================================================
+    # CONNECTIONS & TRANSACTIONS
+    # ==========================================================================
+
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's pooled connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._uri, uri=True, check_same_thread=False, cached_statements=256
+            )
+            if not self.is_memory:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            self._local.batch_depth = 0
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def batch(self):
+        """
+        Group writes on this thread into a single transaction.
+
+        Example:
+            >>> with db.batch():
+            ...     for ret in returns:
+            ...         db.create_return(ret)
+        """
+        conn = self._conn()
+        self._local.batch_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._local.batch_depth -= 1
+            if self._local.batch_depth == 0:
+                conn.rollback()
+            raise
+        self._local.batch_depth -= 1
+        if self._local.batch_depth == 0:
+            conn.commit()
+
+    def _commit(self, conn: sqlite3.Connection) -> None:
+        """Commit unless inside a batch()."""
+        if self._local.batch_depth == 0:
+            conn.commit()
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    # ==========================================================================
+    # ROW MAPPING
+    # ==========================================================================
+
+    @staticmethod
+    def _user_row(user: User) -> Tuple:
+        """Encode a User as a users row."""
+        return (
+            user.user_id,
+            user.name,
+            user.email,
+            user.phone,
+            normalize_phone(user.phone),
+            user.address,
+            user.return_count,
+            user.account_age_days,
+        )
+
+    @staticmethod
+    def _user_from_row(row) -> User:
+        """Decode a users row."""
+        return User(
+            user_id=row[0],
+            name=row[1],
+            email=row[2],
+            phone=row[3],
+            address=row[4],
+            return_count=row[5],
+            account_age_days=row[6],
+        )
+
+    @staticmethod
+    def _return_row(ret: ReturnRequest) -> Tuple:
+        """Encode a ReturnRequest as a returns row."""
+        return (
+            ret.return_id,
+            ret.order_id,
+            ret.user_id,
+            ret.item_id,
+            ret.reason.value,
+            ret.status.value,
+            _to_us(ret.created_at),
+            ret.refund_cents,
+            ret.notes,
+            ret.label_url,
+            ret.qr_code_url,
+            ret.tracking_number,
+            ret.fraud_risk_score,
+        )
+
+    @staticmethod
+    def _return_from_row(row) -> ReturnRequest:
+        """Decode a returns row."""
+        return ReturnRequest(
+            return_id=row[0],
+            order_id=row[1],
+            user_id=row[2],
+            item_id=row[3],
+            reason=ReturnReason(row[4]),
+            status=ReturnStatus(row[5]),
+            created_at=_from_us(row[6]),
+            refund_amount=0.0,
+            refund_cents=row[7],
+            notes=row[8],
+            label_url=row[9],
+            qr_code_url=row[10],
+            tracking_number=row[11],
+            fraud_risk_score=row[12],
+        )
+
+    @staticmethod
+    def _tracking_row(info: TrackingInfo) -> Tuple:
+        """Encode TrackingInfo as a tracking row."""
+        return (
+            info.tracking_number,
+            info.carrier,
+            info.status.value,
+            _to_us(info.last_update),
+            _to_us(info.estimated_delivery),
+            info.current_location,
+        )
+
+    @staticmethod
+    def _tracking_from_row(row) -> TrackingInfo:
+        """Decode a tracking row."""
+        return TrackingInfo(
+            tracking_number=row[0],
+            carrier=row[1],
+            status=ShipmentStatus(row[2]),
+            last_update=_from_us(row[3]),
+            estimated_delivery=_from_us(row[4]),
+            current_location=row[5],
+        )
+
+    def _load_orders(self, order_rows: List[Tuple]) -> List[Order]:
+        """Build Orders (with items) from order rows, preserving row order."""
+        if not order_rows:
+            return []
+        conn = self._conn()
+        items: Dict[str, List[OrderItem]] = {row[0]: [] for row in order_rows}
+        for chunk in _chunks(list(items)):
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT {_ITEM_COLUMNS} FROM order_items "
+                f"WHERE order_id IN ({placeholders}) ORDER BY order_id, position",
+                chunk,
+            ):
+                items[row[0]].append(
+                    OrderItem(
+                        item_id=row[1],
+                        product_name=row[2],
+                        price=0.0,
+                        price_cents=row[3],
+                        quantity=row[4],
+                        category=row[5],
+                    )
+                )
+        return [
+            Order(
+                order_id=row[0],
+                user_id=row[1],
+                items=items[row[0]],
+                order_date=_from_us(row[2]),
+                total_amount=0,
+                total_cents=row[3],
+                status=row[4],
+            )
+            for row in order_rows
+        ]
+
+    # ==========================================================================
+    # USER OPERATIONS
+    # ==========================================================================
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        """Retrieve a user by ID."""
+        row = self._conn().execute(
+            f"SELECT {_USER_COLUMNS} FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return self._user_from_row(row) if row else None
+
+    def add_user(self, user: User) -> User:
+        """Add or replace a user."""
+        conn = self._conn()
+        conn.execute(_INSERT_USER, self._user_row(user))
+        self._commit(conn)
+        return user
+
+    def list_users(self) -> List[User]:
+        """Retrieve every user."""
+        rows = self._conn().execute(f"SELECT {_USER_COLUMNS} FROM users ORDER BY user_id")
+        return [self._user_from_row(row) for row in rows]
+
+    def get_user_by_phone(self, phone: str) -> Optional[User]:
+        """Retrieve a user by phone number in any common or spoken format."""
+        phone_key = normalize_phone(phone)
+        if not phone_key:
+            return None
+        row = self._conn().execute(
+            f"SELECT {_USER_COLUMNS} FROM users WHERE phone_key = ? LIMIT 1", (phone_key,)
+        ).fetchone()
+        return self._user_from_row(row) if row else None
+
+    # ==========================================================================
+    # BULK LOADING
+    # ==========================================================================
+
+    def bulk_insert_users(self, users: Iterable[User]) -> int:
+        """Insert or replace many users in one transaction."""
+        conn = self._conn()
+        rows = [self._user_row(user) for user in users]
+        conn.executemany(_INSERT_USER, rows)
+        self._commit(conn)
+        return len(rows)
+
+    def bulk_insert_orders(self, orders: Iterable[Order]) -> int:
+        """Insert or replace many orders and their items in one transaction."""
+        conn = self._conn()
+        order_rows = []
+        item_rows = []
+        for order in orders:
+            order_rows.append(
+                (order.order_id, order.user_id, _to_us(order.order_date),
+                 order.total_cents, order.status)
+            )
+            item_rows.extend(
+                (order.order_id, position, item.item_id, item.product_name, item.price_cents,
+                 item.quantity, item.category)
+                for position, item in enumerate(order.items)
+            )
+        conn.executemany(_INSERT_ORDER, order_rows)
+        conn.executemany(_DELETE_ORDER_ITEMS, ((row[0],) for row in order_rows))
+        conn.executemany(_INSERT_ITEM, item_rows)
+        self._commit(conn)
+        return len(order_rows)
+
+    def bulk_insert_returns(self, returns: Iterable[ReturnRequest]) -> int:
+        """
+        Insert many existing returns in one transaction.
+
+        Unlike create_return this does not bump ``User.return_count``.
+
+        Raises:
+            ValueError: If a tracking number belongs to another return
+        """
+        conn = self._conn()
+        returns = list(returns)
+        rows = [self._return_row(ret) for ret in returns]
+        try:
+            conn.executemany(_UPSERT_RETURN, rows)
+        except sqlite3.IntegrityError as e:
+            if self._local.batch_depth == 0:
+                conn.rollback()
+            raise ValueError(f"Duplicate tracking number in bulk insert: {e}") from e
+        self._commit(conn)
+        if returns and self._return_listeners:
+            self._notify_returns(returns)
+        return len(rows)
+
+    def bulk_insert_tracking(self, tracking: Iterable[TrackingInfo]) -> int:
+        """Insert or replace many tracking records in one transaction."""
+        conn = self._conn()
+        rows = [self._tracking_row(info) for info in tracking]
+        conn.executemany(_INSERT_TRACKING, rows)
+        conn.executemany(
+            _APPEND_SCAN, (_scan_params(row[0], row[3], row[2], row[5]) for row in rows)
+        )
+        self._commit(conn)
+        return len(rows)
+
+    # ==========================================================================
+    # ORDER OPERATIONS
+    # ==========================================================================
+
+    def add_order(self, order: Order) -> Order:
+        """Add or replace an order and its items."""
+        conn = self._conn()
+        conn.execute(
+            _INSERT_ORDER,
+            (order.order_id, order.user_id, _to_us(order.order_date), order.total_cents, order.status),
+        )
+        conn.execute(_DELETE_ORDER_ITEMS, (order.order_id,))
+        conn.executemany(
+            _INSERT_ITEM,
+            [
+                (order.order_id, position, item.item_id, item.product_name, item.price_cents,
+                 item.quantity, item.category)
+                for position, item in enumerate(order.items)
+            ],
+        )
+        self._commit(conn)
+        return order
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Retrieve an order by ID."""
+        row = self._conn().execute(
+            f"SELECT {_ORDER_COLUMNS} FROM orders WHERE order_id = ?", (order_id,)
+        ).fetchone()
+        orders = self._load_orders([row] if row else [])
+        return orders[0] if orders else None
+
+    def get_user_orders(self, user_id: str, limit: int = 10) -> List[Order]:
+        """Retrieve recent orders for a user, most recent first."""
+        rows = self._conn().execute(
+            f"SELECT {_ORDER_COLUMNS} FROM orders WHERE user_id = ? "
+            "ORDER BY order_date DESC LIMIT ?",
+            (user_id, limit),
+        ).fetchall()
+        return self._load_orders(rows)
+
+    def get_items_bulk(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], OrderItem]:
+        """
+        Resolve many (order_id, item_id) pairs in one call.
+
+        Reads the items of every order named, one query per chunk of
+        orders, without loading the orders themselves.
+
+        Returns:
+            The item for each pair found; missing orders and items are left out
+        """
+        wanted = set(pairs)
+        found: Dict[Tuple[str, str], OrderItem] = {}
+        conn = self._conn()
+        for chunk in _chunks(sorted({order_id for order_id, _ in wanted})):
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT {_ITEM_COLUMNS} FROM order_items "
+                f"WHERE order_id IN ({placeholders}) ORDER BY order_id, position",
+                chunk,
+            ):
+                key = (row[0], row[1])
+                # The first line with an ID wins, as in Order.get_item_by_id
+                if key in wanted and key not in found:
+                    found[key] = OrderItem(
+                        item_id=row[1],
+                        product_name=row[2],
+                        price=0.0,
+                        price_cents=row[3],
+                        quantity=row[4],
+                        category=row[5],
+                    )
+        return found
+
+    # ==========================================================================
+    # RETURN OPERATIONS
+    # ==========================================================================
+
+    def create_return(self, return_request: ReturnRequest) -> ReturnRequest:
+        """
+        Create a new return request.
+
+        Raises:
+            ValueError: If the tracking number belongs to another return
+        """
+        conn = self._conn()
+        try:
+            conn.execute(_UPSERT_RETURN, self._return_row(return_request))
+        except sqlite3.IntegrityError as e:
+            if self._local.batch_depth == 0:
+                conn.rollback()
+            raise ValueError(
+                f"Tracking number {return_request.tracking_number} is already assigned"
+            ) from e
+        conn.execute(
+            "UPDATE users SET return_count = return_count + 1 WHERE user_id = ?",
+            (return_request.user_id,),
+        )
+        self._commit(conn)
+        if self._return_listeners:
+            self._notify_returns([return_request])
+        return return_request
+
+    def get_return(self, return_id: str) -> Optional[ReturnRequest]:
+        """Retrieve a return request by ID."""
+        row = self._conn().execute(
+            f"SELECT {_RETURN_COLUMNS} FROM returns WHERE return_id = ?", (return_id,)
+        ).fetchone()
+        return self._return_from_row(row) if row else None
+
+    def update_return_status(
+        self, return_id: str, status: ReturnStatus
+    ) -> Optional[ReturnRequest]:
+        """Update the status of a return request."""
+        conn = self._conn()
+        conn.execute("UPDATE returns SET status = ? WHERE return_id = ?", (status.value, return_id))
+        self._commit(conn)
+        return_request = self.get_return(return_id)
+        if return_request and self._return_listeners:
+            self._notify_returns([return_request])
+        return return_request
+
+    def update_return_statuses(self, updates: Iterable[Tuple[str, ReturnStatus]]) -> int:
+        """Update the status of many returns in one transaction."""
+        conn = self._conn()
+        updates = list(updates)
+        before = conn.total_changes
+        conn.executemany(
+            "UPDATE returns SET status = ? WHERE return_id = ?",
+            ((status.value, return_id) for return_id, status in updates),
+        )
+        self._commit(conn)
+        changed = conn.total_changes - before
+        if changed and self._return_listeners:
+            self._notify_returns(self._load_returns({return_id for return_id, _ in updates}))
+        return changed
+
+    def list_returns(self) -> List[ReturnRequest]:
+        """Retrieve every return."""
+        rows = self._conn().execute(f"SELECT {_RETURN_COLUMNS} FROM returns")
+        return [self._return_from_row(row) for row in rows]
+
+    def add_return_listener(self, listener: Callable[[List[ReturnRequest]], None]) -> None:
+        """
+        Register a callback for return writes.
+
+        The listener is called with the affected returns after they are
+        created, bulk inserted or change status (inside a ``batch()``,
+        before the batch commits). Only writes made through this instance
+        are seen.
+        """
+        self._return_listeners.append(listener)
+
+    def _notify_returns(self, returns: List[ReturnRequest]) -> None:
+        """Pass stored or updated returns to every registered listener."""
+        for listener in self._return_listeners:
+            listener(returns)
+
+    def _load_returns(self, return_ids: Iterable[str]) -> List[ReturnRequest]:
+        """Read many returns by ID, one query per chunk of IDs."""
+        conn = self._conn()
+        returns = []
+        for chunk in _chunks(sorted(return_ids)):
+            placeholders = ",".join("?" * len(chunk))
+            returns.extend(
+                self._return_from_row(row)
+                for row in conn.execute(
+                    f"SELECT {_RETURN_COLUMNS} FROM returns WHERE return_id IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return returns
+
+    def get_user_returns(self, user_id: str) -> List[ReturnRequest]:
+        """Retrieve all returns for a user, oldest first."""
+        rows = self._conn().execute(
+            f"SELECT {_RETURN_COLUMNS} FROM returns WHERE user_id = ? ORDER BY created_at",
+            (user_id,),
+        )
+        return [self._return_from_row(row) for row in rows]
+
+    def get_latest_user_return(self, user_id: str) -> Optional[ReturnRequest]:
+        """Retrieve the most recently created return for a user."""
+        row = self._conn().execute(
+            f"SELECT {_RETURN_COLUMNS} FROM returns WHERE user_id = ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (user_id,),
+        ).fetchone()
+        return self._return_from_row(row) if row else None
+
+    def get_user_return_history(
+        self, user_id: str, offset: int = 0, limit: int = 10
+    ) -> List[ReturnRequest]:
+        """Retrieve a page of a user's returns, most recent first."""
+        rows = self._conn().execute(
+            f"SELECT {_RETURN_COLUMNS} FROM returns WHERE user_id = ? "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (user_id, limit, offset),
+        )
+        return [self._return_from_row(row) for row in rows]
+
+    def get_return_by_tracking(self, tracking_number: str) -> Optional[ReturnRequest]:
+        """Find a return by tracking number."""
+        row = self._conn().execute(
+            f"SELECT {_RETURN_COLUMNS} FROM returns WHERE tracking_number = ?",
+            (tracking_number,),
+        ).fetchone()
+        return self._return_from_row(row) if row else None
+
+    def set_return_tracking_number(
+        self, return_id: str, tracking_number: Optional[str]
+    ) -> Optional[ReturnRequest]:
+        """
+        Assign, change or clear the tracking number of a return.
+
+        Raises:
+            ValueError: If the tracking number belongs to another return
+        """
+        conn = self._conn()
+        try:
+            conn.execute(
+                "UPDATE returns SET tracking_number = ? WHERE return_id = ?",
+                (tracking_number, return_id),
+            )
+        except sqlite3.IntegrityError as e:
+            if self._local.batch_depth == 0:
+                conn.rollback()
+            raise ValueError(f"Tracking number {tracking_number} is already assigned") from e
+        self._commit(conn)
+        return self.get_return(return_id)
+
+    # ==========================================================================
+    # TRACKING OPERATIONS
+    # ==========================================================================
+
+    def create_tracking(self, tracking_info: TrackingInfo) -> TrackingInfo:
+        """Create tracking information."""
+        conn = self._conn()
+        conn.execute(_INSERT_TRACKING, self._tracking_row(tracking_info))
+        conn.execute(
+            _APPEND_SCAN,
+            _scan_params(
+                tracking_info.tracking_number,
+                _to_us(tracking_info.last_update),
+                tracking_info.status.value,
+                tracking_info.current_location,
+            ),
+        )
+        self._commit(conn)
+        return tracking_info
+
+    def get_tracking(self, tracking_number: str) -> Optional[TrackingInfo]:
+        """Retrieve tracking information."""
+        row = self._conn().execute(
+            f"SELECT {_TRACKING_COLUMNS} FROM tracking WHERE tracking_number = ?",
+            (tracking_number,),
+        ).fetchone()
+        return self._tracking_from_row(row) if row else None
+
+    def update_tracking_status(
+        self, tracking_number: str, status: ShipmentStatus, location: Optional[str] = None
+    ) -> Optional[TrackingInfo]:
+        """Update tracking status."""
+        conn = self._conn()
+        now = _to_us(datetime.now())
+        cursor = conn.execute(
+            "UPDATE tracking SET status = ?, last_update = ?, "
+            "current_location = COALESCE(?, current_location) WHERE tracking_number = ?",
+            (status.value, now, location, tracking_number),
+        )
+        if cursor.rowcount:
+            conn.execute(_APPEND_SCAN, _scan_params(tracking_number, now, status.value, location))
+        self._commit(conn)
+        return self.get_tracking(tracking_number)
+
+    def get_tracking_history(
+        self, tracking_number: str, limit: Optional[int] = None
+    ) -> List[TrackingScan]:
+        """Retrieve the scan history for a tracking number, oldest first."""
+        rows = self._conn().execute(
+            "SELECT status, ts, location FROM tracking_events WHERE tracking_number = ? "
+            "ORDER BY ts DESC, seq DESC LIMIT ?",
+            (tracking_number, -1 if limit is None else limit),
+        ).fetchall()
+        rows.reverse()
+        return [
+            TrackingScan(ShipmentStatus(row[0]), _from_us(row[1]), row[2]) for row in rows
+        ]
+
+    def record_tracking_scans(
+        self, scans: Iterable[Tuple[str, ShipmentStatus, datetime, Optional[str]]]
+    ) -> int:
+        """Append carrier scans (in time order per tracking number) to the history."""
+        conn = self._conn()
+        before = conn.total_changes
+        conn.executemany(
+            _APPEND_SCAN,
+            (
+                _scan_params(tracking_number, _to_us(timestamp), status.value, location)
+                for tracking_number, status, timestamp, location in scans
+            ),
+        )
+        self._commit(conn)
+        return conn.total_changes - before
+
+    def apply_tracking_updates(self, updates: Iterable[TrackingInfo]) -> List[TrackingInfo]:
+        """
+        Apply the latest known state of many shipments in one transaction.
+
+        Updates older than the stored ``last_update`` are ignored.
+
+        Returns:
+            The stored TrackingInfo records that changed
+        """
+        conn = self._conn()
+        applied = []
+        for update in updates:
+            row = self._tracking_row(update)
+            if conn.execute(_UPSERT_NEWER_TRACKING, row).rowcount:
+                conn.execute(_APPEND_SCAN, _scan_params(row[0], row[3], row[2], row[5]))
+                applied.append(update.tracking_number)
+        self._commit(conn)
+
+        stored = []
+        for chunk in _chunks(applied):
+            placeholders = ",".join("?" * len(chunk))
+            stored.extend(
+                self._tracking_from_row(row)
+                for row in conn.execute(
+                    f"SELECT {_TRACKING_COLUMNS} FROM tracking "
+                    f"WHERE tracking_number IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return stored
@@ -0,0 +1,427 @@
+"""
+Seeded synthetic dataset generator.
+
+Produces production-shaped users, orders, returns and tracking records
+for benchmarks and load tests. Data is generated one user at a time from
+a per-user RNG, so any user can be regenerated on its own, the stream
+never holds more than one user's records, and the same seed always
+yields the same dataset.
+
+Usage:
+    python -m database.synthetic --users 2700000 --url sqlite:///bench.db
+"""
+
+import argparse
+import bisect
+import itertools
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from models.order import Order, OrderItem
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from models.tracking import TrackingInfo, ShipmentStatus
+from models.user import User
+
+
+# Fixed reference time so a seed always produces identical timestamps
+REFERENCE_TIME = datetime(2026, 10, 1)
+
+# Orders per user follow a lognormal (median ~2.7, mean ~3.7, long tail)
+ORDERS_PER_USER_MU = 1.0
+ORDERS_PER_USER_SIGMA = 0.8
+MAX_ORDERS_PER_USER = 250
+
+# Line items per order are geometric; a small share of orders are
+# wholesale orders with hundreds of lines
+ITEMS_CONTINUE_PROBABILITY = 0.35
+MAX_RETAIL_ITEMS = 12
+WHOLESALE_ORDER_RATE = 0.002
+WHOLESALE_ITEMS = (50, 300)
+
+ORDER_HISTORY_DAYS = 365
+
+# (weight, median price, return rate)
+CATEGORY_PROFILES: Dict[str, Tuple[float, float, float]] = {
+    "Clothing": (0.24, 34.0, 0.22),
+    "Footwear": (0.12, 79.0, 0.18),
+    "Electronics": (0.16, 149.0, 0.08),
+    "Accessories": (0.14, 24.0, 0.06),
+    "Home & Kitchen": (0.18, 45.0, 0.07),
+    "General": (0.16, 19.0, 0.05),
+}
+
+_DEFAULT_REASON_WEIGHTS = {
+    ReturnReason.BUYER_REMORSE: 0.30,
+    ReturnReason.DAMAGED: 0.15,
+    ReturnReason.DEFECTIVE: 0.15,
+    ReturnReason.NOT_AS_DESCRIBED: 0.15,
+    ReturnReason.WRONG_ITEM: 0.10,
+    ReturnReason.SIZE_ISSUE: 0.05,
+    ReturnReason.OTHER: 0.10,
+}
+
+REASON_WEIGHTS: Dict[str, Dict[ReturnReason, float]] = {
+    "Clothing": {
+        ReturnReason.SIZE_ISSUE: 0.50,
+        ReturnReason.BUYER_REMORSE: 0.20,
+        ReturnReason.NOT_AS_DESCRIBED: 0.15,
+        ReturnReason.DAMAGED: 0.05,
+        ReturnReason.WRONG_ITEM: 0.05,
+        ReturnReason.OTHER: 0.05,
+    },
+    "Footwear": {
+        ReturnReason.SIZE_ISSUE: 0.55,
+        ReturnReason.BUYER_REMORSE: 0.15,
+        ReturnReason.NOT_AS_DESCRIBED: 0.10,
+        ReturnReason.DEFECTIVE: 0.10,
+        ReturnReason.WRONG_ITEM: 0.05,
+        ReturnReason.OTHER: 0.05,
+    },
+    "Electronics": {
+        ReturnReason.DEFECTIVE: 0.35,
+        ReturnReason.DAMAGED: 0.25,
+        ReturnReason.NOT_AS_DESCRIBED: 0.15,
+        ReturnReason.BUYER_REMORSE: 0.15,
+        ReturnReason.WRONG_ITEM: 0.05,
+        ReturnReason.OTHER: 0.05,
+    },
+}
+
+PRODUCT_NAMES: Dict[str, List[str]] = {
+    "Clothing": ["Cotton T-Shirt", "Denim Jacket", "Wool Sweater", "Chino Pants", "Rain Coat"],
+    "Footwear": ["Running Shoes", "Leather Boots", "Canvas Sneakers", "Sandals", "Loafers"],
+    "Electronics": ["Wireless Headphones", "Smart Watch", "Bluetooth Speaker", "Tablet", "Webcam"],
+    "Accessories": ["Phone Case", "Leather Belt", "Sunglasses", "Backpack", "Wallet"],
+    "Home & Kitchen": ["Coffee Maker", "Chef Knife", "Bath Towel Set", "Table Lamp", "Blender"],
+    "General": ["Notebook", "Water Bottle", "Umbrella", "Gift Card Holder", "Desk Organizer"],
+}
+
+FIRST_NAMES = ["James", "Maria", "Wei", "Aisha", "Carlos", "Priya", "John", "Jane", "Olga", "Kenji"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Khan", "Johnson", "Patel", "Doe", "Ivanova", "Sato", "Brown"]
+
+CARRIERS = [("UPS", 0.5), ("FedEx", 0.3), ("USPS", 0.2)]
+
+_CATEGORIES = list(CATEGORY_PROFILES)
+_CATEGORY_CUM_WEIGHTS = list(
+    itertools.accumulate(profile[0] for profile in CATEGORY_PROFILES.values())
+)
+_CARRIER_NAMES = [name for name, _ in CARRIERS]
+_CARRIER_CUM_WEIGHTS = list(itertools.accumulate(weight for _, weight in CARRIERS))
+_REASON_TABLES = {
+    category: (list(weights), list(itertools.accumulate(weights.values())))
+    for category, weights in [*REASON_WEIGHTS.items(), (None, _DEFAULT_REASON_WEIGHTS)]
+}
+
+
+def _weighted(rng: random.Random, values: List, cum_weights: List[float]):
+    """Weighted choice from precomputed cumulative weights."""
+    return values[bisect.bisect(cum_weights, rng.random() * cum_weights[-1])]
+
+
+def user_id(index: int) -> str:
+    """User ID of the synthetic user at ``index``."""
+    return f"U{index:08d}"
+
+
+def order_id(index: int, order_number: int) -> str:
+    """Order ID of a synthetic user's ``order_number``-th order."""
+    return f"O{index:08d}-{order_number:03d}"
+
+
+def item_id(index: int, order_number: int, line: int) -> str:
+    """Item ID of one line of a synthetic order."""
+    return f"I{index:08d}-{order_number:03d}-{line:03d}"
+
+
+def phone_number(index: int) -> str:
+    """Unique NANP phone number of the synthetic user at ``index``."""
+    digits = f"{2_000_000_000 + index:010d}"
+    return f"+1-{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+
+
+class UserBundle(NamedTuple):
+    """All records generated for one synthetic user."""
+
+    user: User
+    orders: List[Order]
+    returns: List[ReturnRequest]
+    tracking: List[TrackingInfo]
+
+
+class SyntheticDataGenerator:
+    """
+    Streams realistic users with their orders, returns and tracking.
+
+    Each user is generated from its own RNG seeded by (seed, index), so
+    ``bundle(i)`` is reproducible in isolation and ``generate`` can be
+    sharded across processes by index range.
+    """
+
+    def __init__(self, seed: int = 0, reference_time: datetime = REFERENCE_TIME):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Dataset seed
+            reference_time: "Now" for the dataset; orders and returns are
+                dated before it
+        """
+        self.seed = seed
+        self.reference_time = reference_time
+
+    def generate(self, users: int, start: int = 0) -> Iterator[UserBundle]:
+        """
+        Yield one bundle per user.
+
+        Args:
+            users: Number of users to generate
+            start: Index of the first user
+        """
+        for index in range(start, start + users):
+            yield self.bundle(index)
+
+    def bundle(self, index: int) -> UserBundle:
+        """Generate the records for the user at ``index``."""
+        rng = random.Random((self.seed << 40) ^ index)
+        now = self.reference_time
+
+        order_count = min(
+            MAX_ORDERS_PER_USER,
+            max(1, round(rng.lognormvariate(ORDERS_PER_USER_MU, ORDERS_PER_USER_SIGMA))),
+        )
+        # Accounts are at least as old as their order history
+        account_age_days = rng.randint(30, 3650)
+        history_days = min(ORDER_HISTORY_DAYS, account_age_days)
+
+        orders: List[Order] = []
+        returns: List[ReturnRequest] = []
+        tracking: List[TrackingInfo] = []
+        for order_number in range(order_count):
+            order_date = now - timedelta(seconds=int(rng.random() * history_days * 86400))
+            order = self._order(rng, index, order_number, order_date)
+            orders.append(order)
+            self._returns(rng, index, order, returns, tracking)
+
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        user = User(
+            user_id=user_id(index),
+            name=f"{first} {last}",
+            email=f"{first.lower()}.{last.lower()}{index}@example.com",
+            phone=phone_number(index),
+            address=f"{rng.randint(1, 9999)} Main St, Springfield",
+            return_count=len(returns),
+            account_age_days=account_age_days,
+        )
+        return UserBundle(user, orders, returns, tracking)
+
+    def _order(
+        self, rng: random.Random, index: int, order_number: int, order_date: datetime
+    ) -> Order:
+        """Generate one order and its line items."""
+        if rng.random() < WHOLESALE_ORDER_RATE:
+            line_count = rng.randint(*WHOLESALE_ITEMS)
+            max_quantity = 20
+        else:
+            line_count = 1
+            while line_count < MAX_RETAIL_ITEMS and rng.random() < ITEMS_CONTINUE_PROBABILITY:
+                line_count += 1
+            max_quantity = 1 if rng.random() < 0.9 else 3
+
+        items = []
+        for line in range(line_count):
+            category = _weighted(rng, _CATEGORIES, _CATEGORY_CUM_WEIGHTS)
+            median_price = CATEGORY_PROFILES[category][1]
+            # Prices are lognormal around the category median, ending in .99
+            price = max(0.99, math.floor(median_price * rng.lognormvariate(0, 0.6)) + 0.99)
+            items.append(
+                OrderItem(
+                    item_id=item_id(index, order_number, line),
+                    product_name=rng.choice(PRODUCT_NAMES[category]),
+                    price=price,
+                    quantity=rng.randint(1, max_quantity),
+                    category=category,
+                )
+            )
+
+        age = self.reference_time - order_date
+        if age < timedelta(days=1):
+            status = "processing"
+        elif age < timedelta(days=5):
+            status = "shipped"
+        else:
+            status = "delivered"
+        return Order(
+            order_id=order_id(index, order_number),
+            user_id=user_id(index),
+            items=items,
+            order_date=order_date,
+            total_amount=0,
+            status=status,
+        )
+
+    def _returns(
+        self,
+        rng: random.Random,
+        index: int,
+        order: Order,
+        returns: List[ReturnRequest],
+        tracking: List[TrackingInfo],
+    ) -> None:
+        """Generate returns (and their tracking) for a delivered order."""
+        if order.status != "delivered":
+            return
+        for line, item in enumerate(order.items):
+            if rng.random() >= CATEGORY_PROFILES[item.category][2]:
+                continue
+
+            created_at = order.order_date + timedelta(
+                days=rng.randint(2, 30), seconds=int(rng.random() * 86400)
+            )
+            if created_at >= self.reference_time:
+                continue
+            reasons, cum_weights = _REASON_TABLES.get(item.category, _REASON_TABLES[None])
+            reason = _weighted(rng, reasons, cum_weights)
+            status, shipment_status = self._return_status(rng, self.reference_time - created_at)
+
+            tracking_number = None
+            if shipment_status is not None:
+                tracking_number = f"1ZSYN{index:08d}{order.order_id[-3:]}{line:03d}"
+                carrier = _weighted(rng, _CARRIER_NAMES, _CARRIER_CUM_WEIGHTS)
+                last_update = min(
+                    self.reference_time,
+                    created_at + timedelta(hours=rng.randint(2, 24 * 7)),
+                )
+                tracking.append(
+                    TrackingInfo(
+                        tracking_number=tracking_number,
+                        carrier=carrier,
+                        status=shipment_status,
+                        last_update=last_update,
+                        estimated_delivery=created_at + timedelta(days=5),
+                        current_location=None,
+                    )
+                )
+
+            returns.append(
+                ReturnRequest(
+                    return_id=f"RET-{order.order_id}-{line:03d}",
+                    order_id=order.order_id,
+                    user_id=order.user_id,
+                    item_id=item.item_id,
+                    reason=reason,
+                    status=status,
+                    created_at=created_at,
+                    refund_cents=item.total_price_cents,
+                    tracking_number=tracking_number,
+                    # Most returns are low risk with a thin high-risk tail
+                    fraud_risk_score=round(rng.betavariate(1.2, 8.0), 3),
+                )
+            )
+
+    @staticmethod
+    def _return_status(
+        rng: random.Random, age: timedelta
+    ) -> Tuple[ReturnStatus, Optional[ShipmentStatus]]:
+        """Pick a return status consistent with the return's age."""
+        if rng.random() < 0.02:
+            return ReturnStatus.DISPUTED, ShipmentStatus.DELIVERED
+        if rng.random() < 0.03:
+            return ReturnStatus.REJECTED, ShipmentStatus.DELIVERED
+        if age < timedelta(days=1):
+            if rng.random() < 0.5:
+                return ReturnStatus.INITIATED, None
+            return ReturnStatus.LABEL_GENERATED, ShipmentStatus.LABEL_CREATED
+        if age < timedelta(days=5):
+            return ReturnStatus.IN_TRANSIT, ShipmentStatus.IN_TRANSIT
+        if age < timedelta(days=8):
+            return ReturnStatus.RECEIVED, ShipmentStatus.DELIVERED
+        if age < timedelta(days=12):
+            return ReturnStatus.REFUND_PENDING, ShipmentStatus.DELIVERED
+        return ReturnStatus.REFUND_PROCESSED, ShipmentStatus.DELIVERED
+
+
+def load_synthetic_data(
+    db,
+    users: int,
+    seed: int = 0,
+    batch_size: int = 10_000,
+    start: int = 0,
+    generator: Optional[SyntheticDataGenerator] = None,
+) -> Dict[str, int]:
+    """
+    Stream a synthetic dataset into a storage engine via its bulk methods.
+
+    Records are buffered only until ``batch_size`` orders are pending, so
+    memory stays flat regardless of dataset size.
+
+    Args:
+        db: Storage engine with bulk_insert_* methods
+        users: Number of users to load
+        seed: Dataset seed (ignored if ``generator`` is given)
+        batch_size: Orders per flush
+        start: Index of the first user
+        generator: Generator to draw from
+
+    Returns:
+        Counts of loaded users, orders, items, returns and tracking records
+    """
+    generator = generator or SyntheticDataGenerator(seed)
+    counts = {"users": 0, "orders": 0, "items": 0, "returns": 0, "tracking": 0}
+    pending_users: List[User] = []
+    pending_orders: List[Order] = []
+    pending_returns: List[ReturnRequest] = []
+    pending_tracking: List[TrackingInfo] = []
+
+    def flush() -> None:
+        counts["users"] += db.bulk_insert_users(pending_users)
+        counts["orders"] += db.bulk_insert_orders(pending_orders)
+        counts["returns"] += db.bulk_insert_returns(pending_returns)
+        counts["tracking"] += db.bulk_insert_tracking(pending_tracking)
+        pending_users.clear()
+        pending_orders.clear()
+        pending_returns.clear()
+        pending_tracking.clear()
+
+    for bundle in generator.generate(users, start):
+        pending_users.append(bundle.user)
+        pending_orders.extend(bundle.orders)
+        pending_returns.extend(bundle.returns)
+        pending_tracking.extend(bundle.tracking)
+        counts["items"] += sum(len(order.items) for order in bundle.orders)
+        if len(pending_orders) >= batch_size:
+            flush()
+    flush()
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Generate a dataset into the database at --url."""
+    from database import create_database
+
+    parser = argparse.ArgumentParser(description="Load a synthetic ReturnFlow dataset")
+    parser.add_argument("--users", type=int, default=10_000, help="Number of users")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset seed")
+    parser.add_argument("--url", default="sqlite:///synthetic.db", help="Target DATABASE_URL")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Orders per flush")
+    args = parser.parse_args(argv)
+
+    db = create_database(args.url)
+    start = time.perf_counter()
+    counts = load_synthetic_data(db, args.users, seed=args.seed, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    summary = ", ".join(f"{value:,} {name}" for name, value in counts.items())
+    print(f"Loaded {summary} in {elapsed:.1f}s ({counts['orders'] / elapsed:,.0f} orders/sec)")
+    close = getattr(db, "close", None)
+    if close:
+        close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Tracking status cache with per-status TTLs.
+
+Serves tracking answers from memory. Entries past their TTL are still
+returned (stale-while-revalidate) while a background thread re-fetches
+them from the carrier, so a caller never waits on a carrier round trip.
+"""
+
+import heapq
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from models.tracking import TrackingInfo, ShipmentStatus
+
+
+# How long a cached status stays fresh, in seconds. Shipments that are
+# moving change often; delivered shipments never change again.
+DEFAULT_STATUS_TTLS: Dict[ShipmentStatus, float] = {
+    ShipmentStatus.LABEL_CREATED: 300.0,
+    ShipmentStatus.PICKED_UP: 120.0,
+    ShipmentStatus.IN_TRANSIT: 60.0,
+    ShipmentStatus.OUT_FOR_DELIVERY: 30.0,
+    ShipmentStatus.DELIVERED: math.inf,
+    ShipmentStatus.EXCEPTION: 60.0,
+}
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+@dataclass
+class _CacheEntry:
+    """A cached tracking record and the time it stops being fresh."""
+
+    tracking_info: TrackingInfo
+    fresh_until: float
+
+
+class TrackingCache:
+    """In-memory tracking cache with background refresh from a carrier client."""
+
+    def __init__(
+        self,
+        carrier_client,
+        database=None,
+        status_ttls: Optional[Dict[ShipmentStatus, float]] = None,
+        refresh_interval: float = 1.0,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the tracking cache.
+
+        Args:
+            carrier_client: Object with ``fetch_tracking(tracking_number)``
+            database: Optional database kept in sync with refreshed tracking
+                and used to seed cache misses
+            status_ttls: Freshness window per shipment status, in seconds
+            refresh_interval: How often the refresher checks for due entries
+            max_entries: Tracking numbers kept in memory; the least recently
+                used are dropped beyond it (None for no bound)
+            clock: Monotonic time source, in seconds
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.carrier = carrier_client
+        self.db = database
+        self.status_ttls = dict(DEFAULT_STATUS_TTLS)
+        if status_ttls:
+            self.status_ttls.update(status_ttls)
+        self.refresh_interval = refresh_interval
+        self.max_entries = max_entries
+        self._clock = clock
+
+        # Least recently used first
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # (fresh_until, tracking_number) min-heap; stale heap items are skipped
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+        }
+
+    # ==========================================================================
+    # READS & WRITES
+    # ==========================================================================
+
+    def get(self, tracking_number: str) -> Optional[TrackingInfo]:
+        """
+        Get tracking info from memory.
+
+        Stale entries are returned immediately and queued for refresh.
+        On a miss the database copy, if any, is cached and refreshed in
+        the background.
+
+        Args:
+            tracking_number: Carrier tracking number
+
+        Returns:
+            Cached TrackingInfo, or None if nothing is known yet
+        """
+        if not tracking_number:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(tracking_number)
+            if entry is not None:
+                self._entries.move_to_end(tracking_number)
+                if now < entry.fresh_until:
+                    self.stats["hits"] += 1
+                else:
+                    self.stats["stale_hits"] += 1
+                    self._schedule_refresh(tracking_number)
+                return entry.tracking_info
+            self.stats["misses"] += 1
+
+        stored = self.db.get_tracking(tracking_number) if self.db is not None else None
+        if stored is not None:
+            # Serve the stored copy now and let the refresher bring it up to date
+            self.put(stored, fresh=False)
+        return stored
+
+    def put(self, tracking_info: TrackingInfo, fresh: bool = True) -> None:
+        """
+        Cache tracking info.
+
+        Args:
+            tracking_info: Tracking info to cache
+            fresh: If False the entry is treated as already stale and
+                refreshed on the next refresher pass
+        """
+        now = self._clock()
+        fresh_until = now + self._ttl_for(tracking_info.status) if fresh else now
+        tracking_number = tracking_info.tracking_number
+
+        with self._lock:
+            self._entries[tracking_number] = _CacheEntry(tracking_info, fresh_until)
+            self._entries.move_to_end(tracking_number)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    # Heap items of evicted entries are skipped by _collect_due
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._pending.discard(evicted)
+                    self.stats["evictions"] += 1
+            if math.isfinite(fresh_until):
+                heapq.heappush(self._expiry_heap, (fresh_until, tracking_number))
+            if not fresh:
+                self._schedule_refresh(tracking_number)
+
+    def invalidate(self, tracking_number: str) -> None:
+        """Drop a tracking number from the cache."""
+        with self._lock:
+            self._entries.pop(tracking_number, None)
+            self._pending.discard(tracking_number)
+
+    def __len__(self) -> int:
+        """Number of cached tracking numbers."""
+        return len(self._entries)
+
+    def _ttl_for(self, status: ShipmentStatus) -> float:
+        """Freshness window for a shipment status."""
+        return self.status_ttls.get(status, 60.0)
+
+    def _schedule_refresh(self, tracking_number: str) -> None:
+        """Queue a tracking number for refresh. Caller holds the lock."""
+        if tracking_number not in self._pending:
+            self._pending.add(tracking_number)
+            self._wakeup.set()
+
+    # ==========================================================================
+    # BACKGROUND REFRESH
+    # ==========================================================================
+
+    def start(self) -> None:
+        """Start the background refresher thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="tracking-cache-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background refresher thread."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh_due(self) -> int:
+        """
+        Refresh every queued or expired entry once.
+
+        Runs on the refresher thread, but can be called directly (for
+        example from tests or a cron-style job).
+
+        Returns:
+            Number of tracking numbers refreshed
+        """
+        due = self._collect_due()
+        for tracking_number in due:
+            self._refresh_one(tracking_number)
+        return len(due)
+
+    def _refresh_loop(self) -> None:
+        """Refresher thread body."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.refresh_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            self.refresh_due()
+
+    def _collect_due(self) -> List[str]:
+        """Pop every tracking number that is queued or past its TTL."""
+        now = self._clock()
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                fresh_until, tracking_number = heapq.heappop(self._expiry_heap)
+                entry = self._entries.get(tracking_number)
+                # Skip heap items superseded by a later put
+                if entry is not None and entry.fresh_until == fresh_until:
+                    self._pending.add(tracking_number)
+            due = list(self._pending)
+            self._pending.clear()
+        return due
+
+    def _refresh_one(self, tracking_number: str) -> None:
+        """Re-fetch one tracking number from the carrier."""
+        try:
+            latest = self.carrier.fetch_tracking(tracking_number)
+        except Exception:
+            # Keep serving the stale copy and try again on a later pass
+            with self._lock:
+                self.stats["refresh_errors"] += 1
+                entry = self._entries.get(tracking_number)
+                if entry is not None:
+                    entry.fresh_until = self._clock() + self.refresh_interval
+                    heapq.heappush(self._expiry_heap, (entry.fresh_until, tracking_number))
+            return
+
+        if latest is None:
+            return
+
+        with self._lock:
+            self.stats["refreshes"] += 1
+        if self.db is not None:
+            stored = self.db.get_tracking(tracking_number)
+            if stored is None:
+                self.db.create_tracking(latest)
+            elif stored.status != latest.status or stored.current_location != latest.current_location:
+                self.db.update_tracking_status(
+                    tracking_number, latest.status, latest.current_location
+                )
+        self.put(latest)
@@ -0,0 +1,211 @@
+"""
+Append-only tracking scan history with a compact array encoding.
+
+Every scan is stored as fixed-width entries in a handful of shared
+``array`` buffers instead of one Python object per event:
+
+- status code (1 byte, index into ShipmentStatus)
+- microseconds since the shipment's previous scan (8 bytes, signed; the
+  first scan stores absolute epoch microseconds)
+- interned location ID (4 bytes, 0 = no location)
+- index of the shipment's previous scan (4 bytes, -1 = none)
+
+Each shipment's scans form a backward-linked chain through the shared
+buffers, so appends are O(1), "latest" is O(1) and history is
+O(scans for that shipment). Timestamps are kept to the microsecond, the
+same resolution as the models.
+"""
+
+import sys
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from models.compact import from_epoch_us, to_epoch_us
+from models.tracking import ShipmentStatus
+
+
+_STATUSES = list(ShipmentStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+
+class TrackingScan(NamedTuple):
+    """One decoded scan event."""
+
+    status: ShipmentStatus
+    timestamp: datetime
+    location: Optional[str]
+
+
+class TrackingEventLog:
+    """Per-tracking-number append-only scan log."""
+
+    def __init__(self):
+        """Initialize an empty log."""
+        # Per-event columns
+        self._status = array("B")
+        self._delta = array("q")
+        self._location = array("I")
+        self._prev = array("i")
+
+        # Per-shipment columns, indexed by shipment ID
+        self._shipment_ids: Dict[str, int] = {}
+        self._head = array("i")
+        self._last_ts = array("q")
+
+        # Interned locations; ID 0 is reserved for "no location"
+        self._locations: List[Optional[str]] = [None]
+        self._location_ids: Dict[str, int] = {}
+
+        self._lock = threading.Lock()
+
+    def append(
+        self,
+        tracking_number: str,
+        status: ShipmentStatus,
+        timestamp: datetime,
+        location: Optional[str] = None,
+    ) -> bool:
+        """
+        Append a scan to a shipment's history.
+
+        Scans must arrive in time order per shipment. A scan older than
+        the shipment's latest recorded scan is ignored, as is one at the
+        same time with a status and location already recorded at that
+        time, so replays of the same events are idempotent.
+
+        Returns:
+            True if the scan was recorded
+        """
+        epoch = to_epoch_us(timestamp)
+        status_code = _STATUS_CODES[status]
+        with self._lock:
+            shipment_id = self._shipment_ids.get(tracking_number)
+            if shipment_id is None:
+                shipment_id = len(self._head)
+                self._shipment_ids[tracking_number] = shipment_id
+                self._head.append(-1)
+                self._last_ts.append(0)
+                prev = -1
+                delta = epoch
+            else:
+                prev = self._head[shipment_id]
+                delta = epoch - self._last_ts[shipment_id]
+                if delta < 0:
+                    return False
+                if delta == 0 and self._recorded_at_head(prev, status_code, location):
+                    return False
+
+            self._status.append(status_code)
+            self._delta.append(delta)
+            self._location.append(self._intern_location(location))
+            self._prev.append(prev)
+
+            self._head[shipment_id] = len(self._status) - 1
+            self._last_ts[shipment_id] = epoch
+        return True
+
+    def latest(self, tracking_number: str) -> Optional[TrackingScan]:
+        """Most recent scan for a shipment."""
+        with self._lock:
+            shipment_id = self._shipment_ids.get(tracking_number)
+            if shipment_id is None:
+                return None
+            return self._decode(self._head[shipment_id], self._last_ts[shipment_id])
+
+    def latest_timestamp(self, tracking_number: str) -> Optional[datetime]:
+        """Timestamp of the most recent scan for a shipment."""
+        with self._lock:
+            shipment_id = self._shipment_ids.get(tracking_number)
+            if shipment_id is None:
+                return None
+            return from_epoch_us(self._last_ts[shipment_id])
+
+    def history(self, tracking_number: str, limit: Optional[int] = None) -> List[TrackingScan]:
+        """
+        Scans for a shipment in chronological order.
+
+        Args:
+            tracking_number: Carrier tracking number
+            limit: Only return the most recent ``limit`` scans
+
+        Returns:
+            List of TrackingScan, oldest first
+        """
+        scans = []
+        # Appends replace the head and may grow (reallocate) the buffers
+        with self._lock:
+            shipment_id = self._shipment_ids.get(tracking_number)
+            if shipment_id is None:
+                return []
+            index = self._head[shipment_id]
+            epoch = self._last_ts[shipment_id]
+            while index != -1 and (limit is None or len(scans) < limit):
+                scans.append(self._decode(index, epoch))
+                epoch -= self._delta[index]
+                index = self._prev[index]
+        scans.reverse()
+        return scans
+
+    def __len__(self) -> int:
+        """Total number of recorded scans."""
+        return len(self._status)
+
+    def __contains__(self, tracking_number: str) -> bool:
+        """Check whether a shipment has any recorded scans."""
+        return tracking_number in self._shipment_ids
+
+    def tracking_numbers(self) -> List[str]:
+        """Tracking numbers with at least one recorded scan."""
+        with self._lock:
+            return list(self._shipment_ids)
+
+    @property
+    def shipment_count(self) -> int:
+        """Number of shipments with at least one scan."""
+        return len(self._shipment_ids)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the log's buffers and lookup tables."""
+        buffers = (self._status, self._delta, self._location, self._prev, self._head, self._last_ts)
+        total = sum(buf.buffer_info()[1] * buf.itemsize for buf in buffers)
+        total += sys.getsizeof(self._shipment_ids)
+        total += sum(sys.getsizeof(key) for key in self._shipment_ids)
+        total += sys.getsizeof(self._locations) + sys.getsizeof(self._location_ids)
+        total += sum(sys.getsizeof(location) for location in self._locations if location)
+        return total
+
+    def _intern_location(self, location: Optional[str]) -> int:
+        """Map a location string to a small integer ID. Caller holds the lock."""
+        if not location:
+            return 0
+        location_id = self._location_ids.get(location)
+        if location_id is None:
+            location_id = len(self._locations)
+            self._locations.append(location)
+            self._location_ids[location] = location_id
+        return location_id
+
+    def _recorded_at_head(self, index: int, status_code: int, location: Optional[str]) -> bool:
+        """
+        Check the scans sharing the head scan's timestamp for this status and location.
+
+        Caller holds the lock.
+        """
+        location_id = self._location_ids.get(location, -1) if location else 0
+        while index != -1:
+            if self._status[index] == status_code and self._location[index] == location_id:
+                return True
+            if self._delta[index] != 0 or self._prev[index] == -1:
+                return False
+            index = self._prev[index]
+        return False
+
+    def _decode(self, index: int, epoch: int) -> TrackingScan:
+        """Decode the scan at ``index`` given its absolute epoch microseconds."""
+        return TrackingScan(
+            status=_STATUSES[self._status[index]],
+            timestamp=from_epoch_us(epoch),
+            location=self._locations[self._location[index]],
+        )
@@ -5,6 +5,7 @@ A multi-agent conversational system for handling product returns through voice.
 Built on VocalBridge AI architecture.
 """
 
+from database import create_database
 from database.mock_db import MockDatabase
 from services.orchestrator import VoiceOrchestrator
 
@@ -86,8 +87,8 @@ def list_users(db: MockDatabase):
     print("Available Test Users")
     print("="*60)
 
-    for user_id, user in db.users.items():
-        print(f"\nUser ID: {user_id}")
+    for user in db.list_users():
+        print(f"\nUser ID: {user.user_id}")
         print(f"Name: {user.name}")
         print(f"Phone: {user.phone}")
         print(f"Email: {user.email}")
@@ -105,7 +106,7 @@ def interactive_mode():
     print("Type 'help' for available commands or start talking naturally.\n")
 
     # Initialize database and orchestrator
-    db = MockDatabase()
+    db = create_database()
     orchestrator = VoiceOrchestrator(db)
 
     session_id = None
@@ -169,6 +170,8 @@ def interactive_mode():
             print(f"\n❌ Error: {e}")
             print("Type 'help' for available commands.")
 
+    orchestrator.close()
+
 
 def main():
     """Main entry point."""
@@ -0,0 +1,100 @@
+"""
+Building blocks for the memory-compact model classes.
+
+The models keep their public attributes (``price`` in dollars,
+``created_at`` as a datetime, ...) but store them compactly: instances
+use ``__slots__`` instead of a per-instance ``__dict__``, money is held
+as integer cents (also readable and writable as ``price_cents``,
+``total_cents`` and ``refund_cents``), timestamps as integer microseconds since the epoch,
+and low-cardinality strings (categories, carriers, locations) are
+interned so millions of records share one copy of each.
+
+Timestamps are naive local time throughout the code base (the form
+``datetime.now()`` gives), and the stored number is that wall-clock
+reading, so naive datetimes are converted without any adjustment and
+round-trip unchanged. Aware datetimes (such as ISO 8601 strings ending
+in ``Z`` from an import) are converted to the local zone first and read
+back as naive local time like the rest.
+"""
+
+from datetime import datetime, timedelta
+from sys import intern
+from typing import Optional, Tuple
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Dollar attributes of the models and the integer cents attribute behind
+# each, which the encoders write in their place
+CENTS_FIELDS = {
+    "price": "price_cents",
+    "total_amount": "total_cents",
+    "refund_amount": "refund_cents",
+}
+
+
+def to_cents(amount: float) -> int:
+    """Convert a dollar amount to integer cents, rounding to the nearest cent."""
+    return round(amount * 100)
+
+
+def to_epoch_us(moment: datetime) -> int:
+    """
+    Convert a datetime to microseconds since 1970-01-01 on the local clock.
+
+    Naive datetimes are local time and taken as they are; aware ones are
+    converted to local time first.
+    """
+    if moment.utcoffset() is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(micros: int) -> datetime:
+    """Convert microseconds since 1970-01-01 back to a naive datetime."""
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def optional_epoch_us(moment: Optional[datetime]) -> Optional[int]:
+    """to_epoch_us that passes None through."""
+    return None if moment is None else to_epoch_us(moment)
+
+
+def optional_from_epoch_us(micros: Optional[int]) -> Optional[datetime]:
+    """from_epoch_us that passes None through."""
+    return None if micros is None else from_epoch_us(micros)
+
+
+def optional_intern(value: Optional[str]) -> Optional[str]:
+    """Intern a string, passing None through."""
+    return None if value is None else intern(value)
+
+
+class CompactModel:
+    """
+    Base for slotted models.
+
+    Subclasses list their public attributes, in constructor order, in
+    ``FIELDS``; equality and repr are defined over them the way a
+    dataclass would.
+    """
+
+    __slots__ = ()
+
+    FIELDS: Tuple[str, ...] = ()
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    # Mutable records, like an eq=True dataclass, are unhashable
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({values})"
@@ -1,49 +1,201 @@
 """Order and OrderItem models."""
 
-from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from sys import intern
+from typing import Dict, List, Optional
 
+from .compact import CompactModel, from_epoch_us, to_cents, to_epoch_us
 
-@dataclass
-class OrderItem:
+
+# Orders with at most this many lines are scanned rather than indexed
+_SCAN_ITEMS = 8
+
+
+class OrderItem(CompactModel):
     """Represents an item in an order."""
 
-    item_id: str
-    product_name: str
-    price: float
-    quantity: int = 1
-    category: str = "General"
+    __slots__ = ("item_id", "product_name", "_price_cents", "quantity", "_category")
+
+    FIELDS = ("item_id", "product_name", "price", "quantity", "category")
+
+    def __init__(
+        self,
+        item_id: str,
+        product_name: str,
+        price: float,
+        quantity: int = 1,
+        category: str = "General",
+        *,
+        price_cents: Optional[int] = None,
+    ):
+        self.item_id = item_id
+        # Catalog names repeat across orders, so share one copy
+        self.product_name = intern(product_name)
+        self._price_cents = price_cents if price_cents is not None else to_cents(price)
+        self.quantity = quantity
+        self._category = intern(category)
+
+    @property
+    def price(self) -> float:
+        """Unit price in dollars."""
+        return self._price_cents / 100
+
+    @price.setter
+    def price(self, value: float) -> None:
+        self._price_cents = to_cents(value)
+
+    @property
+    def price_cents(self) -> int:
+        """Unit price in integer cents."""
+        return self._price_cents
+
+    @price_cents.setter
+    def price_cents(self, value: int) -> None:
+        self._price_cents = value
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @category.setter
+    def category(self, value: str) -> None:
+        self._category = intern(value)
 
     @property
     def total_price(self) -> float:
         """Calculate total price for this item."""
-        return self.price * self.quantity
+        return self._price_cents * self.quantity / 100
+
+    @property
+    def total_price_cents(self) -> int:
+        """Total price for this item in integer cents."""
+        return self._price_cents * self.quantity
 
 
-@dataclass
-class Order:
+class Order(CompactModel):
     """Represents a customer order."""
 
-    order_id: str
-    user_id: str
-    items: List[OrderItem]
-    order_date: datetime
-    total_amount: float
-    status: str = "delivered"
+    __slots__ = (
+        "order_id",
+        "user_id",
+        "_items",
+        "_item_positions",
+        "_order_date_us",
+        "_total_cents",
+        "_status",
+    )
+
+    FIELDS = ("order_id", "user_id", "items", "order_date", "total_amount", "status")
+
+    def __init__(
+        self,
+        order_id: str,
+        user_id: str,
+        items: List[OrderItem],
+        order_date: datetime,
+        total_amount: float,
+        status: str = "delivered",
+        *,
+        total_cents: Optional[int] = None,
+    ):
+        self.order_id = order_id
+        self.user_id = user_id
+        self.items = items
+        self._order_date_us = to_epoch_us(order_date)
+        self._status = intern(status)
+        # Calculate total if not provided
+        if total_cents is not None:
+            self._total_cents = total_cents
+        elif total_amount == 0:
+            self._total_cents = sum(item._price_cents * item.quantity for item in items)
+        else:
+            self._total_cents = to_cents(total_amount)
+
+    @property
+    def items(self) -> List[OrderItem]:
+        return self._items
 
-    def __post_init__(self):
-        """Calculate total if not provided."""
-        if self.total_amount == 0:
-            self.total_amount = sum(item.total_price for item in self.items)
+    @items.setter
+    def items(self, value: List[OrderItem]) -> None:
+        self._items = value
+        self._item_positions = None
+
+    @property
+    def order_date(self) -> datetime:
+        return from_epoch_us(self._order_date_us)
+
+    @order_date.setter
+    def order_date(self, value: datetime) -> None:
+        self._order_date_us = to_epoch_us(value)
+
+    @property
+    def total_amount(self) -> float:
+        """Order total in dollars."""
+        return self._total_cents / 100
+
+    @total_amount.setter
+    def total_amount(self, value: float) -> None:
+        self._total_cents = to_cents(value)
+
+    @property
+    def total_cents(self) -> int:
+        """Order total in integer cents."""
+        return self._total_cents
+
+    @total_cents.setter
+    def total_cents(self, value: int) -> None:
+        self._total_cents = value
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self._status = intern(value)
 
     def get_item_by_id(self, item_id: str) -> OrderItem | None:
-        """Find an item in the order by ID."""
-        for item in self.items:
+        """
+        Find an item in the order by ID.
+
+        Larger orders use an item_id -> position map built on first
+        lookup. Each hit is checked against the live list, and a miss falls
+        back to a scan that rebuilds the map, so items appended, removed or
+        edited in place are still found.
+        """
+        items = self._items
+        positions = self._item_positions
+        if positions is None:
+            if len(items) <= _SCAN_ITEMS:
+                return self._scan_for_item(item_id)
+            positions = self._item_positions = self._build_item_positions()
+
+        position = positions.get(item_id)
+        if position is not None and position < len(items):
+            item = items[position]
+            if item.item_id == item_id:
+                return item
+
+        # A genuine miss, or the map is stale because items changed in place:
+        # scan, and rebuild the map if the item turns up
+        item = self._scan_for_item(item_id)
+        if item is not None:
+            self._item_positions = self._build_item_positions()
+        return item
+
+    def _scan_for_item(self, item_id: str) -> Optional[OrderItem]:
+        for item in self._items:
             if item.item_id == item_id:
                 return item
         return None
 
+    def _build_item_positions(self) -> Dict[str, int]:
+        positions: Dict[str, int] = {}
+        for position, item in enumerate(self._items):
+            # The first line with an ID wins, as in a scan
+            positions.setdefault(item.item_id, position)
+        return positions
+
     def is_returnable(self, days: int = 30) -> bool:
         """Check if order is within return window."""
         days_since_order = (datetime.now() - self.order_date).days
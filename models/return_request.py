@@ -1,10 +1,11 @@
 """Return request models and enums."""
 
-from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from .compact import CompactModel, from_epoch_us, to_cents, to_epoch_us
+
 
 class ReturnReason(Enum):
     """Possible reasons for returning an item."""
@@ -31,23 +32,98 @@ class ReturnStatus(Enum):
     DISPUTED = "disputed"
 
 
-@dataclass
-class ReturnRequest:
+class ReturnRequest(CompactModel):
     """Represents a product return request."""
 
-    return_id: str
-    order_id: str
-    user_id: str
-    item_id: str
-    reason: ReturnReason
-    status: ReturnStatus = ReturnStatus.INITIATED
-    created_at: datetime = field(default_factory=datetime.now)
-    refund_amount: float = 0.0
-    notes: str = ""
-    label_url: Optional[str] = None
-    qr_code_url: Optional[str] = None
-    tracking_number: Optional[str] = None
-    fraud_risk_score: float = 0.0
+    __slots__ = (
+        "return_id",
+        "order_id",
+        "user_id",
+        "item_id",
+        "reason",
+        "status",
+        "_created_us",
+        "_refund_cents",
+        "notes",
+        "label_url",
+        "qr_code_url",
+        "tracking_number",
+        "fraud_risk_score",
+    )
+
+    FIELDS = (
+        "return_id",
+        "order_id",
+        "user_id",
+        "item_id",
+        "reason",
+        "status",
+        "created_at",
+        "refund_amount",
+        "notes",
+        "label_url",
+        "qr_code_url",
+        "tracking_number",
+        "fraud_risk_score",
+    )
+
+    def __init__(
+        self,
+        return_id: str,
+        order_id: str,
+        user_id: str,
+        item_id: str,
+        reason: ReturnReason,
+        status: ReturnStatus = ReturnStatus.INITIATED,
+        created_at: Optional[datetime] = None,
+        refund_amount: float = 0.0,
+        notes: str = "",
+        label_url: Optional[str] = None,
+        qr_code_url: Optional[str] = None,
+        tracking_number: Optional[str] = None,
+        fraud_risk_score: float = 0.0,
+        *,
+        refund_cents: Optional[int] = None,
+    ):
+        self.return_id = return_id
+        self.order_id = order_id
+        self.user_id = user_id
+        self.item_id = item_id
+        self.reason = reason
+        self.status = status
+        self._created_us = to_epoch_us(created_at if created_at is not None else datetime.now())
+        self._refund_cents = refund_cents if refund_cents is not None else to_cents(refund_amount)
+        self.notes = notes
+        self.label_url = label_url
+        self.qr_code_url = qr_code_url
+        self.tracking_number = tracking_number
+        self.fraud_risk_score = fraud_risk_score
+
+    @property
+    def created_at(self) -> datetime:
+        return from_epoch_us(self._created_us)
+
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self._created_us = to_epoch_us(value)
+
+    @property
+    def refund_amount(self) -> float:
+        """Refund in dollars."""
+        return self._refund_cents / 100
+
+    @refund_amount.setter
+    def refund_amount(self, value: float) -> None:
+        self._refund_cents = to_cents(value)
+
+    @property
+    def refund_cents(self) -> int:
+        """Refund in integer cents."""
+        return self._refund_cents
+
+    @refund_cents.setter
+    def refund_cents(self, value: int) -> None:
+        self._refund_cents = value
 
     def generate_return_id(self) -> str:
         """Generate a unique return ID."""
@@ -0,0 +1,102 @@
+"""
+JSON-compatible encoding of the data models.
+
+``encode`` turns models (and lists, tuples and dicts of them) into plain
+JSON values; ``decode`` reverses it. Models are tagged with their type,
+datetimes are ISO strings and enums are stored by value, so encoded data
+stays readable and survives model field reordering. Money is written as
+the integer cents the models hold (``price_cents`` in place of
+``price``, and so on), so a journal replays amounts exactly; data
+written earlier, with dollars under the public names, still decodes.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Type
+
+from .compact import CENTS_FIELDS
+from .order import Order, OrderItem
+from .return_request import ReturnRequest, ReturnReason, ReturnStatus
+from .tracking import TrackingInfo, ShipmentStatus
+from .user import User
+
+
+MODEL_TYPES: Dict[str, Type] = {
+    "user": User,
+    "order": Order,
+    "order_item": OrderItem,
+    "return": ReturnRequest,
+    "tracking": TrackingInfo,
+}
+
+ENUM_TYPES: Dict[str, Type[Enum]] = {
+    "return_reason": ReturnReason,
+    "return_status": ReturnStatus,
+    "shipment_status": ShipmentStatus,
+}
+
+_MODEL_TAGS = {model: tag for tag, model in MODEL_TYPES.items()}
+_ENUM_TAGS = {enum: tag for tag, enum in ENUM_TYPES.items()}
+
+
+def to_dict(model) -> Dict[str, Any]:
+    """Encode a model as a dict of JSON values, tagged with its type."""
+    data = {"$type": _MODEL_TAGS[type(model)]}
+    for name in model.FIELDS:
+        cents = CENTS_FIELDS.get(name)
+        if cents is not None:
+            data[cents] = getattr(model, cents)
+        else:
+            data[name] = encode(getattr(model, name))
+    return data
+
+
+def from_dict(data: Dict[str, Any]):
+    """Decode a model produced by ``to_dict``."""
+    model = MODEL_TYPES[data["$type"]]
+    values = {}
+    for name in model.FIELDS:
+        cents = CENTS_FIELDS.get(name)
+        if cents is not None and cents in data:
+            if type(data[cents]) is not int:
+                raise ValueError(f"Invalid {model.__name__}: {cents} must be an int")
+            # The dollar argument may be required; the cents keyword wins
+            values[name] = 0
+            values[cents] = data[cents]
+        elif name in data:
+            values[name] = decode(data[name])
+    return model(**values)
+
+
+def encode(value: Any) -> Any:
+    """Encode a model, enum, datetime or container of them as JSON values."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, Enum):
+        return {"$enum": _ENUM_TAGS[type(value)], "value": value.value}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if type(value) in _MODEL_TAGS:
+        return to_dict(value)
+    if isinstance(value, dict):
+        return {"$map": [[encode(key), encode(item)] for key, item in value.items()]}
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def decode(value: Any) -> Any:
+    """Decode a value produced by ``encode``. Tuples come back as lists."""
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    if "$enum" in value:
+        return ENUM_TYPES[value["$enum"]](value["value"])
+    if "$type" in value:
+        return from_dict(value)
+    if "$map" in value:
+        return {decode(key): decode(item) for key, item in value["$map"]}
+    raise ValueError(f"Unrecognized encoded value: {value!r}")
@@ -1,10 +1,19 @@
 """Tracking and shipment models."""
 
-from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from sys import intern
 from typing import Optional
 
+from .compact import (
+    CompactModel,
+    from_epoch_us,
+    optional_epoch_us,
+    optional_from_epoch_us,
+    optional_intern,
+    to_epoch_us,
+)
+
 
 class ShipmentStatus(Enum):
     """Status of shipment tracking."""
@@ -17,16 +26,75 @@ class ShipmentStatus(Enum):
     EXCEPTION = "exception"
 
 
-@dataclass
-class TrackingInfo:
+class TrackingInfo(CompactModel):
     """Represents tracking information for a return shipment."""
 
-    tracking_number: str
-    carrier: str
-    status: ShipmentStatus
-    last_update: datetime
-    estimated_delivery: Optional[datetime] = None
-    current_location: Optional[str] = None
+    __slots__ = (
+        "tracking_number",
+        "_carrier",
+        "status",
+        "_last_update_us",
+        "_estimated_delivery_us",
+        "_current_location",
+    )
+
+    FIELDS = (
+        "tracking_number",
+        "carrier",
+        "status",
+        "last_update",
+        "estimated_delivery",
+        "current_location",
+    )
+
+    def __init__(
+        self,
+        tracking_number: str,
+        carrier: str,
+        status: ShipmentStatus,
+        last_update: datetime,
+        estimated_delivery: Optional[datetime] = None,
+        current_location: Optional[str] = None,
+    ):
+        self.tracking_number = tracking_number
+        self._carrier = intern(carrier)
+        self.status = status
+        self._last_update_us = to_epoch_us(last_update)
+        self._estimated_delivery_us = optional_epoch_us(estimated_delivery)
+        # Scan locations are a small set of hubs shared by many shipments
+        self._current_location = optional_intern(current_location)
+
+    @property
+    def carrier(self) -> str:
+        return self._carrier
+
+    @carrier.setter
+    def carrier(self, value: str) -> None:
+        self._carrier = intern(value)
+
+    @property
+    def last_update(self) -> datetime:
+        return from_epoch_us(self._last_update_us)
+
+    @last_update.setter
+    def last_update(self, value: datetime) -> None:
+        self._last_update_us = to_epoch_us(value)
+
+    @property
+    def estimated_delivery(self) -> Optional[datetime]:
+        return optional_from_epoch_us(self._estimated_delivery_us)
+
+    @estimated_delivery.setter
+    def estimated_delivery(self, value: Optional[datetime]) -> None:
+        self._estimated_delivery_us = optional_epoch_us(value)
+
+    @property
+    def current_location(self) -> Optional[str]:
+        return self._current_location
+
+    @current_location.setter
+    def current_location(self, value: Optional[str]) -> None:
+        self._current_location = optional_intern(value)
 
     def get_status_message(self) -> str:
         """Get a human-readable status message."""
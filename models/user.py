@@ -1,20 +1,42 @@
 """User model."""
 
-from dataclasses import dataclass
 from typing import Optional
 
+from .compact import CompactModel
 
-@dataclass
-class User:
+
+class User(CompactModel):
     """Represents a customer user."""
 
-    user_id: str
-    name: str
-    email: str
-    phone: str
-    address: Optional[str] = None
-    return_count: int = 0
-    account_age_days: int = 0
+    __slots__ = (
+        "user_id",
+        "name",
+        "email",
+        "phone",
+        "address",
+        "return_count",
+        "account_age_days",
+    )
+
+    FIELDS = __slots__
+
+    def __init__(
+        self,
+        user_id: str,
+        name: str,
+        email: str,
+        phone: str,
+        address: Optional[str] = None,
+        return_count: int = 0,
+        account_age_days: int = 0,
+    ):
+        self.user_id = user_id
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.address = address
+        self.return_count = return_count
+        self.account_age_days = account_age_days
 
     def get_fraud_risk_multiplier(self) -> float:
         """Calculate fraud risk multiplier based on user history."""
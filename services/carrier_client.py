@@ -0,0 +1,111 @@
+"""
+Local carrier stand-in for tracking lookups.
+
+Simulates a carrier tracking API (UPS, USPS, FedEx) so the tracking cache
+and its background refresher can be exercised without real carrier
+credentials. Shipments advance one scan status every ``step_seconds``.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from models.tracking import TrackingInfo, ShipmentStatus
+
+
+# Order in which a healthy shipment moves through carrier scans
+SHIPMENT_PROGRESSION = [
+    ShipmentStatus.LABEL_CREATED,
+    ShipmentStatus.PICKED_UP,
+    ShipmentStatus.IN_TRANSIT,
+    ShipmentStatus.OUT_FOR_DELIVERY,
+    ShipmentStatus.DELIVERED,
+]
+
+_LOCATIONS = {
+    ShipmentStatus.PICKED_UP: "San Francisco, CA",
+    ShipmentStatus.IN_TRANSIT: "Oakland, CA Hub",
+    ShipmentStatus.OUT_FOR_DELIVERY: "Reno, NV",
+    ShipmentStatus.DELIVERED: "ReturnFlow Warehouse, Reno, NV",
+}
+
+
+class MockCarrierClient:
+    """In-process carrier API stand-in with simulated latency."""
+
+    def __init__(
+        self,
+        database=None,
+        carrier: str = "UPS",
+        step_seconds: float = 3600.0,
+        latency_seconds: float = 0.0,
+    ):
+        """
+        Initialize the carrier stand-in.
+
+        Args:
+            database: Optional database used to seed shipments the carrier
+                has not seen yet from their stored tracking info
+            carrier: Carrier name reported on tracking info
+            step_seconds: Simulated time between scan events
+            latency_seconds: Simulated round-trip time of each API call
+        """
+        self.db = database
+        self.carrier = carrier
+        self.step_seconds = step_seconds
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+        # tracking_number -> (index into SHIPMENT_PROGRESSION, first seen epoch)
+        self._shipments: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def fetch_tracking(self, tracking_number: str) -> Optional[TrackingInfo]:
+        """
+        Fetch the current tracking info for a shipment.
+
+        Args:
+            tracking_number: Carrier tracking number
+
+        Returns:
+            TrackingInfo, or None for an empty tracking number
+        """
+        if not tracking_number:
+            return None
+
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+        now = time.time()
+        with self._lock:
+            self.calls += 1
+            if tracking_number not in self._shipments:
+                self._shipments[tracking_number] = (self._initial_step(tracking_number), now)
+            start_step, first_seen = self._shipments[tracking_number]
+
+        steps = int((now - first_seen) / self.step_seconds) if self.step_seconds > 0 else 0
+        step = min(start_step + steps, len(SHIPMENT_PROGRESSION) - 1)
+        status = SHIPMENT_PROGRESSION[step]
+        remaining_steps = len(SHIPMENT_PROGRESSION) - 1 - step
+
+        return TrackingInfo(
+            tracking_number=tracking_number,
+            carrier=self.carrier,
+            status=status,
+            last_update=datetime.fromtimestamp(first_seen + steps * self.step_seconds),
+            estimated_delivery=(
+                datetime.now() + timedelta(seconds=remaining_steps * self.step_seconds)
+                if remaining_steps
+                else None
+            ),
+            current_location=_LOCATIONS.get(status),
+        )
+
+    def _initial_step(self, tracking_number: str) -> int:
+        """Start a new shipment from its stored status, if any."""
+        if self.db is not None:
+            stored = self.db.get_tracking(tracking_number)
+            if stored and stored.status in SHIPMENT_PROGRESSION:
+                return SHIPMENT_PROGRESSION.index(stored.status)
+        return 0
@@ -0,0 +1,224 @@
+"""
+Bounded conversation history with spill-to-disk transcripts.
+
+Every turn appends the caller's words and the agent's reply to the
+context's ``conversation_history`` list, which used to grow for as long
+as the call lasted. ConversationHistory keeps only the most recent
+``max_entries`` entries in the context. Older entries are moved, a batch
+at a time, to an append-only gzip transcript per session, which is read
+back only when the full call is needed (an escalation handoff or a
+dispute review).
+
+Each spill appends one gzip member of JSON lines (entries encoded with
+``models.serialization``), so writing never rewrites earlier data and
+the file reads back as a single stream. The context records how many
+entries were spilled in ``history_spilled``, so contexts stay plain data
+that the Redis session store can share. Workers sharing sessions must
+then share the transcript directory as well.
+
+Transcripts are deleted when their session ends or is evicted, and
+independently of the session store by a sweep of transcripts untouched
+for ``max_age`` seconds: sessions that expire in Redis are never seen
+by this process. Every turn of a session with a transcript touches it,
+so a live call's transcript is never swept. A temporary directory
+created here is removed by ``close`` or, failing that, at exit.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+
+from models.serialization import decode, encode
+
+
+DEFAULT_MAX_ENTRIES = 40
+DEFAULT_SPILL_BATCH = 20
+DEFAULT_MAX_AGE = 24 * 3600.0
+
+
+class ConversationHistory:
+    """Appends turns to contexts, spilling old ones to per-session transcripts."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        spill_batch: int = DEFAULT_SPILL_BATCH,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+    ):
+        """
+        Initialize the history manager.
+
+        Args:
+            directory: Where transcripts are written (a private temporary
+                directory, created on the first spill, if omitted)
+            max_entries: Entries kept in the context after a spill; it
+                holds at most ``max_entries + spill_batch - 1``
+            spill_batch: Entries moved to disk at a time, so each spill
+                is one compressed write rather than one per turn
+            max_age: Seconds after its last turn that a transcript is
+                swept (None keeps transcripts until their session is
+                dropped); keep it above the session store's idle TTL
+        """
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        if spill_batch < 1:
+            raise ValueError("spill_batch must be at least 1")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("max_age must be positive")
+        self.max_entries = max_entries
+        self.spill_batch = spill_batch
+        self.max_age = max_age
+        self._directory = Path(directory) if directory is not None else None
+        # Removes the temporary directory, if this instance created one
+        self._cleanup: Optional[weakref.finalize] = None
+        self._next_sweep = time.time() + max_age / 10 if max_age is not None else None
+        self._lock = threading.Lock()
+        self.stats = {"spills": 0, "spilled_entries": 0, "loads": 0, "swept": 0}
+
+    @property
+    def directory(self) -> Path:
+        """Transcript directory, created if needed."""
+        with self._lock:
+            if self._directory is None:
+                self._directory = Path(tempfile.mkdtemp(prefix="returnflow-transcripts-"))
+                self._cleanup = weakref.finalize(
+                    self, shutil.rmtree, str(self._directory), ignore_errors=True
+                )
+            else:
+                self._directory.mkdir(parents=True, exist_ok=True)
+            return self._directory
+
+    def path_for(self, session_id: str) -> Path:
+        """Transcript file of a session."""
+        return self.directory / f"{quote(session_id, safe='')}.jsonl.gz"
+
+    # ==========================================================================
+    # WRITES
+    # ==========================================================================
+
+    def append(self, session_id: str, context: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """
+        Add an entry to a session's history, spilling the oldest if over the bound.
+
+        Args:
+            session_id: The conversation session ID
+            context: The session's context
+            entry: History entry (a dict of JSON values, datetimes and models)
+        """
+        history = context["conversation_history"]
+        history.append(entry)
+        self._sweep_if_due()
+        if len(history) < self.max_entries + self.spill_batch:
+            if context.get("history_spilled"):
+                # Keep a live call's transcript clear of the age sweep
+                try:
+                    os.utime(self.path_for(session_id))
+                except FileNotFoundError:
+                    pass
+            return
+
+        count = len(history) - self.max_entries
+        lines = "".join(
+            json.dumps(encode(old), separators=(",", ":")) + "\n" for old in history[:count]
+        )
+        path = self.path_for(session_id)
+        with self._lock:
+            with gzip.open(path, "at", encoding="utf-8") as transcript:
+                transcript.write(lines)
+            self.stats["spills"] += 1
+            self.stats["spilled_entries"] += count
+        del history[:count]
+        context["history_spilled"] = context.get("history_spilled", 0) + count
+
+    def discard(self, session_id: str) -> None:
+        """Delete a session's transcript, if it has one."""
+        if self._directory is None:
+            return
+        self.path_for(session_id).unlink(missing_ok=True)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Delete transcripts untouched for ``max_age`` seconds.
+
+        Runs from ``append`` every tenth of ``max_age``; call it directly
+        to sweep on another schedule.
+
+        Args:
+            now: Current epoch time (defaults to ``time.time()``)
+
+        Returns:
+            Number of transcripts deleted
+        """
+        if self.max_age is None or self._directory is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.max_age
+        swept = 0
+        try:
+            entries = list(os.scandir(self._directory))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            if not entry.name.endswith(".jsonl.gz"):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    swept += 1
+            except FileNotFoundError:
+                # Discarded or swept by another worker meanwhile
+                continue
+        with self._lock:
+            self.stats["swept"] += swept
+        return swept
+
+    def _sweep_if_due(self) -> None:
+        """Sweep old transcripts if a tenth of ``max_age`` passed since the last sweep."""
+        if self._next_sweep is None:
+            return
+        now = time.time()
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + self.max_age / 10
+        self.sweep(now)
+
+    def close(self) -> None:
+        """Remove the temporary transcript directory, if this instance created one."""
+        with self._lock:
+            cleanup, self._cleanup = self._cleanup, None
+            if cleanup is not None:
+                self._directory = None
+        if cleanup is not None:
+            cleanup()
+
+    # ==========================================================================
+    # READS
+    # ==========================================================================
+
+    def spilled(self, session_id: str) -> List[Dict[str, Any]]:
+        """Entries of a session that were moved to disk, oldest first."""
+        if self._directory is None:
+            return []
+        path = self.path_for(session_id)
+        if not path.exists():
+            return []
+        with self._lock:
+            self.stats["loads"] += 1
+            with gzip.open(path, "rt", encoding="utf-8") as transcript:
+                return [decode(json.loads(line)) for line in transcript]
+
+    def full_history(self, session_id: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """The whole conversation, oldest first: spilled entries, then those in the context."""
+        history = context.get("conversation_history", [])
+        if not context.get("history_spilled"):
+            return list(history)
+        return self.spilled(session_id) + list(history)
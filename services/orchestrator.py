@@ -1,7 +1,13 @@
 """Voice Orchestrator - Coordinates agent workflow and conversation flow."""
 
-from typing import Dict, Any, Optional
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Any, Iterator, List, MutableMapping, Optional, Tuple
 from datetime import datetime
+import asyncio
+import threading
+import time
+import uuid
 
 from agents import (
     IntentRouter,
@@ -11,7 +17,111 @@ from agents import (
     LogisticsAgent,
     TrackingRefundAgent,
 )
+from agents.base_agent import AgentResponse, BaseAgent
+from database.async_db import AsyncDatabase
 from database.mock_db import MockDatabase
+from services.carrier_client import MockCarrierClient
+from database.tracking_cache import TrackingCache
+from services.conversation_history import ConversationHistory
+from services.session_store import MemorySessionStore
+
+
+INITIAL_STATE = "intent_router"
+
+# Conversation state -> orchestrator attribute holding the agent for it.
+# Agents move the conversation by naming the next state in next_action;
+# "escalate" and "end" close a flow, so the next input starts over at the
+# intent router.
+STATE_AGENTS: Dict[str, str] = {
+    "intent_router": "intent_router",
+    "purchase_retrieval": "purchase_agent",
+    "await_order_selection": "purchase_agent",
+    "return_classification": "classification_agent",
+    "return_processing": "processing_agent",
+    "logistics": "logistics_agent",
+    "await_user_response": "logistics_agent",
+    "tracking_refund": "tracking_agent",
+    "escalate": "intent_router",
+    "end": "intent_router",
+}
+
+
+class StateMetrics:
+    """
+    Turn counts and handler timing per conversation state.
+
+    One instance is shared by every session of an orchestrator, and may
+    be updated from several threads. Async turns are timed wall-clock,
+    including the time spent awaiting storage.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # state -> [turns, errors, total seconds, slowest seconds]
+        self._states: Dict[str, list] = {}
+        self.transitions: Counter = Counter()
+        # Sessions found in a state with no handler, and next_action values
+        # naming no state; both fall back to INITIAL_STATE
+        self.unknown_states = 0
+        self.invalid_transitions = 0
+
+    @contextmanager
+    def timing(self, state: str) -> Iterator[None]:
+        """Time one turn handled in ``state``, counting it as an error if it raises."""
+        start = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self._states.get(state)
+                if entry is None:
+                    entry = self._states[state] = [0, 0, 0.0, 0.0]
+                entry[0] += 1
+                entry[1] += failed
+                entry[2] += elapsed
+                if elapsed > entry[3]:
+                    entry[3] = elapsed
+
+    def record_transition(self, from_state: str, to_state: str, valid: bool = True) -> None:
+        with self._lock:
+            self.transitions[from_state, to_state] += 1
+            if not valid:
+                self.invalid_transitions += 1
+
+    def record_unknown_state(self) -> None:
+        with self._lock:
+            self.unknown_states += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current metrics as plain data, for dashboards.
+
+        Returns:
+            Dict with per-state ``states`` (turns, errors, total_ms,
+            mean_ms, max_ms), ``transitions`` keyed "from->to", and the
+            ``unknown_states`` and ``invalid_transitions`` counts
+        """
+        with self._lock:
+            states = {
+                state: {
+                    "turns": turns,
+                    "errors": errors,
+                    "total_ms": round(total * 1000, 3),
+                    "mean_ms": round(total * 1000 / turns, 3),
+                    "max_ms": round(slowest * 1000, 3),
+                }
+                for state, (turns, errors, total, slowest) in self._states.items()
+            }
+            transitions = {f"{a}->{b}": count for (a, b), count in self.transitions.items()}
+            return {
+                "states": states,
+                "transitions": transitions,
+                "unknown_states": self.unknown_states,
+                "invalid_transitions": self.invalid_transitions,
+            }
 
 
 class VoiceOrchestrator:
@@ -24,20 +134,70 @@ class VoiceOrchestrator:
     3. Manages the conversation state machine
     """
 
-    def __init__(self, database: MockDatabase):
-        """Initialize the orchestrator with all agents."""
+    def __init__(
+        self,
+        database: MockDatabase,
+        tracking_cache: Optional[TrackingCache] = None,
+        async_database: Optional[AsyncDatabase] = None,
+        session_store: Optional[MutableMapping[str, Dict[str, Any]]] = None,
+        history: Optional[ConversationHistory] = None,
+    ):
+        """
+        Initialize the orchestrator with all agents.
+
+        Args:
+            database: Storage engine shared by the agents
+            tracking_cache: Tracking cache (a refreshing one is started if
+                omitted, and stopped by ``close``)
+            async_database: Awaitable view of ``database`` used by
+                ``process_input_async`` (wraps ``database`` if omitted)
+            session_store: Mapping of session ID to conversation context
+                (a MemorySessionStore, which drops idle and least recently
+                used sessions, if omitted; a RedisSessionStore shares
+                sessions between workers)
+            history: Keeps each context's conversation history bounded,
+                spilling older turns to transcripts on disk (a
+                ConversationHistory in a temporary directory if omitted)
+        """
         self.db = database
+        self.async_db = async_database or AsyncDatabase(database)
+
+        # Tracking answers are served from memory; a background thread keeps
+        # them current from the (stand-in) carrier API
+        self._owns_tracking_cache = tracking_cache is None
+        if tracking_cache is None:
+            tracking_cache = TrackingCache(MockCarrierClient(database), database)
+            tracking_cache.start()
+        self.tracking_cache = tracking_cache
 
         # Initialize all agents
         self.intent_router = IntentRouter()
-        self.purchase_agent = PurchaseRetrievalAgent(database)
-        self.classification_agent = ReturnClassificationAgent(database)
-        self.processing_agent = ReturnProcessingAgent(database)
+        self.purchase_agent = PurchaseRetrievalAgent(database, self.async_db)
+        self.classification_agent = ReturnClassificationAgent(database, self.async_db)
+        self.processing_agent = ReturnProcessingAgent(database, self.async_db)
         self.logistics_agent = LogisticsAgent()
-        self.tracking_agent = TrackingRefundAgent(database)
+        self.tracking_agent = TrackingRefundAgent(database, tracking_cache, self.async_db)
 
-        # Conversation context
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        # Conversation state -> handling agent, resolved once
+        self._handlers: Dict[str, BaseAgent] = {
+            state: getattr(self, attribute) for state, attribute in STATE_AGENTS.items()
+        }
+        self.metrics = StateMetrics()
+
+        self._owns_history = history is None
+        self.history = history if history is not None else ConversationHistory()
+
+        # Conversation context. Contexts are stored back after every change,
+        # so stores that hand out copies (Redis) see each update
+        if session_store is None:
+            session_store = MemorySessionStore()
+        if isinstance(session_store, MemorySessionStore) and session_store.on_evict is None:
+            session_store.on_evict = self._session_dropped
+        self.sessions: MutableMapping[str, Dict[str, Any]] = session_store
+
+        # session_id -> [lock, turns holding or awaiting it], for sessions with
+        # an async turn in flight
+        self._turn_locks: Dict[str, list] = {}
 
     def start_conversation(self, user_id: str) -> str:
         """
@@ -49,10 +209,14 @@ class VoiceOrchestrator:
         Returns:
             Session ID
         """
-        session_id = f"session_{user_id}_{int(datetime.now().timestamp())}"
+        # The random suffix keeps IDs unique when one caller ID starts many
+        # sessions in the same second
+        session_id = f"session_{user_id}_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
+        # A transcript left by an earlier session with the same ID is not this call's
+        self.history.discard(session_id)
         self.sessions[session_id] = {
             "user_id": user_id,
-            "current_agent": "intent_router",
+            "current_agent": INITIAL_STATE,
             "conversation_history": [],
             "created_at": datetime.now(),
         }
@@ -71,57 +235,161 @@ class VoiceOrchestrator:
         Returns:
             Tuple of (success, response_message, data)
         """
-        if session_id not in self.sessions:
-            return (
-                False,
-                "Session not found. Please start a new conversation.",
-                None,
-            )
+        context = self._begin_turn(session_id, user_input)
+        if context is None:
+            return self._session_not_found()
 
-        context = self.sessions[session_id]
-        current_agent = context.get("current_agent", "intent_router")
+        state, agent = self._agent_for(context)
+        with self.metrics.timing(state):
+            response = agent.process(user_input, context)
+        return self._finish_turn(session_id, context, state, response)
 
-        # Add to conversation history
-        context["conversation_history"].append(
-            {"timestamp": datetime.now(), "user": user_input}
+    async def process_input_async(
+        self, session_id: str, user_input: str
+    ) -> tuple[bool, str, Optional[Dict[str, Any]]]:
+        """
+        Process user input without blocking the event loop.
+
+        Same conversation flow as ``process_input``, but agents await
+        their storage lookups, so one loop can serve many sessions.
+        Turns of one session run one at a time, in the order they were
+        submitted; turns of different sessions run concurrently. Call
+        from a single event loop.
+
+        Args:
+            session_id: The conversation session ID
+            user_input: The user's voice input
+
+        Returns:
+            Tuple of (success, response_message, data)
+        """
+        async with self._session_turn(session_id):
+            context = self._begin_turn(session_id, user_input)
+            if context is None:
+                return self._session_not_found()
+
+            state, agent = self._agent_for(context)
+            with self.metrics.timing(state):
+                response = await agent.process_async(user_input, context)
+            return self._finish_turn(session_id, context, state, response)
+
+    @asynccontextmanager
+    async def _session_turn(self, session_id: str) -> AsyncIterator[None]:
+        """Hold a session's turn lock; asyncio.Lock wakes waiters in FIFO order."""
+        entry = self._turn_locks.get(session_id)
+        if entry is None:
+            entry = self._turn_locks[session_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            # Drop the lock with the last turn, so idle sessions cost nothing
+            entry[1] -= 1
+            if not entry[1]:
+                del self._turn_locks[session_id]
+
+    @staticmethod
+    def _session_not_found() -> tuple[bool, str, Optional[Dict[str, Any]]]:
+        """Result for input on an unknown or ended session."""
+        return (
+            False,
+            "Session not found. Please start a new conversation.",
+            None,
         )
 
-        # Route to appropriate agent
-        if current_agent == "intent_router":
-            response = self.intent_router.process(user_input, context)
-        elif current_agent == "purchase_retrieval" or current_agent == "await_order_selection":
-            response = self.purchase_agent.process(user_input, context)
-        elif current_agent == "return_classification":
-            response = self.classification_agent.process(user_input, context)
-        elif current_agent == "return_processing":
-            response = self.processing_agent.process(user_input, context)
-        elif current_agent == "logistics" or current_agent == "await_user_response":
-            response = self.logistics_agent.process(user_input, context)
-        elif current_agent == "tracking_refund":
-            response = self.tracking_agent.process(user_input, context)
-        else:
-            # Default to intent router
-            response = self.intent_router.process(user_input, context)
+    def _begin_turn(self, session_id: str, user_input: str) -> Optional[Dict[str, Any]]:
+        """Look up the session and record the user's input."""
+        context = self.sessions.get(session_id)
+        if context is None:
+            return None
+
+        # Add to conversation history
+        self.history.append(session_id, context, {"timestamp": datetime.now(), "user": user_input})
+        return context
+
+    def register_state(self, state: str, agent: BaseAgent) -> None:
+        """
+        Route a conversation state to an agent.
+
+        Agents may then name ``state`` in ``next_action``. Registering a
+        known state replaces its agent.
+        """
+        self._handlers[state] = agent
 
-        # Update context with next agent
-        if response.next_action:
-            context["current_agent"] = response.next_action
+    def _agent_for(self, context: Dict[str, Any]) -> Tuple[str, BaseAgent]:
+        """Look up the conversation's state and the agent that handles it."""
+        state = context.get("current_agent", INITIAL_STATE)
+        agent = self._handlers.get(state)
+        if agent is None:
+            # Saved by an older deployment, or corrupted: start over
+            self.metrics.record_unknown_state()
+            state = context["current_agent"] = INITIAL_STATE
+            agent = self._handlers[state]
+        return state, agent
+
+    def _finish_turn(
+        self, session_id: str, context: Dict[str, Any], state: str, response: AgentResponse
+    ) -> tuple[bool, str, Optional[Dict[str, Any]]]:
+        """Advance the conversation state and record the agent's reply."""
+        next_state = response.next_action
+        if next_state:
+            valid = next_state in self._handlers
+            self.metrics.record_transition(state, next_state, valid)
+            context["current_agent"] = next_state if valid else INITIAL_STATE
 
         # Add response to history
-        context["conversation_history"].append(
-            {"timestamp": datetime.now(), "agent": response.message}
+        self.history.append(
+            session_id, context, {"timestamp": datetime.now(), "agent": response.message}
         )
+        self.sessions[session_id] = context
 
-        return (response.success, response.message, response.data)
+        data = response.data
+        if next_state == "escalate":
+            # The specialist taking over needs the whole call, including
+            # the turns spilled to disk
+            data = dict(data or {})
+            data["transcript"] = self.history.full_history(session_id, context)
+        return (response.success, response.message, data)
 
     def get_context(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get the current conversation context."""
         return self.sessions.get(session_id)
 
+    def get_transcript(self, session_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a session's whole conversation history, oldest first.
+
+        Turns spilled to disk are read back, so this is for disputes and
+        escalations rather than every turn.
+        """
+        context = self.sessions.get(session_id)
+        if context is None:
+            return None
+        return self.history.full_history(session_id, context)
+
     def end_conversation(self, session_id: str) -> None:
         """End a conversation session."""
         if session_id in self.sessions:
             del self.sessions[session_id]
+        self.history.discard(session_id)
+
+    def _session_dropped(self, session_id: str, context: Dict[str, Any], reason: str) -> None:
+        """Delete the transcript of a session the session store expired or evicted."""
+        self.history.discard(session_id)
+
+    def close(self) -> None:
+        """Stop the background work this orchestrator started."""
+        if self._owns_tracking_cache:
+            self.tracking_cache.stop()
+        if self._owns_history:
+            self.history.close()
+
+    def __enter__(self) -> "VoiceOrchestrator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def identify_user(self, session_id: str, phone: str = None, user_id: str = None) -> bool:
         """
@@ -138,19 +406,38 @@ class VoiceOrchestrator:
         if session_id not in self.sessions:
             return False
 
-        context = self.sessions[session_id]
-
         if phone:
             user = self.db.get_user_by_phone(phone)
-            if user:
-                context["user_id"] = user.user_id
-                context["user"] = user
-                return True
         elif user_id:
             user = self.db.get_user(user_id)
-            if user:
-                context["user_id"] = user.user_id
-                context["user"] = user
-                return True
+        else:
+            user = None
+        return self._attach_user(session_id, user)
 
-        return False
+    async def identify_user_async(
+        self, session_id: str, phone: str = None, user_id: str = None
+    ) -> bool:
+        """Async variant of ``identify_user``."""
+        if session_id not in self.sessions:
+            return False
+
+        if phone:
+            user = await self.async_db.get_user_by_phone(phone)
+        elif user_id:
+            user = await self.async_db.get_user(user_id)
+        else:
+            user = None
+        return self._attach_user(session_id, user)
+
+    def _attach_user(self, session_id: str, user) -> bool:
+        """Store an identified user in the session context."""
+        if not user:
+            return False
+        # The session may have expired or been evicted during the lookup
+        context = self.sessions.get(session_id)
+        if context is None:
+            return False
+        context["user_id"] = user.user_id
+        context["user"] = user
+        self.sessions[session_id] = context
+        return True
@@ -0,0 +1,649 @@
+"""
+Redis-backed conversation sessions and hot entity cache.
+
+Sessions kept in ``VoiceOrchestrator.sessions`` and entities cached in
+process memory tie a caller to one worker. Keeping both in Redis lets
+any worker pick up any turn of any call:
+
+    client = RedisClient.from_url(config.redis_url)
+    orchestrator = VoiceOrchestrator(
+        RedisCachedDatabase(create_database(), client),
+        session_store=RedisSessionStore(client),
+    )
+
+The client speaks RESP directly over one socket with no third-party
+dependency. Batches go out as one MGET/MSET or as a pipeline, so N keys
+cost one round trip rather than N. Cached entities are JSON in the
+tagged format of ``models.serialization``, so they stay readable from
+``redis-cli``; sessions, rewritten every turn, use the denser and faster
+``models.codec`` binary encoding by default.
+Use ``services.resp_server`` as a local stand-in when no Redis server is
+available.
+"""
+
+import json
+import socket
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from database.phone import normalize_phone
+from models.order import Order, OrderItem
+from models.return_request import ReturnRequest, ReturnStatus
+from models import codec
+from models.serialization import decode, encode
+from models.user import User
+from services.resp_server import SocketReader
+
+
+DEFAULT_SESSION_TTL = 3600
+DEFAULT_ENTITY_TTL = 30
+
+
+class RedisError(Exception):
+    """The server answered with an error reply."""
+
+
+class RedisConnectionError(RedisError):
+    """The server could not be reached or dropped the connection."""
+
+
+# ==============================================================================
+# CLIENT
+# ==============================================================================
+
+
+def pack_command(args: Sequence[Any]) -> bytes:
+    """Encode one command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode()
+        else:
+            data = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class RedisClient:
+    """Minimal synchronous Redis client over a single connection."""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        timeout: float = 5.0,
+    ):
+        """
+        Initialize the client (it connects on first use).
+
+        Args:
+            host: Server host
+            port: Server port
+            db: Database number selected after connecting
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self.round_trips = 0
+
+        self._sock: Optional[socket.socket] = None
+        self._reader: Optional[SocketReader] = None
+        # One request/reply exchange on the socket at a time
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisClient":
+        """Create a client from a ``redis://host:port/db`` URL."""
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported Redis URL: {url}")
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(parsed.hostname or "localhost", parsed.port or 6379, db, **kwargs)
+
+    # ==========================================================================
+    # CONNECTION AND PROTOCOL
+    # ==========================================================================
+
+    def _connect(self) -> None:
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError as e:
+            raise RedisConnectionError(f"Cannot connect to {self.host}:{self.port}: {e}") from e
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._reader = SocketReader(sock)
+        if self.db:
+            self._exchange([("SELECT", self.db)], raise_errors=True)
+
+    def close(self) -> None:
+        """Close the connection (the next command reconnects)."""
+        with self._lock:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+                self._reader = None
+
+    def __enter__(self) -> "RedisClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise RedisConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise RedisConnectionError("Connection closed by server")
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def _exchange(self, commands: Sequence[Sequence[Any]], raise_errors: bool) -> List[Any]:
+        """Send commands in one write and read their replies (lock held)."""
+        if self._sock is None:
+            self._connect()
+        try:
+            self._sock.sendall(b"".join(pack_command(command) for command in commands))
+            replies = [self._read_reply() for _ in commands]
+        except (OSError, RedisConnectionError) as e:
+            # The connection is in an unknown state; start over next time
+            self._disconnect()
+            if isinstance(e, RedisConnectionError):
+                raise
+            raise RedisConnectionError(str(e)) from e
+        self.round_trips += 1
+        if raise_errors:
+            for reply in replies:
+                if isinstance(reply, RedisError):
+                    raise reply
+        return replies
+
+    def execute(self, *args) -> Any:
+        """
+        Run one command.
+
+        Raises:
+            RedisError: On an error reply
+            RedisConnectionError: If the server is unreachable
+        """
+        with self._lock:
+            return self._exchange([args], raise_errors=True)[0]
+
+    def execute_many(self, commands: Sequence[Sequence[Any]], raise_errors: bool = True) -> List:
+        """Run several commands in one round trip and return their replies."""
+        if not commands:
+            return []
+        with self._lock:
+            return self._exchange(commands, raise_errors)
+
+    def pipeline(self) -> "Pipeline":
+        """Queue commands to send together; see Pipeline."""
+        return Pipeline(self)
+
+    # ==========================================================================
+    # COMMANDS
+    # ==========================================================================
+
+    def ping(self) -> bool:
+        return self.execute("PING") == "PONG"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.execute("GET", key)
+
+    def set(self, key: str, value, ex: Optional[int] = None) -> bool:
+        """Set a key, expiring after ``ex`` seconds if given."""
+        args = ("SET", key, value) + (("EX", ex) if ex else ())
+        return self.execute(*args) == "OK"
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """Fetch many keys in one command (None for missing keys)."""
+        return self.execute("MGET", *keys) if keys else []
+
+    def mset(self, mapping: Dict[str, Any], ex: Optional[int] = None) -> None:
+        """
+        Set many keys in one round trip.
+
+        MSET has no expiry option, so with ``ex`` it is followed by one
+        EXPIRE per key in the same pipeline.
+        """
+        if not mapping:
+            return
+        commands = [("MSET", *[part for item in mapping.items() for part in item])]
+        if ex:
+            commands.extend(("EXPIRE", key, ex) for key in mapping)
+        self.execute_many(commands)
+
+    def delete(self, *keys: str) -> int:
+        return self.execute("DEL", *keys) if keys else 0
+
+    def exists(self, key: str) -> bool:
+        return self.execute("EXISTS", key) > 0
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return self.execute("EXPIRE", key, seconds) == 1
+
+    def ttl(self, key: str) -> int:
+        return self.execute("TTL", key)
+
+    def keys(self, pattern: str) -> List[str]:
+        return [key.decode() for key in self.execute("KEYS", pattern)]
+
+    def flushdb(self) -> None:
+        self.execute("FLUSHDB")
+
+
+class Pipeline:
+    """
+    Commands queued on the client and sent in a single round trip.
+
+        with client.pipeline() as pipe:
+            pipe.set("a", 1).set("b", 2).get("a")
+        pipe.results  # ["OK", "OK", b"1"]
+
+    Error replies are returned in place (as RedisError instances) rather
+    than raised, so one failed command does not hide the others' results.
+    """
+
+    def __init__(self, client: RedisClient):
+        self.client = client
+        self.commands: List[Tuple] = []
+        self.results: List[Any] = []
+
+    def execute_command(self, *args) -> "Pipeline":
+        self.commands.append(args)
+        return self
+
+    def get(self, key: str) -> "Pipeline":
+        return self.execute_command("GET", key)
+
+    def set(self, key: str, value, ex: Optional[int] = None) -> "Pipeline":
+        return self.execute_command("SET", key, value, *(("EX", ex) if ex else ()))
+
+    def delete(self, *keys: str) -> "Pipeline":
+        return self.execute_command("DEL", *keys)
+
+    def expire(self, key: str, seconds: int) -> "Pipeline":
+        return self.execute_command("EXPIRE", key, seconds)
+
+    def execute(self) -> List[Any]:
+        """Send the queued commands and return their replies in order."""
+        commands, self.commands = self.commands, []
+        self.results = self.client.execute_many(commands, raise_errors=False)
+        return self.results
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.execute()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(encode(value), separators=(",", ":"))
+
+
+def _loads(raw: bytes) -> Any:
+    return decode(json.loads(raw))
+
+
+_SESSION_ENCODINGS = {
+    "binary": (codec.dumps, codec.loads),
+    "json": (_dumps, _loads),
+}
+
+
+# ==============================================================================
+# SESSIONS
+# ==============================================================================
+
+
+class RedisSessionStore(MutableMapping):
+    """
+    Conversation sessions in Redis, as a drop-in for the orchestrator's dict.
+
+    Each session is one key holding its encoded context, refreshed with a
+    sliding TTL on every write so abandoned calls expire on their own.
+    Reads return a fresh copy: changes are only shared once the context
+    is stored back (the orchestrator does so at the end of every turn).
+    """
+
+    def __init__(
+        self,
+        client: RedisClient,
+        prefix: str = "returnflow:session:",
+        ttl: Optional[int] = DEFAULT_SESSION_TTL,
+        encoding: str = "binary",
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            client: Redis connection
+            prefix: Key prefix for session keys
+            ttl: Seconds a session lives after its last write (None keeps it)
+            encoding: "binary" (models.codec) or "json" (readable in redis-cli)
+        """
+        if encoding not in _SESSION_ENCODINGS:
+            raise ValueError(f"Unknown session encoding: {encoding}")
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.encoding = encoding
+        self._dumps, self._loads = _SESSION_ENCODINGS[encoding]
+
+    def _key(self, session_id: str) -> str:
+        return self.prefix + session_id
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        raw = self.client.get(self._key(session_id))
+        if raw is None:
+            raise KeyError(session_id)
+        return self._loads(raw)
+
+    def __setitem__(self, session_id: str, context: Dict[str, Any]) -> None:
+        self.client.set(self._key(session_id), self._dumps(context), ex=self.ttl)
+
+    def __delitem__(self, session_id: str) -> None:
+        if not self.client.delete(self._key(session_id)):
+            raise KeyError(session_id)
+
+    def __contains__(self, session_id) -> bool:
+        return self.client.exists(self._key(session_id))
+
+    def __iter__(self) -> Iterator[str]:
+        # KEYS walks the whole keyspace; fine for admin use, not per turn
+        start = len(self.prefix)
+        return iter([key[start:] for key in self.client.keys(self.prefix + "*")])
+
+    def __len__(self) -> int:
+        return len(self.client.keys(self.prefix + "*"))
+
+    def get_many(self, session_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch several sessions with one MGET; missing ones are left out."""
+        raws = self.client.mget([self._key(session_id) for session_id in session_ids])
+        return {
+            session_id: self._loads(raw)
+            for session_id, raw in zip(session_ids, raws)
+            if raw is not None
+        }
+
+    def save_many(self, contexts: Dict[str, Dict[str, Any]]) -> None:
+        """Store several sessions in one round trip."""
+        self.client.mset(
+            {
+                self._key(session_id): self._dumps(context)
+                for session_id, context in contexts.items()
+            },
+            ex=self.ttl,
+        )
+
+
+def create_session_store(redis_url: Optional[str] = None):
+    """
+    Session store selected by configuration.
+
+    Returns a RedisSessionStore when ``SESSION_STORE=redis`` (connecting to
+    ``redis_url`` or ``REDIS_URL``), otherwise a MemorySessionStore that
+    keeps sessions in process memory.
+    """
+    from config import config
+    from services.session_store import MemorySessionStore
+
+    if redis_url is None:
+        if config.session_store != "redis":
+            return MemorySessionStore(config.session_ttl, config.session_max_sessions)
+        redis_url = config.redis_url or "redis://localhost:6379/0"
+    return RedisSessionStore(RedisClient.from_url(redis_url), ttl=config.session_ttl)
+
+
+# ==============================================================================
+# ENTITY CACHE
+# ==============================================================================
+
+
+class RedisCachedDatabase:
+    """
+    Storage engine wrapper caching hot entities in Redis.
+
+    Like CachedDatabase, but the cache is shared by every worker using
+    the same Redis: users, orders and returns are read through by ID
+    (phone numbers as pointers to user IDs), and writes made through the
+    wrapper delete the affected keys. ``get_users``/``get_orders`` fetch
+    many entities with one MGET and backfill misses with one MSET.
+    """
+
+    def __init__(
+        self,
+        backend,
+        client: RedisClient,
+        ttl: int = DEFAULT_ENTITY_TTL,
+        prefix: str = "returnflow:",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage engine to read through to
+            client: Redis connection
+            ttl: Seconds an entity is served before it is re-read
+            prefix: Key prefix for entity keys
+        """
+        self.backend = backend
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _key(self, kind: str, entity_id: str) -> str:
+        return f"{self.prefix}{kind}:{entity_id}"
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from Redis."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def invalidate(self, *keys: Tuple[str, str]) -> None:
+        """Delete cached entities, e.g. ``("user", "USER001")``."""
+        if keys:
+            self.stats["invalidations"] += self.client.delete(
+                *[self._key(kind, entity_id) for kind, entity_id in keys]
+            )
+
+    # ==========================================================================
+    # CACHED READS
+    # ==========================================================================
+
+    def _read_through(self, kind: str, entity_id: str, load):
+        raw = self.client.get(self._key(kind, entity_id))
+        if raw is not None:
+            self.stats["hits"] += 1
+            return _loads(raw)
+        self.stats["misses"] += 1
+        entity = load(entity_id)
+        # Absent records are not cached so a later insert is seen at once
+        if entity is not None:
+            self.client.set(self._key(kind, entity_id), _dumps(entity), ex=self.ttl)
+        return entity
+
+    def _read_many(self, kind: str, entity_ids: Sequence[str], load) -> Dict[str, Any]:
+        """MGET the IDs, load the misses one by one and MSET them back."""
+        entity_ids = list(dict.fromkeys(entity_ids))
+        raws = self.client.mget([self._key(kind, entity_id) for entity_id in entity_ids])
+        found: Dict[str, Any] = {}
+        backfill: Dict[str, str] = {}
+        for entity_id, raw in zip(entity_ids, raws):
+            if raw is not None:
+                self.stats["hits"] += 1
+                found[entity_id] = _loads(raw)
+                continue
+            self.stats["misses"] += 1
+            entity = load(entity_id)
+            if entity is not None:
+                found[entity_id] = entity
+                backfill[self._key(kind, entity_id)] = _dumps(entity)
+        self.client.mset(backfill, ex=self.ttl)
+        return found
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        """Retrieve a user by ID."""
+        return self._read_through("user", user_id, self.backend.get_user)
+
+    def get_users(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        """Retrieve many users by ID in one round trip (absent IDs are left out)."""
+        return self._read_many("user", user_ids, self.backend.get_user)
+
+    def get_user_by_phone(self, phone: str) -> Optional[User]:
+        """Retrieve a user by phone number in any format."""
+        phone_key = normalize_phone(phone)
+        if not phone_key:
+            return None
+        user_id = self.client.get(self._key("phone", phone_key))
+        if user_id is not None:
+            user = self.get_user(user_id.decode())
+            # The user may since have changed number
+            if user is not None and normalize_phone(user.phone) == phone_key:
+                return user
+        user = self.backend.get_user_by_phone(phone)
+        if user is not None:
+            self.client.mset(
+                {
+                    self._key("phone", phone_key): user.user_id,
+                    self._key("user", user.user_id): _dumps(user),
+                },
+                ex=self.ttl,
+            )
+        return user
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Retrieve an order by ID."""
+        return self._read_through("order", order_id, self.backend.get_order)
+
+    def get_orders(self, order_ids: Sequence[str]) -> Dict[str, Order]:
+        """Retrieve many orders by ID in one round trip (absent IDs are left out)."""
+        return self._read_many("order", order_ids, self.backend.get_order)
+
+    def get_items_bulk(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], OrderItem]:
+        """Resolve many (order_id, item_id) pairs, fetching their orders with one MGET."""
+        pairs = list(pairs)
+        orders = self.get_orders([order_id for order_id, _ in pairs])
+        found: Dict[Tuple[str, str], OrderItem] = {}
+        for order_id, item_id in pairs:
+            order = orders.get(order_id)
+            item = order.get_item_by_id(item_id) if order else None
+            if item is not None:
+                found[order_id, item_id] = item
+        return found
+
+    def get_return(self, return_id: str) -> Optional[ReturnRequest]:
+        """Retrieve a return request by ID."""
+        return self._read_through("return", return_id, self.backend.get_return)
+
+    # ==========================================================================
+    # WRITES (write through, then invalidate)
+    # ==========================================================================
+
+    def add_user(self, user: User) -> User:
+        """Add or replace a user."""
+        result = self.backend.add_user(user)
+        self.invalidate(("user", user.user_id), ("phone", normalize_phone(user.phone)))
+        return result
+
+    def bulk_insert_users(self, users: Iterable[User]) -> int:
+        """Insert or replace many users."""
+        users = list(users)
+        count = self.backend.bulk_insert_users(users)
+        self.invalidate(
+            *[("user", user.user_id) for user in users],
+            *[("phone", normalize_phone(user.phone)) for user in users],
+        )
+        return count
+
+    def add_order(self, order: Order) -> Order:
+        """Add or replace an order."""
+        result = self.backend.add_order(order)
+        self.invalidate(("order", order.order_id))
+        return result
+
+    def bulk_insert_orders(self, orders: Iterable[Order]) -> int:
+        """Insert or replace many orders."""
+        orders = list(orders)
+        count = self.backend.bulk_insert_orders(orders)
+        self.invalidate(*[("order", order.order_id) for order in orders])
+        return count
+
+    def create_return(self, return_request: ReturnRequest) -> ReturnRequest:
+        """Create a new return request (also bumps the user's return count)."""
+        result = self.backend.create_return(return_request)
+        self.invalidate(("return", return_request.return_id), ("user", return_request.user_id))
+        return result
+
+    def bulk_insert_returns(self, returns: Iterable[ReturnRequest]) -> int:
+        """Insert many existing returns without bumping return counts."""
+        returns = list(returns)
+        count = self.backend.bulk_insert_returns(returns)
+        self.invalidate(*[("return", ret.return_id) for ret in returns])
+        return count
+
+    def update_return_status(
+        self, return_id: str, status: ReturnStatus
+    ) -> Optional[ReturnRequest]:
+        """Update the status of a return request."""
+        result = self.backend.update_return_status(return_id, status)
+        self.invalidate(("return", return_id))
+        return result
+
+    def update_return_statuses(self, updates: Iterable[Tuple[str, ReturnStatus]]) -> int:
+        """Update the status of many returns in one call."""
+        updates = list(updates)
+        count = self.backend.update_return_statuses(updates)
+        self.invalidate(*[("return", return_id) for return_id, _ in updates])
+        return count
+
+    def set_return_tracking_number(
+        self, return_id: str, tracking_number: Optional[str]
+    ) -> Optional[ReturnRequest]:
+        """Assign, change or clear the tracking number of a return."""
+        result = self.backend.set_return_tracking_number(return_id, tracking_number)
+        self.invalidate(("return", return_id))
+        return result
+
+    def __getattr__(self, name: str):
+        """Pass every other read and write straight to the backend."""
+        backend = self.__dict__.get("backend")
+        if backend is None or name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(backend, name)
@@ -0,0 +1,480 @@
+"""
+Local Redis stand-in speaking the RESP protocol.
+
+Implements the subset of Redis the session store and entity cache use
+(strings with expiry, MGET/MSET, key management), so the Redis adapter
+can be tested and benchmarked on one machine without a Redis install.
+Each connection is served by its own thread; keyspace operations are
+serialized by one lock, as Redis serializes commands. Pipelined requests
+are answered as they arrive and replies are flushed once the client's
+pending input is drained, so a pipeline costs one round trip.
+
+Usage:
+    python -m services.resp_server --port 6379
+"""
+
+import argparse
+import fnmatch
+import socket
+import socketserver
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Reply sentinels distinct from bulk strings
+class SimpleString(str):
+    """A RESP simple string reply such as ``+OK``."""
+
+
+class ErrorReply(str):
+    """A RESP error reply such as ``-ERR unknown command``."""
+
+
+OK = SimpleString("OK")
+PONG = SimpleString("PONG")
+
+
+class ProtocolError(Exception):
+    """Malformed RESP input from a client."""
+
+
+# ==============================================================================
+# PROTOCOL
+# ==============================================================================
+
+
+def encode_reply(value) -> bytes:
+    """Encode a reply value as RESP2."""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, ErrorReply):
+        return b"-" + value.encode() + b"\r\n"
+    if isinstance(value, SimpleString):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    raise TypeError(f"Cannot encode {type(value).__name__} as RESP")
+
+
+def read_command(stream) -> Optional[List[bytes]]:
+    """
+    Read one command (an array of bulk strings, or an inline command).
+
+    Returns:
+        The command's arguments, or None at end of stream
+    """
+    line = stream.readline()
+    if not line:
+        return None
+    if not line.endswith(b"\r\n"):
+        raise ProtocolError("unterminated line")
+    if line[:1] != b"*":
+        # Inline command, as typed into telnet
+        return line.split()
+    try:
+        count = int(line[1:-2])
+    except ValueError:
+        raise ProtocolError("invalid multibulk length")
+    args = []
+    for _ in range(count):
+        header = stream.readline()
+        if header[:1] != b"$":
+            raise ProtocolError("expected '$'")
+        try:
+            length = int(header[1:-2])
+        except ValueError:
+            raise ProtocolError("invalid bulk length")
+        data = stream.read(length + 2)
+        if len(data) != length + 2:
+            return None
+        args.append(data[:-2])
+    return args
+
+
+# ==============================================================================
+# KEYSPACE
+# ==============================================================================
+
+
+class Keyspace:
+    """String keys with optional expiry, evaluated lazily on access."""
+
+    def __init__(self):
+        # key -> (value, expires_at monotonic seconds or None)
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.lock = threading.Lock()
+
+    def _live(self, key: bytes, now: float) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: bytes, now: float) -> Optional[bytes]:
+        entry = self._live(key, now)
+        return entry[0] if entry else None
+
+    def set(self, key: bytes, value: bytes, expires_at: Optional[float]) -> None:
+        self._data[key] = (value, expires_at)
+
+    def delete(self, key: bytes, now: float) -> bool:
+        return self._live(key, now) is not None and self._data.pop(key, None) is not None
+
+    def expire(self, key: bytes, expires_at: Optional[float], now: float) -> bool:
+        entry = self._live(key, now)
+        if entry is None:
+            return False
+        self._data[key] = (entry[0], expires_at)
+        return True
+
+    def ttl_ms(self, key: bytes, now: float) -> int:
+        """Remaining life in ms; -1 without expiry, -2 when missing (as Redis)."""
+        entry = self._live(key, now)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return int((entry[1] - now) * 1000)
+
+    def keys(self, now: float) -> List[bytes]:
+        return [key for key in list(self._data) if self._live(key, now) is not None]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# ==============================================================================
+# COMMANDS
+# ==============================================================================
+
+
+class CommandError(Exception):
+    """A command failed; the message becomes the error reply."""
+
+
+def _int(arg: bytes) -> int:
+    try:
+        return int(arg)
+    except ValueError:
+        raise CommandError("ERR value is not an integer or out of range")
+
+
+def _arity(args: List[bytes], minimum: int, exact: bool = False) -> None:
+    if len(args) < minimum or (exact and len(args) != minimum):
+        name = args[0].decode(errors="replace").lower()
+        raise CommandError(f"ERR wrong number of arguments for '{name}' command")
+
+
+class CommandTable:
+    """Executes commands against a keyspace."""
+
+    def __init__(self, keyspace: Keyspace):
+        self.keyspace = keyspace
+        self.handlers: Dict[bytes, Callable[[List[bytes], float], object]] = {
+            b"PING": self.ping,
+            b"ECHO": self.echo,
+            b"SELECT": self.select,
+            b"GET": self.get,
+            b"SET": self.set,
+            b"MGET": self.mget,
+            b"MSET": self.mset,
+            b"DEL": self.delete,
+            b"EXISTS": self.exists,
+            b"EXPIRE": self.expire,
+            b"PEXPIRE": self.pexpire,
+            b"TTL": self.ttl,
+            b"PTTL": self.pttl,
+            b"KEYS": self.keys,
+            b"DBSIZE": self.dbsize,
+            b"FLUSHDB": self.flush,
+            b"FLUSHALL": self.flush,
+        }
+
+    def execute(self, args: List[bytes]):
+        """Run one command and return its reply value."""
+        if not args:
+            return ErrorReply("ERR empty command")
+        handler = self.handlers.get(args[0].upper())
+        if handler is None:
+            return ErrorReply(f"ERR unknown command '{args[0].decode(errors='replace')}'")
+        try:
+            with self.keyspace.lock:
+                return handler(args, time.monotonic())
+        except CommandError as e:
+            return ErrorReply(str(e))
+
+    def ping(self, args, now):
+        return args[1] if len(args) > 1 else PONG
+
+    def echo(self, args, now):
+        _arity(args, 2, exact=True)
+        return args[1]
+
+    def select(self, args, now):
+        # One keyspace; accepted so redis://host:port/0 URLs work
+        _arity(args, 2, exact=True)
+        _int(args[1])
+        return OK
+
+    def get(self, args, now):
+        _arity(args, 2, exact=True)
+        return self.keyspace.get(args[1], now)
+
+    def set(self, args, now):
+        _arity(args, 3)
+        key, value = args[1], args[2]
+        expires_at = None
+        only_if_missing = only_if_present = False
+        options = iter(args[3:])
+        for option in options:
+            option = option.upper()
+            if option in (b"EX", b"PX"):
+                amount = _int(next(options, b""))
+                if amount <= 0:
+                    raise CommandError("ERR invalid expire time in 'set' command")
+                expires_at = now + (amount if option == b"EX" else amount / 1000)
+            elif option == b"NX":
+                only_if_missing = True
+            elif option == b"XX":
+                only_if_present = True
+            else:
+                raise CommandError("ERR syntax error")
+        exists = self.keyspace.get(key, now) is not None
+        if (only_if_missing and exists) or (only_if_present and not exists):
+            return None
+        self.keyspace.set(key, value, expires_at)
+        return OK
+
+    def mget(self, args, now):
+        _arity(args, 2)
+        return [self.keyspace.get(key, now) for key in args[1:]]
+
+    def mset(self, args, now):
+        if len(args) < 3 or len(args) % 2 == 0:
+            raise CommandError("ERR wrong number of arguments for 'mset' command")
+        for position in range(1, len(args), 2):
+            self.keyspace.set(args[position], args[position + 1], None)
+        return OK
+
+    def delete(self, args, now):
+        _arity(args, 2)
+        return sum(self.keyspace.delete(key, now) for key in args[1:])
+
+    def exists(self, args, now):
+        _arity(args, 2)
+        return sum(self.keyspace.get(key, now) is not None for key in args[1:])
+
+    def expire(self, args, now):
+        _arity(args, 3, exact=True)
+        return self.keyspace.expire(args[1], now + _int(args[2]), now)
+
+    def pexpire(self, args, now):
+        _arity(args, 3, exact=True)
+        return self.keyspace.expire(args[1], now + _int(args[2]) / 1000, now)
+
+    def ttl(self, args, now):
+        _arity(args, 2, exact=True)
+        remaining = self.keyspace.ttl_ms(args[1], now)
+        return remaining if remaining < 0 else (remaining + 999) // 1000
+
+    def pttl(self, args, now):
+        _arity(args, 2, exact=True)
+        return self.keyspace.ttl_ms(args[1], now)
+
+    def keys(self, args, now):
+        _arity(args, 2, exact=True)
+        pattern = args[1]
+        return [key for key in self.keyspace.keys(now) if fnmatch.fnmatchcase(key, pattern)]
+
+    def dbsize(self, args, now):
+        return len(self.keyspace.keys(now))
+
+    def flush(self, args, now):
+        self.keyspace.clear()
+        return OK
+
+
+# ==============================================================================
+# SERVER
+# ==============================================================================
+
+
+class SocketReader:
+    """Buffered reader over a socket that knows whether input is pending."""
+
+    def __init__(self, sock: socket.socket, chunk_size: int = 65536):
+        self.sock = sock
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+
+    def _fill(self) -> bool:
+        data = self.sock.recv(self.chunk_size)
+        if not data:
+            return False
+        self.buffer += data
+        return True
+
+    def readline(self) -> bytes:
+        """Read through the next newline (or whatever is left at EOF)."""
+        start = 0
+        while True:
+            end = self.buffer.find(b"\n", start)
+            if end >= 0:
+                line = bytes(self.buffer[: end + 1])
+                del self.buffer[: end + 1]
+                return line
+            start = len(self.buffer)
+            if not self._fill():
+                line = bytes(self.buffer)
+                self.buffer.clear()
+                return line
+
+    def read(self, size: int) -> bytes:
+        """Read exactly ``size`` bytes (fewer only at EOF)."""
+        while len(self.buffer) < size:
+            if not self._fill():
+                break
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    @property
+    def pending(self) -> int:
+        """Bytes received but not yet consumed."""
+        return len(self.buffer)
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    """Serves one client connection until it disconnects or sends QUIT."""
+
+    def handle(self):
+        sock: socket.socket = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        reader = SocketReader(sock)
+        commands: CommandTable = self.server.commands
+        replies: List[bytes] = []
+        try:
+            while True:
+                try:
+                    args = read_command(reader)
+                except ProtocolError as e:
+                    replies.append(encode_reply(ErrorReply(f"ERR Protocol error: {e}")))
+                    return
+                if args is None:
+                    return
+                if args and args[0].upper() == b"QUIT":
+                    replies.append(encode_reply(OK))
+                    return
+                if args:
+                    self.server.commands_processed += 1
+                    replies.append(encode_reply(commands.execute(args)))
+                # Answer a pipeline in one write once all of it has been read
+                if not reader.pending:
+                    sock.sendall(b"".join(replies))
+                    replies.clear()
+        except OSError:
+            return
+        finally:
+            if replies:
+                try:
+                    sock.sendall(b"".join(replies))
+                except OSError:
+                    pass
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class RespServer:
+    """In-process RESP server on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Create the server (bound, but not yet serving).
+
+        Args:
+            host: Interface to listen on
+            port: TCP port (0 picks a free one; see ``port`` once bound)
+        """
+        self.keyspace = Keyspace()
+        self._server = _ThreadingServer((host, port), _ConnectionHandler)
+        self._server.commands = CommandTable(self.keyspace)
+        self._server.commands_processed = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        """``redis://`` URL clients can connect to."""
+        return f"redis://{self.host}:{self.port}/0"
+
+    @property
+    def commands_processed(self) -> int:
+        return self._server.commands_processed
+
+    def start(self) -> "RespServer":
+        """Serve connections on a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                name="resp-server",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "RespServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the stand-in in the foreground."""
+    parser = argparse.ArgumentParser(description="Local Redis stand-in (RESP protocol)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args(argv)
+
+    server = RespServer(args.host, args.port)
+    print(f"Serving {server.url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
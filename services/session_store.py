@@ -0,0 +1,202 @@
+"""
+In-process conversation session store with idle expiry and an LRU bound.
+
+Sessions used to live in a plain dict that only shrank when
+``end_conversation`` was called, so dropped calls, closed browser tabs
+and crashed clients leaked their whole context (user, orders, history).
+MemorySessionStore is a drop-in MutableMapping that forgets a session
+once it has been idle for ``idle_ttl`` seconds, and evicts the least
+recently used session once more than ``max_sessions`` are held.
+
+Expiry is swept from a min-heap holding one deadline per session. Using
+a session only moves its deadline in the entry; the heap item is pushed
+back with the new deadline when it comes due, so a busy session costs
+no heap work per turn and a sweep touches only sessions that may have
+expired. Sweeps run inline, amortized over writes and lookups, and
+``sweep()`` can be called from a timer for idle processes.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Optional, Tuple
+import heapq
+import threading
+import time
+
+
+DEFAULT_IDLE_TTL = 3600.0
+DEFAULT_MAX_SESSIONS = 10_000
+
+# Eviction reasons passed to on_evict
+EXPIRED = "expired"
+EVICTED = "evicted"
+
+_SLACK = 64
+
+
+class _Entry:
+    __slots__ = ("context", "expires_at", "scheduled")
+
+    def __init__(self, context: Dict[str, Any], expires_at: float):
+        self.context = context
+        self.expires_at = expires_at
+        # Deadline of this session's item in the expiry heap
+        self.scheduled = expires_at
+
+
+class MemorySessionStore(MutableMapping):
+    """Session ID -> conversation context, with idle TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        on_evict: Optional[Callable[[str, Dict[str, Any], str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            idle_ttl: Seconds a session is kept after it was last read or
+                written
+            max_sessions: Sessions held before the least recently used is
+                evicted
+            on_evict: Called as ``on_evict(session_id, context, reason)``
+                for each session dropped by the store (reason EXPIRED or
+                EVICTED; deletions are not reported)
+            clock: Monotonic time source, in seconds
+        """
+        if idle_ttl <= 0:
+            raise ValueError("idle_ttl must be positive")
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.on_evict = on_evict
+        self._clock = clock
+
+        # Least recently used first
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # (deadline, session_id) min-heap; items not matching an entry's
+        # scheduled deadline are stale and skipped
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "sweeps": 0}
+
+    # ==========================================================================
+    # MAPPING INTERFACE
+    # ==========================================================================
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        now = self._clock()
+        dropped: List[Tuple[str, Dict[str, Any], str]] = []
+        try:
+            with self._lock:
+                self._sweep(now, dropped)
+                entry = self._entries.get(session_id)
+                if entry is None:
+                    self.stats["misses"] += 1
+                    raise KeyError(session_id)
+                self.stats["hits"] += 1
+                entry.expires_at = now + self.idle_ttl
+                self._entries.move_to_end(session_id)
+                return entry.context
+        finally:
+            self._notify(dropped)
+
+    def __setitem__(self, session_id: str, context: Dict[str, Any]) -> None:
+        now = self._clock()
+        dropped: List[Tuple[str, Dict[str, Any], str]] = []
+        with self._lock:
+            self._sweep(now, dropped)
+            expires_at = now + self.idle_ttl
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry.context = context
+                entry.expires_at = expires_at
+                self._entries.move_to_end(session_id)
+            else:
+                self._entries[session_id] = _Entry(context, expires_at)
+                heapq.heappush(self._heap, (expires_at, session_id))
+                while len(self._entries) > self.max_sessions:
+                    evicted_id, evicted = self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+                    dropped.append((evicted_id, evicted.context, EVICTED))
+                self._compact()
+        self._notify(dropped)
+
+    def __delitem__(self, session_id: str) -> None:
+        with self._lock:
+            del self._entries[session_id]
+            self._compact()
+
+    def __contains__(self, session_id: object) -> bool:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            # Expired entries are only dropped by a sweep, so check the deadline
+            return entry is not None and entry.expires_at > now
+
+    def __iter__(self) -> Iterator[str]:
+        now = self._clock()
+        with self._lock:
+            return iter([sid for sid, entry in self._entries.items() if entry.expires_at > now])
+
+    def __len__(self) -> int:
+        now = self._clock()
+        with self._lock:
+            return sum(entry.expires_at > now for entry in self._entries.values())
+
+    # ==========================================================================
+    # EXPIRY
+    # ==========================================================================
+
+    def sweep(self) -> int:
+        """
+        Drop every session idle for longer than ``idle_ttl``.
+
+        Returns:
+            Number of sessions expired
+        """
+        dropped: List[Tuple[str, Dict[str, Any], str]] = []
+        with self._lock:
+            self._sweep(self._clock(), dropped)
+        self._notify(dropped)
+        return len(dropped)
+
+    def _sweep(self, now: float, dropped: List) -> None:
+        """Expire due sessions. Caller holds the lock."""
+        heap = self._heap
+        if not heap or heap[0][0] > now:
+            return
+        self.stats["sweeps"] += 1
+        while heap and heap[0][0] <= now:
+            deadline, session_id = heapq.heappop(heap)
+            entry = self._entries.get(session_id)
+            if entry is None or entry.scheduled != deadline:
+                continue  # deleted, or superseded by a newer heap item
+            if entry.expires_at > now:
+                # Used since it was scheduled: come back at the new deadline
+                entry.scheduled = entry.expires_at
+                heapq.heappush(heap, (entry.expires_at, session_id))
+                continue
+            del self._entries[session_id]
+            self.stats["expired"] += 1
+            dropped.append((session_id, entry.context, EXPIRED))
+
+    def _compact(self) -> None:
+        """Rebuild the heap once stale items outnumber live sessions. Caller holds the lock."""
+        if len(self._heap) > 2 * len(self._entries) + _SLACK:
+            self._heap = [(entry.scheduled, sid) for sid, entry in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _notify(self, dropped: List[Tuple[str, Dict[str, Any], str]]) -> None:
+        """Report dropped sessions, outside the lock."""
+        if self.on_evict is not None:
+            for session_id, context, reason in dropped:
+                self.on_evict(session_id, context, reason)
+
+    def store_stats(self) -> Dict[str, float]:
+        """Counters plus current size and heap size."""
+        with self._lock:
+            return {**self.stats, "size": len(self._entries), "heap_size": len(self._heap)}
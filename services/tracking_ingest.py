@@ -0,0 +1,297 @@
+"""
+Carrier Tracking Event Ingestion
+
+Accepts batches of carrier scan events (from the webhook endpoint or a
+replayed export file), de-duplicates and orders them per tracking number,
+and applies them to tracking state in bulk. Return statuses are advanced
+in the same pass (IN_TRANSIT once the carrier has the package, RECEIVED
+once it is delivered to the warehouse).
+"""
+
+import argparse
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.tracking import TrackingInfo, ShipmentStatus
+from models.return_request import ReturnStatus
+
+
+# Return status implied by each carrier scan
+SHIPMENT_TO_RETURN_STATUS = {
+    ShipmentStatus.PICKED_UP: ReturnStatus.IN_TRANSIT,
+    ShipmentStatus.IN_TRANSIT: ReturnStatus.IN_TRANSIT,
+    ShipmentStatus.OUT_FOR_DELIVERY: ReturnStatus.IN_TRANSIT,
+    ShipmentStatus.DELIVERED: ReturnStatus.RECEIVED,
+}
+
+# Return statuses a carrier scan may move a return out of. Later states
+# (refunds, rejections, disputes) are never overwritten by a scan.
+ADVANCEABLE_RETURN_STATUSES = {
+    ReturnStatus.IN_TRANSIT: {ReturnStatus.INITIATED, ReturnStatus.LABEL_GENERATED},
+    ReturnStatus.RECEIVED: {
+        ReturnStatus.INITIATED,
+        ReturnStatus.LABEL_GENERATED,
+        ReturnStatus.IN_TRANSIT,
+    },
+}
+
+
+@dataclass
+class TrackingEvent:
+    """A single carrier scan event."""
+
+    tracking_number: str
+    status: ShipmentStatus
+    timestamp: datetime
+    location: Optional[str] = None
+    carrier: str = "UPS"
+    event_id: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrackingEvent":
+        """
+        Build an event from a webhook/export payload.
+
+        Timestamps are epoch seconds or ISO 8601 strings. Both become naive
+        local time, the form ``datetime.now()`` gives everywhere else:
+        strings with a UTC offset (such as ``2026-03-01T12:00:00Z``) are
+        converted to the local zone, and those without are taken as local.
+
+        Raises:
+            ValueError: If a required field is missing or malformed
+        """
+        try:
+            tracking_number = data["tracking_number"]
+            status = ShipmentStatus(data["status"])
+            raw_timestamp = data["timestamp"]
+        except KeyError as e:
+            raise ValueError(f"Missing field: {e.args[0]}")
+
+        try:
+            if isinstance(raw_timestamp, (int, float)):
+                timestamp = datetime.fromtimestamp(raw_timestamp)
+            else:
+                timestamp = datetime.fromisoformat(raw_timestamp)
+        except (TypeError, OverflowError, OSError) as e:
+            raise ValueError(f"Invalid timestamp {raw_timestamp!r}: {e}")
+        if timestamp.utcoffset() is not None:
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+
+        return cls(
+            tracking_number=tracking_number,
+            status=status,
+            timestamp=timestamp,
+            location=data.get("location"),
+            carrier=data.get("carrier", "UPS"),
+            event_id=data.get("event_id"),
+        )
+
+    def dedupe_key(self) -> Tuple:
+        """Key identifying re-deliveries of the same scan."""
+        if self.event_id:
+            return (self.event_id,)
+        return (self.tracking_number, self.status, self.timestamp, self.location)
+
+
+@dataclass
+class IngestResult:
+    """Counters for one or more ingested batches."""
+
+    received: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    tracking_updated: int = 0
+    returns_updated: int = 0
+
+    def merge(self, other: "IngestResult") -> None:
+        """Add another result's counters to this one."""
+        self.received += other.received
+        self.invalid += other.invalid
+        self.duplicates += other.duplicates
+        self.tracking_updated += other.tracking_updated
+        self.returns_updated += other.returns_updated
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to a JSON-friendly dict."""
+        return {
+            "received": self.received,
+            "invalid": self.invalid,
+            "duplicates": self.duplicates,
+            "tracking_updated": self.tracking_updated,
+            "returns_updated": self.returns_updated,
+        }
+
+
+class TrackingIngestor:
+    """Applies batches of carrier events to the database."""
+
+    def __init__(self, database, tracking_cache=None):
+        """
+        Initialize the ingestor.
+
+        Args:
+            database: Database to apply tracking and return updates to
+            tracking_cache: Optional TrackingCache to keep in sync
+        """
+        self.db = database
+        self.tracking_cache = tracking_cache
+        self._lock = threading.Lock()
+
+    def ingest_payloads(self, payloads: Iterable[Dict[str, Any]]) -> IngestResult:
+        """Parse raw event dicts and ingest them as one batch."""
+        events = []
+        invalid = 0
+        for payload in payloads:
+            try:
+                events.append(TrackingEvent.from_dict(payload))
+            except (ValueError, TypeError):
+                invalid += 1
+
+        result = self.ingest(events)
+        result.received += invalid
+        result.invalid += invalid
+        return result
+
+    def ingest(self, events: Iterable[TrackingEvent]) -> IngestResult:
+        """
+        Ingest a batch of events.
+
+        Args:
+            events: Carrier events in any order, possibly with duplicates
+
+        Returns:
+            IngestResult with counters for the batch
+        """
+        result = IngestResult()
+        grouped = self._group_events(events, result)
+
+        # Latest scan per shipment; earlier scans in the batch are superseded
+        latest = [
+            TrackingInfo(
+                tracking_number=tracking_number,
+                carrier=shipment_events[-1].carrier,
+                status=shipment_events[-1].status,
+                last_update=shipment_events[-1].timestamp,
+                current_location=self._latest_location(shipment_events),
+            )
+            for tracking_number, shipment_events in grouped.items()
+        ]
+
+        with self._lock:
+            # Full scan history first, then the latest state per shipment
+            self.db.record_tracking_scans(
+                (event.tracking_number, event.status, event.timestamp, event.location)
+                for shipment_events in grouped.values()
+                for event in shipment_events
+            )
+            applied = self.db.apply_tracking_updates(latest)
+            result.tracking_updated = len(applied)
+            result.returns_updated = self.db.update_return_statuses(
+                self._return_transitions(applied)
+            )
+
+        if self.tracking_cache is not None:
+            for tracking_info in applied:
+                self.tracking_cache.put(tracking_info)
+
+        return result
+
+    def _group_events(
+        self, events: Iterable[TrackingEvent], result: IngestResult
+    ) -> Dict[str, List[TrackingEvent]]:
+        """De-duplicate events and group them per tracking number in time order."""
+        seen = set()
+        grouped: Dict[str, List[TrackingEvent]] = {}
+        for event in events:
+            result.received += 1
+            key = event.dedupe_key()
+            if key in seen:
+                result.duplicates += 1
+                continue
+            seen.add(key)
+            grouped.setdefault(event.tracking_number, []).append(event)
+
+        for shipment_events in grouped.values():
+            if len(shipment_events) > 1:
+                shipment_events.sort(key=lambda event: event.timestamp)
+        return grouped
+
+    def _latest_location(self, shipment_events: List[TrackingEvent]) -> Optional[str]:
+        """Most recent non-empty location among a shipment's events."""
+        for event in reversed(shipment_events):
+            if event.location:
+                return event.location
+        return None
+
+    def _return_transitions(
+        self, applied: List[TrackingInfo]
+    ) -> Iterator[Tuple[str, ReturnStatus]]:
+        """Return status changes implied by updated shipments."""
+        for tracking_info in applied:
+            target = SHIPMENT_TO_RETURN_STATUS.get(tracking_info.status)
+            if target is None:
+                continue
+            return_request = self.db.get_return_by_tracking(tracking_info.tracking_number)
+            if return_request and return_request.status in ADVANCEABLE_RETURN_STATUSES[target]:
+                yield return_request.return_id, target
+
+    # ==========================================================================
+    # FILE REPLAY
+    # ==========================================================================
+
+    def replay_file(self, path: str, batch_size: int = 10000) -> IngestResult:
+        """
+        Replay a JSONL file of carrier events in batches.
+
+        Args:
+            path: File with one event object per line
+            batch_size: Events per ingested batch
+
+        Returns:
+            Combined IngestResult for the whole file
+        """
+        total = IngestResult()
+        batch: List[Dict[str, Any]] = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    batch.append(json.loads(line))
+                except json.JSONDecodeError:
+                    total.received += 1
+                    total.invalid += 1
+                    continue
+                if len(batch) >= batch_size:
+                    total.merge(self.ingest_payloads(batch))
+                    batch = []
+        if batch:
+            total.merge(self.ingest_payloads(batch))
+        return total
+
+
+def main():
+    """Replay carrier events from a JSONL file into a fresh mock database."""
+    from database.mock_db import MockDatabase
+
+    parser = argparse.ArgumentParser(description="Replay carrier tracking events")
+    parser.add_argument("path", help="JSONL file with one tracking event per line")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    ingestor = TrackingIngestor(MockDatabase())
+    start = datetime.now()
+    result = ingestor.replay_file(args.path, batch_size=args.batch_size)
+    elapsed = (datetime.now() - start).total_seconds()
+
+    print(json.dumps(result.to_dict(), indent=2))
+    if elapsed > 0:
+        print(f"{result.received / elapsed:,.0f} events/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,14 @@ to enable true voice-based conversations.
 
 from typing import Optional, Callable
 from datetime import datetime
+import asyncio
 
 from config import config
 from services.vocalbridge_client import VocalBridgeClient
+from services.conversation_history import ConversationHistory
 from services.orchestrator import VoiceOrchestrator
+from services.redis_store import create_session_store
+from database import create_database
 from database.mock_db import MockDatabase
 
 
@@ -165,6 +169,85 @@ class VoiceInterface:
         self.current_session_id = None
         self.voice_session_id = None
 
+    # ==========================================================================
+    # ASYNC CONVERSATION
+    # ==========================================================================
+
+    async def start_voice_conversation_async(self, user_id: str) -> tuple[str, str]:
+        """
+        Async variant of ``start_voice_conversation``.
+
+        The VocalBridge call runs in a worker thread, so one event loop
+        can serve many interfaces (one per caller).
+        """
+        orch_session_id = self.orchestrator.start_conversation(user_id)
+        await self.orchestrator.identify_user_async(orch_session_id, user_id=user_id)
+        voice_session_id = await asyncio.to_thread(self.vocal_client.create_session, user_id)
+
+        self.current_session_id = orch_session_id
+        self.voice_session_id = voice_session_id
+
+        return orch_session_id, voice_session_id
+
+    async def process_voice_input_async(
+        self,
+        audio_data: bytes,
+        audio_format: str = "wav"
+    ) -> tuple[bool, str, bytes]:
+        """
+        Async variant of ``process_voice_input``.
+
+        Speech recognition and synthesis run in worker threads and the
+        orchestrator turn awaits its storage lookups, so the event loop
+        keeps serving other callers meanwhile.
+
+        Returns:
+            Tuple of (success, text_response, audio_response)
+        """
+        if not self.current_session_id:
+            return False, "No active session", b""
+
+        try:
+            user_text = await asyncio.to_thread(
+                self.vocal_client.speech_to_text, audio_data, format=audio_format
+            )
+            success, response_text, data = await self.orchestrator.process_input_async(
+                self.current_session_id,
+                user_text
+            )
+            response_audio = await asyncio.to_thread(
+                self.vocal_client.text_to_speech, response_text
+            )
+            return success, response_text, response_audio
+
+        except Exception as e:
+            error_msg = f"Voice processing error: {e}"
+            return False, error_msg, b""
+
+    async def process_text_input_async(self, text: str) -> tuple[bool, str, bytes]:
+        """
+        Async variant of ``process_text_input``.
+
+        Returns:
+            Tuple of (success, text_response, audio_response)
+        """
+        if not self.current_session_id:
+            return False, "No active session", b""
+
+        try:
+            success, response_text, data = await self.orchestrator.process_input_async(
+                self.current_session_id,
+                text
+            )
+            response_audio = await asyncio.to_thread(
+                self.vocal_client.text_to_speech, response_text
+            )
+            return success, response_text, response_audio
+
+        except Exception as e:
+            error_msg = f"Processing error: {e}"
+            return False, error_msg, b""
+
     # ==========================================================================
     # STREAMING (Advanced)
     # ==========================================================================
@@ -246,7 +329,7 @@ def create_voice_interface(database: Optional[MockDatabase] = None) -> VoiceInte
     Create a fully configured voice interface.
 
     Args:
-        database: Database instance (will create if not provided)
+        database: Database instance (created from config.database_url if not provided)
 
     Returns:
         VoiceInterface instance ready to use
@@ -256,9 +339,16 @@ def create_voice_interface(database: Optional[MockDatabase] = None) -> VoiceInte
         >>> interface.start_voice_conversation("USER001")
     """
     if database is None:
-        database = MockDatabase()
-
-    orchestrator = VoiceOrchestrator(database)
+        database = create_database()
+
+    # Sessions go to Redis when SESSION_STORE=redis, so workers can share calls
+    orchestrator = VoiceOrchestrator(
+        database,
+        session_store=create_session_store(),
+        history=ConversationHistory(
+            config.history_dir, config.history_max_entries, max_age=config.history_max_age
+        ),
+    )
     return VoiceInterface(orchestrator)
 
 
@@ -306,6 +396,7 @@ def example_voice_conversation():
 
     # End conversation
     interface.end_conversation()
+    interface.orchestrator.close()
     print("Conversation ended.")
     print()
     print("=" * 60)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Async Session Load Test
+
+Runs many concurrent callers through the full return flow on one event
+loop with VoiceOrchestrator.process_input_async. Each caller pauses
+between turns (think time), and every storage call takes a few
+milliseconds, as a remote database would. Reports sustained sessions and
+turns per second, and turn latency percentiles, as concurrency grows.
+A thread per caller would need one OS thread for each of these sessions.
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import AsyncDatabase, MockDatabase
+from services.orchestrator import VoiceOrchestrator
+
+
+STEPS = [
+    "I want to return my headphones",
+    "first order",
+    "headphones",
+    "damaged",
+    "It was broken when it arrived",
+    "yes",
+]
+THINK_TIME = (0.05, 0.25)
+STORAGE_LATENCY = 0.003
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+class RemoteDatabase(AsyncDatabase):
+    """AsyncDatabase whose every call waits STORAGE_LATENCY, like a network round trip."""
+
+    async def _call(self, method, *args, **kwargs):
+        await asyncio.sleep(STORAGE_LATENCY)
+        return method(*args, **kwargs)
+
+
+async def caller(orchestrator: VoiceOrchestrator, rng: random.Random, latencies: list) -> None:
+    session_id = orchestrator.start_conversation("USER001")
+    await orchestrator.identify_user_async(session_id, user_id="USER001")
+    for step in STEPS:
+        await asyncio.sleep(rng.uniform(*THINK_TIME))
+        start = time.perf_counter()
+        success, message, _ = await orchestrator.process_input_async(session_id, step)
+        latencies.append(time.perf_counter() - start)
+        assert success, message
+    orchestrator.end_conversation(session_id)
+
+
+async def load(sessions: int):
+    db = MockDatabase()
+    orchestrator = VoiceOrchestrator(db, async_database=RemoteDatabase(db))
+    rng = random.Random(7)
+    latencies: list = []
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(orchestrator, rng, latencies) for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    orchestrator.close()
+    return elapsed, latencies
+
+
+def main(concurrency=(100, 1000, 2500, 5000)):
+    print_header(f"ASYNC LOAD: {len(STEPS)} turns per call, one event loop")
+    print(f"  think time {THINK_TIME[0] * 1000:.0f}-{THINK_TIME[1] * 1000:.0f} ms per turn, "
+          f"storage calls {STORAGE_LATENCY * 1000:.0f} ms\n")
+    print(f"  {'callers':>8} {'wall s':>8} {'sessions/s':>11} {'turns/s':>9} "
+          f"{'p50 ms':>8} {'p99 ms':>8}")
+    for sessions in concurrency:
+        elapsed, latencies = asyncio.run(load(sessions))
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+        print(f"  {sessions:>8,} {elapsed:>8.2f} {sessions / elapsed:>11,.0f} "
+              f"{len(latencies) / elapsed:>9,.0f} {p50:>8.1f} {p99:>8.1f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Bulk Loader Benchmark
+
+Writes synthetic JSONL exports of increasing size and loads them with
+database.bulk_loader, reporting records/sec, MB/s and peak RSS. Each
+load runs in a fresh process so peak RSS belongs to that load alone.
+The "discard" target parses and builds every model but keeps nothing,
+isolating the loader's own memory, which should stay flat as the file
+grows.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from database.bulk_loader import write_jsonl
+from database.synthetic import SyntheticDataGenerator
+
+
+# Runs in a child process: load one file into one target, print the report as JSON
+LOAD_SCRIPT = """
+import json, sys
+sys.path.insert(0, sys.argv[1])
+from database import MockDatabase, SqliteDatabase
+from database.bulk_loader import load_jsonl
+
+class Discard:
+    def bulk_insert_users(self, users):
+        return len(users)
+    def bulk_insert_orders(self, orders):
+        return len(orders)
+
+target, path, db_path = sys.argv[2], sys.argv[3], sys.argv[4]
+db = {
+    "discard": Discard,
+    "MockDatabase": lambda: MockDatabase(seed=False),
+    "SqliteDatabase": lambda: SqliteDatabase(db_path, seed=False),
+}[target]()
+report = load_jsonl(db, path)
+print(json.dumps({
+    "records_per_second": report.records_per_second,
+    "mb_per_second": report.megabytes_per_second,
+    "peak_rss_mb": report.peak_rss_bytes / 1e6 if report.peak_rss_bytes else float("nan"),
+}))
+"""
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def write_export(path: Path, users: int) -> int:
+    def records():
+        for bundle in SyntheticDataGenerator(seed=0).generate(users):
+            yield bundle.user
+            yield from bundle.orders
+
+    return write_jsonl(path, records())
+
+
+def load_in_child(target: str, path: Path, db_path: Path) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT, str(ROOT), target, str(path), str(db_path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(sizes=(5_000, 20_000, 80_000)):
+    with tempfile.TemporaryDirectory() as tmp:
+        print_header("STREAMING JSONL LOAD (users + orders)")
+        print(f"  {'file':<22} {'target':<16} {'records/s':>11} {'MB/s':>7} {'peak RSS':>10}")
+        for users in sizes:
+            path = Path(tmp) / f"export-{users}.jsonl"
+            records = write_export(path, users)
+            size_mb = path.stat().st_size / 1e6
+            label = f"{records:,} rec, {size_mb:,.0f} MB"
+            for target in ("discard", "MockDatabase", "SqliteDatabase"):
+                db_path = Path(tmp) / f"load-{users}.db"
+                result = load_in_child(target, path, db_path)
+                if db_path.exists():
+                    os.remove(db_path)
+                print(
+                    f"  {label:<22} {target:<16} {result['records_per_second']:>11,.0f} "
+                    f"{result['mb_per_second']:>7,.1f} {result['peak_rss_mb']:>7,.0f} MB"
+                )
+                label = ""
+    print()
+
+
+if __name__ == "__main__":
+    main()
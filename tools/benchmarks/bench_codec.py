@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Codec Benchmark
+
+Compares the binary codec (models.codec) with the tagged JSON encoding
+(models.serialization + json) on size and encode/decode time, for a
+session context mid-call, a wholesale order and a batch of returns.
+Pickle is shown for reference only: it is not safe on untrusted input.
+"""
+
+import json
+import pickle
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import MockDatabase
+from database.synthetic import load_synthetic_data
+from models import codec
+from models.order import Order, OrderItem
+from models.serialization import decode, encode
+from services.orchestrator import VoiceOrchestrator
+
+
+DEMO_STEPS = [
+    "I want to return my headphones",
+    "first order",
+    "headphones",
+    "damaged",
+    "It was broken when it arrived",
+    "yes",
+]
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def session_context():
+    with VoiceOrchestrator(MockDatabase()) as orchestrator:
+        session_id = orchestrator.start_conversation("USER001")
+        orchestrator.identify_user(session_id, user_id="USER001")
+        for step in DEMO_STEPS:
+            orchestrator.process_input(session_id, step)
+        return orchestrator.get_context(session_id)
+
+
+def wholesale_order():
+    items = [
+        OrderItem(f"ITEM{i}", f"Part {i % 40}", 3.25 + i % 7, quantity=12, category="Wholesale")
+        for i in range(300)
+    ]
+    return Order("ORD-WHOLESALE", "USER001", items, datetime(2026, 3, 1), total_amount=0)
+
+
+def return_batch():
+    db = MockDatabase(seed=False)
+    load_synthetic_data(db, 2000)
+    return list(db.returns.values())[:1000]
+
+
+def best_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def compare(name: str, value, number: int) -> None:
+    print_header(name)
+    formats = {
+        "binary codec": (codec.dumps, codec.loads),
+        "tagged JSON": (
+            lambda v: json.dumps(encode(v), separators=(",", ":")).encode(),
+            lambda data: decode(json.loads(data)),
+        ),
+        "pickle (unsafe)": (pickle.dumps, pickle.loads),
+    }
+    assert codec.loads(codec.dumps(value)) == value
+    json_size = len(formats["tagged JSON"][0](value))
+    print(f"  {'format':<18} {'bytes':>9} {'vs JSON':>8} {'encode us':>11} {'decode us':>11}")
+    for label, (dumps, loads) in formats.items():
+        data = dumps(value)
+        encode_us = best_us(lambda: dumps(value), number)
+        decode_us = best_us(lambda: loads(data), number)
+        print(
+            f"  {label:<18} {len(data):>9,} {len(data) / json_size:>8.0%} "
+            f"{encode_us:>11,.1f} {decode_us:>11,.1f}"
+        )
+
+
+def main():
+    compare("SESSION CONTEXT (after six turns)", session_context(), number=500)
+    compare("WHOLESALE ORDER (300 lines)", wholesale_order(), number=100)
+    compare("RETURN BATCH (1,000 returns)", return_batch(), number=20)
+    print()
+
+
+if __name__ == "__main__":
+    main()
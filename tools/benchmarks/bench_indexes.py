@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Secondary Index Benchmark
+
+Exercises every MockDatabase index (phone, orders by user, returns by
+user, tracking number, status) on a synthetic dataset, both for lookups
+and for the writes that maintain them, and compares the lookups that
+used to be linear scans with a scan over the same data.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import MockDatabase
+from database.synthetic import load_synthetic_data, phone_number, user_id
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def rate(count: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def scan_user_orders(db: MockDatabase, uid: str, limit: int = 10):
+    """The linear scan get_user_orders used before it had an index."""
+    orders = [order for order in db.orders.values() if order.user_id == uid]
+    orders.sort(key=lambda order: order.order_date, reverse=True)
+    return orders[:limit]
+
+
+def main(users: int = 50000, lookups: int = 20000, scans: int = 50):
+    db = MockDatabase(seed=False)
+    counts = load_synthetic_data(db, users)
+    print_header(
+        f"INDEXES: {counts['users']:,} users, {counts['orders']:,} orders, "
+        f"{counts['returns']:,} returns"
+    )
+
+    user_ids = [user_id(i % users) for i in range(lookups)]
+    phones = [phone_number(i % users) for i in range(lookups)]
+    returns = list(db.returns.values())
+    tracking = [r.tracking_number for r in returns if r.tracking_number]
+    tracking = [tracking[i % len(tracking)] for i in range(lookups)]
+
+    print(f"  {'lookup':<44} {'ops/sec':>14}")
+    results = [
+        ("get_user_by_phone          (phone)", lookups,
+         lambda: [db.get_user_by_phone(p) for p in phones]),
+        ("get_user_orders            (orders.user_id)", lookups,
+         lambda: [db.get_user_orders(u, 5) for u in user_ids]),
+        ("  same query as a linear scan", scans,
+         lambda: [scan_user_orders(db, u, 5) for u in user_ids[:scans]]),
+        ("get_latest_user_return     (returns.user_id)", lookups,
+         lambda: [db.get_latest_user_return(u) for u in user_ids]),
+        ("get_user_return_history    (returns.user_id)", lookups,
+         lambda: [db.get_user_return_history(u, 0, 5) for u in user_ids]),
+        ("get_return_by_tracking     (tracking_number)", lookups,
+         lambda: [db.get_return_by_tracking(t) for t in tracking]),
+        ("find_returns user+status   (user_id, status)", lookups,
+         lambda: [db.find_returns(user_id=u, status=ReturnStatus.DISPUTED) for u in user_ids]),
+        ("find_returns status        (status)", scans,
+         lambda: [db.find_returns(status=ReturnStatus.DISPUTED) for _ in range(scans)]),
+        ("  same query as a linear scan", scans,
+         lambda: [[r for r in db.returns.values() if r.status == ReturnStatus.DISPUTED]
+                  for _ in range(scans)]),
+    ]
+    for label, count, fn in results:
+        print(f"  {label:<44} {rate(count, fn):>14,.0f}")
+
+    print(f"\n  {'write (index maintenance)':<44} {'ops/sec':>14}")
+    new_returns = [
+        ReturnRequest(
+            return_id=f"RET-BENCH-{i}",
+            order_id="ORD",
+            user_id=user_ids[i],
+            item_id="ITEM",
+            reason=ReturnReason.DAMAGED,
+            tracking_number=f"1ZBENCH{i:010d}",
+        )
+        for i in range(lookups)
+    ]
+    statuses = list(ReturnStatus)
+    writes = [
+        ("create_return              (all 3 return indexes)",
+         lambda: [db.create_return(r) for r in new_returns]),
+        ("update_return_status       (status bucket move)",
+         lambda: [db.update_return_status(r.return_id, statuses[i % len(statuses)])
+                  for i, r in enumerate(new_returns)]),
+        ("set_return_tracking_number (unique re-key)",
+         lambda: [db.set_return_tracking_number(r.return_id, f"1ZMOVED{i:010d}")
+                  for i, r in enumerate(new_returns)]),
+    ]
+    for label, fn in writes:
+        print(f"  {label:<44} {rate(lookups, fn):>14,.0f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
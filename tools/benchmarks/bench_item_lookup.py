@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Order Item Lookup Benchmark
+
+Compares Order.get_item_by_id on wholesale-sized orders with the linear
+scan it replaced, and resolving a batch of (order_id, item_id) pairs
+with get_items_bulk against one get_order call per pair.
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import MockDatabase, SqliteDatabase
+from models.order import Order, OrderItem
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def rate(count: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def make_order(order_id: str, lines: int) -> Order:
+    items = [
+        OrderItem(f"{order_id}-ITEM{i}", f"Part {i % 50}", 9.99, quantity=10, category="Wholesale")
+        for i in range(lines)
+    ]
+    return Order(order_id, "USER001", items, datetime(2026, 1, 1), total_amount=0)
+
+
+def scan(order: Order, item_id: str):
+    """The lookup get_item_by_id used before it had a map."""
+    for item in order.items:
+        if item.item_id == item_id:
+            return item
+    return None
+
+
+def bench_single_order(lookups: int) -> None:
+    print_header(f"GET_ITEM_BY_ID: {lookups:,} lookups")
+    print(f"  {'order lines':>12} {'scan/sec':>14} {'indexed/sec':>14} {'speedup':>9}")
+    for lines in (5, 50, 500, 2000):
+        order = make_order("ORD", lines)
+        ids = [f"ORD-ITEM{random.randrange(lines)}" for _ in range(lookups)]
+        scanned = rate(lookups, lambda: [scan(order, item_id) for item_id in ids])
+        indexed = rate(lookups, lambda: [order.get_item_by_id(item_id) for item_id in ids])
+        print(f"  {lines:>12,} {scanned:>14,.0f} {indexed:>14,.0f} {indexed / scanned:>8.1f}x")
+
+
+def bench_bulk(orders: int, lines: int, pairs: int) -> None:
+    print_header(f"GET_ITEMS_BULK: {pairs:,} pairs over {orders:,} orders of {lines} lines")
+    all_orders = [make_order(f"ORD{i}", lines) for i in range(orders)]
+    wanted = []
+    for _ in range(pairs):
+        order = random.choice(all_orders)
+        wanted.append((order.order_id, f"{order.order_id}-ITEM{random.randrange(lines)}"))
+
+    print(f"  {'engine':<10} {'per pair/sec':>14} {'bulk/sec':>14}")
+    for name, db in [("mock", MockDatabase(seed=False)), ("sqlite", SqliteDatabase(seed=False))]:
+        db.bulk_insert_orders(all_orders)
+
+        def per_pair():
+            for order_id, item_id in wanted:
+                db.get_order(order_id).get_item_by_id(item_id)
+
+        single = rate(pairs, per_pair)
+        bulk = rate(pairs, lambda: db.get_items_bulk(wanted))
+        print(f"  {name:<10} {single:>14,.0f} {bulk:>14,.0f}")
+
+
+def main():
+    random.seed(7)
+    bench_single_order(20000)
+    bench_bulk(orders=200, lines=300, pairs=5000)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Journal Benchmark
+
+Measures what durability costs on the write path (plain MockDatabase
+versus a JournaledDatabase with batched and per-write fsync, single and
+multi-threaded) and how long recovery takes from a snapshot versus from
+replaying the journal alone.
+"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import JournaledDatabase, MockDatabase
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def make_returns(count: int, prefix: str):
+    return [
+        ReturnRequest(
+            return_id=f"RET-{prefix}-{i}",
+            order_id="ORD001",
+            user_id="USER001",
+            item_id="ITEM001",
+            reason=ReturnReason.DAMAGED,
+            refund_amount=149.99,
+            tracking_number=f"1Z{prefix}{i:012d}",
+        )
+        for i in range(count)
+    ]
+
+
+def write_workload(db, count: int, prefix: str) -> float:
+    """Create ``count`` returns and advance each one; return writes/sec."""
+    returns = make_returns(count, prefix)
+    start = time.perf_counter()
+    for ret in returns:
+        db.create_return(ret)
+        db.update_return_status(ret.return_id, ReturnStatus.RECEIVED)
+    return 2 * count / (time.perf_counter() - start)
+
+
+def threaded_workload(db, count: int, threads: int) -> float:
+    """Run the write workload on several threads to exercise group commit."""
+    per_thread = count // threads
+    workers = [
+        threading.Thread(target=write_workload, args=(db, per_thread, f"T{t}"))
+        for t in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return 2 * per_thread * threads / (time.perf_counter() - start)
+
+
+def bench_writes(writes: int, always_writes: int, threads: int):
+    print_header("WRITE THROUGHPUT (create_return + update_return_status)")
+    rows = [("MockDatabase (no durability)", write_workload(MockDatabase(), writes, "M"))]
+
+    for label, durability, count, workers in [
+        ("journal, batch fsync", "batch", writes, 1),
+        ("journal, fsync per write", "always", always_writes, 1),
+        (f"journal, fsync per write, {threads} threads", "always", always_writes, threads),
+    ]:
+        directory = tempfile.mkdtemp(prefix="bench-journal-")
+        try:
+            db = JournaledDatabase(directory, durability=durability, snapshot_every=0)
+            if workers == 1:
+                rate = write_workload(db, count, "J")
+            else:
+                rate = threaded_workload(db, count, workers)
+            db.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        rows.append((label, rate))
+
+    for label, rate in rows:
+        print(f"  {label:<42} {rate:>12,.0f} writes/s")
+
+
+def bench_recovery(records: int):
+    print_header(f"RECOVERY TIME ({2 * records:,} journaled writes)")
+    directory = tempfile.mkdtemp(prefix="bench-journal-")
+    try:
+        db = JournaledDatabase(directory, snapshot_every=0)
+        write_workload(db, records, "R")
+        db.close()
+
+        start = time.perf_counter()
+        db = JournaledDatabase(directory, snapshot_every=0)
+        replay_time = time.perf_counter() - start
+        replayed = db.replayed
+        db.snapshot()
+        db.close()
+
+        start = time.perf_counter()
+        db = JournaledDatabase(directory, snapshot_every=0)
+        snapshot_time = time.perf_counter() - start
+        db.create_return(make_returns(1, "TAIL")[0])
+        db.close()
+
+        start = time.perf_counter()
+        db = JournaledDatabase(directory, snapshot_every=0)
+        tail_time = time.perf_counter() - start
+        tail = db.replayed
+        db.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"  {'journal replay only':<42} {replay_time * 1000:>9.1f} ms ({replayed:,} records)")
+    print(f"  {'snapshot only':<42} {snapshot_time * 1000:>9.1f} ms")
+    print(f"  {'snapshot + journal tail':<42} {tail_time * 1000:>9.1f} ms ({tail} record)")
+
+
+def main(writes: int = 20000, always_writes: int = 1000, threads: int = 8, records: int = 50000):
+    bench_writes(writes, always_writes, threads)
+    bench_recovery(records)
+    print()
+
+
+if __name__ == "__main__":
+    main()
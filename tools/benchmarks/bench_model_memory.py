@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Model Memory Benchmark
+
+Reports bytes per record for the slotted, compact models against the
+plain dataclasses they replaced (reproduced below as the "before"
+layout). Field values are re-created per record, as they would be when
+decoded from database rows or JSON, so string interning shows up the way
+it does in production.
+"""
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from models.order import Order, OrderItem
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from models.tracking import TrackingInfo, ShipmentStatus
+from models.user import User
+
+
+# ==============================================================================
+# BEFORE: the dataclass models as they were
+# ==============================================================================
+
+
+@dataclass
+class DataclassUser:
+    user_id: str
+    name: str
+    email: str
+    phone: str
+    address: Optional[str] = None
+    return_count: int = 0
+    account_age_days: int = 0
+
+
+@dataclass
+class DataclassOrderItem:
+    item_id: str
+    product_name: str
+    price: float
+    quantity: int = 1
+    category: str = "General"
+
+
+@dataclass
+class DataclassOrder:
+    order_id: str
+    user_id: str
+    items: List[DataclassOrderItem]
+    order_date: datetime
+    total_amount: float
+    status: str = "delivered"
+
+
+@dataclass
+class DataclassReturnRequest:
+    return_id: str
+    order_id: str
+    user_id: str
+    item_id: str
+    reason: ReturnReason
+    status: ReturnStatus = ReturnStatus.INITIATED
+    created_at: datetime = field(default_factory=datetime.now)
+    refund_amount: float = 0.0
+    notes: str = ""
+    label_url: Optional[str] = None
+    qr_code_url: Optional[str] = None
+    tracking_number: Optional[str] = None
+    fraud_risk_score: float = 0.0
+
+
+@dataclass
+class DataclassTrackingInfo:
+    tracking_number: str
+    carrier: str
+    status: ShipmentStatus
+    last_update: datetime
+    estimated_delivery: Optional[datetime] = None
+    current_location: Optional[str] = None
+
+
+BEFORE = {
+    "User": DataclassUser,
+    "Order": DataclassOrder,
+    "OrderItem": DataclassOrderItem,
+    "ReturnRequest": DataclassReturnRequest,
+    "TrackingInfo": DataclassTrackingInfo,
+}
+AFTER = {
+    "User": User,
+    "Order": Order,
+    "OrderItem": OrderItem,
+    "ReturnRequest": ReturnRequest,
+    "TrackingInfo": TrackingInfo,
+}
+
+BASE = datetime(2026, 1, 1)
+PRODUCTS = [
+    ("Wireless Headphones", "Electronics"),
+    ("Running Shoes", "Footwear"),
+    ("Coffee Maker", "Home & Kitchen"),
+    ("Phone Case", "Accessories"),
+]
+CARRIERS = ["UPS", "FedEx", "USPS"]
+HUBS = ["Oakland, CA", "Reno, NV", "Memphis, TN", "Louisville, KY"]
+
+
+def fresh(text: str) -> str:
+    """A new string object with the same value, as a row decoder produces."""
+    return text.encode().decode()
+
+
+def build(models, kind: str, i: int):
+    """Build record ``i`` of ``kind`` with realistic per-record values."""
+    when = BASE + timedelta(minutes=i)
+    if kind == "User":
+        return models["User"](
+            f"USER{i:08d}", f"Customer {i}", f"customer{i}@example.com", f"+1-555-{i % 10000:04d}",
+            fresh("1 Main St, Springfield"), i % 7, 100 + i % 900,
+        )
+    if kind == "OrderItem":
+        name, category = PRODUCTS[i % len(PRODUCTS)]
+        return models["OrderItem"](f"ITEM{i:08d}", fresh(name), 19.99 + i % 200, 1, fresh(category))
+    if kind == "Order":
+        return models["Order"](
+            f"ORD{i:08d}", f"USER{i // 3:08d}", [], when, 39.98 + i % 500, fresh("delivered")
+        )
+    if kind == "ReturnRequest":
+        return models["ReturnRequest"](
+            f"RET-ORD{i:08d}-001", f"ORD{i:08d}", f"USER{i // 3:08d}", f"ITEM{i:08d}",
+            ReturnReason.DAMAGED, ReturnStatus.IN_TRANSIT, when, 19.99 + i % 200,
+            tracking_number=f"1ZSYN{i:012d}", fraud_risk_score=(i % 100) / 100,
+        )
+    return models["TrackingInfo"](
+        f"1ZSYN{i:012d}", fresh(CARRIERS[i % 3]), ShipmentStatus.IN_TRANSIT, when,
+        when + timedelta(days=5), fresh(HUBS[i % len(HUBS)]),
+    )
+
+
+def bytes_per_record(models, kind: str, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    records = [build(models, kind, i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list itself holds one pointer per record
+    per_record = (current - sys.getsizeof(records)) / count
+    del records
+    return per_record
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def main(count: int = 200_000):
+    print_header(f"MODEL MEMORY ({count:,} records each, tracemalloc)")
+    print(f"  {'model':<16} {'dataclass':>12} {'slotted':>12} {'saved':>8}")
+    totals = [0.0, 0.0]
+    for kind in BEFORE:
+        before = bytes_per_record(BEFORE, kind, count)
+        after = bytes_per_record(AFTER, kind, count)
+        totals[0] += before
+        totals[1] += after
+        print(f"  {kind:<16} {before:>9,.0f} B {after:>9,.0f} B {1 - after / before:>7.0%}")
+    before, after = totals
+    print(f"  {'one of each':<16} {before:>9,.0f} B {after:>9,.0f} B {1 - after / before:>7.0%}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
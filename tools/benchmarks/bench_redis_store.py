@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Redis Adapter Benchmark
+
+Measures what batching buys against the local RESP stand-in: one command
+per key versus MGET/MSET and pipelines, the cost of storing and loading
+a conversation session per turn, and entity lookups through the shared
+cache one at a time versus batched. The stand-in runs in this process
+and shares its GIL, so it understates what batching saves against a
+real server across a network; point --url at one to compare (the
+database is flushed at the end).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import MockDatabase
+from database.synthetic import load_synthetic_data, user_id
+from services.orchestrator import VoiceOrchestrator
+from services.redis_store import RedisCachedDatabase, RedisClient, RedisSessionStore
+from services.resp_server import RespServer
+
+
+BATCH = 100
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def rate(count: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def batches(items, size: int = BATCH):
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def bench_commands(client: RedisClient, keys: int) -> None:
+    print_header(f"KEYS: {keys:,} writes and reads, batches of {BATCH}")
+    names = [f"bench:key:{i}" for i in range(keys)]
+    value = "x" * 200
+
+    def pipelined_set():
+        for batch in batches(names):
+            with client.pipeline() as pipe:
+                for name in batch:
+                    pipe.set(name, value, ex=300)
+
+    def pipelined_get():
+        for batch in batches(names):
+            with client.pipeline() as pipe:
+                for name in batch:
+                    pipe.get(name)
+
+    results = [
+        ("SET, one round trip per key", lambda: [client.set(n, value, ex=300) for n in names]),
+        ("MSET + EXPIRE pipeline", lambda: [
+            client.mset({n: value for n in batch}, ex=300) for batch in batches(names)
+        ]),
+        ("SET EX pipeline", pipelined_set),
+        ("GET, one round trip per key", lambda: [client.get(n) for n in names]),
+        ("MGET", lambda: [client.mget(batch) for batch in batches(names)]),
+        ("GET pipeline", pipelined_get),
+    ]
+    print(f"  {'operation':<36} {'keys/sec':>14}")
+    for label, fn in results:
+        print(f"  {label:<36} {rate(keys, fn):>14,.0f}")
+
+
+def bench_sessions(client: RedisClient, turns: int) -> None:
+    print_header(f"SESSIONS: {turns:,} turns, alternating between two workers")
+    steps = ["I want to return my headphones", "first order", "headphones", "damaged"]
+    db = MockDatabase()
+
+    def run(orchestrators) -> None:
+        done = 0
+        while done < turns:
+            session_id = orchestrators[0].start_conversation("USER001")
+            orchestrators[-1].identify_user(session_id, user_id="USER001")
+            for turn, step in enumerate(steps):
+                orchestrators[turn % len(orchestrators)].process_input(session_id, step)
+            orchestrators[0].end_conversation(session_id)
+            done += len(steps)
+
+    store = RedisSessionStore(client)
+    in_memory = VoiceOrchestrator(db)
+    shared = [VoiceOrchestrator(db, session_store=store) for _ in range(2)]
+    memory_rate = rate(turns, lambda: run([in_memory]))
+    redis_rate = rate(turns, lambda: run(shared))
+    print(f"  {'sessions in':<36} {'turns/sec':>14} {'ms/turn':>10}")
+    for label, turns_per_second in [
+        ("process memory (one worker)", memory_rate),
+        ("Redis (two workers)", redis_rate),
+    ]:
+        print(f"  {label:<36} {turns_per_second:>14,.0f} {1000 / turns_per_second:>10.3f}")
+    for orchestrator in [in_memory, *shared]:
+        orchestrator.close()
+
+
+def bench_entities(client: RedisClient, users: int) -> None:
+    print_header(f"ENTITIES: {users:,} users through the shared cache")
+    backend = MockDatabase(seed=False)
+    load_synthetic_data(backend, users)
+    cache = RedisCachedDatabase(backend, client, ttl=300)
+    ids = [user_id(i) for i in range(users)]
+
+    cold = rate(users, lambda: [cache.get_users(batch) for batch in batches(ids)])
+    warm_single = rate(users, lambda: [cache.get_user(uid) for uid in ids])
+    warm_batched = rate(users, lambda: [cache.get_users(batch) for batch in batches(ids)])
+    print(f"  {'lookup':<36} {'users/sec':>14}")
+    print(f"  {'get_users, cold (MGET + MSET backfill)':<36} {cold:>14,.0f}")
+    print(f"  {'get_user, warm, one per round trip':<36} {warm_single:>14,.0f}")
+    print(f"  {'get_users, warm (MGET)':<36} {warm_batched:>14,.0f}")
+    print(f"  hit rate {cache.hit_rate:.1%}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Redis URL (defaults to a local RESP stand-in)")
+    parser.add_argument("--keys", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url is None:
+        server = RespServer().start()
+        args.url = server.url
+    client = RedisClient.from_url(args.url)
+    try:
+        bench_commands(client, args.keys)
+        bench_sessions(client, args.turns)
+        bench_entities(client, args.users)
+        print(f"\n  {client.round_trips:,} round trips in total\n")
+    finally:
+        client.flushdb()
+        client.close()
+        if server is not None:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Returns Analytics Benchmark
+
+Times the three ops questions (returns by reason, refund dollars by
+category, average fraud score by day) answered by looping over
+MockDatabase's ReturnRequest objects versus the columnar
+ReturnsAnalytics mirror, then shows how the columnar queries scale to
+millions of rows. Pass a larger ``rows`` to main() for tens of millions
+(about 34 bytes of column data per row).
+"""
+
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import MockDatabase, ReturnsAnalytics
+from database.synthetic import load_synthetic_data
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+
+
+CATEGORIES = ["Electronics", "Apparel", "Footwear", "Home & Kitchen", "Toys", "Beauty", "Sports"]
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def timed(fn, repeat: int = 3) -> float:
+    """Best of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def python_queries(db: MockDatabase):
+    """The same aggregates computed over ReturnRequest objects."""
+
+    def by_reason():
+        return Counter(ret.reason for ret in db.returns.values())
+
+    def by_category():
+        totals = defaultdict(float)
+        for ret in db.returns.values():
+            item = db.orders[ret.order_id].get_item_by_id(ret.item_id)
+            totals[item.category] += ret.refund_amount
+        return totals
+
+    def fraud_by_day():
+        scores = defaultdict(lambda: [0.0, 0])
+        for ret in db.returns.values():
+            entry = scores[ret.created_at.date()]
+            entry[0] += ret.fraud_risk_score
+            entry[1] += 1
+        return {day: total / count for day, (total, count) in scores.items()}
+
+    return by_reason, by_category, fraud_by_day
+
+
+def columnar_queries(analytics: ReturnsAnalytics):
+    return (
+        analytics.count_by_reason,
+        analytics.refund_by_category,
+        analytics.average_fraud_score_by_day,
+    )
+
+
+def bench_against_objects(users: int):
+    db = MockDatabase()
+    load_synthetic_data(db, users)
+    start = time.perf_counter()
+    analytics = ReturnsAnalytics.attach(db)
+    attach_ms = (time.perf_counter() - start) * 1000
+
+    print_header(f"OBJECTS VS COLUMNS ({len(analytics):,} returns from {users:,} synthetic users)")
+    print(f"  attach + backfill: {attach_ms:,.1f} ms\n")
+    print(f"  {'query':<30} {'python loop':>14} {'columnar':>12} {'speedup':>9}")
+    labels = ["returns by reason", "refund $ by category", "avg fraud score by day"]
+    for label, slow, fast in zip(labels, python_queries(db), columnar_queries(analytics)):
+        slow_ms, fast_ms = timed(slow), timed(fast)
+        print(f"  {label:<30} {slow_ms:>11,.2f} ms {fast_ms:>9,.2f} ms {slow_ms / fast_ms:>8,.0f}x")
+
+
+def synthetic_returns(count: int, start: int, rng: random.Random):
+    reasons = list(ReturnReason)
+    statuses = list(ReturnStatus)
+    epoch = datetime(2025, 1, 1)
+    return [
+        ReturnRequest(
+            return_id=f"RET-B-{start + i}",
+            order_id=f"ORD-B-{(start + i) % len(CATEGORIES)}",
+            user_id=f"USER-B-{rng.randrange(1_000_000)}",
+            item_id="ITEM",
+            reason=rng.choice(reasons),
+            status=rng.choice(statuses),
+            created_at=epoch + timedelta(seconds=rng.randrange(365 * 86400)),
+            refund_amount=round(rng.uniform(5, 500), 2),
+            fraud_risk_score=rng.random(),
+        )
+        for i in range(count)
+    ]
+
+
+def bench_scale(rows: int, chunk: int = 100_000):
+    analytics = ReturnsAnalytics(lambda ret: CATEGORIES[int(ret.order_id.rsplit("-", 1)[1])])
+    rng = random.Random(0)
+    ingest = 0.0
+    for start in range(0, rows, chunk):
+        batch = synthetic_returns(min(chunk, rows - start), start, rng)
+        began = time.perf_counter()
+        analytics.observe(batch)
+        ingest += time.perf_counter() - began
+
+    print_header(f"COLUMNAR QUERIES AT SCALE ({rows:,} rows)")
+    print(f"  ingest: {rows / ingest:,.0f} rows/sec\n")
+    cutoff = datetime(2025, 10, 1)
+    queries = [
+        ("count_by_reason", lambda: analytics.count_by_reason()),
+        ("refund_by_category", lambda: analytics.refund_by_category()),
+        ("average_fraud_score_by_day", lambda: analytics.average_fraud_score_by_day()),
+        (
+            "refund_by_category (disputed, Q4)",
+            lambda: analytics.refund_by_category(statuses=[ReturnStatus.DISPUTED], since=cutoff),
+        ),
+        ("count (one user)", lambda: analytics.count(user_id="USER-B-42")),
+    ]
+    for label, query in queries:
+        print(f"  {label:<38} {timed(query):>9,.1f} ms")
+
+
+def main(users: int = 20000, rows: int = 2_000_000):
+    bench_against_objects(users)
+    bench_scale(rows)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Session Store Benchmark
+
+Replays a day of calls against a plain dict and MemorySessionStore on a
+simulated clock: callers arrive steadily, take a few turns each, and a
+share of them hang up without ending the conversation. Reports lookups
+per second and how many contexts each store is still holding at the end.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.session_store import MemorySessionStore
+
+
+ABANDON_RATE = 0.2
+TURNS_PER_CALL = 8
+CONCURRENT_CALLS = 500
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def replay(sessions, clock, calls: int) -> int:
+    """Interleave calls, advancing the clock one second per turn. Returns turns taken."""
+    rng = random.Random(7)
+    active = {}
+    turns = 0
+    for call in range(calls):
+        session_id = f"session_{call}"
+        sessions[session_id] = {"conversation_history": [], "user_id": f"USER{call % 997}"}
+        active[session_id] = TURNS_PER_CALL
+        while len(active) >= CONCURRENT_CALLS or (call == calls - 1 and active):
+            session_id = next(iter(active))
+            clock.now += 1
+            context = sessions[session_id]
+            context["conversation_history"].append({"user": "yes"})
+            sessions[session_id] = context
+            turns += 1
+            active[session_id] -= 1
+            if active[session_id] == 0:
+                del active[session_id]
+                if rng.random() >= ABANDON_RATE:
+                    del sessions[session_id]
+            else:
+                # Round robin, so calls interleave
+                active[session_id] = active.pop(session_id)
+    return turns
+
+
+def main(calls: int = 100_000):
+    print_header(f"SESSION STORES: {calls:,} calls, {ABANDON_RATE:.0%} abandoned")
+    print(f"  {'store':<34} {'turns/sec':>12} {'left held':>10}")
+    for label, make in [
+        ("dict", lambda clock: {}),
+        ("idle TTL 15 min", lambda clock: MemorySessionStore(900, clock=clock)),
+        ("idle TTL 1 day, 2,000 session cap", lambda clock: MemorySessionStore(
+            86400, max_sessions=2000, clock=clock
+        )),
+    ]:
+        clock = SimulatedClock()
+        sessions = make(clock)
+        start = time.perf_counter()
+        turns = replay(sessions, clock, calls)
+        elapsed = time.perf_counter() - start
+        if isinstance(sessions, MemorySessionStore):
+            sessions.sweep()
+        print(f"  {label:<34} {turns / elapsed:>12,.0f} {len(sessions):>10,}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Concurrent Session Benchmark
+
+Runs a voice-session-like mix of reads and return writes from a growing
+number of threads against MockDatabase and ShardedDatabase, reporting
+throughput and checking that no return count update was lost.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import MockDatabase, ShardedDatabase
+from database.synthetic import item_id, load_synthetic_data, order_id, phone_number, user_id
+from models.return_request import ReturnRequest, ReturnReason
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def session_worker(db, worker_id: int, users: int, sessions: int, barrier) -> None:
+    """One thread handling back-to-back sessions: identify, look up, file a return."""
+    barrier.wait()
+    for s in range(sessions):
+        u = (worker_id * 7919 + s * 31) % users
+        db.get_user_by_phone(phone_number(u))
+        db.get_user(user_id(u))
+        db.get_user_orders(user_id(u), limit=5)
+        db.get_order(order_id(u, 0))
+        db.get_latest_user_return(user_id(u))
+        db.create_return(
+            ReturnRequest(
+                return_id=f"RET-BENCH-{worker_id}-{s}",
+                order_id=order_id(u, 0),
+                user_id=user_id(u),
+                item_id=item_id(u, 0, 0),
+                reason=ReturnReason.DAMAGED,
+                tracking_number=f"1ZBENCH{worker_id:03d}{s:08d}",
+            )
+        )
+
+
+def run(db, threads: int, users: int, sessions: int) -> float:
+    """Run the workload and return sessions per second."""
+    before = sum(db.get_user(user_id(u)).return_count for u in range(users))
+    barrier = threading.Barrier(threads + 1)
+    workers = [
+        threading.Thread(target=session_worker, args=(db, t, users, sessions, barrier))
+        for t in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    after = sum(db.get_user(user_id(u)).return_count for u in range(users))
+    lost = threads * sessions - (after - before)
+    if lost:
+        print(f"    !! {lost} return count updates lost")
+    return threads * sessions / elapsed
+
+
+def main(users: int = 2000, sessions_per_thread: int = 1000, thread_counts=(1, 2, 4, 8, 16)):
+    print_header(f"Concurrent sessions: {users:,} synthetic users, {sessions_per_thread:,} sessions/thread")
+    print(f"  Python {sys.version.split()[0]}, GIL {'enabled' if getattr(sys, '_is_gil_enabled', lambda: True)() else 'disabled'}\n")
+
+    engines = [
+        ("MockDatabase (global index lock)", MockDatabase),
+        ("ShardedDatabase (16 shards)", lambda: ShardedDatabase(shards=16)),
+    ]
+    databases = []
+    for _, factory in engines:
+        db = factory()
+        load_synthetic_data(db, users)
+        databases.append(db)
+
+    print(f"  {'threads':<10}" + "".join(f"{name:>36}" for name, _ in engines))
+    for threads in thread_counts:
+        rates = [run(db, threads, users, sessions_per_thread) for db in databases]
+        print(f"  {threads:<10}" + "".join(f"{rate:>28,.0f} sess/sec" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Storage Engine Benchmark
+
+Compares the in-memory MockDatabase with SqliteDatabase (in-memory and
+WAL file) on the operations agents run every turn, plus single versus
+batched return writes, against a synthetic production-shaped dataset.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import MockDatabase, SqliteDatabase
+from database.synthetic import item_id, load_synthetic_data, order_id, phone_number, user_id
+from models.return_request import ReturnRequest, ReturnReason
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+class _nullcontext:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def make_returns(users: int, count: int, prefix: str):
+    return [
+        ReturnRequest(
+            return_id=f"RET-{prefix}-{i}",
+            order_id=order_id(i % users, 0),
+            user_id=user_id(i % users),
+            item_id=item_id(i % users, 0, 0),
+            reason=ReturnReason.DAMAGED,
+            refund_amount=19.99,
+            tracking_number=f"1Z{prefix}{i:012d}",
+        )
+        for i in range(count)
+    ]
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return label, count / elapsed
+
+
+def bench_engine(name, db, users: int, writes: int, reads: int):
+    results = []
+
+    singles = make_returns(users, writes, "S")
+    results.append(timed("create_return (single)", writes, lambda: [db.create_return(r) for r in singles]))
+
+    batched = make_returns(users, writes, "B")
+    batch = getattr(db, "batch", None)
+
+    def write_batched():
+        with (batch() if batch else _nullcontext()):
+            for r in batched:
+                db.create_return(r)
+
+    results.append(timed("create_return (batched)", writes, write_batched))
+
+    user_ids = [user_id(i % users) for i in range(reads)]
+    results.append(timed("get_user_orders", reads, lambda: [db.get_user_orders(u, limit=5) for u in user_ids]))
+    results.append(timed("get_latest_user_return", reads, lambda: [db.get_latest_user_return(u) for u in user_ids]))
+    tracking = [f"1ZS{i % writes:012d}" for i in range(reads)]
+    results.append(timed("get_return_by_tracking", reads, lambda: [db.get_return_by_tracking(t) for t in tracking]))
+    phones = [phone_number(i % users) for i in range(reads)]
+    results.append(timed("get_user_by_phone", reads, lambda: [db.get_user_by_phone(p) for p in phones]))
+
+    print(f"{name}")
+    for label, rate in results:
+        print(f"  {label:<28}{rate:>14,.0f} ops/sec")
+    print()
+
+
+def main(users: int = 20000, writes: int = 5000, reads: int = 2000):
+    engines = []
+    engines.append(("MockDatabase (in-memory dicts)", MockDatabase()))
+    engines.append(("SqliteDatabase (:memory:)", SqliteDatabase(":memory:")))
+    tmp = tempfile.TemporaryDirectory()
+    engines.append(("SqliteDatabase (file, WAL)", SqliteDatabase(os.path.join(tmp.name, "bench.db"))))
+
+    for name, db in engines:
+        start = time.perf_counter()
+        counts = load_synthetic_data(db, users)
+        elapsed = time.perf_counter() - start
+        if name == engines[0][0]:
+            print_header(
+                f"Storage engines: {counts['users']:,} users, {counts['orders']:,} orders, "
+                f"{counts['returns']:,} returns (synthetic, seed 0)"
+            )
+        print(f"  bulk load: {counts['orders'] / elapsed:,.0f} orders/sec")
+        bench_engine(name, db, users, writes, reads)
+        close = getattr(db, "close", None)
+        if close:
+            close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
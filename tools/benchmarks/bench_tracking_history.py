@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tracking History Memory Benchmark
+
+Compares the memory used per million scan events by the compact
+TrackingEventLog against keeping one TrackingInfo object per event, and
+measures append, latest and history throughput.
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database.tracking_history import TrackingEventLog
+from models.tracking import TrackingInfo, ShipmentStatus
+
+
+SCANS = [
+    (ShipmentStatus.LABEL_CREATED, None),
+    (ShipmentStatus.PICKED_UP, "San Francisco, CA"),
+    (ShipmentStatus.IN_TRANSIT, "Oakland, CA Hub"),
+    (ShipmentStatus.OUT_FOR_DELIVERY, "Reno, NV"),
+    (ShipmentStatus.DELIVERED, "ReturnFlow Warehouse, Reno, NV"),
+]
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def generate_events(total_events: int):
+    """Yield (tracking_number, status, timestamp, location) in time order per shipment."""
+    base = datetime(2026, 11, 1)
+    shipments = total_events // len(SCANS)
+    for step, (status, location) in enumerate(SCANS):
+        timestamp = base + timedelta(hours=step * 8)
+        for i in range(shipments):
+            yield f"1Z{i:016d}", status, timestamp, location
+
+
+def measure(build, total_events: int):
+    """Elapsed build time (untraced) and memory held by the built store (traced)."""
+    start = time.perf_counter()
+    store = build(total_events)
+    elapsed = time.perf_counter() - start
+    del store
+
+    tracemalloc.start()
+    store = build(total_events)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, current, elapsed
+
+
+def build_event_log(total_events: int) -> TrackingEventLog:
+    log = TrackingEventLog()
+    for event in generate_events(total_events):
+        log.append(*event)
+    return log
+
+
+def build_object_lists(total_events: int):
+    history = {}
+    for tracking_number, status, timestamp, location in generate_events(total_events):
+        history.setdefault(tracking_number, []).append(
+            TrackingInfo(
+                tracking_number=tracking_number,
+                carrier="UPS",
+                status=status,
+                last_update=timestamp,
+                current_location=location,
+            )
+        )
+    return history
+
+
+def bench(total_events: int = 1_000_000):
+    print_header(f"Tracking history: {total_events:,} scan events")
+    scale = 1_000_000 / total_events
+
+    log, log_bytes, log_time = measure(build_event_log, total_events)
+    objects, object_bytes, object_time = measure(build_object_lists, total_events)
+    del objects
+
+    print(f"{'Store':<28}{'MB / 1M events':>16}{'bytes/event':>14}{'append/sec':>14}")
+    print("-" * 72)
+    for name, used, elapsed in [
+        ("TrackingEventLog", log_bytes, log_time),
+        ("TrackingInfo per event", object_bytes, object_time),
+    ]:
+        print(
+            f"{name:<28}{used * scale / 1e6:>16.1f}{used / total_events:>14.1f}"
+            f"{total_events / elapsed:>14,.0f}"
+        )
+    print(f"\nReported by TrackingEventLog.memory_bytes(): {log.memory_bytes() / 1e6:.1f} MB")
+
+    tracking_numbers = [f"1Z{i:016d}" for i in range(0, log.shipment_count, 97)]
+    start = time.perf_counter()
+    for tracking_number in tracking_numbers:
+        log.latest(tracking_number)
+    latest_rate = len(tracking_numbers) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for tracking_number in tracking_numbers:
+        log.history(tracking_number)
+    history_rate = len(tracking_numbers) / (time.perf_counter() - start)
+
+    print(f"latest():  {latest_rate:>12,.0f} lookups/sec")
+    print(f"history(): {history_rate:>12,.0f} lookups/sec ({len(SCANS)} scans each)")
+
+
+if __name__ == "__main__":
+    bench()
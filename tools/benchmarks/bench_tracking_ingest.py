@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tracking Event Ingestion Benchmark
+
+Measures batched carrier event ingestion throughput (events/sec),
+including de-duplication, per-shipment ordering and return status
+cascades, for both pre-parsed events and raw webhook payloads.
+"""
+
+import sys
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database.mock_db import MockDatabase
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from models.tracking import ShipmentStatus
+from services.tracking_ingest import TrackingEvent, TrackingIngestor
+
+
+SCAN_SEQUENCE = [
+    ShipmentStatus.PICKED_UP,
+    ShipmentStatus.IN_TRANSIT,
+    ShipmentStatus.OUT_FOR_DELIVERY,
+    ShipmentStatus.DELIVERED,
+]
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70 + "\n")
+
+
+def build_database(shipments: int) -> MockDatabase:
+    """Mock database with one return per shipment."""
+    db = MockDatabase()
+    for i in range(shipments):
+        db.create_return(
+            ReturnRequest(
+                return_id=f"RET-BENCH-{i}",
+                order_id="ORD001",
+                user_id="USER001",
+                item_id="ITEM001",
+                reason=ReturnReason.DAMAGED,
+                status=ReturnStatus.LABEL_GENERATED,
+                tracking_number=f"1ZBENCH{i:010d}",
+            )
+        )
+    return db
+
+
+def build_events(shipments: int, batch_size: int, duplicate_rate: float = 0.05):
+    """Shuffled scan events with a fraction of re-deliveries."""
+    base = datetime(2026, 11, 27, 8, 0)
+    events = []
+    while len(events) < batch_size:
+        i = random.randrange(shipments)
+        step = random.randrange(len(SCAN_SEQUENCE))
+        events.append(
+            TrackingEvent(
+                tracking_number=f"1ZBENCH{i:010d}",
+                status=SCAN_SEQUENCE[step],
+                timestamp=base + timedelta(hours=step * 6),
+                location=f"Hub {step}",
+            )
+        )
+        if random.random() < duplicate_rate:
+            events.append(events[-1])
+    random.shuffle(events)
+    return events
+
+
+def bench(shipments: int = 20000, batch_size: int = 50000, batches: int = 5):
+    print_header(f"Ingesting {batches} x {batch_size:,} events over {shipments:,} shipments")
+    random.seed(42)
+    db = build_database(shipments)
+    ingestor = TrackingIngestor(db)
+    batches_data = [build_events(shipments, batch_size) for _ in range(batches)]
+
+    start = time.perf_counter()
+    total = 0
+    for events in batches_data:
+        result = ingestor.ingest(events)
+        total += result.received
+    elapsed = time.perf_counter() - start
+    print(f"Parsed events:   {total / elapsed:>12,.0f} events/sec")
+
+    payloads = [
+        [
+            {
+                "tracking_number": e.tracking_number,
+                "status": e.status.value,
+                "timestamp": e.timestamp.isoformat(),
+                "location": e.location,
+            }
+            for e in events
+        ]
+        for events in batches_data
+    ]
+    db = build_database(shipments)
+    ingestor = TrackingIngestor(db)
+    start = time.perf_counter()
+    total = 0
+    for batch in payloads:
+        total += ingestor.ingest_payloads(batch).received
+    elapsed = time.perf_counter() - start
+    print(f"Raw payloads:    {total / elapsed:>12,.0f} events/sec")
+
+    received = sum(1 for r in db.returns.values() if r.status == ReturnStatus.RECEIVED)
+    print(f"Returns marked RECEIVED: {received:,}")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,264 @@
+"""
+Async orchestrator tests
+
+Checks that process_input_async follows the same conversation flow as
+process_input and that many sessions can share one event loop.
+"""
+
+import asyncio
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from agents import ReturnClassificationAgent, TrackingRefundAgent
+from database import AsyncDatabase, MockDatabase, SqliteDatabase
+from models.return_request import ReturnReason, ReturnRequest, ReturnStatus
+from services.orchestrator import VoiceOrchestrator
+from services.voice_interface import VoiceInterface
+
+
+DEMO_STEPS = [
+    "I want to return my headphones",
+    "first order",
+    "headphones",
+    "damaged",
+    "It was broken when it arrived",
+    "yes",
+    "Where is the nearest UPS?",
+    "no thanks",
+]
+
+ENGINES = {"mock": MockDatabase, "sqlite": SqliteDatabase}
+
+
+def normalize(message: str) -> str:
+    """Mask the generated return ID and tracking number."""
+    message = re.sub(r"RET-\w+-\d+", "RET-X", message)
+    return re.sub(r"1Z[A-Z0-9]{16}", "1ZX", message)
+
+
+def run_sync(orchestrator: VoiceOrchestrator, steps):
+    session_id = orchestrator.start_conversation("USER001")
+    orchestrator.identify_user(session_id, user_id="USER001")
+    results = []
+    for step in steps:
+        success, message, _ = orchestrator.process_input(session_id, step)
+        results.append((success, normalize(message), orchestrator.get_context(session_id)["current_agent"]))
+    return results
+
+
+async def run_async(orchestrator: VoiceOrchestrator, steps, caller: str = "USER001"):
+    session_id = orchestrator.start_conversation(caller)
+    assert await orchestrator.identify_user_async(session_id, user_id="USER001")
+    results = []
+    for step in steps:
+        success, message, _ = await orchestrator.process_input_async(session_id, step)
+        results.append((success, normalize(message), orchestrator.get_context(session_id)["current_agent"]))
+    return results
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_async_flow_matches_sync_flow(engine):
+    sync_orchestrator = VoiceOrchestrator(ENGINES[engine]())
+    async_orchestrator = VoiceOrchestrator(ENGINES[engine]())
+
+    expected = run_sync(sync_orchestrator, DEMO_STEPS)
+    assert asyncio.run(run_async(async_orchestrator, DEMO_STEPS)) == expected
+    assert [state for _, _, state in expected[3:6]] == [
+        "return_classification",
+        "return_processing",
+        "logistics",
+    ]
+
+    # The return was written through the async path
+    assert async_orchestrator.db.get_latest_user_return("USER001").item_id == "ITEM001"
+
+    # Tracking and refund lookups go through the async tracking agent
+    tracking = [(step, "tracking_refund") for step in ("where is my return", "when is my refund")]
+    for orchestrator, runner in ((sync_orchestrator, None), (async_orchestrator, asyncio.run)):
+        session_id = orchestrator.start_conversation("USER001")
+        orchestrator.identify_user(session_id, user_id="USER001")
+        for step, state in tracking:
+            orchestrator.get_context(session_id)["current_agent"] = state
+            if runner:
+                success, message, data = runner(orchestrator.process_input_async(session_id, step))
+            else:
+                success, message, data = orchestrator.process_input(session_id, step)
+            assert success, message
+        orchestrator.close()
+
+
+def test_many_sessions_share_one_loop():
+    orchestrator = VoiceOrchestrator(SqliteDatabase())
+
+    async def main():
+        # Distinct callers so session IDs started in the same second differ
+        return await asyncio.gather(
+            *(run_async(orchestrator, DEMO_STEPS, caller=f"caller-{i}") for i in range(50))
+        )
+
+    results = asyncio.run(main())
+    assert all(result == results[0] for result in results)
+    assert results[0][5][2] == "logistics"
+    # Every session filed its return (seed data starts at two)
+    assert orchestrator.db.get_user("USER001").return_count == 52
+    orchestrator.close()
+
+
+class SlowDatabase(AsyncDatabase):
+    """AsyncDatabase whose every call takes 50ms, like a remote store."""
+
+    async def _call(self, method, *args, **kwargs):
+        await asyncio.sleep(0.05)
+        return method(*args, **kwargs)
+
+
+def test_classification_fetches_user_and_order_concurrently():
+    db = MockDatabase()
+    agent = ReturnClassificationAgent(db, SlowDatabase(db))
+    context = {"user_id": "USER001", "selected_order_id": "ORD001", "item_price": 149.99}
+
+    start = time.perf_counter()
+    response = asyncio.run(agent.process_async("it arrived damaged", context))
+    elapsed = time.perf_counter() - start
+
+    assert response.next_action == "return_processing"
+    assert elapsed < 0.09
+
+
+def test_identify_user_async_after_the_session_is_dropped():
+    db = MockDatabase()
+    with VoiceOrchestrator(db, async_database=SlowDatabase(db)) as orchestrator:
+        session_id = orchestrator.start_conversation("USER001")
+
+        async def main():
+            lookup = asyncio.create_task(
+                orchestrator.identify_user_async(session_id, user_id="USER001")
+            )
+            await asyncio.sleep(0.01)
+            # Expired or evicted while the lookup is in flight
+            del orchestrator.sessions[session_id]
+            return await lookup
+
+        assert asyncio.run(main()) is False
+        assert orchestrator.get_context(session_id) is None
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_tracking_status_creates_tracking_then_reads_history_concurrently(engine):
+    db = ENGINES[engine]()
+    db.create_return(
+        ReturnRequest(
+            return_id="RET-SHIPPED",
+            order_id="ORD001",
+            user_id="USER001",
+            item_id="ITEM001",
+            reason=ReturnReason.DAMAGED,
+            status=ReturnStatus.IN_TRANSIT,
+            tracking_number="1ZNOTRACKINGYET001",
+        )
+    )
+    agent = TrackingRefundAgent(db, None, SlowDatabase(db))
+    context = {"user_id": "USER001", "return_id": "RET-SHIPPED"}
+
+    # No tracking record yet: it is created and its first scan reported
+    first = asyncio.run(agent.process_async("where is my return", context))
+    assert [scan["status"] for scan in first.data["scan_history"]] == ["in_transit"]
+    assert db.get_tracking("1ZNOTRACKINGYET001") is not None
+
+    # Once stored, the record and its history are read together
+    start = time.perf_counter()
+    second = asyncio.run(agent.process_async("where is my return", context))
+    elapsed = time.perf_counter() - start
+    assert second.data["scan_history"] == first.data["scan_history"]
+    # get_return, then get_tracking alongside get_tracking_history
+    assert elapsed < 0.14
+
+
+class JitteryDatabase(AsyncDatabase):
+    """AsyncDatabase whose calls take a random 0-10ms, so turns would interleave."""
+
+    async def _call(self, method, *args, **kwargs):
+        await asyncio.sleep(random.random() * 0.01)
+        return method(*args, **kwargs)
+
+
+def test_turns_of_one_session_run_in_order():
+    random.seed(3)
+    db = MockDatabase()
+    with VoiceOrchestrator(MockDatabase()) as reference:
+        expected = run_sync(reference, DEMO_STEPS)
+
+    async def main():
+        orchestrator = VoiceOrchestrator(db, async_database=JitteryDatabase(db))
+        sessions = []
+        for i in range(5):
+            session_id = orchestrator.start_conversation(f"caller-{i}")
+            assert await orchestrator.identify_user_async(session_id, user_id="USER001")
+            sessions.append(session_id)
+
+        # Submit every turn of every session at once
+        turns = [
+            orchestrator.process_input_async(session_id, step)
+            for step in DEMO_STEPS
+            for session_id in sessions
+        ]
+        results = await asyncio.gather(*turns)
+        assert not orchestrator._turn_locks
+        return orchestrator, sessions, results
+
+    orchestrator, sessions, results = asyncio.run(main())
+    for index, session_id in enumerate(sessions):
+        replies = [normalize(message) for _, message, _ in results[index :: len(sessions)]]
+        assert replies == [message for _, message, _ in expected]
+        history = orchestrator.get_context(session_id)["conversation_history"]
+        assert [entry["user"] for entry in history[::2]] == DEMO_STEPS
+    orchestrator.close()
+
+
+class EchoVoiceClient:
+    """Speech client stand-in: the audio is the text, with 20ms of latency."""
+
+    def create_session(self, user_id):
+        time.sleep(0.02)
+        return f"voice-{user_id}"
+
+    def speech_to_text(self, audio_data, format="wav"):
+        time.sleep(0.02)
+        return audio_data.decode()
+
+    def text_to_speech(self, text):
+        time.sleep(0.02)
+        return text.encode()
+
+
+def test_async_voice_interfaces_share_one_loop():
+    orchestrator = VoiceOrchestrator(MockDatabase())
+
+    async def call():
+        interface = VoiceInterface(orchestrator, EchoVoiceClient())
+        await interface.start_voice_conversation_async("USER001")
+        replies = []
+        for step in DEMO_STEPS[:4]:
+            success, text, audio = await interface.process_voice_input_async(step.encode())
+            assert audio == text.encode()
+            replies.append((success, normalize(text)))
+        return replies
+
+    async def main():
+        return await asyncio.gather(*(call() for _ in range(10)))
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    orchestrator.close()
+    assert all(result == results[0] for result in results)
+    assert all(success for success, _ in results[0])
+    # 10 callers x (1 + 4 x 2) blocking speech calls of 20ms, overlapped
+    assert elapsed < 10 * 9 * 0.02 / 2
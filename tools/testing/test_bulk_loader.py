@@ -0,0 +1,113 @@
+"""
+Streaming JSONL bulk loader tests
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database import MockDatabase, SqliteDatabase
+from database.bulk_loader import load_jsonl, main, order_from_record, write_jsonl
+from database.synthetic import SyntheticDataGenerator
+
+
+class ChunkRecorder(MockDatabase):
+    """MockDatabase that records the size of every bulk insert."""
+
+    def __init__(self):
+        super().__init__(seed=False)
+        self.chunks = []
+
+    def bulk_insert_users(self, users):
+        self.chunks.append(len(users))
+        return super().bulk_insert_users(users)
+
+    def bulk_insert_orders(self, orders):
+        self.chunks.append(len(orders))
+        return super().bulk_insert_orders(orders)
+
+
+def synthetic_records(users: int):
+    for bundle in SyntheticDataGenerator(seed=5).generate(users):
+        yield bundle.user
+        yield from bundle.orders
+
+
+@pytest.mark.parametrize("name", ["export.jsonl", "export.jsonl.gz"])
+def test_round_trip_in_bounded_chunks(tmp_path, name):
+    path = tmp_path / name
+    written = write_jsonl(path, synthetic_records(60))
+    expected = list(synthetic_records(60))
+
+    db = ChunkRecorder()
+    report = load_jsonl(db, path, chunk_size=25)
+    assert report.records == written == len(expected)
+    assert report.items == sum(len(r.items) for r in expected if hasattr(r, "items"))
+    if not name.endswith(".gz"):
+        assert report.bytes_read == path.stat().st_size
+    assert report.peak_rss_bytes is None or report.peak_rss_bytes > 0
+    assert max(db.chunks) <= 25
+
+    for record in expected:
+        if hasattr(record, "items"):
+            assert db.get_order(record.order_id) == record
+        else:
+            assert db.get_user(record.user_id) == record
+    assert "records/sec" in report.summary()
+
+
+def test_invalid_line_is_reported_with_its_number(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    write_jsonl(path, synthetic_records(3))
+    lines = path.read_text().splitlines()
+    path.write_text("\n".join(lines[:2] + ["", '{"order_id": "X", "items": []}'] + lines[2:]) + "\n")
+
+    with pytest.raises(ValueError, match=r"bad.jsonl:4: invalid record"):
+        load_jsonl(MockDatabase(seed=False), path)
+
+
+def test_command_line_loads_into_sqlite(tmp_path, capsys):
+    path = tmp_path / "export.jsonl"
+    write_jsonl(path, synthetic_records(20))
+    url = f"sqlite:///{tmp_path / 'loaded.db'}"
+    assert main([str(path), "--url", url, "--chunk-size", "7"]) == 0
+    assert "Loaded 20 users" in capsys.readouterr().out
+
+    db = SqliteDatabase(str(tmp_path / "loaded.db"))
+    bundle = SyntheticDataGenerator(seed=5).bundle(0)
+    assert db.get_user(bundle.user.user_id) == bundle.user
+    assert db.get_user_orders(bundle.user.user_id, limit=100) == sorted(
+        bundle.orders, key=lambda order: order.order_date, reverse=True
+    )
+    db.close()
+
+
+@pytest.fixture
+def pacific(monkeypatch):
+    """Run the test with the host clock in US Pacific time (UTC-8 in March)."""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_utc_order_dates_load_as_naive_local_time(pacific):
+    record = {
+        "order_id": "ORD-UTC",
+        "user_id": "USER001",
+        "items": [{"item_id": "ITEM1", "product_name": "Lamp", "price": 19.99}],
+        "order_date": "2026-03-01T12:00:00Z",
+    }
+    order = order_from_record(record)
+    assert order.order_date == datetime(2026, 3, 1, 4, 0)
+
+    db = SqliteDatabase()
+    db.add_order(order)
+    assert db.get_order("ORD-UTC") == order
+    db.close()
@@ -0,0 +1,112 @@
+"""
+Binary codec tests
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database import MockDatabase
+from models import codec
+from models.codec import CodecError
+from models.order import Order, OrderItem
+from models.return_request import ReturnReason, ReturnRequest, ReturnStatus
+from models.tracking import ShipmentStatus, TrackingInfo
+
+
+def make_context():
+    db = MockDatabase()
+    return {
+        "user_id": "USER001",
+        "user": db.get_user("USER001"),
+        "available_orders": db.get_user_orders("USER001"),
+        "current_agent": "return_processing",
+        "conversation_history": [
+            {"timestamp": datetime(2026, 3, 1, 12, 0, i), "user": f"turn {i} \N{SNOWMAN}"}
+            for i in range(5)
+        ],
+        "created_at": datetime(2026, 3, 1, 11, 59, 59, 999999),
+        "return": ReturnRequest(
+            "RET1", "ORD001", "USER001", "ITEM001", ReturnReason.DAMAGED,
+            status=ReturnStatus.DISPUTED, created_at=datetime(2026, 3, 1), refund_amount=149.99,
+        ),
+        "tracking": TrackingInfo("1Z1", "UPS", ShipmentStatus.IN_TRANSIT, datetime(1969, 7, 20)),
+        "item_price": 0.1 + 0.2,
+        "fraud_risk_score": -1.5e-300,
+        "awaiting_order_selection": False,
+    }
+
+
+def test_round_trip_is_lossless():
+    context = make_context()
+    assert codec.loads(codec.dumps(context)) == context
+
+    values = [
+        None, True, 0, -1, 2**63 - 1, -(2**63), 2**200, -(3**100), float("inf"), "",
+        b"\x00\xff", (1, ("nested", [2])), {1: "int key", ("a", 2): None, None: []},
+        datetime(1, 1, 1), datetime(9999, 12, 31, 23, 59, 59, 999999),
+        datetime(2026, 3, 1, 9, tzinfo=timezone(timedelta(hours=-7, minutes=-30))),
+    ]
+    decoded = codec.loads(codec.dumps(values))
+    assert decoded == values
+    assert type(decoded[11]) is tuple and decoded[15].utcoffset() == values[15].utcoffset()
+
+
+def test_money_is_written_as_integer_cents(monkeypatch):
+    order = Order(
+        "ORD9", "USER9", [OrderItem("ITEM1", "Lamp", 19.99, 3)], datetime(2026, 3, 1), 0
+    )
+    ret = ReturnRequest("RET9", "ORD9", "USER9", "ITEM1", ReturnReason.DAMAGED, refund_cents=1999)
+    # An order writes no floats: every amount goes in the int64 column
+    assert codec._HEADER.unpack_from(codec.dumps(order))[6] == 0
+    data = codec.dumps([order, ret])
+    decoded = codec.loads(data)
+    assert decoded == [order, ret]
+    assert decoded[0].items[0].price_cents == 1999 and decoded[0].total_cents == 5997
+
+    # Version 1 messages carried dollars under the public field names
+    monkeypatch.setattr(codec, "VERSION", 1)
+    monkeypatch.setattr(codec, "_WIRE_FIELDS", {model: model.FIELDS for model in codec.MODEL_IDS})
+    legacy = codec.dumps([order, ret])
+    monkeypatch.undo()
+    assert legacy[2] == 1
+    assert codec.loads(legacy) == [order, ret]
+
+
+def test_denser_than_json():
+    import json
+
+    from models.serialization import encode
+
+    context = make_context()
+    assert len(codec.dumps(context)) < 0.75 * len(json.dumps(encode(context)))
+
+
+def test_rejects_unsupported_and_malformed_input():
+    with pytest.raises(TypeError):
+        codec.dumps({"when": datetime.now().date()})
+    with pytest.raises(TypeError):
+        codec.dumps(object())
+
+    data = codec.dumps(make_context())
+    for cut in range(0, len(data), 7):
+        with pytest.raises(CodecError):
+            codec.loads(data[:cut])
+    with pytest.raises(CodecError):
+        codec.loads(data + b"\x00")
+    with pytest.raises(CodecError):
+        codec.loads(b"\x80\x04\x95" + data[3:])  # a pickle header is not accepted
+
+    # Flip every byte of a small message in turn: always a clean CodecError or a value
+    small = codec.dumps({"k": [1, "two", 3.0, ReturnStatus.RECEIVED]})
+    for position in range(len(small)):
+        corrupted = bytearray(small)
+        corrupted[position] ^= 0xFF
+        try:
+            codec.loads(bytes(corrupted))
+        except CodecError:
+            pass
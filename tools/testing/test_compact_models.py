@@ -0,0 +1,137 @@
+"""
+Compact model tests
+"""
+
+import pickle
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from models import Order, OrderItem, ReturnRequest, ReturnReason, TrackingInfo, ShipmentStatus, User
+from models.compact import from_epoch_us, to_epoch_us
+
+
+def make_order():
+    return Order(
+        order_id="ORD9",
+        user_id="USER9",
+        items=[
+            OrderItem("ITEM1", "Lamp", 19.99, quantity=3, category="Home " + "& Kitchen"),
+            OrderItem("ITEM2", "Bulb", 0.1 + 0.2),
+        ],
+        order_date=datetime(2026, 2, 3, 4, 5, 6, 789),
+        total_amount=0,
+    )
+
+
+def test_models_are_slotted_and_keep_public_attributes():
+    order = make_order()
+    tracking = TrackingInfo("1Z9", "UPS", ShipmentStatus.IN_TRANSIT, datetime(2026, 2, 4))
+    models = [
+        User("USER9", "Ann", "a@example.com", "555"),
+        order,
+        order.items[0],
+        tracking,
+        ReturnRequest("RET9", "ORD9", "USER9", "ITEM1", ReturnReason.DAMAGED),
+    ]
+    for model in models:
+        assert not hasattr(model, "__dict__")
+        with pytest.raises(AttributeError):
+            model.unexpected = 1
+
+    assert order.order_date == datetime(2026, 2, 3, 4, 5, 6, 789)
+    assert order.items[1].price == 0.3
+    assert order.total_amount == 60.27
+    assert order.items[0].total_price == 59.97
+    assert tracking.estimated_delivery is None
+
+    # Money is integer cents underneath, and can be read and set as such
+    assert order.total_cents == 6027 and order.items[0].total_price_cents == 5997
+    order.items[1].price_cents = 45
+    assert order.items[1].price == 0.45
+    assert OrderItem("ITEM3", "Cord", 0, price_cents=1999) == OrderItem("ITEM3", "Cord", 19.99)
+    refund = ReturnRequest("RET9", "ORD9", "USER9", "ITEM1", ReturnReason.OTHER, refund_cents=1999)
+    assert refund.refund_amount == 19.99
+
+    tracking.last_update = datetime(2026, 2, 5, 1)
+    tracking.current_location = "Reno, NV"
+    assert tracking.last_update == datetime(2026, 2, 5, 1)
+    assert tracking.current_location == "Reno, NV"
+
+
+def test_low_cardinality_strings_are_interned():
+    first, second = make_order(), make_order()
+    assert first.items[0].category is second.items[0].category
+    assert first.items[0].category is sys.intern("Home & Kitchen")
+    carrier = "".join(["U", "PS"])
+    tracking = TrackingInfo("1Z1", carrier, ShipmentStatus.DELIVERED, datetime.now())
+    assert tracking.carrier is sys.intern("UPS")
+
+
+def test_equality_repr_and_pickle():
+    def make_return():
+        return ReturnRequest(
+            "RET9",
+            "ORD9",
+            "USER9",
+            "ITEM1",
+            ReturnReason.DAMAGED,
+            created_at=datetime(2026, 1, 1),
+            refund_amount=149.99,
+        )
+
+    ret, same = make_return(), make_return()
+    assert ret == same and ret != make_order()
+    assert "refund_amount=149.99" in repr(ret) and "created_at=datetime" in repr(ret)
+    assert pickle.loads(pickle.dumps(make_order())) == make_order()
+
+
+def test_item_lookup_follows_item_edits():
+    items = [OrderItem(f"ITEM{i}", "Widget", 1.0) for i in range(200)]
+    order = Order("ORD9", "USER9", items, datetime(2026, 2, 3), total_amount=0)
+    assert order.get_item_by_id("ITEM150") is items[150]
+    assert order.get_item_by_id("NOPE") is None
+
+    # Edited in place, removed, appended, or the list swapped out
+    items[150].item_id = "RENAMED"
+    assert order.get_item_by_id("ITEM150") is None
+    assert order.get_item_by_id("RENAMED") is items[150]
+    del items[0]
+    assert order.get_item_by_id("ITEM199") is items[-1]
+    items.append(OrderItem("NEW", "Gadget", 2.0))
+    assert order.get_item_by_id("NEW") is items[-1]
+    order.items = [OrderItem("ITEM1", "Other", 3.0)]
+    assert order.get_item_by_id("ITEM1").product_name == "Other"
+    assert order.get_item_by_id("ITEM199") is None
+
+
+@pytest.fixture
+def pacific(monkeypatch):
+    """Run the test with the host clock in US Pacific time (UTC-8 in March)."""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_aware_timestamps_are_stored_as_naive_local_time(pacific):
+    local = datetime(2026, 3, 1, 4, 0, 0, 5)
+    aware = datetime(2026, 3, 1, 7, 0, 0, 5, tzinfo=timezone(timedelta(hours=-5)))
+    assert to_epoch_us(aware) == to_epoch_us(local)
+    assert from_epoch_us(to_epoch_us(aware)) == local
+    # Naive values are already local and round-trip unchanged
+    now = datetime.now()
+    assert from_epoch_us(to_epoch_us(now)) == now
+
+    tracking = TrackingInfo(
+        "1ZABC", "UPS", ShipmentStatus.IN_TRANSIT, datetime.fromisoformat("2026-03-01T12:00:00Z")
+    )
+    assert tracking.last_update == datetime(2026, 3, 1, 4, 0)
+    assert tracking.last_update.tzinfo is None
+    assert tracking.last_update < datetime(2026, 3, 1, 5, 0)
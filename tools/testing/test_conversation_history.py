@@ -0,0 +1,115 @@
+"""
+Conversation history tests
+
+Checks that contexts keep a bounded tail of the conversation, that the
+spilled turns read back intact, that the orchestrator hands the
+whole call to an escalation, and that transcripts left behind are swept.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agents.base_agent import AgentResponse, BaseAgent
+from database import MockDatabase
+from services.conversation_history import ConversationHistory
+from services.orchestrator import VoiceOrchestrator
+
+
+class EscalatingAgent(BaseAgent):
+    def __init__(self):
+        super().__init__("EscalatingAgent")
+
+    def process(self, user_input, context):
+        return AgentResponse(success=True, message="Escalating", next_action="escalate")
+
+
+def test_history_is_bounded_and_spills_round_trip(tmp_path):
+    history = ConversationHistory(str(tmp_path), max_entries=4, spill_batch=3)
+    context = {"conversation_history": []}
+    entries = [
+        {"timestamp": datetime(2026, 3, 1, 12, 0, i), "user": f"turn {i}"} for i in range(20)
+    ]
+    for entry in entries:
+        history.append("session/1", context, entry)
+        assert len(context["conversation_history"]) < 4 + 3
+
+    assert context["conversation_history"] == entries[-len(context["conversation_history"]):]
+    assert context["history_spilled"] == 20 - len(context["conversation_history"])
+    assert history.stats["spills"] == 5
+    assert history.spilled("session/1") == entries[: context["history_spilled"]]
+    assert history.full_history("session/1", context) == entries
+
+    history.discard("session/1")
+    assert history.spilled("session/1") == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_orchestrator_keeps_long_calls_bounded_and_escalates_with_transcript(tmp_path):
+    history = ConversationHistory(str(tmp_path), max_entries=10, spill_batch=10)
+    orchestrator = VoiceOrchestrator(MockDatabase(), history=history)
+    orchestrator.register_state("supervisor", EscalatingAgent())
+    session_id = orchestrator.start_conversation("USER001")
+
+    # A clarification loop: the router keeps asking what the caller wants
+    for i in range(50):
+        orchestrator.process_input(session_id, f"um {i}")
+    context = orchestrator.get_context(session_id)
+    assert len(context["conversation_history"]) < 20
+    assert context["history_spilled"] + len(context["conversation_history"]) == 100
+
+    context["current_agent"] = "supervisor"
+    _, _, data = orchestrator.process_input(session_id, "let me talk to a person")
+    transcript = data["transcript"]
+    assert len(transcript) == 102
+    assert [entry.get("user") for entry in transcript[:4:2]] == ["um 0", "um 1"]
+    assert transcript[-1]["agent"] == "Escalating"
+    assert orchestrator.get_transcript(session_id) == transcript
+
+    orchestrator.end_conversation(session_id)
+    assert list(tmp_path.iterdir()) == []
+    orchestrator.close()
+
+
+def test_sweep_deletes_only_transcripts_untouched_for_max_age(tmp_path):
+    history = ConversationHistory(str(tmp_path), max_entries=1, spill_batch=1, max_age=3600)
+    live, expired = {"conversation_history": []}, {"conversation_history": []}
+    for i in range(3):
+        history.append("live", live, {"user": f"turn {i}"})
+        history.append("expired", expired, {"user": f"turn {i}"})
+
+    # Both sessions went quiet two hours ago; only "live" takes another turn
+    stale = time.time() - 7200
+    for session_id in ("live", "expired"):
+        os.utime(history.path_for(session_id), (stale, stale))
+    history.append("live", live, {"user": "still here"})
+
+    assert history.sweep() == 1
+    assert history.stats["swept"] == 1
+    assert history.path_for("live").exists()
+    assert not history.path_for("expired").exists()
+    assert history.full_history("live", live)[-1] == {"user": "still here"}
+
+
+def test_close_removes_the_temporary_transcript_directory():
+    with VoiceOrchestrator(MockDatabase()) as orchestrator:
+        history = orchestrator.history
+        context = {"conversation_history": []}
+        for i in range(100):
+            history.append("session", context, {"user": f"turn {i}"})
+        directory = history.directory
+        assert history.path_for("session").exists()
+    assert not directory.exists()
+
+    supplied = ConversationHistory()
+    directory = supplied.directory
+    with VoiceOrchestrator(MockDatabase(), history=supplied):
+        pass
+    # The caller's history is left for the caller to close
+    assert directory.exists()
+    supplied.close()
+    assert not directory.exists()
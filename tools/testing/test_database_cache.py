@@ -0,0 +1,138 @@
+"""
+Read-through database cache tests
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import CachedDatabase, MockDatabase, SqliteDatabase, create_database
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from models.user import User
+from services.orchestrator import VoiceOrchestrator
+
+
+class CountingDatabase(SqliteDatabase):
+    """SqliteDatabase that counts backend reads, standing in for round trips."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_user(self, user_id):
+        self.reads += 1
+        return super().get_user(user_id)
+
+    def get_order(self, order_id):
+        self.reads += 1
+        return super().get_order(order_id)
+
+    def get_user_orders(self, user_id, limit=10):
+        self.reads += 1
+        return super().get_user_orders(user_id, limit)
+
+
+def make_return(return_id="RET-C-1"):
+    return ReturnRequest(
+        return_id=return_id,
+        order_id="ORD001",
+        user_id="USER001",
+        item_id="ITEM001",
+        reason=ReturnReason.DAMAGED,
+    )
+
+
+def test_repeated_reads_hit_the_cache():
+    backend = CountingDatabase()
+    db = CachedDatabase(backend)
+    for _ in range(5):
+        assert db.get_order("ORD001").order_id == "ORD001"
+        assert db.get_user("USER001").name == "John Doe"
+    assert backend.reads == 2
+    assert db.get_order("MISSING") is None and db.get_order("MISSING") is None
+    assert db.cache_stats()["hits"] == 8
+    assert db.hit_rate == 8 / 12
+
+    assert [o.order_id for o in db.get_user_orders("USER001", limit=5)] == ["ORD001", "ORD002"]
+    # The complete list is known, so a larger limit is served from memory too
+    assert len(db.get_user_orders("USER001", limit=10)) == 2
+    assert len(db.get_user_orders("USER001", limit=1)) == 1
+    assert backend.reads == 5
+
+
+def test_writes_invalidate_affected_keys():
+    db = CachedDatabase(SqliteDatabase())
+    assert db.get_user("USER001").return_count == 2
+    db.create_return(make_return())
+    assert db.get_user("USER001").return_count == 3
+
+    assert db.get_return("RET-C-1").status == ReturnStatus.INITIATED
+    db.update_return_status("RET-C-1", ReturnStatus.RECEIVED)
+    assert db.get_return("RET-C-1").status == ReturnStatus.RECEIVED
+    db.update_return_statuses([("RET-C-1", ReturnStatus.DISPUTED)])
+    assert db.get_return("RET-C-1").status == ReturnStatus.DISPUTED
+
+    assert db.get_user_by_phone("555-0002").user_id == "USER002"
+    jane = db.get_user("USER002")
+    db.add_user(User(jane.user_id, jane.name, jane.email, "+1-555-0099"))
+    assert db.get_user_by_phone("555-0002") is None
+    assert db.get_user_by_phone("(555) 0099").user_id == "USER002"
+
+    order = db.get_order("ORD003")
+    order.status = "returned"
+    db.add_order(order)
+    assert db.get_order("ORD003").status == "returned"
+    assert db.get_user_orders("USER002")[0].status == "returned"
+
+
+def test_ttl_and_lru_bounds():
+    backend = CountingDatabase()
+    db = CachedDatabase(backend, max_entries=2, ttl=0.05)
+    db.get_order("ORD001")
+    db.get_order("ORD002")
+    db.get_order("ORD001")
+    db.get_order("ORD003")  # evicts ORD002, the least recently used
+    assert db.stats["evictions"] == 1
+    db.get_order("ORD001")
+    assert backend.reads == 3
+    db.get_order("ORD002")
+    assert backend.reads == 4
+
+    time.sleep(0.06)
+    db.get_order("ORD002")
+    assert backend.reads == 5
+    assert db.stats["expired"] == 1
+
+
+def test_agents_share_the_cache_transparently():
+    backend = CountingDatabase()
+    db = create_database("sqlite://", cache_size=100)
+    assert isinstance(db, CachedDatabase)
+    db.backend = backend
+
+    steps = [
+        "I want to return my headphones",
+        "first order",
+        "headphones",
+        "damaged",
+        "It was broken when it arrived",
+        "yes",
+    ]
+    cached = VoiceOrchestrator(db)
+    plain = VoiceOrchestrator(MockDatabase())
+    replies = []
+    for orchestrator in (cached, plain):
+        session_id = orchestrator.start_conversation("USER001")
+        orchestrator.identify_user(session_id, user_id="USER001")
+        replies.append([orchestrator.process_input(session_id, step)[0] for step in steps])
+        orchestrator.close()
+
+    assert replies[0] == replies[1] == [True] * len(steps)
+    assert db.get_latest_user_return("USER001").item_id == "ITEM001"
+    # One backend read each for the user, their orders and the selected order;
+    # every later lookup by the other agents is served from memory
+    assert backend.reads == 3
+    assert db.stats["hits"] >= 3
+    assert isinstance(create_database("sqlite://", cache_size=0), SqliteDatabase)
@@ -0,0 +1,186 @@
+"""
+Declarative index framework tests
+
+Indexes are checked against brute-force scans of the table after
+random inserts, updates and deletes.
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from operator import attrgetter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database import MockDatabase
+from database.indexing import Index, Table
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+
+
+BASE = datetime(2026, 1, 1)
+
+
+def make_table():
+    return Table(
+        "return_id",
+        [
+            Index("user_id", sort_key=attrgetter("created_at")),
+            Index("tracking_number", unique=True),
+            Index("status"),
+        ],
+    )
+
+
+def make_return(i: int, user: int, tracking: str = None, minutes: int = None) -> ReturnRequest:
+    return ReturnRequest(
+        return_id=f"RET-{i}",
+        order_id="ORD",
+        user_id=f"USER{user}",
+        item_id="ITEM",
+        reason=ReturnReason.DAMAGED,
+        created_at=BASE + timedelta(minutes=i if minutes is None else minutes),
+        tracking_number=tracking,
+    )
+
+
+def assert_consistent(table: Table) -> None:
+    records = list(table.values())
+    for user_id in {r.user_id for r in records}:
+        expected = sorted(
+            (r for r in records if r.user_id == user_id), key=attrgetter("created_at")
+        )
+        assert [r.created_at for r in table.index("user_id").get(user_id)] == [
+            r.created_at for r in expected
+        ]
+        assert {r.return_id for r in table.index("user_id").get(user_id)} == {
+            r.return_id for r in expected
+        }
+    assert table.index("tracking_number").entries == {
+        r.tracking_number: r for r in records if r.tracking_number
+    }
+    for status in ReturnStatus:
+        assert {r.return_id for r in table.where(status=status)} == {
+            r.return_id for r in records if r.status == status
+        }
+    assert sum(len(bucket) for bucket in table.index("user_id").entries.values()) == len(records)
+
+
+def test_unique_conflicts_change_nothing():
+    table = make_table()
+    table.insert(make_return(1, 1, tracking="1ZA"))
+    table.insert(make_return(2, 1))
+
+    with pytest.raises(ValueError, match="already assigned to RET-1"):
+        table.insert(make_return(3, 2, tracking="1ZA"))
+    assert "RET-3" not in table
+
+    with pytest.raises(ValueError):
+        table.update("RET-2", tracking_number="1ZA", status=ReturnStatus.RECEIVED)
+    assert table["RET-2"].tracking_number is None
+    assert table["RET-2"].status == ReturnStatus.INITIATED
+    assert table.update("MISSING", status=ReturnStatus.RECEIVED) is None
+    assert_consistent(table)
+
+
+def test_sorted_buckets_and_lookups():
+    table = make_table()
+    for i, minutes in enumerate([30, 10, 20, 10]):
+        table.insert(make_return(i, 1, minutes=minutes))
+    index = table.index("user_id")
+    assert [r.created_at.minute for r in index.bucket("USER1")] == [10, 10, 20, 30]
+    assert index.last("USER1").return_id == "RET-0"
+    assert index.count("USER1") == 4 and index.count("USER9") == 0
+    assert index.get("USER9") == [] and index.last("USER9") is None
+
+    table.update("RET-0", created_at=BASE)
+    assert index.bucket("USER1")[0].return_id == "RET-0"
+    assert table.delete("RET-0").return_id == "RET-0"
+    assert table.delete("RET-0") is None
+    assert_consistent(table)
+
+
+def test_records_mutated_in_place_are_reindexed_on_insert():
+    table = make_table()
+    record = table.insert(make_return(1, 1, tracking="1ZOLD"))
+    table.insert(make_return(2, 1, minutes=5))
+
+    # Callers that edit a stored record directly re-insert it afterwards
+    record.user_id = "USER2"
+    record.tracking_number = "1ZNEW"
+    record.status = ReturnStatus.RECEIVED
+    record.created_at = BASE + timedelta(minutes=10)
+    table.insert(record)
+    assert [r.return_id for r in table.index("user_id").get("USER1")] == ["RET-2"]
+    assert table.index("tracking_number").get("1ZOLD") is None
+    assert table.where(status=ReturnStatus.INITIATED) == [table["RET-2"]]
+    assert_consistent(table)
+
+    record.tracking_number = "1ZLAST"
+    table.update("RET-1", status=ReturnStatus.REFUND_PROCESSED)
+    assert table.index("tracking_number").get("1ZNEW") is None
+    assert table.find(tracking_number="1ZLAST") is record
+    assert table.delete("RET-1") is record
+    assert_consistent(table)
+
+
+def test_where_uses_the_most_selective_index():
+    table = make_table()
+    for i in range(100):
+        table.insert(make_return(i, i % 10, tracking=f"1Z{i}" if i % 3 else None))
+
+    status = table.index("status")
+    calls = []
+    original = status.bucket
+    status.bucket = lambda key: calls.append(key) or original(key)
+
+    matches = table.where(user_id="USER3", status=ReturnStatus.INITIATED)
+    assert [r.return_id for r in matches] == [f"RET-{i}" for i in range(3, 100, 10)]
+    # The 10-record user bucket beat the 100-record status bucket
+    assert calls == []
+    assert table.find(tracking_number="1Z4").return_id == "RET-4"
+    assert table.find(tracking_number="1Z4", user_id="USER5") is None
+    assert len(table.where(reason=ReturnReason.DAMAGED)) == 100
+
+
+def test_random_operations_keep_indexes_consistent():
+    rng = random.Random(4)
+    table = make_table()
+    statuses = list(ReturnStatus)
+    for step in range(3000):
+        i = rng.randrange(300)
+        action = rng.random()
+        try:
+            if action < 0.4:
+                tracking = f"1Z{rng.randrange(200)}" if rng.random() < 0.7 else None
+                table.insert(make_return(i, rng.randrange(20), tracking, rng.randrange(500)))
+            elif action < 0.8:
+                table.update(
+                    f"RET-{i}",
+                    status=rng.choice(statuses),
+                    tracking_number=f"1Z{rng.randrange(200)}" if rng.random() < 0.5 else None,
+                    created_at=BASE + timedelta(minutes=rng.randrange(500)),
+                )
+            else:
+                table.delete(f"RET-{i}")
+        except ValueError:
+            pass
+    assert len(table) > 0
+    assert_consistent(table)
+
+
+def test_mock_database_queries_go_through_indexes():
+    db = MockDatabase()
+    assert [o.order_id for o in db.get_user_orders("USER001")] == ["ORD001", "ORD002"]
+    assert db.get_user_orders("USER001", limit=1)[0].order_id == "ORD001"
+    assert db.get_user_orders("USER001", limit=0) == []
+    assert db.get_user_orders("NOBODY") == []
+
+    db.create_return(make_return(1, 1, tracking="1ZM"))
+    db.create_return(make_return(2, 1))
+    db.update_return_status("RET-1", ReturnStatus.RECEIVED)
+    assert [r.return_id for r in db.find_returns(status=ReturnStatus.RECEIVED)] == ["RET-1"]
+    assert [r.return_id for r in db.find_returns(user_id="USER1")] == ["RET-1", "RET-2"]
+    assert_consistent(db.returns)
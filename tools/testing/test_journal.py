@@ -0,0 +1,174 @@
+"""
+Journaled database durability tests
+
+Every test writes through one JournaledDatabase, reopens the directory
+and checks that recovery rebuilt the same state.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database import JournaledDatabase, create_database
+from models.order import Order, OrderItem
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from models.serialization import decode, encode, from_dict, to_dict
+from models.tracking import TrackingInfo, ShipmentStatus
+from models.user import User
+
+
+BASE = datetime(2026, 3, 1, 9, 0)
+
+
+def make_return(index: int) -> ReturnRequest:
+    return ReturnRequest(
+        return_id=f"RET-J-{index}",
+        order_id="ORD001",
+        user_id="USER001",
+        item_id="ITEM001",
+        reason=ReturnReason.DAMAGED,
+        created_at=BASE + timedelta(minutes=index),
+        refund_amount=149.99,
+        tracking_number=f"1ZJ{index:06d}",
+    )
+
+
+def write_workload(db, returns: int = 20) -> None:
+    db.add_user(User(user_id="USER003", name="New User", email="n@example.com", phone="+1-555-0003"))
+    db.add_order(
+        Order(
+            order_id="ORD100",
+            user_id="USER003",
+            items=[OrderItem(item_id="ITEM100", product_name="Lamp", price=30.0, category="Home & Kitchen")],
+            order_date=BASE,
+            total_amount=0,
+        )
+    )
+    for i in range(returns):
+        db.create_return(make_return(i))
+    db.update_return_status("RET-J-0", ReturnStatus.RECEIVED)
+    db.update_return_statuses([("RET-J-1", ReturnStatus.DISPUTED)])
+    db.set_return_tracking_number("RET-J-2", "1ZMOVED")
+    db.create_tracking(TrackingInfo("1ZJ000003", "UPS", ShipmentStatus.LABEL_CREATED, BASE))
+    db.update_tracking_status("1ZJ000003", ShipmentStatus.IN_TRANSIT, "Oakland, CA")
+    db.record_tracking_scans([("1ZJ000004", ShipmentStatus.PICKED_UP, BASE, "Reno, NV")])
+    db.apply_tracking_updates(
+        [TrackingInfo("1ZJ000004", "UPS", ShipmentStatus.DELIVERED, BASE + timedelta(days=2))]
+    )
+
+
+def state(db):
+    """Comparable view of everything the workload touches."""
+    returns = db.get_user_returns("USER001")
+    return (
+        db.get_user("USER001"),
+        db.get_user_by_phone("555-0003"),
+        db.get_user_orders("USER003"),
+        returns,
+        db.get_return_by_tracking("1ZMOVED").return_id,
+        db.get_return_by_tracking("1ZJ000002"),
+        db.get_tracking("1ZJ000003"),
+        db.get_tracking("1ZJ000004"),
+        db.get_tracking_history("1ZJ000003"),
+        db.get_tracking_history("1ZJ000004"),
+    )
+
+
+def test_serialization_round_trip():
+    ret = make_return(1)
+    assert from_dict(to_dict(ret)) == ret
+    value = [ret, (ShipmentStatus.DELIVERED, BASE), {"key": None}]
+    assert decode(encode(value)) == [ret, [ShipmentStatus.DELIVERED, BASE], {"key": None}]
+
+
+def test_money_is_serialized_as_integer_cents():
+    ret = ReturnRequest(
+        "RET-C", "ORD001", "USER001", "ITEM001", ReturnReason.DAMAGED, refund_cents=1001
+    )
+    item = OrderItem("ITEM9", "Lamp", 0.29)
+    data = to_dict(ret)
+    assert data["refund_cents"] == 1001 and "refund_amount" not in data
+    assert to_dict(item)["price_cents"] == 29
+    assert from_dict(data).refund_cents == 1001
+    assert decode(encode([item])) == [item]
+
+    # Journals and snapshots written earlier carried dollars
+    legacy = to_dict(ret)
+    del legacy["refund_cents"]
+    legacy["refund_amount"] = 10.01
+    assert from_dict(legacy) == ret
+    legacy_item = dict(to_dict(item), price=0.29)
+    del legacy_item["price_cents"]
+    assert from_dict(legacy_item) == item
+    with pytest.raises(ValueError):
+        from_dict(dict(data, refund_cents=10.01))
+
+
+@pytest.mark.parametrize("durability", ["batch", "always"])
+def test_recovery_replays_journal(tmp_path, durability):
+    db = JournaledDatabase(str(tmp_path), durability=durability)
+    write_workload(db)
+    if durability == "always":
+        assert db.journal.synced_lsn == db.journal.lsn
+    expected = state(db)
+    db.close()
+
+    recovered = JournaledDatabase(str(tmp_path))
+    assert recovered.replayed > 0
+    assert state(recovered) == expected
+    assert recovered.get_user("USER001").return_count == 22
+    recovered.close()
+
+
+def test_snapshot_then_tail_replay(tmp_path):
+    db = JournaledDatabase(str(tmp_path))
+    write_workload(db, returns=10)
+    db.snapshot()
+    db.create_return(make_return(50))
+    expected = state(db)
+    db.close()
+
+    recovered = JournaledDatabase(str(tmp_path))
+    assert recovered.replayed == 1
+    assert state(recovered) == expected
+    assert len(list(tmp_path.glob("snapshot-*"))) == 1
+    recovered.close()
+
+
+def test_torn_final_record_is_discarded(tmp_path):
+    db = JournaledDatabase(str(tmp_path))
+    db.create_return(make_return(0))
+    db.create_return(make_return(1))
+    db.close()
+
+    segment = sorted(tmp_path.glob("journal-*.log"))[-1]
+    data = segment.read_bytes()
+    segment.write_bytes(data[:-15])
+
+    recovered = JournaledDatabase(str(tmp_path))
+    assert recovered.get_return("RET-J-0") is not None
+    assert recovered.get_return("RET-J-1") is None
+    recovered.create_return(make_return(2))
+    recovered.close()
+
+    again = JournaledDatabase(str(tmp_path))
+    assert again.get_return("RET-J-2") is not None
+    again.close()
+
+
+def test_failed_writes_are_not_journaled(tmp_path):
+    db = create_database(f"journal:///{tmp_path}")
+    db.create_return(make_return(0))
+    clash = make_return(1)
+    clash.tracking_number = "1ZJ000000"
+    with pytest.raises(ValueError):
+        db.create_return(clash)
+    db.close()
+
+    recovered = JournaledDatabase(str(tmp_path))
+    assert recovered.get_return("RET-J-1") is None
+    recovered.close()
@@ -0,0 +1,140 @@
+"""
+MockDatabase secondary index tests
+
+Checks that the per-user, tracking-number and phone indexes agree with
+the underlying records, including under concurrent updates.
+"""
+
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database.mock_db import MockDatabase
+from models.return_request import ReturnRequest, ReturnReason
+from models.user import User
+
+
+def make_return(index: int, user_id: str = "USER001", tracking_number: str = None) -> ReturnRequest:
+    """Build a return request for ORD001/ITEM001."""
+    return ReturnRequest(
+        return_id=f"RET-TEST-{index}",
+        order_id="ORD001",
+        user_id=user_id,
+        item_id="ITEM001",
+        reason=ReturnReason.DAMAGED,
+        created_at=datetime(2026, 1, 1) + timedelta(minutes=index),
+        tracking_number=tracking_number,
+    )
+
+
+def assert_tracking_index_consistent(db: MockDatabase) -> None:
+    """Every indexed tracking number maps to the return that holds it, and vice versa."""
+    expected = {
+        ret.tracking_number: ret.return_id for ret in db.returns.values() if ret.tracking_number
+    }
+    indexed = {tn: ret.return_id for tn, ret in db.returns.index("tracking_number").entries.items()}
+    assert indexed == expected
+
+
+def test_latest_return_follows_created_at_not_insertion_order():
+    db = MockDatabase()
+    db.create_return(make_return(2))
+    db.create_return(make_return(0))
+    db.create_return(make_return(1))
+
+    assert db.get_latest_user_return("USER001").return_id == "RET-TEST-2"
+    assert [r.return_id for r in db.get_user_returns("USER001")] == [
+        "RET-TEST-0",
+        "RET-TEST-1",
+        "RET-TEST-2",
+    ]
+    assert [r.return_id for r in db.get_user_return_history("USER001", offset=1, limit=5)] == [
+        "RET-TEST-1",
+        "RET-TEST-0",
+    ]
+    assert db.get_latest_user_return("USER002") is None
+
+
+def test_tracking_lookup_after_assign_change_and_clear():
+    db = MockDatabase()
+    db.create_return(make_return(0, tracking_number="1ZOLD"))
+    assert db.get_return_by_tracking("1ZOLD").return_id == "RET-TEST-0"
+
+    db.set_return_tracking_number("RET-TEST-0", "1ZNEW")
+    assert db.get_return_by_tracking("1ZOLD") is None
+    assert db.get_return_by_tracking("1ZNEW").return_id == "RET-TEST-0"
+
+    db.set_return_tracking_number("RET-TEST-0", None)
+    assert db.get_return_by_tracking("1ZNEW") is None
+    assert_tracking_index_consistent(db)
+
+
+def test_tracking_number_cannot_be_shared():
+    db = MockDatabase()
+    db.create_return(make_return(0, tracking_number="1ZSHARED"))
+    db.create_return(make_return(1))
+
+    with pytest.raises(ValueError):
+        db.set_return_tracking_number("RET-TEST-1", "1ZSHARED")
+    with pytest.raises(ValueError):
+        db.create_return(make_return(2, tracking_number="1ZSHARED"))
+    assert_tracking_index_consistent(db)
+
+
+def test_tracking_index_consistent_under_concurrent_updates():
+    db = MockDatabase()
+    return_count = 50
+    for i in range(return_count):
+        db.create_return(make_return(i, tracking_number=f"1ZINIT{i:04d}"))
+
+    # A small pool of shared tracking numbers forces threads to contend
+    shared_numbers = [f"1ZPOOL{i:02d}" for i in range(20)]
+    errors = []
+
+    def worker(worker_id: int) -> None:
+        for step in range(500):
+            return_id = f"RET-TEST-{(worker_id * 7 + step) % return_count}"
+            tracking_number = shared_numbers[(worker_id + step * 3) % len(shared_numbers)]
+            try:
+                if step % 5 == 0:
+                    db.set_return_tracking_number(return_id, None)
+                else:
+                    db.set_return_tracking_number(return_id, tracking_number)
+            except ValueError:
+                pass
+            except Exception as e:  # pragma: no cover - surfaced by the assert below
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert_tracking_index_consistent(db)
+    for tracking_number, return_request in db.returns.index("tracking_number").entries.items():
+        assert db.get_return_by_tracking(tracking_number) is return_request
+
+
+@pytest.mark.parametrize(
+    "phone",
+    ["+1-555-0001", "5550001", "1 555 0001", "(555) 0001", "five five five oh oh oh one"],
+)
+def test_user_by_phone_matches_any_format(phone):
+    db = MockDatabase()
+    assert db.get_user_by_phone(phone).user_id == "USER001"
+
+
+def test_phone_index_follows_user_updates():
+    db = MockDatabase()
+    db.add_user(User(user_id="USER001", name="John Doe", email="j@example.com", phone="+1-555-0099"))
+
+    assert db.get_user_by_phone("555-0001") is None
+    assert db.get_user_by_phone("five five five oh oh nine nine").user_id == "USER001"
+    assert db.get_user_by_phone("not a number") is None
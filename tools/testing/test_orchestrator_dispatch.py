@@ -0,0 +1,94 @@
+"""
+Orchestrator dispatch tests
+
+Covers the state -> agent table, validation of next_action transitions
+and the per-state turn metrics.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from agents.base_agent import AgentResponse, BaseAgent
+from database import MockDatabase
+from services.orchestrator import INITIAL_STATE, STATE_AGENTS, VoiceOrchestrator
+
+
+DEMO_STEPS = [
+    "I want to return my headphones",
+    "first order",
+    "headphones",
+    "damaged",
+    "It was broken when it arrived",
+    "yes",
+]
+
+
+class ScriptedAgent(BaseAgent):
+    """Replies with a fixed next_action, or raises."""
+
+    def __init__(self, next_action=None, error=None):
+        self.next_action = next_action
+        self.error = error
+
+    def process(self, user_input, context):
+        if self.error:
+            raise self.error
+        return AgentResponse(success=True, message="ok", next_action=self.next_action)
+
+
+def start(orchestrator):
+    session_id = orchestrator.start_conversation("USER001")
+    orchestrator.identify_user(session_id, user_id="USER001")
+    return session_id
+
+
+def test_every_state_has_an_agent_and_metrics_follow_the_flow():
+    orchestrator = VoiceOrchestrator(MockDatabase())
+    for state, attribute in STATE_AGENTS.items():
+        assert isinstance(getattr(orchestrator, attribute), BaseAgent), state
+
+    session_id = start(orchestrator)
+    states = []
+    for step in DEMO_STEPS:
+        states.append(orchestrator.get_context(session_id)["current_agent"])
+        orchestrator.process_input(session_id, step)
+
+    metrics = orchestrator.metrics.snapshot()
+    assert sum(entry["turns"] for entry in metrics["states"].values()) == len(DEMO_STEPS)
+    for state in set(states):
+        entry = metrics["states"][state]
+        assert entry["turns"] == states.count(state) and entry["errors"] == 0
+        assert 0 <= entry["mean_ms"] <= entry["max_ms"] <= entry["total_ms"]
+    assert metrics["transitions"]["intent_router->purchase_retrieval"] == 1
+    assert metrics["unknown_states"] == metrics["invalid_transitions"] == 0
+    orchestrator.close()
+
+
+def test_unknown_states_invalid_transitions_and_errors_are_counted():
+    orchestrator = VoiceOrchestrator(MockDatabase())
+    orchestrator.register_state("survey", ScriptedAgent(next_action="no_such_state"))
+    orchestrator.register_state("broken", ScriptedAgent(error=RuntimeError("down")))
+    session_id = start(orchestrator)
+    context = orchestrator.get_context(session_id)
+
+    # A state saved by another deployment starts over at the router
+    context["current_agent"] = "retired_state"
+    orchestrator.process_input(session_id, "hello")
+    assert orchestrator.metrics.unknown_states == 1
+
+    # next_action must name a registered state
+    context["current_agent"] = "survey"
+    orchestrator.process_input(session_id, "five stars")
+    assert context["current_agent"] == INITIAL_STATE
+    assert orchestrator.metrics.invalid_transitions == 1
+    assert orchestrator.metrics.transitions["survey", "no_such_state"] == 1
+
+    context["current_agent"] = "broken"
+    with pytest.raises(RuntimeError):
+        orchestrator.process_input(session_id, "anything")
+    assert orchestrator.metrics.snapshot()["states"]["broken"]["errors"] == 1
+    orchestrator.close()
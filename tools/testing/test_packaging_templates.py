@@ -0,0 +1,99 @@
+"""
+Packaging template tests
+
+Covers category lookup, slot rendering and the item category handoff
+from PurchaseRetrievalAgent to LogisticsAgent.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from agents.logistics_agent import LogisticsAgent
+from agents.packaging_templates import (
+    DEFAULT_CATEGORY,
+    PackagingTemplate,
+    PackagingTemplateRegistry,
+    packaging_templates,
+)
+from agents.purchase_retrieval_agent import PurchaseRetrievalAgent
+from database.mock_db import MockDatabase
+
+
+def test_lookup_ignores_case():
+    template = packaging_templates.get("Electronics")
+    assert packaging_templates.get("electronics") is template
+    assert packaging_templates.get("HOME & KITCHEN").category == "Home & Kitchen"
+
+
+def test_unknown_or_missing_category_falls_back_to_default():
+    default = packaging_templates.get(DEFAULT_CATEGORY)
+    assert packaging_templates.get("Garden Furniture") is default
+    assert packaging_templates.get(None) is default
+    assert packaging_templates.get("") is default
+
+
+def test_render_fills_slots():
+    template = PackagingTemplate.compile("Books", "Pack the {item_name} for {carrier}.")
+    assert template.slots == ("item_name", "carrier", None)
+    assert template.render(item_name="novel", carrier="UPS") == "Pack the novel for UPS."
+    assert "Running Shoes" in packaging_templates.get("Footwear").render(item_name="Running Shoes")
+
+
+def test_render_missing_slot_raises():
+    template = PackagingTemplate.compile("Books", "Pack the {item_name} for {carrier}.")
+    with pytest.raises(KeyError, match="carrier"):
+        template.render(item_name="novel")
+
+
+def test_template_ids_are_stable_and_track_wording():
+    first = PackagingTemplate.compile("Home & Kitchen", "Pack the {item_name}.")
+    again = PackagingTemplate.compile("Home & Kitchen", "Pack the {item_name}.")
+    reworded = PackagingTemplate.compile("Home & Kitchen", "Box the {item_name}.")
+    assert first.template_id == again.template_id
+    assert first.template_id.startswith("packaging.home_and_kitchen.")
+    assert reworded.template_id != first.template_id
+
+    registry = PackagingTemplateRegistry({DEFAULT_CATEGORY: "Pack the {item_name}."})
+    template = registry.get(DEFAULT_CATEGORY)
+    assert registry.get_by_id(template.template_id) is template
+
+
+def test_registry_requires_default_category():
+    with pytest.raises(ValueError, match=DEFAULT_CATEGORY):
+        PackagingTemplateRegistry({"Electronics": "Pack the {item_name}."})
+
+
+def test_selected_item_category_picks_logistics_template():
+    db = MockDatabase()
+    retrieval = PurchaseRetrievalAgent(db)
+    logistics = LogisticsAgent()
+
+    # ORD002 holds a single item, so selecting the order selects it
+    context = {"user_id": "USER001"}
+    retrieval.process("show my orders", context)
+    orders = context["available_orders"]
+    context["available_orders"] = [o for o in orders if o.order_id == "ORD002"]
+    retrieval.process("the first one", context)
+    assert context["item_category"] == "Footwear"
+
+    response = logistics.process("how do I pack it?", context)
+    assert response.data["category"] == "Footwear"
+    assert response.data["template_id"] == packaging_templates.get("Footwear").template_id
+    assert "Running Shoes" in response.message
+
+
+def test_item_selection_from_multi_item_order_sets_category():
+    db = MockDatabase()
+    retrieval = PurchaseRetrievalAgent(db)
+    context = {"user_id": "USER001", "selected_order_id": "ORD001"}
+
+    retrieval.process("the phone case", context)
+    assert context["item_category"] == "Accessories"
+
+    response = LogisticsAgent().process("how should I box it", context)
+    assert response.data["category"] == "Accessories"
+    assert "Phone Case" in response.message
@@ -0,0 +1,174 @@
+"""
+Redis adapter tests
+
+Runs the client, session store and entity cache against the in-process
+RESP stand-in, including a conversation served alternately by two
+orchestrators that share nothing but Redis.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database import MockDatabase
+from models.return_request import ReturnReason, ReturnRequest, ReturnStatus
+from services.orchestrator import VoiceOrchestrator
+from services.redis_store import (
+    RedisCachedDatabase,
+    RedisClient,
+    RedisError,
+    RedisSessionStore,
+)
+from services.resp_server import RespServer
+
+
+@pytest.fixture
+def server():
+    with RespServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    with RedisClient.from_url(server.url) as client:
+        yield client
+
+
+def test_commands_and_pipelining(server, client):
+    assert client.ping()
+    assert client.get("missing") is None
+    assert client.set("greeting", "hello")
+    assert client.get("greeting") == b"hello"
+
+    client.mset({"a": 1, "b": "two"})
+    assert client.mget(["a", "missing", "b"]) == [b"1", None, b"two"]
+    assert client.delete("a", "b", "missing") == 2
+
+    # A pipeline is one round trip, and error replies come back in place
+    trips = client.round_trips
+    with client.pipeline() as pipe:
+        for i in range(100):
+            pipe.set(f"k{i}", i)
+        pipe.execute_command("NOSUCHCOMMAND")
+        pipe.get("k42")
+    assert client.round_trips == trips + 1
+    assert pipe.results[:100] == ["OK"] * 100
+    assert isinstance(pipe.results[100], RedisError)
+    assert pipe.results[101] == b"42"
+
+    with pytest.raises(RedisError):
+        client.execute("SET", "only-a-key")
+
+
+def test_expiry(client):
+    client.set("short", "lived", ex=1)
+    client.mset({"batch": "lived"}, ex=100)
+    assert 0 < client.ttl("short") <= 1
+    assert 99 <= client.ttl("batch") <= 100
+    assert client.execute("PEXPIRE", "short", 50) == 1
+    time.sleep(0.1)
+    assert client.get("short") is None
+    assert client.ttl("short") == -2
+
+
+@pytest.mark.parametrize("encoding", ["binary", "json"])
+def test_session_store_round_trip(client, encoding):
+    db = MockDatabase()
+    store = RedisSessionStore(client, ttl=60, encoding=encoding)
+    context = {
+        "user_id": "USER001",
+        "user": db.get_user("USER001"),
+        "available_orders": db.get_user_orders("USER001"),
+        "conversation_history": [],
+        "item_price": 149.99,
+    }
+    store["s1"] = context
+    store["s2"] = {"user_id": "USER002"}
+
+    assert "s1" in store and "nope" not in store
+    assert store["s1"] == context
+    assert sorted(store) == ["s1", "s2"]
+    assert set(store.get_many(["s1", "s2", "nope"])) == {"s1", "s2"}
+    assert 0 < client.ttl("returnflow:session:s1") <= 60
+
+    del store["s1"]
+    assert store.get("s1") is None
+    with pytest.raises(KeyError):
+        del store["s1"]
+
+
+def test_workers_share_conversations(client):
+    """Alternate every turn of one call between two orchestrators."""
+    db = MockDatabase()
+    workers = [
+        VoiceOrchestrator(db, session_store=RedisSessionStore(client)) for _ in range(2)
+    ]
+    reference = VoiceOrchestrator(MockDatabase())
+
+    steps = ["I want to return my headphones", "first order", "headphones", "damaged"]
+    shared = workers[0].start_conversation("USER001")
+    local = reference.start_conversation("USER001")
+    assert workers[1].identify_user(shared, user_id="USER001")
+    assert reference.identify_user(local, user_id="USER001")
+
+    for turn, step in enumerate(steps):
+        assert workers[turn % 2].process_input(shared, step)[:2] == reference.process_input(
+            local, step
+        )[:2]
+
+    context = workers[1].get_context(shared)
+    assert context["current_agent"] == reference.get_context(local)["current_agent"]
+    assert context["user"] == db.get_user("USER001")
+    assert len(context["conversation_history"]) == 2 * len(steps)
+
+    workers[0].end_conversation(shared)
+    assert workers[1].process_input(shared, "hello")[0] is False
+    for orchestrator in [*workers, reference]:
+        orchestrator.close()
+
+
+def test_entity_cache_reads_through_and_invalidates(client):
+    backend = MockDatabase()
+    db = RedisCachedDatabase(backend, client)
+
+    assert db.get_user("USER001") == backend.get_user("USER001")
+    assert db.get_user("USER001") == backend.get_user("USER001")
+    assert db.stats["hits"] == 1 and db.stats["misses"] == 1
+    assert db.get_user_by_phone("+1 (555) 0001").user_id == "USER001"
+
+    # Batched lookups: one MGET, misses backfilled, absent IDs left out
+    orders = db.get_orders(["ORD001", "ORD002", "NOPE"])
+    assert set(orders) == {"ORD001", "ORD002"}
+    trips = client.round_trips
+    assert db.get_orders(["ORD001", "ORD002"]) == orders
+    assert client.round_trips == trips + 1
+    assert set(db.get_users(["USER001", "USER002"])) == {"USER001", "USER002"}
+
+    # Writes through the wrapper are seen by the next read
+    order = backend.get_order("ORD001")
+    order.status = "shipped"
+    db.add_order(order)
+    assert db.get_order("ORD001").status == "shipped"
+
+    # A different worker's cache sees the same entries
+    other = RedisCachedDatabase(backend, client)
+    assert other.get_order("ORD001").status == "shipped"
+    assert other.stats["hits"] == 1
+
+
+def test_entity_cache_return_invalidation(client):
+    backend = MockDatabase()
+    db = RedisCachedDatabase(backend, client)
+
+    ret = db.create_return(
+        ReturnRequest("RET-T1", "ORD001", "USER001", "ITEM001", ReturnReason.DAMAGED)
+    )
+    assert db.get_return("RET-T1") == ret
+    db.update_return_status("RET-T1", ReturnStatus.RECEIVED)
+    assert db.get_return("RET-T1").status == ReturnStatus.RECEIVED
+    db.set_return_tracking_number("RET-T1", "1ZTEST")
+    assert db.get_return("RET-T1").tracking_number == "1ZTEST"
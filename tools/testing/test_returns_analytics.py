@@ -0,0 +1,177 @@
+"""
+Columnar returns analytics tests
+
+Every query is checked against the same aggregate computed by looping
+over the database's ReturnRequest objects.
+"""
+
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from database import (
+    AsyncDatabase,
+    JournaledDatabase,
+    MockDatabase,
+    ReturnsAnalytics,
+    ShardedDatabase,
+    SqliteDatabase,
+)
+from database.returns_analytics import UNKNOWN_CATEGORY
+from database.synthetic import load_synthetic_data
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+
+
+def category(db, ret):
+    order = db.get_order(ret.order_id)
+    item = order.get_item_by_id(ret.item_id) if order else None
+    return item.category if item else UNKNOWN_CATEGORY
+
+
+def expected(db, keep=lambda ret: True):
+    returns = [ret for ret in db.list_returns() if keep(ret)]
+    refunds = defaultdict(float)
+    fraud = defaultdict(list)
+    for ret in returns:
+        refunds[category(db, ret)] += ret.refund_amount
+        fraud[ret.created_at.date()].append(ret.fraud_risk_score)
+    return (
+        Counter(ret.reason for ret in returns),
+        Counter(ret.status for ret in returns),
+        {name: round(total, 2) for name, total in refunds.items()},
+        {day: sum(scores) / len(scores) for day, scores in fraud.items()},
+    )
+
+
+def actual(analytics, **filters):
+    return (
+        analytics.count_by_reason(**filters),
+        analytics.count_by_status(**filters),
+        analytics.refund_by_category(**filters),
+        analytics.average_fraud_score_by_day(**filters),
+    )
+
+
+def assert_matches(analytics, db, keep=lambda ret: True, **filters):
+    reasons, statuses, refunds, fraud = actual(analytics, **filters)
+    want_reasons, want_statuses, want_refunds, want_fraud = expected(db, keep)
+    assert reasons == dict(want_reasons)
+    assert statuses == dict(want_statuses)
+    assert refunds == pytest.approx(want_refunds)
+    assert fraud == pytest.approx(want_fraud)
+    assert analytics.count(**filters) == sum(want_reasons.values())
+
+
+@pytest.fixture
+def loaded():
+    db = MockDatabase()
+    load_synthetic_data(db, users=400, seed=11)
+    return db, ReturnsAnalytics.attach(db, capacity=8)
+
+
+def test_matches_python_aggregates(loaded):
+    db, analytics = loaded
+    assert len(analytics) == len(db.returns) > 0
+    assert_matches(analytics, db)
+
+
+def test_filters(loaded):
+    db, analytics = loaded
+    cutoff = sorted(ret.created_at for ret in db.list_returns())[len(db.returns) // 2]
+    assert_matches(
+        analytics,
+        db,
+        lambda ret: ret.reason in (ReturnReason.DAMAGED, ReturnReason.DEFECTIVE)
+        and ret.created_at >= cutoff,
+        reasons=[ReturnReason.DAMAGED, ReturnReason.DEFECTIVE],
+        since=cutoff,
+    )
+    user = next(iter(db.returns.values())).user_id
+    assert_matches(analytics, db, lambda ret: ret.user_id == user, user_id=user)
+    assert analytics.count(user_id="NOBODY") == 0
+    assert analytics.average_fraud_score_by_day(user_id="NOBODY") == {}
+
+
+def test_writes_are_mirrored(loaded):
+    db, analytics = loaded
+    before = len(analytics)
+    db.create_return(
+        ReturnRequest(
+            return_id="RET-NEW",
+            order_id="ORD001",
+            user_id="USER001",
+            item_id="ITEM001",
+            reason=ReturnReason.WRONG_ITEM,
+            created_at=datetime(2020, 1, 1, 12),
+            refund_amount=149.99,
+            fraud_risk_score=0.9,
+        )
+    )
+    assert len(analytics) == before + 1
+    assert analytics.refund_by_category(since=datetime(2020, 1, 1), until=datetime(2020, 1, 2)) == {
+        "Electronics": 149.99
+    }
+
+    db.update_return_status("RET-NEW", ReturnStatus.REFUND_PROCESSED)
+    ids = list(db.returns)[:25]
+    db.update_return_statuses([(return_id, ReturnStatus.DISPUTED) for return_id in ids])
+    assert analytics.count(statuses=[ReturnStatus.REFUND_PROCESSED], user_id="USER001") == 1
+    assert_matches(
+        analytics,
+        db,
+        lambda ret: ret.status == ReturnStatus.DISPUTED,
+        statuses=[ReturnStatus.DISPUTED],
+    )
+    assert_matches(analytics, db)
+
+
+def test_follows_journaled_database(tmp_path):
+    db = JournaledDatabase(str(tmp_path))
+    load_synthetic_data(db, users=50, seed=2)
+    db.close()
+
+    recovered = JournaledDatabase(str(tmp_path))
+    analytics = ReturnsAnalytics.attach(recovered)
+    recovered.update_return_status(next(iter(recovered.returns)), ReturnStatus.REJECTED)
+    assert analytics.count(statuses=[ReturnStatus.REJECTED]) == sum(
+        ret.status == ReturnStatus.REJECTED for ret in recovered.list_returns()
+    )
+    assert_matches(analytics, recovered.db)
+    recovered.close()
+
+
+@pytest.mark.parametrize("engine", [ShardedDatabase, SqliteDatabase])
+def test_follows_every_engine(engine):
+    db = engine()
+    load_synthetic_data(db, users=100, seed=5)
+    analytics = ReturnsAnalytics.attach(db)
+    assert len(analytics) == len(db.list_returns()) > 0
+
+    db.create_return(
+        ReturnRequest(
+            return_id="RET-NEW",
+            order_id="ORD001",
+            user_id="USER001",
+            item_id="ITEM001",
+            reason=ReturnReason.WRONG_ITEM,
+            created_at=datetime(2020, 1, 1, 12),
+            refund_amount=149.99,
+        )
+    )
+    db.update_return_status("RET-NEW", ReturnStatus.REFUND_PROCESSED)
+    ids = [ret.return_id for ret in db.list_returns() if ret.return_id != "RET-NEW"][:25]
+    db.update_return_statuses([(return_id, ReturnStatus.DISPUTED) for return_id in ids])
+    assert analytics.count(statuses=[ReturnStatus.REFUND_PROCESSED], user_id="USER001") == 1
+    assert_matches(analytics, db)
+
+
+def test_attach_rejects_engines_without_return_listeners():
+    with pytest.raises(TypeError, match="add_return_listener"):
+        ReturnsAnalytics.attach(AsyncDatabase(MockDatabase()))
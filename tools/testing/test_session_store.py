@@ -0,0 +1,92 @@
+"""
+In-memory session store tests
+
+Drives MemorySessionStore with a fake clock through idle expiry, LRU
+eviction and heap compaction, and checks that the orchestrator forgets
+abandoned calls.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database import MockDatabase
+from services.orchestrator import VoiceOrchestrator
+from services.session_store import EVICTED, EXPIRED, MemorySessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_idle_sessions_expire_and_use_keeps_them_alive():
+    clock = FakeClock()
+    dropped = []
+    store = MemorySessionStore(
+        idle_ttl=60, on_evict=lambda sid, ctx, reason: dropped.append((sid, reason)), clock=clock
+    )
+    store["busy"] = {"turn": 0}
+    store["idle"] = {"turn": 0}
+
+    for turn in range(1, 5):
+        clock.now += 40
+        store["busy"]["turn"] = turn  # a read refreshes the deadline
+    assert "idle" not in store and len(store) == 1
+    assert store.sweep() == 0  # the idle session was already swept by the reads
+    assert dropped == [("idle", EXPIRED)]
+    assert store.get("idle") is None
+
+    clock.now += 61
+    assert store.sweep() == 1
+    assert dropped[-1] == ("busy", EXPIRED)
+    assert len(store) == 0 and store.stats["expired"] == 2
+
+
+def test_lru_bound_and_heap_stays_compact():
+    clock = FakeClock()
+    dropped = []
+    store = MemorySessionStore(
+        idle_ttl=60,
+        max_sessions=3,
+        on_evict=lambda sid, ctx, reason: dropped.append((sid, reason)),
+        clock=clock,
+    )
+    for sid in "abc":
+        store[sid] = {}
+    store["a"]  # now most recently used
+    store["d"] = {}
+    assert sorted(store) == ["a", "c", "d"]
+    assert dropped == [("b", EVICTED)]
+    assert store.stats["evictions"] == 1
+
+    # Churn through many short-lived sessions: the heap is rebuilt rather than
+    # growing with deleted sessions
+    for i in range(1000):
+        store[f"s{i}"] = {}
+        del store[f"s{i}"]
+    assert store.store_stats()["heap_size"] <= 2 * len(store) + 64
+
+    with pytest.raises(ValueError):
+        MemorySessionStore(max_sessions=0)
+
+
+def test_orchestrator_forgets_abandoned_calls():
+    clock = FakeClock()
+    store = MemorySessionStore(idle_ttl=300, max_sessions=100, clock=clock)
+    orchestrator = VoiceOrchestrator(MockDatabase(), session_store=store)
+    session_id = orchestrator.start_conversation("USER001")
+    assert orchestrator.identify_user(session_id, user_id="USER001")
+    assert orchestrator.process_input(session_id, "I want to return my headphones")[0]
+
+    clock.now += 301  # the caller hung up without saying goodbye
+    assert orchestrator.process_input(session_id, "hello?")[0] is False
+    assert orchestrator.get_context(session_id) is None
+    assert len(store) == 0
+    orchestrator.close()
@@ -0,0 +1,71 @@
+"""
+Bulk refund settlement tests
+
+The vectorized settlement is checked against the same fees, payouts and
+dispute deltas computed one return at a time in Python integers.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from database import MockDatabase, SqliteDatabase
+from database.synthetic import load_synthetic_data
+from models.return_request import ReturnReason, ReturnRequest
+from services.settlement import DEFAULT_RESTOCKING_FEE_BPS, SettlementBatch, settle
+
+
+def settle_one(db, ret, fee_bps):
+    order = db.get_order(ret.order_id)
+    item = order.get_item_by_id(ret.item_id) if order else None
+    fee = (ret.refund_cents * fee_bps.get(ret.reason, 0) + 5000) // 10000
+    price = item.price_cents if item else ret.refund_cents
+    return ret.refund_cents - fee, fee, price - ret.refund_cents
+
+
+@pytest.mark.parametrize("engine", [MockDatabase, SqliteDatabase])
+def test_matches_per_return_arithmetic(engine):
+    source = MockDatabase(seed=False)
+    load_synthetic_data(source, 300)
+    db = engine(seed=False)
+    db.bulk_insert_orders(list(source.orders.values()))
+    returns = source.list_returns()
+    # Partial refunds and a return whose order is gone
+    returns[0].refund_cents -= 501
+    returns[1].refund_cents += 1
+    returns.append(ReturnRequest("RET-X", "NOPE", "U", "I", ReturnReason.OTHER, refund_cents=999))
+
+    settlement = settle(SettlementBatch.from_returns(db, returns))
+    expected = [settle_one(db, ret, DEFAULT_RESTOCKING_FEE_BPS) for ret in returns]
+    assert settlement.net_cents.tolist() == [net for net, _, _ in expected]
+    assert settlement.fee_cents.tolist() == [fee for _, fee, _ in expected]
+    assert settlement.delta_cents.tolist() == [delta for _, _, delta in expected]
+
+    totals = settlement.totals()
+    assert totals["refund_cents"] == sum(ret.refund_cents for ret in returns)
+    assert totals["net_cents"] + totals["fee_cents"] == totals["refund_cents"]
+    assert totals["underpaid_cents"] == sum(max(delta, 0) for _, _, delta in expected)
+    assert set(settlement.disputed_return_ids()) >= {returns[0].return_id, returns[1].return_id}
+    assert "RET-X" not in settlement.disputed_return_ids()
+
+
+def test_fee_rounding_and_schedule():
+    db = MockDatabase()
+    returns = [
+        ReturnRequest(f"RET{cents}", "ORD001", "USER001", "ITEM001", reason, refund_cents=cents)
+        for cents, reason in [
+            (10, ReturnReason.BUYER_REMORSE),  # 1.5 cents rounds up to 2
+            (3, ReturnReason.BUYER_REMORSE),  # 0.45 cents rounds down to 0
+            (14999, ReturnReason.DAMAGED),
+        ]
+    ]
+    batch = SettlementBatch.from_returns(db, returns)
+    assert settle(batch).fee_cents.tolist() == [2, 0, 0]
+    assert settle(batch, {ReturnReason.DAMAGED: 10000}).net_cents.tolist() == [10, 3, 0]
+    with pytest.raises(ValueError):
+        settle(batch, {ReturnReason.OTHER: 10001})
@@ -0,0 +1,143 @@
+"""
+ShardedDatabase concurrency tests
+
+Hammers one database from many threads and checks that no update is
+lost and every secondary index agrees with the records.
+"""
+
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import ShardedDatabase
+from models.order import Order, OrderItem
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from models.user import User
+
+
+THREADS = 8
+USERS = 20
+RETURNS_PER_THREAD = 300
+
+
+def run_threads(target) -> None:
+    errors = []
+
+    def wrapper(worker_id: int) -> None:
+        try:
+            target(worker_id)
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=wrapper, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+def make_db() -> ShardedDatabase:
+    db = ShardedDatabase(shards=4, seed=False)
+    for u in range(USERS):
+        db.add_user(User(user_id=f"U{u}", name=f"User {u}", email="", phone=f"+1-555-{u:07d}"))
+    return db
+
+
+def test_concurrent_returns_keep_counts_and_indexes_consistent():
+    db = make_db()
+
+    def worker(worker_id: int) -> None:
+        for i in range(RETURNS_PER_THREAD):
+            db.create_return(
+                ReturnRequest(
+                    return_id=f"RET-{worker_id}-{i}",
+                    order_id="ORD",
+                    user_id=f"U{i % USERS}",
+                    item_id="ITEM",
+                    reason=ReturnReason.DAMAGED,
+                    created_at=datetime(2026, 1, 1) + timedelta(seconds=i),
+                    tracking_number=f"1Z{worker_id}{i:06d}",
+                )
+            )
+            # Readers run alongside writers and must always see whole state
+            latest = db.get_latest_user_return(f"U{(i + 1) % USERS}")
+            assert latest is None or db.get_return(latest.return_id) is latest
+
+    run_threads(worker)
+
+    per_user = THREADS * RETURNS_PER_THREAD // USERS
+    for u in range(USERS):
+        returns = db.get_user_returns(f"U{u}")
+        assert db.get_user(f"U{u}").return_count == per_user
+        assert len(returns) == per_user
+        assert [r.created_at for r in returns] == sorted(r.created_at for r in returns)
+        for ret in returns:
+            assert db.get_return_by_tracking(ret.tracking_number) is ret
+
+
+def test_contended_tracking_numbers_stay_unique():
+    db = make_db()
+    for i in range(40):
+        db.create_return(
+            ReturnRequest(
+                return_id=f"RET-{i}", order_id="ORD", user_id=f"U{i % USERS}",
+                item_id="ITEM", reason=ReturnReason.OTHER,
+            )
+        )
+    pool = [f"1ZPOOL{i:02d}" for i in range(10)]
+
+    def worker(worker_id: int) -> None:
+        for step in range(400):
+            return_id = f"RET-{(worker_id * 7 + step) % 40}"
+            try:
+                db.set_return_tracking_number(
+                    return_id, None if step % 5 == 0 else pool[(worker_id + step) % len(pool)]
+                )
+            except ValueError:
+                pass
+            db.update_return_status(return_id, ReturnStatus.IN_TRANSIT)
+
+    run_threads(worker)
+
+    holders = {}
+    for i in range(40):
+        ret = db.get_return(f"RET-{i}")
+        if ret.tracking_number:
+            assert ret.tracking_number not in holders
+            holders[ret.tracking_number] = ret
+    for tracking_number in pool:
+        assert db.get_return_by_tracking(tracking_number) is holders.get(tracking_number)
+
+
+def test_concurrent_orders_and_phone_updates():
+    db = make_db()
+
+    def worker(worker_id: int) -> None:
+        for i in range(200):
+            user_id = f"U{(worker_id + i) % USERS}"
+            db.add_order(
+                Order(
+                    order_id=f"O{worker_id}-{i}",
+                    user_id=user_id,
+                    items=[OrderItem(item_id="I", product_name="Widget", price=1.0)],
+                    order_date=datetime(2026, 1, 1) + timedelta(minutes=i),
+                    total_amount=0,
+                )
+            )
+            db.add_user(
+                User(user_id=user_id, name="", email="", phone=f"+1-555-{worker_id:03d}{i:04d}")
+            )
+
+    run_threads(worker)
+
+    total = sum(len(db.get_user_orders(f"U{u}", limit=10_000)) for u in range(USERS))
+    assert total == THREADS * 200
+    for u in range(USERS):
+        user = db.get_user(f"U{u}")
+        assert db.get_user_by_phone(user.phone) is user
+        orders = db.get_user_orders(f"U{u}", limit=10_000)
+        assert [o.order_date for o in orders] == sorted((o.order_date for o in orders), reverse=True)
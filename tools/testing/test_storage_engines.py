@@ -0,0 +1,227 @@
+"""
+Storage engine parity tests
+
+Runs the same operations against every storage engine to check they
+honour the MockDatabase interface identically.
+"""
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database import MockDatabase, ShardedDatabase, SqliteDatabase, create_database
+from database.sqlite_db import SCHEMA, SCHEMA_VERSION
+from models.return_request import ReturnRequest, ReturnReason, ReturnStatus
+from models.tracking import TrackingInfo, ShipmentStatus
+
+
+ENGINES = {
+    "mock": lambda tmp_path: MockDatabase(),
+    "sharded": lambda tmp_path: ShardedDatabase(shards=4),
+    "sqlite-memory": lambda tmp_path: SqliteDatabase(),
+    "sqlite-file": lambda tmp_path: SqliteDatabase(str(tmp_path / "returnflow.db")),
+}
+
+
+@pytest.fixture(params=list(ENGINES))
+def db(request, tmp_path):
+    return ENGINES[request.param](tmp_path)
+
+
+def make_return(index: int, tracking_number: str = None) -> ReturnRequest:
+    return ReturnRequest(
+        return_id=f"RET-TEST-{index}",
+        order_id="ORD001",
+        user_id="USER001",
+        item_id="ITEM001",
+        reason=ReturnReason.DAMAGED,
+        status=ReturnStatus.LABEL_GENERATED,
+        created_at=datetime(2026, 1, 1) + timedelta(minutes=index),
+        refund_amount=149.99,
+        tracking_number=tracking_number,
+    )
+
+
+def test_seeded_users_and_orders(db):
+    assert db.get_user("USER001").name == "John Doe"
+    assert db.get_user_by_phone("five five five oh oh oh two").user_id == "USER002"
+    assert [o.order_id for o in db.get_user_orders("USER001")] == ["ORD001", "ORD002"]
+    order = db.get_order("ORD001")
+    assert [item.item_id for item in order.items] == ["ITEM001", "ITEM002"]
+    assert order.get_item_by_id("ITEM002").price == 19.99
+
+
+def test_returns_round_trip(db):
+    db.create_return(make_return(1, "1ZONE"))
+    db.create_return(make_return(0, "1ZZERO"))
+
+    assert db.get_return("RET-TEST-1") == make_return(1, "1ZONE")
+    assert db.get_latest_user_return("USER001").return_id == "RET-TEST-1"
+    assert db.get_return_by_tracking("1ZZERO").return_id == "RET-TEST-0"
+    assert db.get_user("USER001").return_count == 4
+
+    db.update_return_status("RET-TEST-0", ReturnStatus.DISPUTED)
+    assert db.get_return("RET-TEST-0").status == ReturnStatus.DISPUTED
+
+    with pytest.raises(ValueError):
+        db.set_return_tracking_number("RET-TEST-0", "1ZONE")
+
+
+def test_tracking_updates_and_history(db):
+    first = datetime(2026, 2, 1, 9, 0)
+    db.create_tracking(
+        TrackingInfo(
+            tracking_number="1ZTRACK",
+            carrier="UPS",
+            status=ShipmentStatus.LABEL_CREATED,
+            last_update=first,
+        )
+    )
+    applied = db.apply_tracking_updates(
+        [
+            TrackingInfo(
+                tracking_number="1ZTRACK",
+                carrier="UPS",
+                status=ShipmentStatus.IN_TRANSIT,
+                last_update=first + timedelta(hours=5),
+                current_location="Oakland, CA",
+            )
+        ]
+    )
+    assert [info.status for info in applied] == [ShipmentStatus.IN_TRANSIT]
+
+    # Older updates never move a shipment backwards
+    assert db.apply_tracking_updates(
+        [
+            TrackingInfo(
+                tracking_number="1ZTRACK",
+                carrier="UPS",
+                status=ShipmentStatus.PICKED_UP,
+                last_update=first + timedelta(hours=1),
+            )
+        ]
+    ) == []
+    assert db.get_tracking("1ZTRACK").current_location == "Oakland, CA"
+    assert [scan.status for scan in db.get_tracking_history("1ZTRACK")] == [
+        ShipmentStatus.LABEL_CREATED,
+        ShipmentStatus.IN_TRANSIT,
+    ]
+
+
+def test_scans_sharing_a_timestamp_are_kept_once_each(db):
+    at = datetime(2026, 2, 1, 9, 0)
+    scans = [
+        ("1ZSAME", ShipmentStatus.PICKED_UP, at, "San Jose, CA"),
+        ("1ZSAME", ShipmentStatus.IN_TRANSIT, at, "San Jose, CA"),
+        ("1ZSAME", ShipmentStatus.IN_TRANSIT, at, "Oakland, CA Hub"),
+        ("1ZSAME", ShipmentStatus.IN_TRANSIT, at, None),
+    ]
+    assert db.record_tracking_scans(scans) == 4
+    # A replay of the same stream, and anything older, adds nothing
+    assert db.record_tracking_scans(scans) == 0
+    assert (
+        db.record_tracking_scans(
+            [("1ZSAME", ShipmentStatus.LABEL_CREATED, at - timedelta(hours=1), None)]
+        )
+        == 0
+    )
+    assert db.record_tracking_scans([("1ZSAME", ShipmentStatus.DELIVERED, at, "")]) == 1
+
+    history = db.get_tracking_history("1ZSAME")
+    assert [(scan.status, scan.timestamp, scan.location) for scan in history] == [
+        (status, timestamp, location) for _, status, timestamp, location in scans
+    ] + [(ShipmentStatus.DELIVERED, at, None)]
+    assert db.get_tracking_history("1ZSAME", limit=2) == history[-2:]
+
+
+def test_get_items_bulk(db):
+    found = db.get_items_bulk(
+        [("ORD001", "ITEM002"), ("ORD002", "ITEM003"), ("ORD001", "NOPE"), ("NOPE", "ITEM001")]
+    )
+    assert set(found) == {("ORD001", "ITEM002"), ("ORD002", "ITEM003")}
+    assert found["ORD001", "ITEM002"] == db.get_order("ORD001").get_item_by_id("ITEM002")
+    assert db.get_items_bulk([]) == {}
+
+
+def test_create_database_selects_engine_from_url(tmp_path):
+    assert isinstance(create_database("memory://"), MockDatabase)
+    assert create_database("memory://?shards=8").shard_count == 8
+    assert isinstance(create_database("sqlite://"), SqliteDatabase)
+    assert isinstance(create_database(f"sqlite:///{tmp_path / 'x.db'}"), SqliteDatabase)
+
+
+def test_sqlite_state_survives_reopen(tmp_path):
+    path = str(tmp_path / "returnflow.db")
+    first = SqliteDatabase(path)
+    first.create_return(make_return(0, "1ZKEEP"))
+    first.close()
+
+    reopened = SqliteDatabase(path)
+    assert reopened.get_return_by_tracking("1ZKEEP").return_id == "RET-TEST-0"
+    assert len(reopened.list_users()) == 2
+
+
+def test_sqlite_migrates_dollar_columns_to_cents(tmp_path):
+    path = str(tmp_path / "v0.db")
+    conn = sqlite3.connect(path)
+    # The schema before money moved to integer cents
+    v0_schema = (
+        SCHEMA.replace("total_cents INTEGER", "total_amount REAL")
+        .replace("price_cents INTEGER", "price REAL")
+        .replace("refund_cents INTEGER", "refund_amount REAL")
+    )
+    conn.executescript(
+        v0_schema
+        + """
+        INSERT INTO users VALUES ('USER9', 'Ann', 'a@example.com', '555', '555', '', 0, 0);
+        INSERT INTO orders VALUES ('ORD9', 'USER9', 0, 60.27, 'delivered');
+        INSERT INTO order_items VALUES ('ORD9', 0, 'ITEM1', 'Lamp', 19.99, 3, 'Home');
+        INSERT INTO returns VALUES ('RET9', 'ORD9', 'USER9', 'ITEM1', 'damaged', 'initiated',
+            0, 0.29, '', NULL, NULL, '1Z9', 0.0);
+        """
+    )
+    conn.close()
+
+    db = SqliteDatabase(path)
+    order = db.get_order("ORD9")
+    assert (order.total_cents, order.items[0].price_cents) == (6027, 1999)
+    assert db.get_return_by_tracking("1Z9").refund_cents == 29
+    assert db.get_user_orders("USER9") == [order]
+    conn = db._conn()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert conn.execute("SELECT typeof(price_cents) FROM order_items").fetchone()[0] == "integer"
+    db.close()
+
+
+def test_sqlite_migrates_scan_history_to_sequenced_keys(tmp_path):
+    path = str(tmp_path / "v1.db")
+    conn = sqlite3.connect(path)
+    # The scan history before scans sharing a timestamp were kept
+    v1_schema = SCHEMA.replace("    seq INTEGER NOT NULL,\n", "").replace(
+        "PRIMARY KEY (tracking_number, ts, seq)", "PRIMARY KEY (tracking_number, ts)"
+    )
+    conn.executescript(
+        v1_schema
+        + """
+        INSERT INTO tracking_events VALUES ('1Z1', 0, 'picked_up', 'San Jose, CA');
+        INSERT INTO tracking_events VALUES ('1Z1', 1000000, 'in_transit', NULL);
+        PRAGMA user_version = 1;
+        """
+    )
+    conn.close()
+
+    db = SqliteDatabase(path)
+    assert db._conn().execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    second = datetime(1970, 1, 1, 0, 0, 1)
+    assert db.record_tracking_scans([("1Z1", ShipmentStatus.IN_TRANSIT, second, "Oakland")]) == 1
+    assert [(scan.status, scan.location) for scan in db.get_tracking_history("1Z1")] == [
+        (ShipmentStatus.PICKED_UP, "San Jose, CA"),
+        (ShipmentStatus.IN_TRANSIT, None),
+        (ShipmentStatus.IN_TRANSIT, "Oakland"),
+    ]
+    db.close()
@@ -0,0 +1,194 @@
+"""
+Tracking cache tests
+
+Drives TrackingCache with a fake clock and calls refresh_due directly,
+so no refresher thread is involved.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database.mock_db import MockDatabase
+from database.tracking_cache import TrackingCache
+from models.tracking import ShipmentStatus, TrackingInfo
+from services.carrier_client import SHIPMENT_PROGRESSION, MockCarrierClient
+
+
+class FakeClock:
+    """Monotonic clock the test moves by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScriptedCarrier:
+    """Carrier reporting ``status`` for every shipment, or raising while ``failing``."""
+
+    def __init__(self, status: ShipmentStatus = ShipmentStatus.IN_TRANSIT):
+        self.status = status
+        self.failing = False
+        self.calls = []
+
+    def fetch_tracking(self, tracking_number: str) -> TrackingInfo:
+        self.calls.append(tracking_number)
+        if self.failing:
+            raise ConnectionError("carrier API unavailable")
+        return make_tracking(tracking_number, self.status)
+
+
+def make_tracking(tracking_number: str, status: ShipmentStatus) -> TrackingInfo:
+    return TrackingInfo(
+        tracking_number=tracking_number,
+        carrier="UPS",
+        status=status,
+        last_update=datetime(2026, 3, 1, 12, 0),
+        current_location="Oakland, CA Hub",
+    )
+
+
+def make_cache(carrier=None, **kwargs):
+    clock = FakeClock()
+    cache = TrackingCache(carrier or ScriptedCarrier(), clock=clock, **kwargs)
+    return cache, clock
+
+
+def test_ttl_follows_shipment_status():
+    cache, clock = make_cache(
+        status_ttls={ShipmentStatus.IN_TRANSIT: 60.0, ShipmentStatus.OUT_FOR_DELIVERY: 30.0}
+    )
+    cache.put(make_tracking("1ZMOVING", ShipmentStatus.IN_TRANSIT))
+    cache.put(make_tracking("1ZNEARLY", ShipmentStatus.OUT_FOR_DELIVERY))
+    cache.put(make_tracking("1ZDONE", ShipmentStatus.DELIVERED))
+
+    clock.now += 45
+    cache.get("1ZMOVING")
+    cache.get("1ZNEARLY")
+    assert cache.stats["hits"] == 1 and cache.stats["stale_hits"] == 1
+
+    # Delivered shipments never go stale, so they never reach the heap
+    clock.now += 10**6
+    cache.get("1ZDONE")
+    assert cache.stats["hits"] == 2
+    assert sorted(cache._collect_due()) == ["1ZMOVING", "1ZNEARLY"]
+
+
+def test_stale_entries_are_served_while_revalidating():
+    carrier = ScriptedCarrier(ShipmentStatus.IN_TRANSIT)
+    cache, clock = make_cache(carrier)
+    cache.put(make_tracking("1ZABC", ShipmentStatus.PICKED_UP))
+
+    clock.now += 500
+    carrier.status = ShipmentStatus.OUT_FOR_DELIVERY
+    # The stale copy comes back at once; nothing was fetched yet
+    assert cache.get("1ZABC").status == ShipmentStatus.PICKED_UP
+    assert carrier.calls == []
+
+    assert cache.refresh_due() == 1
+    assert cache.get("1ZABC").status == ShipmentStatus.OUT_FOR_DELIVERY
+    assert cache.stats["refreshes"] == 1 and cache.stats["stale_hits"] == 1
+
+
+def test_superseded_heap_items_are_skipped():
+    carrier = ScriptedCarrier()
+    cache, clock = make_cache(carrier, status_ttls={ShipmentStatus.IN_TRANSIT: 60.0})
+    cache.put(make_tracking("1ZABC", ShipmentStatus.IN_TRANSIT))
+    clock.now += 30
+    # A newer put pushes a later expiry; the first heap item is now stale
+    cache.put(make_tracking("1ZABC", ShipmentStatus.IN_TRANSIT))
+    assert len(cache._expiry_heap) == 2
+
+    clock.now += 40
+    assert cache.refresh_due() == 0
+    assert carrier.calls == []
+
+    clock.now += 30
+    assert cache.refresh_due() == 1
+    assert carrier.calls == ["1ZABC"]
+
+
+def test_refresh_errors_keep_the_stale_copy_and_retry():
+    carrier = ScriptedCarrier(ShipmentStatus.DELIVERED)
+    cache, clock = make_cache(carrier, refresh_interval=5.0)
+    cache.put(make_tracking("1ZABC", ShipmentStatus.IN_TRANSIT), fresh=False)
+
+    carrier.failing = True
+    assert cache.refresh_due() == 1
+    assert cache.stats["refresh_errors"] == 1
+    assert cache.get("1ZABC").status == ShipmentStatus.IN_TRANSIT
+
+    # Retried one refresh interval later, once the carrier is back
+    carrier.failing = False
+    clock.now += 5
+    assert cache.refresh_due() == 1
+    assert cache.get("1ZABC").status == ShipmentStatus.DELIVERED
+    assert cache.stats["refreshes"] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache, _ = make_cache(max_entries=2)
+    for number in ("1ZA", "1ZB"):
+        cache.put(make_tracking(number, ShipmentStatus.IN_TRANSIT))
+    cache.get("1ZA")
+    cache.put(make_tracking("1ZC", ShipmentStatus.IN_TRANSIT))
+
+    assert len(cache) == 2
+    assert cache.get("1ZB") is None
+    assert cache.get("1ZA") is not None and cache.get("1ZC") is not None
+    assert cache.stats["evictions"] == 1
+
+    with pytest.raises(ValueError):
+        TrackingCache(ScriptedCarrier(), max_entries=0)
+
+
+def test_misses_are_seeded_from_the_database_and_written_back():
+    db = MockDatabase()
+    db.create_tracking(make_tracking("1ZSTORED", ShipmentStatus.PICKED_UP))
+    carrier = ScriptedCarrier(ShipmentStatus.IN_TRANSIT)
+    cache, _ = make_cache(carrier, database=db)
+
+    assert cache.get("1ZSTORED").status == ShipmentStatus.PICKED_UP
+    assert cache.get("1ZUNKNOWN") is None
+    assert cache.stats["misses"] == 2
+
+    cache.refresh_due()
+    assert db.get_tracking("1ZSTORED").status == ShipmentStatus.IN_TRANSIT
+    assert [scan.status for scan in db.get_tracking_history("1ZSTORED")] == [
+        ShipmentStatus.PICKED_UP,
+        ShipmentStatus.IN_TRANSIT,
+    ]
+
+
+def test_mock_carrier_advances_from_the_stored_status():
+    db = MockDatabase()
+    db.create_tracking(make_tracking("1ZSTORED", ShipmentStatus.IN_TRANSIT))
+    carrier = MockCarrierClient(db, step_seconds=3600.0)
+
+    stored = carrier.fetch_tracking("1ZSTORED")
+    fresh = carrier.fetch_tracking("1ZNEW")
+    assert stored.status == ShipmentStatus.IN_TRANSIT
+    assert stored.current_location == "Oakland, CA Hub"
+    assert fresh.status == SHIPMENT_PROGRESSION[0]
+    assert fresh.estimated_delivery is not None
+    assert carrier.fetch_tracking("") is None
+    assert carrier.calls == 2
+
+    # With no time between scans every shipment stays where it started
+    instant = MockCarrierClient(step_seconds=0)
+    assert instant.fetch_tracking("1ZNEW").status == SHIPMENT_PROGRESSION[0]
+
+
+def test_refresher_thread_stops():
+    cache = TrackingCache(ScriptedCarrier(), refresh_interval=0.01)
+    cache.put(make_tracking("1ZABC", ShipmentStatus.IN_TRANSIT), fresh=False)
+    cache.start()
+    thread = cache._thread
+    cache.stop()
+    assert not thread.is_alive()
@@ -0,0 +1,119 @@
+"""
+Tracking scan history tests
+
+Checks the compact TrackingEventLog encoding round-trips scans in order,
+including scans recorded in the same second or microsecond.
+"""
+
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database.tracking_history import TrackingEventLog, TrackingScan
+from models.tracking import ShipmentStatus
+
+START = datetime(2026, 3, 1, 9, 0)
+
+PROGRESS = [
+    TrackingScan(ShipmentStatus.LABEL_CREATED, START, None),
+    TrackingScan(ShipmentStatus.PICKED_UP, START + timedelta(hours=2), "San Francisco, CA"),
+    TrackingScan(ShipmentStatus.IN_TRANSIT, START + timedelta(days=1), "Oakland, CA Hub"),
+    TrackingScan(ShipmentStatus.DELIVERED, START + timedelta(days=3), "Reno, NV"),
+]
+
+
+def test_history_is_chronological_per_shipment():
+    log = TrackingEventLog()
+    for scan in PROGRESS:
+        assert log.append("1ZA", *scan)
+        # Interleave another shipment so the chains share the buffers
+        assert log.append("1ZB", scan.status, scan.timestamp + timedelta(minutes=5))
+
+    assert log.history("1ZA") == PROGRESS
+    assert [scan.timestamp for scan in log.history("1ZB")] == [
+        scan.timestamp + timedelta(minutes=5) for scan in PROGRESS
+    ]
+    assert log.latest("1ZA") == PROGRESS[-1]
+    assert log.latest_timestamp("1ZA") == PROGRESS[-1].timestamp
+    assert len(log) == 8 and log.shipment_count == 2
+    assert sorted(log.tracking_numbers()) == ["1ZA", "1ZB"]
+
+
+def test_older_scans_are_ignored():
+    log = TrackingEventLog()
+    log.append("1ZA", *PROGRESS[2])
+    assert not log.append("1ZA", *PROGRESS[1])
+    assert log.history("1ZA") == [PROGRESS[2]]
+
+
+def test_same_second_scans_are_kept_when_they_differ():
+    log = TrackingEventLog()
+    moment = START.replace(microsecond=250_000)
+    assert log.append("1ZA", ShipmentStatus.OUT_FOR_DELIVERY, moment, "Reno, NV")
+    # Microseconds apart
+    assert log.append("1ZA", ShipmentStatus.DELIVERED, moment + timedelta(microseconds=1))
+    # The same instant, but a different status or location
+    assert log.append("1ZA", ShipmentStatus.EXCEPTION, moment + timedelta(microseconds=1))
+    assert log.append(
+        "1ZA", ShipmentStatus.EXCEPTION, moment + timedelta(microseconds=1), "Reno, NV"
+    )
+
+    # Replays of any scan already recorded at that instant are dropped
+    assert not log.append("1ZA", ShipmentStatus.DELIVERED, moment + timedelta(microseconds=1))
+    assert not log.append(
+        "1ZA", ShipmentStatus.EXCEPTION, moment + timedelta(microseconds=1), "Reno, NV"
+    )
+
+    history = log.history("1ZA")
+    assert [(scan.status, scan.location) for scan in history] == [
+        (ShipmentStatus.OUT_FOR_DELIVERY, "Reno, NV"),
+        (ShipmentStatus.DELIVERED, None),
+        (ShipmentStatus.EXCEPTION, None),
+        (ShipmentStatus.EXCEPTION, "Reno, NV"),
+    ]
+    assert history[0].timestamp == moment
+    assert {scan.timestamp for scan in history[1:]} == {moment + timedelta(microseconds=1)}
+
+
+def test_limit_returns_the_most_recent_scans():
+    log = TrackingEventLog()
+    for scan in PROGRESS:
+        log.append("1ZA", *scan)
+
+    assert log.history("1ZA", limit=2) == PROGRESS[-2:]
+    assert log.history("1ZA", limit=10) == PROGRESS
+    assert log.history("1ZA", limit=0) == []
+
+
+def test_unknown_tracking_numbers():
+    log = TrackingEventLog()
+    assert log.history("1ZNONE") == []
+    assert log.latest("1ZNONE") is None
+    assert log.latest_timestamp("1ZNONE") is None
+    assert "1ZNONE" not in log
+
+
+def test_reads_during_concurrent_appends_see_whole_chains():
+    log = TrackingEventLog()
+    stop = threading.Event()
+
+    def writer(tracking_number):
+        for minute in range(2000):
+            moment = START + timedelta(minutes=minute)
+            log.append(tracking_number, ShipmentStatus.IN_TRANSIT, moment)
+        stop.set()
+
+    threads = [threading.Thread(target=writer, args=(f"1Z{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    while not stop.is_set():
+        history = log.history("1Z0")
+        assert [scan.timestamp for scan in history] == [
+            START + timedelta(minutes=minute) for minute in range(len(history))
+        ]
+    for thread in threads:
+        thread.join()
+    assert len(log) == 8000
@@ -0,0 +1,195 @@
+"""
+Carrier tracking event ingestion tests
+
+Feeds TrackingIngestor batches as the webhook and the replay tool do and
+checks tracking state, scan history and the return status cascade.
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+
+from database.mock_db import MockDatabase
+from models.return_request import ReturnReason, ReturnRequest, ReturnStatus
+from models.tracking import ShipmentStatus
+from services.tracking_ingest import TrackingEvent, TrackingIngestor
+
+START = datetime(2026, 3, 1, 9, 0)
+
+
+def scan(tracking_number: str, status: str, minutes: int, location: str = None, **extra):
+    """A webhook payload for one carrier scan, ``minutes`` after START."""
+    payload = {
+        "tracking_number": tracking_number,
+        "status": status,
+        "timestamp": (START + timedelta(minutes=minutes)).isoformat(),
+        **extra,
+    }
+    if location:
+        payload["location"] = location
+    return payload
+
+
+def make_db(status: ReturnStatus = ReturnStatus.LABEL_GENERATED) -> MockDatabase:
+    """Mock database with one return shipped under 1ZRETURN."""
+    db = MockDatabase()
+    db.create_return(
+        ReturnRequest(
+            return_id="RET-INGEST",
+            order_id="ORD001",
+            user_id="USER001",
+            item_id="ITEM001",
+            reason=ReturnReason.DAMAGED,
+            status=status,
+            created_at=START,
+            tracking_number="1ZRETURN",
+        )
+    )
+    return db
+
+
+def test_duplicate_deliveries_are_applied_once():
+    db = make_db()
+    ingestor = TrackingIngestor(db)
+    # Re-deliveries match on event_id when the carrier sends one, else on the scan itself
+    picked_up = scan("1ZRETURN", "picked_up", 0, "San Francisco, CA", event_id="evt-1")
+    in_transit = scan("1ZRETURN", "in_transit", 30, "Oakland, CA Hub")
+
+    result = ingestor.ingest_payloads([picked_up, dict(picked_up), in_transit, dict(in_transit)])
+    assert result.to_dict() == {
+        "received": 4,
+        "invalid": 0,
+        "duplicates": 2,
+        "tracking_updated": 1,
+        "returns_updated": 1,
+    }
+
+    # A webhook retry of the same events in a later batch changes nothing
+    again = ingestor.ingest_payloads([in_transit, picked_up])
+    assert again.tracking_updated == 1 and again.returns_updated == 0
+    assert [s.status for s in db.get_tracking_history("1ZRETURN")] == [
+        ShipmentStatus.PICKED_UP,
+        ShipmentStatus.IN_TRANSIT,
+    ]
+
+
+def test_out_of_order_events_keep_the_latest_state():
+    db = make_db()
+    ingestor = TrackingIngestor(db)
+    ingestor.ingest_payloads(
+        [
+            scan("1ZRETURN", "in_transit", 60, "Oakland, CA Hub"),
+            scan("1ZRETURN", "picked_up", 0, "San Francisco, CA"),
+        ]
+    )
+    tracking = db.get_tracking("1ZRETURN")
+    assert tracking.status == ShipmentStatus.IN_TRANSIT
+    assert tracking.current_location == "Oakland, CA Hub"
+    assert [s.status for s in db.get_tracking_history("1ZRETURN")] == [
+        ShipmentStatus.PICKED_UP,
+        ShipmentStatus.IN_TRANSIT,
+    ]
+
+    # A late delivery of an older scan never moves the shipment backwards
+    late = ingestor.ingest_payloads([scan("1ZRETURN", "label_created", -30)])
+    assert late.tracking_updated == 0
+    assert db.get_tracking("1ZRETURN").status == ShipmentStatus.IN_TRANSIT
+
+
+def test_scans_advance_the_return_but_never_past_later_states():
+    db = make_db()
+    ingestor = TrackingIngestor(db)
+
+    ingestor.ingest_payloads([scan("1ZRETURN", "in_transit", 10)])
+    assert db.get_return("RET-INGEST").status == ReturnStatus.IN_TRANSIT
+
+    result = ingestor.ingest_payloads([scan("1ZRETURN", "delivered", 20, "Reno, NV")])
+    assert result.returns_updated == 1
+    assert db.get_return("RET-INGEST").status == ReturnStatus.RECEIVED
+
+    refunded = make_db(ReturnStatus.REFUND_PROCESSED)
+    result = TrackingIngestor(refunded).ingest_payloads([scan("1ZRETURN", "delivered", 20)])
+    assert result.tracking_updated == 1 and result.returns_updated == 0
+    assert refunded.get_return("RET-INGEST").status == ReturnStatus.REFUND_PROCESSED
+
+
+def test_invalid_payloads_are_counted_not_raised():
+    db = make_db()
+    result = TrackingIngestor(db).ingest_payloads(
+        [
+            {"status": "in_transit", "timestamp": START.isoformat()},
+            scan("1ZRETURN", "teleported", 0),
+            scan("1ZRETURN", "in_transit", 0) | {"timestamp": "yesterday"},
+            scan("1ZRETURN", "in_transit", 0) | {"timestamp": None},
+            "not an event",
+            scan("1ZRETURN", "in_transit", 5),
+        ]
+    )
+    assert result.received == 6
+    assert result.invalid == 5
+    assert result.tracking_updated == 1
+
+
+@pytest.fixture
+def pacific(monkeypatch):
+    """Run the test with the host clock in US Pacific time (UTC-8 in March)."""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_utc_offsets_are_normalized_to_naive_local(pacific):
+    delivered = {"tracking_number": "1ZRETURN", "status": "delivered"}
+    event = TrackingEvent.from_dict(delivered | {"timestamp": "2026-03-01T12:00:00Z"})
+    assert event.timestamp == datetime(2026, 3, 1, 4, 0)
+    shifted = TrackingEvent.from_dict(delivered | {"timestamp": "2026-03-01T07:00:00-05:00"})
+    assert shifted.timestamp == event.timestamp
+    epoch = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+    assert TrackingEvent.from_dict(delivered | {"timestamp": epoch}).timestamp == event.timestamp
+
+
+def test_epoch_and_offset_timestamps_order_together(pacific):
+    noon_utc = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    db = make_db()
+    ingestor = TrackingIngestor(db)
+    in_transit = {"tracking_number": "1ZRETURN", "status": "in_transit"}
+    result = ingestor.ingest_payloads([in_transit | {"timestamp": "2026-03-01T12:00:00Z"}])
+    assert result.tracking_updated == 1
+
+    # Half an hour later, from a carrier that sends epoch seconds
+    later = (noon_utc + timedelta(minutes=30)).timestamp()
+    result = ingestor.ingest_payloads(
+        [{"tracking_number": "1ZRETURN", "status": "delivered", "timestamp": later}]
+    )
+    assert result.tracking_updated == 1
+    tracking = db.get_tracking("1ZRETURN")
+    assert tracking.status == ShipmentStatus.DELIVERED
+    assert tracking.last_update == datetime(2026, 3, 1, 4, 30)
+    assert [scan.status for scan in db.get_tracking_history("1ZRETURN")] == [
+        ShipmentStatus.IN_TRANSIT,
+        ShipmentStatus.DELIVERED,
+    ]
+
+
+def test_replay_file_ingests_in_batches(tmp_path):
+    path = tmp_path / "events.jsonl"
+    lines = [json.dumps(scan(f"1ZREPLAY{i % 7}", "in_transit", i)) for i in range(25)]
+    lines[3] = "{not json"
+    lines.insert(10, "")
+    path.write_text("\n".join(lines) + "\n")
+
+    db = make_db()
+    result = TrackingIngestor(db).replay_file(str(path), batch_size=4)
+    assert result.received == 25
+    assert result.invalid == 1
+    assert result.duplicates == 0
+    assert sum(len(db.get_tracking_history(f"1ZREPLAY{i}")) for i in range(7)) == 24
+    assert db.get_tracking("1ZREPLAY0").last_update == START + timedelta(minutes=21)
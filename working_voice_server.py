@@ -8,7 +8,10 @@ Port: 5040
 import sys
 sys.path.insert(0, '/Users/sankar/projects/voice_agent')
 
-from flask import Flask, jsonify, render_template_string, send_from_directory
+from flask import Flask, jsonify, render_template_string, request, send_from_directory
+from database import create_database
+from services.tracking_ingest import TrackingIngestor
+from services.voice_interface import create_voice_interface
 from services.vocalbridge_livekit_client import VocalBridgeClient
 import webbrowser
 import threading
@@ -331,6 +334,11 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 </html>'''
 
 client = VocalBridgeClient()
+# Carrier scans go to the same engine and tracking cache the agents read,
+# so the next "where is my return" on a call sees them
+db = create_database()
+voice_interface = create_voice_interface(db)
+tracking_ingestor = TrackingIngestor(db, voice_interface.orchestrator.tracking_cache)
 
 @app.route('/')
 def index():
@@ -344,6 +352,18 @@ def get_credentials():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/tracking/events', methods=['POST'])
+def ingest_tracking_events():
+    """Carrier webhook: accepts a JSON list of scan events or {"events": [...]}."""
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get('events')
+    if not isinstance(payload, list):
+        return jsonify({'success': False, 'error': 'Expected a list of tracking events'}), 400
+
+    result = tracking_ingestor.ingest_payloads(payload)
+    return jsonify({'success': True, 'data': result.to_dict()})
+
 @app.route('/static/<path:filename>')
 def serve_static(filename):
     return send_from_directory('static', filename)
@@ -386,7 +406,10 @@ def main():
         webbrowser.open(f'http://localhost:{PORT}')
 
     threading.Thread(target=open_browser, daemon=True).start()
-    app.run(debug=False, port=PORT, use_reloader=False)
+    try:
+        app.run(debug=False, port=PORT, use_reloader=False)
+    finally:
+        voice_interface.orchestrator.close()
 
 if __name__ == '__main__':
     main()